@@ -1,17 +1,34 @@
 """ Base classes for managing dataset
 """
-from os import listdir, walk
-from os.path import exists, isdir, join, dirname, realpath
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from os import listdir, replace, sep, stat
+from os.path import exists, isdir, isfile, join, dirname, realpath, relpath
 
 import json
+import numpy as np
 import pandas as pd
 import re
 from enum import IntEnum
+from hashlib import sha256
+from threading import RLock
+from scipy import sparse
 
 from bugfinder import settings
-from bugfinder.base.processing import ProcessingCategory
+from bugfinder.base.processing import ProcessingCategory, DatasetArtifact
 from bugfinder.settings import LOGGER
-from bugfinder.utils.processing import is_processing_stack_valid
+from bugfinder.utils.dirs import (
+    get_signature,
+    scan_tree,
+    is_tree_unchanged,
+    get_file_hash,
+    get_tree_hash,
+)
+from bugfinder.utils.feature_store import FeatureStore
+from bugfinder.utils.processing import (
+    is_processing_stack_valid,
+    are_operations_conflicting,
+)
+from bugfinder.utils.profiling import ResourceProfiler
 from bugfinder.utils.statistics import get_time, display_time
 
 
@@ -24,11 +41,76 @@ class DatasetQueueRetCode(IntEnum):
     OPERATION_FAIL = 3
 
 
+INDEX_CACHE_VERSION = 2
+""" int: Version of the index cache format. Caches with a different version are
+ignored.
+"""
+
+INDEX_RESCAN_RATIO = 0.5
+""" float: Fraction of the test cases of a class above which the class is browsed
+again instead of applying the changes one test case at a time.
+"""
+
+
+def _is_in_test_cases(dirpath, test_cases):
+    """Check whether a directory belongs to one of the given test cases, by looking
+    up each of its ancestors.
+
+    Args:
+        dirpath (str): Directory path, relative to the dataset.
+        test_cases (set): Test cases.
+
+    Returns:
+        bool: True if the directory or one of its ancestors is a test case.
+    """
+    while dirpath != "":
+        if dirpath in test_cases:
+            return True
+
+        dirpath = dirname(dirpath)
+
+    return False
+
+
 class CodeWeaknessClassificationDataset:
     """Main dataset class."""
 
     ignored_dirs = list(settings.DATASET_DIRS.values())
 
+    def _load_index_cache(self):
+        """Load the index cache file. An empty cache is returned if the file does not
+        exist or cannot be used.
+        """
+        index_cache = {"version": INDEX_CACHE_VERSION, "classes": {}}
+
+        if not exists(self.index_filepath):
+            return index_cache
+
+        try:
+            with open(self.index_filepath, "r", encoding="utf-8") as index_fp:
+                stored_index_cache = json.load(index_fp)
+        except (OSError, ValueError) as exc:
+            LOGGER.debug("Index cache could not be read: %s.", str(exc))
+            return index_cache
+
+        if stored_index_cache.get("version") != INDEX_CACHE_VERSION:
+            LOGGER.debug("Index cache version is outdated. Ignoring cache...")
+            return index_cache
+
+        return stored_index_cache
+
+    def _save_index_cache(self, index_cache):
+        """Save the index cache file next to the summary file."""
+        tmp_index_filepath = "%s.tmp" % self.index_filepath
+
+        try:
+            with open(tmp_index_filepath, "w", encoding="utf-8") as index_fp:
+                json.dump(index_cache, index_fp)
+
+            replace(tmp_index_filepath, self.index_filepath)
+        except OSError as exc:
+            LOGGER.debug("Index cache could not be saved: %s.", str(exc))
+
     def _index_dataset(self):
         """Browse the dataset to build various indexes"""
         LOGGER.debug("Indexing test cases...")
@@ -38,61 +120,202 @@ class CodeWeaknessClassificationDataset:
             LOGGER.error(msg)
             raise FileNotFoundError(msg)
 
-        # If the path exists, browse directory
-        for item in listdir(self.path):
+        index_cache = self._load_index_cache()
+        self._index_cache = {"version": INDEX_CACHE_VERSION, "classes": {}}
+        scanned_classes = 0
+
+        # If the path exists, browse directory. Classes are sorted to avoid
+        # discrepancies between runs.
+        for item in sorted(listdir(self.path)):
             item_path = join(self.path, item)
 
             # If item is not a directory or should be ignored, get the next item
             if not isdir(item_path) or item in self.ignored_dirs:
                 continue
 
-            # Add item name as new class
+            # Only browse the class directory if it changed since the last indexing
+            class_index = index_cache["classes"].get(item)
+
+            if class_index is None or not is_tree_unchanged(
+                self.path, class_index["dirs"]
+            ):
+                class_dirs, class_files = scan_tree(self.path, item)
+                class_index = {"dirs": class_dirs, "files": class_files}
+                scanned_classes += 1
+
+            self._index_cache["classes"][item] = class_index
+
+            # Add item name as new class, along with its test cases
             self.classes.append(item)
+            self.test_case_files.update(class_index["files"])
 
-            # Retrieve the list of files in the directory
-            for root, _, files in walk(item_path):
-                # Specify full path for test cases and ignore UNIX hidden files
-                files = [
-                    dirname(join(root, f).replace(self.path, ""))
-                    for f in files
-                    if not f.startswith(".")
-                ]
+        self.test_cases = set(self.test_case_files.keys())
+
+        # Compute stats
+        self.stats = [
+            len(self._index_cache["classes"][class_name]["files"])
+            for class_name in self.classes
+        ]
 
-                self.test_cases.update(files)
+        LOGGER.debug(
+            "%d/%d classes browsed, %d retrieved from cache.",
+            scanned_classes,
+            len(self.classes),
+            len(self.classes) - scanned_classes,
+        )
 
-            # Sort classes to avoid discrepancies between runs
-            self.classes = sorted(self.classes)
+        if scanned_classes > 0 or set(index_cache["classes"].keys()) != set(
+            self.classes
+        ):
+            self._save_index_cache(self._index_cache)
+
+    def _get_features_source(self):
+        """Retrieve the most recent feature source, either the feature store or the
+        CSV feature file.
+
+        Returns:
+            str|None: Path of the feature source, None if there is no feature.
+        """
+        features_sources = [
+            features_source
+            for features_source in [
+                self.feature_store.columns_filepath,
+                join(self.feats_dir, settings.FEATURES_FILE),
+            ]
+            if exists(features_source)
+        ]
 
-            # Compute stats
-            self.stats.append(len(self.test_cases) - sum(self.stats))
+        if len(features_sources) == 0:
+            return None
+
+        # The feature store is preferred over the CSV file if they are as recent.
+        return max(
+            features_sources,
+            key=lambda features_source: stat(features_source).st_mtime_ns,
+        )
 
     def _index_features(self):
-        """Browse the dataset to index features."""
-        features_filename = join(self.feats_dir, settings.FEATURES_FILE)
+        """Browse the dataset to index features. Features are only loaded if they
+        changed since the last time they were loaded. Features from the feature store
+        are read on first access.
+        """
+        features_source = self._get_features_source()
 
-        if not exists(features_filename):
+        if features_source is None:
             LOGGER.debug("Features file does not exist. Skipping dataframe loading...")
             return
 
-        LOGGER.debug("Loading feature dataframe...")
-        self.features = pd.read_csv(features_filename)
+        features_signature = get_signature(features_source)
+
+        if features_signature is None or features_signature != self._features_signature:
+            if features_source == self.feature_store.columns_filepath:
+                LOGGER.debug("Opening feature store...")
+                self.feature_store.reload()
+                self.features = None
+                self._features_from_store = True
+            else:
+                LOGGER.debug("Loading feature dataframe...")
+                self.features = pd.read_csv(features_source)
+
+            self._features_signature = features_signature
+        else:
+            LOGGER.debug("Feature file unchanged. Skipping dataframe loading...")
+
         self._validate_features()
 
         feature_history_version = [
-            int(re.sub(r"[^\.]+\.([0-9]+)\.csv", r"\1", feature_file))
-            for feature_file in listdir(self.feats_dir)
-            if feature_file != settings.FEATURES_FILE
+            int(feature_history_match.group(1))
+            for feature_history_match in [
+                re.match(r"[^\.]+\.([0-9]+)\.", feature_file)
+                for feature_file in listdir(self.feats_dir)
+            ]
+            if feature_history_match is not None
         ]
 
         self.feats_version = (
             max(feature_history_version) + 1 if len(feature_history_version) > 0 else 1
         )
 
-    def __init__(self, dataset_path, silent=False):
-        """Inititialization method"""
-        start_time = get_time()
-        logger_log_func = LOGGER.debug if silent else LOGGER.info
+        # Versions of the feature store are recorded in the store itself.
+        if self.feature_store.exists():
+            self.feats_version = max(
+                self.feats_version, self.feature_store.feature_version
+            )
+
+    @property
+    def features(self):
+        """pd.DataFrame: Features of the dataset. Features from the feature store are
+        only read when first accessed.
+        """
+        if self._features is None:
+            LOGGER.debug("Reading feature store...")
+            self._features = self.feature_store.read()
+
+        return self._features
+
+    @features.setter
+    def features(self, features):
+        self._features = features
+        # Features set in memory are not identified by any file.
+        self._features_signature = None
+        self._features_from_store = False
+
+    def get_features_test_cases(self):
+        """Retrieve the test case each feature row has been extracted from.
+
+        Returns:
+            np.ndarray|None: Test case of each row, None if the features have not
+            been read from a feature store recording them.
+        """
+        if not self._features_from_store:
+            return None
+
+        return self.feature_store.test_cases
+
+    def get_features_matrix(self):
+        """Retrieve the input features, without the output columns, as a sparse
+        matrix. Features that have not been read yet are retrieved from the feature
+        store without building a dataframe.
+
+        Returns:
+            sparse.csr_matrix: Input feature matrix.
+        """
+        if self._features is None:
+            return self.feature_store.get_matrix(
+                [
+                    column
+                    for column in self.feature_store.columns
+                    if column not in ["result", "name"]
+                ]
+            )
+
+        input_features = self._features.drop(["result", "name"], axis=1)
+
+        if input_features.shape[1] > 0 and all(
+            isinstance(dtype, pd.SparseDtype) for dtype in input_features.dtypes
+        ):
+            return input_features.sparse.to_coo().tocsr()
+
+        return sparse.csr_matrix(input_features.to_numpy(dtype=float))
+
+    def get_features_shape(self):
+        """Retrieve the shape of the features without reading them from the feature
+        store.
 
+        Returns:
+            tuple: Number of rows and columns of the features.
+        """
+        if self._features is None:
+            return self.feature_store.shape
+
+        return self._features.shape
+
+    def _init_paths(self, dataset_path):
+        """Set the paths of the dataset directories and files.
+
+        Args:
+            dataset_path (str): Path of the dataset.
+        """
         self.path = join(dataset_path, "")
         self.joern_dir = join(self.path, settings.DATASET_DIRS["joern"])
         self.neo4j_dir = join(self.path, settings.DATASET_DIRS["neo4j"])
@@ -100,15 +323,30 @@ class CodeWeaknessClassificationDataset:
         self.model_dir = join(self.path, settings.DATASET_DIRS["models"])
         self.embeddings_dir = join(self.path, settings.DATASET_DIRS["embeddings"])
         self.summary_filepath = join(self.path, settings.SUMMARY_FILE)
+        self.index_filepath = join(self.path, settings.INDEX_FILE)
+        self.feature_store = FeatureStore(join(self.feats_dir, settings.FEATURES_STORE))
+
+    def __init__(self, dataset_path, silent=False):
+        """Inititialization method"""
+        start_time = get_time()
+        logger_log_func = LOGGER.debug if silent else LOGGER.info
+
+        self._init_paths(dataset_path)
 
         self.classes = []
         self.test_cases = set()
+        self.test_case_files = {}
         self.features = pd.DataFrame()
         self.feats_version = 1
         self.stats = []
         self.ops_queue = []
         self.summary = None
 
+        self._index_cache = {"version": INDEX_CACHE_VERSION, "classes": {}}
+        self._features_signature = None
+        self._lock = RLock()
+        self._file_hashes = {}
+
         self.rebuild_index()
 
         logger_log_func(
@@ -117,39 +355,233 @@ class CodeWeaknessClassificationDataset:
 
     def rebuild_index(self):
         """Rebuild index"""
-        LOGGER.debug("Rebuilding index...")
-        _time = get_time()
+        with self._lock:
+            LOGGER.debug("Rebuilding index...")
+            _time = get_time()
+
+            self.classes = []
+            self.test_cases = set()
+            self.test_case_files = {}
+            self.stats = []
+            self._features_signature = None
+
+            self._index_dataset()
+            self._index_features()
+
+            if len(self.test_cases) > 0:
+                self.stats = [st / len(self.test_cases) for st in self.stats]
+
+            LOGGER.debug(
+                "Dataset index build in %s. %d test_cases, %d classes, "
+                "%d features (v%d).",
+                display_time(get_time() - _time),
+                len(self.test_cases),
+                len(self.classes),
+                self.get_features_shape()[1] - 2,
+                self.feats_version,
+            )
 
-        self.classes = []
-        self.test_cases = set()
-        self.stats = []
+            self.load_summary()
+            self._update_summary_metadata()
+
+    def update_index(self, added=None, removed=None, modified=None):
+        """Apply a set of changes to the index instead of rebuilding it. Only the
+        given test cases are browsed, and the features are only reloaded if the
+        feature file changed.
+
+        Args:
+            added (iterable): Test cases added to the dataset.
+            removed (iterable): Test cases removed from the dataset.
+            modified (iterable): Test cases with modified files. Test cases that do
+                not exist anymore are removed from the index.
+        """
+        with self._lock:
+            LOGGER.debug("Updating index...")
+            _time = get_time()
+
+            added = set(added) if added is not None else set()
+            removed = set(removed) if removed is not None else set()
+            modified = set(modified) if modified is not None else set()
+
+            class_test_cases = {}
+
+            for test_case in added | removed | modified:
+                class_test_cases.setdefault(test_case.split(sep)[0], set()).add(
+                    test_case
+                )
 
-        self._index_dataset()
-        self._index_features()
+            for class_name, test_cases in sorted(class_test_cases.items()):
+                if class_name not in self._index_cache["classes"]:
+                    if class_name in self.ignored_dirs or not isdir(
+                        join(self.path, class_name)
+                    ):
+                        continue
 
-        if len(self.test_cases) > 0:
-            self.stats = [st / len(self.test_cases) for st in self.stats]
+                    self._index_cache["classes"][class_name] = {"dirs": {}, "files": {}}
+                    self.classes = sorted(self.classes + [class_name])
 
-        LOGGER.debug(
-            "Dataset index build in %s. %d test_cases, %d classes, "
-            "%d features (v%d).",
-            display_time(get_time() - _time),
-            len(self.test_cases),
-            len(self.classes),
-            self.features.shape[1] - 2,
-            self.feats_version,
-        )
+                class_index = self._index_cache["classes"][class_name]
+
+                # Browsing the whole class is cheaper than applying large deltas.
+                if class_name in test_cases or len(test_cases) > max(
+                    1, INDEX_RESCAN_RATIO * len(class_index["files"])
+                ):
+                    self._rescan_class(class_name, removed)
+                else:
+                    self._update_class(class_name, test_cases, added, removed)
+
+            if len(added | removed | modified) > 0:
+                self._save_index_cache(self._index_cache)
+
+            self.stats = [
+                len(self._index_cache["classes"][class_name]["files"])
+                for class_name in self.classes
+            ]
+
+            if len(self.test_cases) > 0:
+                self.stats = [st / len(self.test_cases) for st in self.stats]
+
+            self._index_features()
+
+            LOGGER.debug(
+                "Dataset index updated in %s. %d test cases added, %d removed, "
+                "%d modified.",
+                display_time(get_time() - _time),
+                len(added),
+                len(removed),
+                len(modified),
+            )
+
+            if self.summary is None:
+                self.load_summary()
+
+            self._update_summary_metadata()
+
+    def _replace_class_files(self, removed_files, class_files):
+        """Replace files of a class in the in-memory indexes.
+
+        Args:
+            removed_files (iterable): Directories removed from the index.
+            class_files (dict): Files of the directories added to the index.
+        """
+        for test_case in removed_files:
+            del self.test_case_files[test_case]
+            self.test_cases.discard(test_case)
+
+        self.test_case_files.update(class_files)
+        self.test_cases.update(class_files.keys())
+
+    def _rescan_class(self, class_name, removed):
+        """Browse a whole class and replace its entries in the index.
+
+        Args:
+            class_name (str): Name of the class.
+            removed (set): Test cases removed from the dataset, never indexed.
+        """
+        class_index = self._index_cache["classes"][class_name]
+
+        if class_name not in removed and isdir(join(self.path, class_name)):
+            class_dirs, class_files = scan_tree(self.path, class_name)
+            class_files = {
+                dirpath: filenames
+                for dirpath, filenames in class_files.items()
+                if not _is_in_test_cases(dirpath, removed)
+            }
+        else:
+            class_dirs, class_files = {}, {}
+
+        self._replace_class_files(list(class_index["files"].keys()), class_files)
+        self._index_cache["classes"][class_name] = {
+            "dirs": class_dirs,
+            "files": class_files,
+        }
+
+    def _update_class(self, class_name, test_cases, added, removed):
+        """Browse the changed test cases of a class and replace their entries in the
+        index. Entries are matched with the test cases through their ancestors, so
+        that the index of the class is only browsed once.
+
+        Args:
+            class_name (str): Name of the class.
+            test_cases (set): Changed test cases of the class.
+            added (set): Test cases added to the dataset.
+            removed (set): Test cases removed from the dataset.
+        """
+        class_index = self._index_cache["classes"][class_name]
+        # Remove the previous entries of the test cases and their subdirectories
+        class_index["dirs"] = {
+            dirpath: signature
+            for dirpath, signature in class_index["dirs"].items()
+            if not _is_in_test_cases(dirpath, test_cases)
+        }
+        removed_files = [
+            dirpath
+            for dirpath in class_index["files"].keys()
+            if _is_in_test_cases(dirpath, test_cases)
+        ]
+
+        for dirpath in removed_files:
+            del class_index["files"][dirpath]
+
+        class_files = {}
+
+        for test_case in sorted(test_cases):
+            if test_case not in removed and isdir(join(self.path, test_case)):
+                test_case_dirs, test_case_files = scan_tree(self.path, test_case)
+                class_index["dirs"].update(test_case_dirs)
+                class_files.update(test_case_files)
+
+            # Parent directories are checked again during the next indexing when
+            # the structure of the class changed.
+            if test_case in added or test_case not in class_index["dirs"]:
+                test_case_parent = dirname(test_case)
+
+                while test_case_parent != "":
+                    if test_case_parent in class_index["dirs"]:
+                        class_index["dirs"][test_case_parent] = None
+
+                    test_case_parent = dirname(test_case_parent)
+
+        class_index["files"].update(class_files)
+        self._replace_class_files(removed_files, class_files)
+
+    def _update_summary_metadata(self):
+        """Update the dataset metadata stored in the summary"""
+        features_stats = self.summary["metadata"].get("features_stats")
+        artifacts = self.summary["metadata"].get("artifacts")
 
-        self.load_summary()
         self.summary["metadata"] = {
             "test_cases": len(self.test_cases),
             "classes": len(self.classes),
             "features": {
-                "number": self.features.shape[1],
+                "number": self.get_features_shape()[1],
                 "version": self.feats_version,
             },
         }
 
+        # Keep the feature statistics as long as the features did not change
+        if self._is_features_stats_valid(features_stats):
+            self.summary["metadata"]["features_stats"] = features_stats
+
+        if artifacts is not None:
+            self.summary["metadata"]["artifacts"] = artifacts
+
+    def _is_features_stats_valid(self, features_stats):
+        """Check that cached feature statistics describe the current features.
+
+        Args:
+            features_stats (dict|None): Cached feature statistics.
+
+        Returns:
+            bool: True if the statistics can be used, False otherwise.
+        """
+        return (
+            features_stats is not None
+            and self._features_signature is not None
+            and features_stats["version"] == self.feats_version
+            and features_stats["signature"] == self._features_signature
+        )
+
     def load_summary(self):
         """Load summary file"""
         if not exists(self.summary_filepath):
@@ -171,31 +603,123 @@ class CodeWeaknessClassificationDataset:
 
     def _validate_features(self):
         """Ensure feature are valid"""
-        if self.features.shape[1] < 3:
+        if self.get_features_shape()[1] < 3:
             raise IndexError("Feature file must contain at least 3 columns")
 
-    def get_features_info(self):
-        """Retrieve feature information"""
-        LOGGER.info(
-            "Analyzing features (%dx%d matrix)...",
-            self.features.shape[0],
-            self.features.shape[1],
-        )
+    def _get_features_column(self, name):
+        """Retrieve a single feature column, from the feature store if the features
+        have not been read yet.
+
+        Args:
+            name (str): Name of the column.
+
+        Returns:
+            np.ndarray: Values of the column.
+        """
+        if self._features is None:
+            return np.asarray(self.feature_store.get_column(name))
 
+        return self._features[name].to_numpy()
+
+    def get_features_stats(self):
+        """Compute statistics on the input features: number of non-zero values per
+        column, value ranges, sparsity and number of samples per class. Statistics
+        are computed on the whole feature matrix at once and cached in the summary
+        until the features change.
+
+        Returns:
+            dict: Feature statistics.
+        """
         self._validate_features()
 
-        features_info = {"non_empty_cols": 0, "empty_cols": 0}
+        features_stats = self.summary["metadata"].get("features_stats")
 
-        for col in self.features:
-            for item in self.features[col]:
-                if item != 0:
-                    features_info["non_empty_cols"] += 1
-                    break
+        if self._is_features_stats_valid(features_stats):
+            LOGGER.debug("Using cached feature statistics.")
+            return features_stats
+
+        LOGGER.debug("Computing feature statistics...")
+        _time = get_time()
+
+        features_matrix = self.get_features_matrix().tocsc()
+        features_rows, features_cols = features_matrix.shape
+
+        if self._features is None:
+            feature_names = self.feature_store.columns
+        else:
+            feature_names = list(self._features.columns)
+
+        feature_names = [
+            feature_name
+            for feature_name in feature_names
+            if feature_name not in ["result", "name"]
+        ]
+
+        # Explicitly stored zeros are not counted as non-zero values.
+        features_matrix.eliminate_zeros()
+        features_nnz = np.diff(features_matrix.indptr)
+
+        if features_rows > 0 and features_cols > 0:
+            features_min = features_matrix.min(axis=0).toarray().ravel()
+            features_max = features_matrix.max(axis=0).toarray().ravel()
+        else:
+            features_min = features_max = np.zeros(features_cols)
+
+        class_ids, class_counts = np.unique(
+            self._get_features_column("result"), return_counts=True
+        )
+
+        features_stats = {
+            "version": self.feats_version,
+            "signature": self._features_signature,
+            "shape": [features_rows, features_cols],
+            "non_empty_cols": int(np.count_nonzero(features_nnz)),
+            "empty_cols": int(features_cols - np.count_nonzero(features_nnz)),
+            "sparsity": (
+                1 - float(features_nnz.sum()) / (features_rows * features_cols)
+                if features_rows * features_cols > 0
+                else 0.0
+            ),
+            "classes": {
+                (
+                    self.classes[int(class_id)]
+                    if 0 <= int(class_id) < len(self.classes)
+                    else str(class_id)
+                ): int(class_count)
+                for class_id, class_count in zip(class_ids, class_counts)
+            },
+            "columns": {
+                "names": feature_names,
+                "nnz": features_nnz.tolist(),
+                "min": features_min.tolist(),
+                "max": features_max.tolist(),
+            },
+        }
+
+        LOGGER.debug(
+            "Feature statistics computed in %s.", display_time(get_time() - _time)
+        )
+
+        # Statistics are only cached if the features can be identified later on.
+        if self._features_signature is not None:
+            self.summary["metadata"]["features_stats"] = features_stats
+            self.save_summary()
 
-        features_info["empty_cols"] = (
-            self.features.shape[1] - features_info["non_empty_cols"]
+        return features_stats
+
+    def get_features_info(self):
+        """Retrieve feature information"""
+        LOGGER.info(
+            "Analyzing features (%dx%d matrix)...",
+            self.get_features_shape()[0],
+            self.get_features_shape()[1],
         )
-        features_info["non_empty_cols"] -= 2
+
+        features_stats = self.get_features_stats()
+        features_info = {
+            "non_empty_cols": features_stats["non_empty_cols"],
+            "empty_cols": features_stats["empty_cols"],
+        }
 
         LOGGER.info(
             "Features contain %d empty columns, %d non-empty columns.",
@@ -225,10 +749,28 @@ class CodeWeaknessClassificationDataset:
 
         self.ops_queue.append({"class": op_class, "args": op_args})
 
-    def process(self, silent=False):
-        """Run all processing in the processing queue"""
+    def process(self, silent=False, max_workers=None, force=False):
+        """Run all processing in the processing queue. Operations that do not access
+        the same dataset artifacts are run concurrently, other operations are run in
+        the order of the queue. Operations already run successfully on the same
+        inputs, and whose outputs did not change since, are skipped.
+
+        Args:
+            silent (bool): Log the progress at debug level if True.
+            max_workers (int|None): Maximum number of operations run concurrently.
+                Defaults to `settings.PROCESSING_WORKERS`.
+            force (bool): Run every operation, even the up-to-date ones.
+
+        Returns:
+            DatasetQueueRetCode: State of the processing queue.
+        """
         logger_log_func = LOGGER.debug if silent else LOGGER.info
 
+        if max_workers is None:
+            max_workers = settings.PROCESSING_WORKERS
+
+        max_workers = max(max_workers, 1)
+
         _time = get_time()
         LOGGER.debug("Processing ops queue...")
 
@@ -237,116 +779,628 @@ class CodeWeaknessClassificationDataset:
             return DatasetQueueRetCode.INVALID_QUEUE
 
         total_op = len(self.ops_queue)
-        current_op = 0
 
         # Exit if the queue is empty.
         if total_op == 0:
             logger_log_func("No operation in queue.")
             return DatasetQueueRetCode.EMPTY_QUEUE
 
-        # Process operation while the queue is not empty.
-        while len(self.ops_queue) != 0:
-            operation = self.ops_queue.pop(0)  # Get the first op in the queue
-            operation_class = operation["class"](self)
+        up_to_date_ops = 0 if force else self.get_up_to_date_operations(self.ops_queue)
+
+        # The queue is emptied before running the operations, since operations can
+        # queue and process operations themselves.
+        operations = [
+            {
+                "index": op_index + 1,
+                "operation": operation,
+                "artifacts": operation["class"].get_artifacts(operation["args"]),
+            }
+            for op_index, operation in enumerate(self.ops_queue)
+        ]
+        self.ops_queue = []
+
+        pending_ops = list(operations)
+        running_ops = {}
+        has_failed = False
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while len(pending_ops) != 0 or len(running_ops) != 0:
+                # Launch the pending operations that do not conflict with an earlier
+                # pending or running operation.
+                op_position = 0
+
+                while (
+                    not has_failed
+                    and op_position < len(pending_ops)
+                    and len(running_ops) < max_workers
+                ):
+                    pending_op = pending_ops[op_position]
+                    previous_ops = (
+                        list(running_ops.values()) + pending_ops[:op_position]
+                    )
+
+                    if any(
+                        are_operations_conflicting(
+                            pending_op["artifacts"], previous_op["artifacts"]
+                        )
+                        for previous_op in previous_ops
+                    ):
+                        op_position += 1
+                        continue
+
+                    pending_ops.pop(op_position)
+                    future = executor.submit(
+                        self._run_operation,
+                        pending_op["operation"],
+                        pending_op["index"],
+                        total_op,
+                        logger_log_func,
+                        force,
+                        pending_op["index"] <= up_to_date_ops,
+                    )
+                    running_ops[future] = pending_op
+
+                if len(running_ops) == 0:  # Remaining operations are not launched
+                    break
+
+                done_ops, _ = wait(running_ops.keys(), return_when=FIRST_COMPLETED)
+
+                for done_op in done_ops:
+                    del running_ops[done_op]
+
+                    if done_op.result() != DatasetQueueRetCode.OK:
+                        has_failed = True
 
-            operation_category = operation_class.metadata["category"]
+        if has_failed:
+            return DatasetQueueRetCode.OPERATION_FAIL
 
+        logger_log_func(
+            "%d operations run in %s.", total_op, display_time(get_time() - _time)
+        )
+
+        return DatasetQueueRetCode.OK
+
+    def _run_operation(
+        self,
+        operation,
+        current_op,
+        total_op,
+        logger_log_func,
+        force=False,
+        up_to_date=False,
+    ):
+        """Run a single operation of the processing queue and record it in the
+        summary.
+
+        Args:
+            operation (dict): Operation class and arguments.
+            current_op (int): Position of the operation in the queue.
+            total_op (int): Size of the queue.
+            logger_log_func (callable): Logging function used to report progress.
+            force (bool): Run the operation even if it is up-to-date.
+            up_to_date (bool): Whether the operation belongs to the up-to-date
+                operations at the start of the queue.
+
+        Returns:
+            DatasetQueueRetCode: OK if the operation succeeded, OPERATION_FAIL
+                otherwise.
+        """
+        operation_instance = operation["class"](self)
+        operation_category = operation_instance.metadata["category"]
+
+        with self._lock:
             if (
                 operation_category not in self.summary.keys()
                 and operation_category != str(ProcessingCategory.__NONE__)
             ):
                 self.summary[operation_category] = []
 
-            operation_call = {
-                "class": "%s.%s"
-                % (
-                    operation_class.__class__.__module__,
-                    operation_class.__class__.__name__,
-                ),
-                "args": operation["args"],
-            }
-            current_op += 1
+        operation_call = {
+            "class": "%s.%s"
+            % (
+                operation_instance.__class__.__module__,
+                operation_instance.__class__.__name__,
+            ),
+            "args": operation["args"],
+        }
 
+        if not force and (
+            up_to_date
+            or self.is_operation_up_to_date(operation["class"], operation["args"])
+        ):
             logger_log_func(
-                "Running operation %d/%d (%s)...",
+                "Operation %d/%d (%s) is up-to-date. Skipping...",
                 current_op,
                 total_op,
                 operation_call["class"],
             )
+            return DatasetQueueRetCode.OK
 
-            op_start_time = get_time()  # Time single operation
+        logger_log_func(
+            "Running operation %d/%d (%s)...",
+            current_op,
+            total_op,
+            operation_call["class"],
+        )
 
-            try:
-                operation_instance = operation["class"](self)
-                # If args are defined, pass them to execute command
-                if operation["args"] is not None:
-                    operation_instance.execute(**operation["args"])
-                else:
-                    operation_instance.execute()
-
-                self.append_summary(
-                    operation_call,
-                    operation_category,
-                    get_time() - op_start_time,
-                    operation_instance.processing_stats,
-                    DatasetQueueRetCode.OK,
-                )
-            except Exception as exc:
-                LOGGER.error(
-                    "Operation %d/%d failed: %s.", current_op, total_op, str(exc)
-                )
+        op_reads, op_writes = operation["class"].get_artifacts(operation["args"])
+        op_inputs = None
+        op_fingerprint = None
 
-                # Clear the operation queue and exit
-                self.ops_queue.clear()
-                self.append_summary(
-                    operation_call,
-                    operation_category,
-                    get_time() - op_start_time,
-                    {},
-                    DatasetQueueRetCode.OPERATION_FAIL,
-                )
-                return DatasetQueueRetCode.OPERATION_FAIL
+        # Fingerprint the operation on its inputs, before they are modified.
+        if op_reads is not None and op_writes is not None:
+            op_inputs = {
+                artifact: self.get_artifact_version(artifact)
+                for artifact in sorted(op_reads)
+            }
+            op_fingerprint = self.get_operation_fingerprint(
+                operation["class"], operation["args"], op_inputs
+            )
 
-        logger_log_func(
-            "%d operations run in %s.", total_op, display_time(get_time() - _time)
+        op_profiler = ResourceProfiler(
+            self.get_operation_written_paths(operation["class"], operation["args"])
         )
+        op_profiler.start()
+        op_start_time = get_time()  # Time single operation
+
+        try:
+            # If args are defined, pass them to execute command
+            if operation["args"] is not None:
+                operation_instance.execute(**operation["args"])
+            else:
+                operation_instance.execute()
+
+            op_exec_time = get_time() - op_start_time
+            op_stats = dict(operation_instance.processing_stats)
+            op_stats["resources"] = op_profiler.stop()
+            op_stats["resources"].update(operation_instance.resource_stats)
+
+            if op_fingerprint is not None:
+                op_stats["fingerprint"] = op_fingerprint
+                op_stats["inputs"] = op_inputs
+                op_stats["outputs"] = {
+                    artifact: self.get_output_version(op_fingerprint, artifact)
+                    for artifact in sorted(op_writes)
+                }
+
+                for artifact, version in op_stats["outputs"].items():
+                    self._set_artifact_version(artifact, version)
+
+            self.append_summary(
+                operation_call,
+                operation_category,
+                op_exec_time,
+                op_stats,
+                DatasetQueueRetCode.OK,
+            )
+        except Exception as exc:
+            LOGGER.error("Operation %d/%d failed: %s.", current_op, total_op, str(exc))
+
+            op_exec_time = get_time() - op_start_time
+            op_resources = op_profiler.stop()
+            op_resources.update(operation_instance.resource_stats)
+
+            self.append_summary(
+                operation_call,
+                operation_category,
+                op_exec_time,
+                {"resources": op_resources},
+                DatasetQueueRetCode.OPERATION_FAIL,
+            )
+            return DatasetQueueRetCode.OPERATION_FAIL
 
         return DatasetQueueRetCode.OK
 
+    def get_content_index(self, filepaths=None):
+        """Group source files by content. Hashes are computed once and reused as
+        long as the files are not modified.
+
+        Args:
+            filepaths (iterable|None): Paths of the files, relative to the dataset.
+                Defaults to every file of the test cases.
+
+        Returns:
+            dict: Sorted paths of the files, indexed by the SHA-256 hash of their
+                content.
+        """
+        if filepaths is None:
+            filepaths = [
+                join(test_case, filename)
+                for test_case, filenames in self.test_case_files.items()
+                for filename in filenames
+            ]
+
+        content_index = {}
+
+        for filepath in sorted(filepaths):
+            content_hash = get_file_hash(join(self.path, filepath), self._file_hashes)
+            content_index.setdefault(content_hash, []).append(filepath)
+
+        return content_index
+
+    def get_artifact_paths(self, artifact):
+        """Retrieve the paths containing a dataset artifact.
+
+        Args:
+            artifact (str): Artifact name, as returned by
+                `AbstractProcessing.get_artifacts`.
+
+        Returns:
+            list: Paths of the artifact.
+        """
+        artifact_type, _, artifact_name = artifact.partition("/")
+
+        if artifact_type == str(DatasetArtifact.SOURCE):
+            return [
+                join(self.path, item)
+                for item in sorted(listdir(self.path))
+                if isdir(join(self.path, item)) and item not in self.ignored_dirs
+            ]
+
+        artifact_path = join(self.path, settings.DATASET_DIRS[artifact_type])
+
+        if artifact_name != "":
+            artifact_path = join(artifact_path, artifact_name)
+
+        return [artifact_path]
+
+    def get_operation_written_paths(self, op_class, op_args=None):
+        """Retrieve the paths an operation can modify.
+
+        Args:
+            op_class (type): Processing class.
+            op_args (dict|None): Arguments of the processing.
+
+        Returns:
+            list: Paths of the artifacts written by the processing, or of every
+                artifact if the processing does not declare them.
+        """
+        _, op_writes = op_class.get_artifacts(op_args)
+
+        if op_writes is None:
+            op_writes = {str(artifact) for artifact in DatasetArtifact}
+
+        return [
+            artifact_path
+            for artifact in sorted(op_writes)
+            for artifact_path in self.get_artifact_paths(artifact)
+        ]
+
+    def _get_artifact_tree_hash(self, artifact):
+        """Compute the Merkle hash of the paths containing a dataset artifact.
+
+        Args:
+            artifact (str): Artifact name.
+
+        Returns:
+            str: Hexadecimal digest of the artifact.
+        """
+        return sha256(
+            json.dumps(
+                {
+                    relpath(artifact_path, self.path): get_tree_hash(
+                        artifact_path, self._file_hashes
+                    )
+                    for artifact_path in self.get_artifact_paths(artifact)
+                },
+                sort_keys=True,
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def get_artifact_version(self, artifact):
+        """Retrieve the version of a dataset artifact, i.e. the output hash recorded
+        by the last operation writing the artifact. If the artifact was modified
+        outside of the processing queue since, its Merkle hash is used instead.
+
+        Args:
+            artifact (str): Artifact name.
+
+        Returns:
+            str: Version of the artifact.
+        """
+        tree_hash = self._get_artifact_tree_hash(artifact)
+
+        with self._lock:
+            artifact_record = (
+                self.summary["metadata"].get("artifacts", {}).get(artifact)
+            )
+
+        if artifact_record is not None and artifact_record["tree"] == tree_hash:
+            return artifact_record["version"]
+
+        return tree_hash
+
+    def _set_artifact_version(self, artifact, version):
+        """Record the version of an artifact written by an operation, along with the
+        Merkle hash of its content.
+
+        Args:
+            artifact (str): Artifact name.
+            version (str): Output hash of the operation.
+        """
+        tree_hash = self._get_artifact_tree_hash(artifact)
+
+        with self._lock:
+            self.summary["metadata"].setdefault("artifacts", {})[artifact] = {
+                "version": version,
+                "tree": tree_hash,
+            }
+
+    @staticmethod
+    def get_output_version(op_fingerprint, artifact):
+        """Compute the version of an artifact written by an operation.
+
+        Args:
+            op_fingerprint (str): Fingerprint of the operation.
+            artifact (str): Artifact name.
+
+        Returns:
+            str: Output hash of the operation for the artifact.
+        """
+        return sha256(
+            ("%s:%s" % (op_fingerprint, artifact)).encode("utf-8")
+        ).hexdigest()
+
+    def _get_args_fingerprint(self, op_args, output_args):
+        """Replace the paths of the files given as arguments by their content hash.
+
+        Args:
+            op_args (object): Arguments of the processing.
+            output_args (set): Names of the arguments written by the processing,
+                left out of the fingerprint.
+
+        Returns:
+            object: Arguments of the processing, with file contents.
+        """
+        if isinstance(op_args, dict):
+            return {
+                arg_name: self._get_args_fingerprint(arg_value, output_args)
+                for arg_name, arg_value in op_args.items()
+                if arg_name not in output_args
+            }
+
+        if isinstance(op_args, (list, tuple)):
+            return [
+                self._get_args_fingerprint(arg_value, output_args)
+                for arg_value in op_args
+            ]
+
+        if isinstance(op_args, str) and isfile(op_args):
+            return {
+                "path": op_args,
+                "hash": get_file_hash(op_args, self._file_hashes),
+            }
+
+        return op_args
+
+    def get_operation_fingerprint(self, op_class, op_args=None, artifact_versions=None):
+        """Compute the fingerprint of an operation, made of its class, its arguments,
+        the content of the files given as arguments and the versions of the
+        artifacts it reads.
+
+        Args:
+            op_class (type): Processing class.
+            op_args (dict|None): Arguments of the processing.
+            artifact_versions (dict|None): Versions of the artifacts, overriding the
+                current versions of the dataset.
+
+        Returns:
+            str|None: Hexadecimal digest of the operation, None if the processing
+                does not declare its artifacts.
+        """
+        op_reads, op_writes = op_class.get_artifacts(op_args)
+
+        if op_reads is None or op_writes is None:
+            return None
+
+        if artifact_versions is None:
+            artifact_versions = {}
+
+        input_versions = {
+            artifact: artifact_versions[artifact]
+            if artifact in artifact_versions
+            else self.get_artifact_version(artifact)
+            for artifact in sorted(op_reads)
+        }
+
+        return sha256(
+            json.dumps(
+                {
+                    "class": "%s.%s" % (op_class.__module__, op_class.__name__),
+                    "args": self._get_args_fingerprint(
+                        op_args, op_class.get_output_args(op_args)
+                    ),
+                    "inputs": input_versions,
+                },
+                sort_keys=True,
+                default=str,
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def _get_operation_records(self):
+        """List the operations successfully run on the dataset.
+
+        Returns:
+            list: Summary records of the operations having a fingerprint.
+        """
+        op_records = []
+
+        with self._lock:
+            for op_category, category_records in self.summary.items():
+                if op_category == "metadata":
+                    continue
+
+                if op_category == str(ProcessingCategory.TRAINING):
+                    category_records = [
+                        session
+                        for model_summary in category_records.values()
+                        for session in model_summary["sessions"]
+                    ]
+
+                op_records += [
+                    op_record
+                    for op_record in category_records
+                    if "fingerprint" in op_record
+                    and op_record["return_code"] == DatasetQueueRetCode.OK
+                ]
+
+        return op_records
+
+    def _get_artifact_lineage(self, artifact, op_records):
+        """List the successive versions of an artifact, from the current version back
+        through the operations that modified the artifact in place.
+
+        Args:
+            artifact (str): Artifact name.
+            op_records (list): Operations successfully run on the dataset.
+
+        Returns:
+            list: Versions of the artifact, most recent first.
+        """
+        lineage = [self.get_artifact_version(artifact)]
+
+        while True:
+            producer_records = [
+                op_record
+                for op_record in op_records
+                if op_record.get("outputs", {}).get(artifact) == lineage[-1]
+            ]
+
+            if len(producer_records) == 0:
+                break
+
+            previous_version = producer_records[-1]["inputs"].get(artifact)
+
+            if previous_version is None or previous_version in lineage:
+                break
+
+            lineage.append(previous_version)
+
+        return lineage
+
+    def get_up_to_date_operations(self, operations):
+        """Count the operations at the start of a processing queue that were already
+        run successfully, in the same order and on the same inputs, and whose
+        outputs were not modified since. The fingerprint of each operation is
+        chained to the output hashes of the operations preceding it.
+
+        Args:
+            operations (list): Operations of the queue, as dictionaries holding the
+                processing class and arguments.
+
+        Returns:
+            int: Number of operations that can be skipped.
+        """
+        op_records = self._get_operation_records()
+        op_fingerprints = {op_record["fingerprint"] for op_record in op_records}
+        op_artifacts = []
+
+        # Operations that do not declare their artifacts are always run.
+        for operation in operations:
+            op_reads, op_writes = operation["class"].get_artifacts(operation["args"])
+
+            if op_reads is None or op_writes is None:
+                break
+
+            op_artifacts.append((op_reads, op_writes))
+
+        artifact_lineages = {
+            artifact: self._get_artifact_lineage(artifact, op_records)
+            for op_reads, op_writes in op_artifacts
+            for artifact in op_reads | op_writes
+        }
+
+        for op_count in range(len(op_artifacts), 0, -1):
+            write_counts = {}
+
+            for _, op_writes in op_artifacts[:op_count]:
+                for artifact in op_writes:
+                    write_counts[artifact] = write_counts.get(artifact, 0) + 1
+
+            # Start from the versions of the artifacts before the first operation.
+            artifact_versions = {
+                artifact: lineage[write_counts.get(artifact, 0)]
+                if write_counts.get(artifact, 0) < len(lineage)
+                else None
+                for artifact, lineage in artifact_lineages.items()
+            }
+
+            for operation, (_, op_writes) in zip(
+                operations[:op_count], op_artifacts[:op_count]
+            ):
+                op_fingerprint = self.get_operation_fingerprint(
+                    operation["class"], operation["args"], artifact_versions
+                )
+
+                if op_fingerprint not in op_fingerprints:
+                    break
+
+                artifact_versions.update(
+                    {
+                        artifact: self.get_output_version(op_fingerprint, artifact)
+                        for artifact in op_writes
+                    }
+                )
+            else:
+                if all(
+                    artifact_versions[artifact] == artifact_lineages[artifact][0]
+                    for artifact in write_counts
+                ):
+                    return op_count
+
+        return 0
+
+    def is_operation_up_to_date(self, op_class, op_args=None):
+        """Check if an operation has already been run successfully on the current
+        versions of the artifacts it reads, and none of the artifacts it writes
+        changed since.
+
+        Args:
+            op_class (type): Processing class.
+            op_args (dict|None): Arguments of the processing.
+
+        Returns:
+            bool: True if the operation can be skipped, False otherwise.
+        """
+        return (
+            self.get_up_to_date_operations([{"class": op_class, "args": op_args}]) == 1
+        )
+
     def append_summary(self, op_call, op_category, exec_time, op_stats, return_code=-1):
         """Append new processing to summary file"""
-        processing_ops_summary = {
-            "dataset_path": realpath(self.path),
-            "operation": op_call,
-            "time": exec_time,
-            "return_code": return_code,
-        }
+        with self._lock:
+            processing_ops_summary = {
+                "dataset_path": realpath(self.path),
+                "operation": op_call,
+                "time": exec_time,
+                "return_code": return_code,
+            }
 
-        processing_ops_summary.update(op_stats)
+            processing_ops_summary.update(op_stats)
 
-        if op_category == str(ProcessingCategory.TRAINING):
-            if op_call["args"]["name"] not in self.summary[op_category].keys():
-                self.summary[op_category][op_call["args"]["name"]] = {
-                    "last_results": None,
-                    "sessions": [],
-                }
+            if op_category == str(ProcessingCategory.TRAINING):
+                if op_call["args"]["name"] not in self.summary[op_category].keys():
+                    self.summary[op_category][op_call["args"]["name"]] = {
+                        "last_results": None,
+                        "sessions": [],
+                    }
 
-            self.summary[op_category][op_call["args"]["name"]][
-                "last_results"
-            ] = processing_ops_summary["last_results"]
-            del processing_ops_summary["last_results"]
+                self.summary[op_category][op_call["args"]["name"]][
+                    "last_results"
+                ] = processing_ops_summary["last_results"]
+                del processing_ops_summary["last_results"]
 
-            self.summary[op_category][op_call["args"]["name"]]["sessions"].append(
-                processing_ops_summary
-            )
-        elif op_category != str(ProcessingCategory.__NONE__):
-            if op_category not in [member.value for member in ProcessingCategory]:
-                raise IndexError(f"Category {op_category} is not a valid category!")
+                self.summary[op_category][op_call["args"]["name"]]["sessions"].append(
+                    processing_ops_summary
+                )
+            elif op_category != str(ProcessingCategory.__NONE__):
+                if op_category not in [member.value for member in ProcessingCategory]:
+                    raise IndexError(f"Category {op_category} is not a valid category!")
 
-            # Initiate category if it does not exists
-            if op_category not in self.summary.keys():
-                self.summary[op_category] = []
+                # Initiate category if it does not exists
+                if op_category not in self.summary.keys():
+                    self.summary[op_category] = []
 
-            self.summary[op_category].append(processing_ops_summary)
+                self.summary[op_category].append(processing_ops_summary)
 
-        self.save_summary()
+            self.save_summary()
@@ -0,0 +1,419 @@
+""" Datasets restricted to a subset of the test cases of another dataset.
+"""
+from os import makedirs, replace, sep
+from os.path import exists, join, realpath
+
+import json
+import numpy as np
+from shutil import rmtree
+
+from bugfinder import settings
+from bugfinder.base.dataset import CodeWeaknessClassificationDataset
+from bugfinder.base.processing import DatasetArtifact
+from bugfinder.settings import LOGGER
+
+VIEW_MANIFEST_VERSION = 1
+""" int: Version of the view manifest format.
+"""
+
+
+def is_dataset_view(dataset_path):
+    """Check if a path contains a dataset view.
+
+    Args:
+        dataset_path (str): Path of the dataset.
+
+    Returns:
+        bool: True if the path contains a view manifest, False otherwise.
+    """
+    return exists(join(dataset_path, settings.VIEW_MANIFEST_FILE))
+
+
+def open_dataset(dataset_path, silent=False):
+    """Open a dataset or a dataset view.
+
+    Args:
+        dataset_path (str): Path of the dataset or of the view.
+        silent (bool): Log the initialization at debug level if True.
+
+    Returns:
+        CodeWeaknessClassificationDataset: Dataset stored at the given path.
+    """
+    if is_dataset_view(dataset_path):
+        return CodeWeaknessClassificationDatasetView(dataset_path, silent=silent)
+
+    return CodeWeaknessClassificationDataset(dataset_path, silent=silent)
+
+
+class CodeWeaknessClassificationDatasetView(CodeWeaknessClassificationDataset):
+    """Dataset restricted to the test cases listed in a manifest. The view shares
+    the test cases, Joern and Neo4J databases, features and embeddings of its parent
+    dataset, and only stores its manifest, summary and models. Feature rows are
+    matched to the test cases of the view using the test cases recorded in the
+    feature store, or using their class and file name for features extracted without
+    them.
+
+    Operations writing the shared artifacts cannot be queued on a view, except as
+    dry runs.
+    """
+
+    shared_artifacts = {
+        str(DatasetArtifact.SOURCE),
+        str(DatasetArtifact.JOERN),
+        str(DatasetArtifact.NEO4J),
+        str(DatasetArtifact.FEATURES),
+        str(DatasetArtifact.EMBEDDINGS),
+    }
+    """ set: Artifacts of the parent dataset read by the view.
+    """
+
+    @classmethod
+    def create(cls, view_path, dataset, test_cases, force=False, silent=False):
+        """Create a view by writing its manifest. Views of views are built on the
+        parent dataset.
+
+        Args:
+            view_path (str): Path of the new view.
+            dataset (CodeWeaknessClassificationDataset): Dataset the test cases belong
+                to.
+            test_cases (iterable): Test cases of the view.
+            force (bool): Overwrite the view if the path exists.
+            silent (bool): Log the initialization at debug level if True.
+
+        Returns:
+            CodeWeaknessClassificationDatasetView: New view.
+        """
+        test_cases = set(test_cases)
+        unknown_test_cases = test_cases - dataset.test_cases
+
+        if len(unknown_test_cases) > 0:
+            raise ValueError(
+                "%d test cases are not part of %s."
+                % (len(unknown_test_cases), dataset.path)
+            )
+
+        if exists(view_path):
+            if force:
+                rmtree(view_path)
+            else:
+                raise FileExistsError(
+                    f"{view_path} already exists. Run with force=True to overwrite the "
+                    f"directory."
+                )
+
+        makedirs(view_path)
+        manifest_filepath = join(view_path, settings.VIEW_MANIFEST_FILE)
+        tmp_manifest_filepath = "%s.tmp" % manifest_filepath
+
+        with open(tmp_manifest_filepath, "w", encoding="utf-8") as manifest_fp:
+            json.dump(
+                {
+                    "version": VIEW_MANIFEST_VERSION,
+                    "parent": realpath(dataset.path),
+                    "test_cases": sorted(test_cases),
+                },
+                manifest_fp,
+                indent=2,
+            )
+
+        replace(tmp_manifest_filepath, manifest_filepath)
+
+        return cls(view_path, silent=silent)
+
+    def _load_manifest(self):
+        """Load the manifest of the view.
+
+        Returns:
+            dict: Path of the parent dataset and test cases of the view.
+        """
+        if not exists(self.manifest_filepath):
+            raise FileNotFoundError(f"{self.manifest_filepath} does not exists.")
+
+        with open(self.manifest_filepath, "r", encoding="utf-8") as manifest_fp:
+            manifest = json.load(manifest_fp)
+
+        if manifest.get("version") != VIEW_MANIFEST_VERSION:
+            raise ValueError(
+                f"Unsupported manifest version for {self.manifest_filepath}."
+            )
+
+        return manifest
+
+    def _init_paths(self, dataset_path):
+        """Set the paths of the dataset directories and files. Summary and models
+        are stored in the view directory, other artifacts are read from the parent
+        dataset.
+
+        Args:
+            dataset_path (str): Path of the parent dataset.
+        """
+        super()._init_paths(dataset_path)
+
+        self.model_dir = join(self.view_path, settings.DATASET_DIRS["models"])
+        self.summary_filepath = join(self.view_path, settings.SUMMARY_FILE)
+
+    def _filter_index(self):
+        """Restrict the index of the parent dataset to the test cases of the view."""
+        missing_test_cases = self.view_test_cases - self.test_cases
+
+        if len(missing_test_cases) > 0:
+            LOGGER.warning(
+                "%d test cases of the view are missing from %s.",
+                len(missing_test_cases),
+                self.path,
+            )
+
+        # Files of the parent are kept to match the features to the view.
+        self._parent_test_case_files = self.test_case_files
+        self.test_case_files = {
+            test_case: filenames
+            for test_case, filenames in self.test_case_files.items()
+            if test_case in self.view_test_cases
+        }
+        self.test_cases = set(self.test_case_files.keys())
+
+        # Classes of the parent are kept, since they are used as feature results.
+        self.stats = [
+            len(
+                [
+                    test_case
+                    for test_case in self.test_cases
+                    if test_case.split(sep)[0] == class_name
+                ]
+            )
+            for class_name in self.classes
+        ]
+
+        self._features_mask = None
+        self._view_features = None
+
+    def _index_dataset(self):
+        """Browse the parent dataset and keep the test cases of the view"""
+        super()._index_dataset()
+        self._filter_index()
+
+    def update_index(self, added=None, removed=None, modified=None):
+        """Apply a set of changes to the index of the parent dataset, and keep the
+        test cases of the view.
+
+        Args:
+            added (iterable): Test cases added to the dataset.
+            removed (iterable): Test cases removed from the dataset.
+            modified (iterable): Test cases with modified files.
+        """
+        with self._lock:
+            super().update_index(added, removed, modified)
+            self._filter_index()
+
+            if len(self.test_cases) > 0:
+                self.stats = [st / len(self.test_cases) for st in self.stats]
+
+            self._update_summary_metadata()
+
+    def get_features_mask(self):
+        """Identify the feature rows of the parent dataset belonging to the view.
+
+        Returns:
+            np.ndarray: Boolean mask of the parent feature rows.
+        """
+        if self._features_mask is not None:
+            return self._features_mask
+
+        if CodeWeaknessClassificationDataset.get_features_shape(self)[0] == 0:
+            self._features_mask = np.zeros(0, dtype=bool)
+            return self._features_mask
+
+        features_test_cases = CodeWeaknessClassificationDataset.get_features_test_cases(
+            self
+        )
+
+        if features_test_cases is not None:
+            self._features_mask = np.isin(
+                features_test_cases, list(self.test_cases)
+            ).astype(bool)
+            return self._features_mask
+
+        # Features without test cases are matched using their class and file name,
+        # as long as the file name identifies test cases on one side of the view.
+        view_files = {}
+
+        for test_case, filenames in self._parent_test_case_files.items():
+            class_index = self.classes.index(test_case.split(sep)[0])
+
+            for filename in filenames:
+                view_files.setdefault((class_index, filename), set()).add(
+                    test_case in self.test_cases
+                )
+
+        features_mask = []
+        ambiguous_files = set()
+
+        for result, name in zip(
+            super()._get_features_column("result"),
+            super()._get_features_column("name"),
+        ):
+            in_view = view_files.get((int(result), str(name)), set())
+
+            if len(in_view) > 1:
+                ambiguous_files.add("%s/%s" % (self.classes[int(result)], name))
+
+            features_mask.append(True in in_view)
+
+        if len(ambiguous_files) > 0:
+            raise ValueError(
+                "Feature rows of %s cannot be attributed to the view, since their "
+                "file name belongs to test cases inside and outside of it. Extract "
+                "the features again to record their test cases."
+                % ", ".join(sorted(ambiguous_files))
+            )
+
+        self._features_mask = np.array(features_mask, dtype=bool)
+
+        return self._features_mask
+
+    @property
+    def features(self):
+        """pd.DataFrame: Features of the parent dataset belonging to the view."""
+        if self._view_features is None:
+            parent_features = CodeWeaknessClassificationDataset.features.fget(self)
+            self._view_features = parent_features[self.get_features_mask()].reset_index(
+                drop=True
+            )
+
+        return self._view_features
+
+    @features.setter
+    def features(self, features):
+        CodeWeaknessClassificationDataset.features.fset(self, features)
+        # The features of the parent changed, rows are matched again on next access.
+        self._features_mask = None
+        self._view_features = None
+
+    def get_features_matrix(self):
+        """Retrieve the input features of the view, without the output columns, as
+        a sparse matrix.
+
+        Returns:
+            sparse.csr_matrix: Input feature matrix.
+        """
+        return super().get_features_matrix()[np.flatnonzero(self.get_features_mask())]
+
+    def get_features_shape(self):
+        """Retrieve the shape of the features of the view.
+
+        Returns:
+            tuple: Number of rows and columns of the features.
+        """
+        return (
+            int(np.count_nonzero(self.get_features_mask())),
+            super().get_features_shape()[1],
+        )
+
+    def _get_features_column(self, name):
+        """Retrieve a single feature column of the view.
+
+        Args:
+            name (str): Name of the column.
+
+        Returns:
+            np.ndarray: Values of the column.
+        """
+        return super()._get_features_column(name)[self.get_features_mask()]
+
+    def __init__(self, view_path, silent=False):
+        """Inititialization method
+
+        Args:
+            view_path (str): Path of the view, containing its manifest.
+            silent (bool): Log the initialization at debug level if True.
+        """
+        self.view_path = join(view_path, "")
+        self.manifest_filepath = join(self.view_path, settings.VIEW_MANIFEST_FILE)
+
+        manifest = self._load_manifest()
+        self.parent_path = join(manifest["parent"], "")
+        self.view_test_cases = set(manifest["test_cases"])
+
+        self._features_mask = None
+        self._view_features = None
+
+        super().__init__(self.parent_path, silent=silent)
+
+    def create_inverse(self, view_path, force=False, silent=False):
+        """Create a view containing the test cases of the parent dataset that are not
+        part of this view.
+
+        Args:
+            view_path (str): Path of the new view.
+            force (bool): Overwrite the view if the path exists.
+            silent (bool): Log the initialization at debug level if True.
+
+        Returns:
+            CodeWeaknessClassificationDatasetView: Inverse view.
+        """
+        parent_dataset = CodeWeaknessClassificationDataset(
+            self.parent_path, silent=True
+        )
+
+        return self.create(
+            view_path,
+            parent_dataset,
+            parent_dataset.test_cases - self.test_cases,
+            force=force,
+            silent=silent,
+        )
+
+    def get_artifact_paths(self, artifact):
+        """Retrieve the paths containing a dataset artifact. Models are stored in the
+        view directory.
+
+        Args:
+            artifact (str): Artifact name, as returned by
+                `AbstractProcessing.get_artifacts`.
+
+        Returns:
+            list: Paths of the artifact.
+        """
+        artifact_type, _, artifact_name = artifact.partition("/")
+
+        if artifact_type != str(DatasetArtifact.MODELS):
+            return super().get_artifact_paths(artifact)
+
+        if artifact_name != "":
+            return [join(self.model_dir, artifact_name)]
+
+        return [self.model_dir]
+
+    def is_operation_allowed(self, op_class, op_args=None):
+        """Check that an operation does not modify the artifacts shared with the
+        parent dataset.
+
+        Args:
+            op_class (type): Processing class.
+            op_args (dict|None): Arguments of the processing.
+
+        Returns:
+            bool: True if the operation can be run on the view, False otherwise.
+        """
+        if op_args is not None and op_args.get("dry_run", False):
+            return True
+
+        _, op_writes = op_class.get_artifacts(op_args)
+
+        if op_writes is None:
+            return False
+
+        return all(
+            artifact.partition("/")[0] not in self.shared_artifacts
+            for artifact in op_writes
+        )
+
+    def queue_operation(self, op_class, op_args=None):
+        """Queue operation, if it does not modify the parent dataset."""
+        if not self.is_operation_allowed(op_class, op_args):
+            raise ValueError(
+                "Operation %s.%s cannot be run on a dataset view."
+                % (op_class.__module__, op_class.__name__)
+            )
+
+        super().queue_operation(op_class, op_args)
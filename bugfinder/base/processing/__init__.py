@@ -20,6 +20,20 @@ class ProcessingCategory(Enum):
         return str(self.value)
 
 
+class DatasetArtifact(Enum):
+    """Parts of a dataset that processing classes can read or write"""
+
+    SOURCE = "source"
+    JOERN = "joern"
+    NEO4J = "neo4j"
+    FEATURES = "feats"
+    MODELS = "models"
+    EMBEDDINGS = "embeddings"
+
+    def __str__(self):
+        return str(self.value)
+
+
 class ProcessingDeprecation:
     """Add a deprecation notice to a given class"""
 
@@ -32,6 +46,67 @@ class ProcessingDeprecation:
 class AbstractProcessing(ABC):
     """Abstract class for all dataset processing."""
 
+    reads = None
+    """ set|None: Dataset artifacts read by the processing. None if unknown, in which
+    case the processing is never run alongside other processing.
+    """
+
+    writes = None
+    """ set|None: Dataset artifacts written by the processing. None if unknown, in
+    which case the processing is never run alongside other processing.
+    """
+
+    named_artifacts = set()
+    """ set: Artifacts restricted to the item designated by the `name` argument of
+    the processing, such as a single model of the model directory.
+    """
+
+    output_args = set()
+    """ set: Names of the arguments designating files written by the processing,
+    which are left out of the operation fingerprint.
+    """
+
+    @classmethod
+    def get_artifacts(cls, op_args=None):
+        """Retrieve the dataset artifacts accessed by the processing when executed
+        with the given arguments.
+
+        Args:
+            op_args (dict|None): Arguments of the processing.
+
+        Returns:
+            tuple: Sets of artifacts read and written, or (None, None) if the
+                processing does not declare them.
+        """
+        if cls.reads is None or cls.writes is None:
+            return None, None
+
+        op_name = op_args.get("name") if op_args is not None else None
+
+        def get_artifact_id(artifact):
+            if artifact in cls.named_artifacts and op_name is not None:
+                return "%s/%s" % (str(artifact), op_name)
+
+            return str(artifact)
+
+        op_reads = {get_artifact_id(artifact) for artifact in cls.reads}
+        op_writes = {get_artifact_id(artifact) for artifact in cls.writes}
+
+        return op_reads, op_writes
+
+    @classmethod
+    def get_output_args(cls, op_args=None):
+        """Retrieve the names of the arguments designating files written by the
+        processing when executed with the given arguments.
+
+        Args:
+            op_args (dict|None): Arguments of the processing.
+
+        Returns:
+            set: Names of the output arguments.
+        """
+        return cls.output_args
+
     def __init__(self, dataset, deprecation_warning=None):
         """Class constructor
 
@@ -42,6 +117,7 @@ class AbstractProcessing(ABC):
 
         self.metadata = {"category": str(ProcessingCategory.PROCESSING)}
         self.processing_stats = {}
+        self.resource_stats = {}
         self.dataset = dataset
 
         if deprecation_warning:
@@ -23,6 +23,7 @@ class AbstractContainerProcessing(AbstractProcessing):
     environment = None
     command = None
     detach = True
+    mem_limit = None
 
     container = None
 
@@ -60,6 +61,7 @@ class AbstractContainerProcessing(AbstractProcessing):
                         self.environment,
                         self.command,
                         self.detach,
+                        self.mem_limit,
                     )
 
                     started = True
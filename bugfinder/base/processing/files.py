@@ -1,32 +1,221 @@
 """ Abstract classes for creating processing steps.
 """
-from os import listdir
-from os.path import join
+from multiprocessing import Pool
+from os import listdir, replace
+from os.path import exists, join, relpath, splitext
+from shutil import copyfile
 
 from abc import abstractmethod
 
-from bugfinder.base.processing import AbstractProcessing
+from bugfinder import settings
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
+from bugfinder.settings import LOGGER
+from bugfinder.utils.dirs import break_hard_link, get_file_hash
+from bugfinder.utils.statistics import get_dedup_stats
 
 
 class AbstractFileProcessing(AbstractProcessing):
     """Abstract processing class for handling file changes."""
 
+    reads = {DatasetArtifact.SOURCE}
+    writes = {DatasetArtifact.SOURCE}
+
+    parallel = True
+    """ bool: Distribute the test cases over a pool of `settings.POOL_SIZE`
+    processes. Processing sharing state between files must disable it.
+    """
+
+    break_links = False
+    """ bool: Give hard linked files their own copy before processing them, so that
+    datasets sharing the files are not modified. Only needed by processing modifying
+    files in place, instead of replacing them with a new file.
+    """
+
+    deduplicate = False
+    """ bool: Process a single file out of the files with identical content and
+    extension, and copy the result to the others. Only suitable for processing whose
+    result only depends on the content and the extension of the file.
+    """
+
     def execute(self):
         """Execute the 'process_file' method on files where 'match_file' returns
-        True.
+        True. Files of a test case are always processed by the same process. If
+        `deduplicate` is set, files with duplicated content are processed once.
+
+        Returns:
+            list: Return codes of 'process_file', ordered by test case and file.
         """
-        exec_retcode_list = []
+        test_case_filepaths = [
+            (
+                test_case,
+                [
+                    join(self.dataset.path, test_case, filepath)
+                    for filepath in sorted(listdir(join(self.dataset.path, test_case)))
+                    if self.match_file(filepath)
+                ],
+            )
+            for test_case in sorted(self.dataset.test_cases)
+        ]
+        test_case_filepaths = [
+            (test_case, filepaths)
+            for test_case, filepaths in test_case_filepaths
+            if len(filepaths) > 0
+        ]
+        duplicate_filepaths = {}
 
-        for test_case in self.dataset.test_cases:
-            exec_retcode_list += [
-                self.process_file(join(self.dataset.path, test_case, filepath))
-                for filepath in listdir(join(self.dataset.path, test_case))
-                if self.match_file(filepath)
+        if self.deduplicate:
+            duplicate_filepaths = self.get_duplicate_filepaths(
+                [
+                    filepath
+                    for _, filepaths in test_case_filepaths
+                    for filepath in filepaths
+                ]
+            )
+
+        processed_filepaths = [
+            (
+                test_case,
+                [
+                    filepath
+                    for filepath in filepaths
+                    if filepath not in duplicate_filepaths
+                ],
+            )
+            for test_case, filepaths in test_case_filepaths
+        ]
+        processed_filepaths = [
+            (test_case, filepaths)
+            for test_case, filepaths in processed_filepaths
+            if len(filepaths) > 0
+        ]
+        pool_size = min(settings.POOL_SIZE, len(processed_filepaths))
+
+        if self.parallel and pool_size > 1:
+            LOGGER.debug(
+                "Processing %d test cases with %d processes...",
+                len(processed_filepaths),
+                pool_size,
+            )
+
+            with Pool(pool_size) as pool:
+                test_case_retcode_lists = pool.map(
+                    self.process_files,
+                    [filepaths for _, filepaths in processed_filepaths],
+                    chunksize=max(1, len(processed_filepaths) // (pool_size * 4)),
+                )
+        else:
+            test_case_retcode_lists = [
+                self.process_files(filepaths) for _, filepaths in processed_filepaths
             ]
 
-        self.dataset.rebuild_index()
+        file_retcodes = {
+            filepath: retcode
+            for (_, filepaths), retcode_list in zip(
+                processed_filepaths, test_case_retcode_lists
+            )
+            for filepath, retcode in zip(filepaths, retcode_list)
+        }
+
+        self.copy_duplicate_files(duplicate_filepaths)
+
+        exec_retcode_list = [
+            file_retcodes[duplicate_filepaths.get(filepath, filepath)]
+            for _, filepaths in test_case_filepaths
+            for filepath in filepaths
+        ]
+        modified_test_cases = {test_case for test_case, _ in test_case_filepaths}
+
+        self.dataset.update_index(modified=modified_test_cases)
         return exec_retcode_list
 
+    def get_duplicate_filepaths(self, filepaths):
+        """Find the files with the same content and extension as another file, and
+        record the deduplication statistics in the processing stats.
+
+        Args:
+            filepaths (list): Paths of the files to process.
+
+        Returns:
+            dict: Path of the file processed instead of each duplicate file.
+        """
+        content_index = self.dataset.get_content_index(
+            [relpath(filepath, self.dataset.path) for filepath in filepaths]
+        )
+        duplicate_filepaths = {}
+
+        for content_filepaths in content_index.values():
+            original_filepaths = {}
+
+            for filepath in content_filepaths:
+                filepath = join(self.dataset.path, filepath)
+                original_filepath = original_filepaths.setdefault(
+                    splitext(filepath)[1], filepath
+                )
+
+                if filepath != original_filepath:
+                    duplicate_filepaths[filepath] = original_filepath
+
+        self.processing_stats["dedup"] = get_dedup_stats(
+            len(filepaths), len(content_index)
+        )
+
+        LOGGER.debug(
+            "%d files are duplicates of other files.", len(duplicate_filepaths)
+        )
+        return duplicate_filepaths
+
+    @staticmethod
+    def copy_duplicate_files(duplicate_filepaths):
+        """Copy processed files over their duplicates, if their content changed.
+
+        Args:
+            duplicate_filepaths (dict): Path of the processed file for each
+                duplicate file.
+        """
+        original_hashes = {}
+
+        for filepath, original_filepath in duplicate_filepaths.items():
+            if original_filepath not in original_hashes:
+                original_hashes[original_filepath] = (
+                    get_file_hash(original_filepath)
+                    if exists(original_filepath)
+                    else None
+                )
+
+            if original_hashes[original_filepath] is None:
+                continue
+
+            # Duplicates are only rewritten if the processing changed the content
+            if get_file_hash(filepath) != original_hashes[original_filepath]:
+                tmp_filepath = "%s.tmp" % filepath
+                copyfile(original_filepath, tmp_filepath)
+                replace(tmp_filepath, filepath)
+
+    def process_files(self, filepaths):
+        """Execute the 'process_file' method on a list of files.
+
+        Args:
+            filepaths (list): Paths of the files to process.
+
+        Returns:
+            list: Return codes of 'process_file'.
+        """
+        retcode_list = []
+
+        for filepath in filepaths:
+            if self.break_links:
+                break_hard_link(filepath)
+
+            retcode_list.append(self.process_file(filepath))
+
+        return retcode_list
+
+    def __getstate__(self):
+        """Exclude the dataset when sending the processing to worker processes."""
+        state = self.__dict__.copy()
+        state["dataset"] = None
+        return state
+
     @abstractmethod
     def match_file(self, filepath) -> bool:  # pragma: no cover
         """ """
@@ -2,25 +2,64 @@
 """
 from concurrent.futures import ThreadPoolExecutor
 from os import mkdir
-from os.path import join, exists, basename, dirname
+from os.path import join, exists, basename, dirname, relpath
 
-import csv
 import itertools
+import numpy as np
+import pandas as pd
 import pickle
 from abc import abstractmethod
+from scipy import sparse
 
+from bugfinder.base.processing import DatasetArtifact
 from bugfinder.base.dataset import ProcessingCategory
+from bugfinder.processing.joern import CODE_DIR
 from bugfinder.processing.neo4j import Neo4J3Processing
-from bugfinder.settings import LOGGER, ROOT_DIR, POOL_SIZE
+from bugfinder.processing.neo4j.queries import register_query
+from bugfinder.settings import LOGGER, ROOT_DIR, POOL_SIZE, FEATURES_STORE
+from bugfinder.utils.feature_store import FeatureStore
 
 IMPLEMENTATION_ERROR = "%s needs to be implemented."
 
+LIST_ENTRYPOINTS_QUERY = register_query(
+    "extraction.list_entrypoints",
+    """
+    MATCH (f {type:"Function"})-[
+            :IS_FUNCTION_OF_CFG
+        ]->(entry {type:'CFGEntryNode'})
+    WHERE id(f)=$id AND NOT (entry)<-[:FLOWS_TO]-()
+    RETURN entry.functionId AS function_id, id(entry) as entry_id
+    """,
+)
+
 
 class GraphFeatureExtractor(Neo4J3Processing):
     """Feature extractor for Joern databases"""
 
+    reads = {DatasetArtifact.NEO4J}
+    writes = {DatasetArtifact.NEO4J, DatasetArtifact.FEATURES}
+
     need_map_features = False
+    sparse_features = False
     feature_map_filepath = None
+    feature_test_cases = None
+
+    @classmethod
+    def get_output_args(cls, op_args=None):
+        """Retrieve the names of the arguments designating files written by the
+        processing. The feature map is written when mapping the features, and read
+        when extracting them.
+
+        Args:
+            op_args (dict|None): Arguments of the processing.
+
+        Returns:
+            set: Names of the output arguments.
+        """
+        if op_args is not None and op_args.get("need_map_features", False):
+            return cls.output_args | {"feature_map_filepath"}
+
+        return cls.output_args
 
     def __init__(self, dataset, deprecation_warning=None):
         """Class instantiation method"""
@@ -29,20 +68,13 @@ class GraphFeatureExtractor(Neo4J3Processing):
 
     def _get_entrypoint_list_worker(self, testcase):
         """Worker retrieving the list of entrypoint for a given test case"""
-        list_entrypoint_cmd = """
-            MATCH (f {type:"Function"})-[
-                    :IS_FUNCTION_OF_CFG
-                ]->(entry {type:'CFGEntryNode'})
-            WHERE id(f)=%d AND NOT (entry)<-[:FLOWS_TO]-()
-            RETURN entry.functionId AS function_id, id(entry) as entry_id
-        """
         testcase_info = {"filepath": testcase["filepath"]}
 
         # Collect the entry points and merge with test case info.
         return [
             {**entrypoint_info, **testcase_info}
-            for entrypoint_info in self.neo4j_db.run(
-                list_entrypoint_cmd % testcase["id"]
+            for entrypoint_info in LIST_ENTRYPOINTS_QUERY.run(
+                self.neo4j_db, id=testcase["id"]
             ).data()
         ]
 
@@ -81,11 +113,16 @@ class GraphFeatureExtractor(Neo4J3Processing):
             self.feature_map_filepath = feature_map_filepath
 
     def execute(
-        self, command_args=None, feature_map_filepath=None, need_map_features=False
+        self,
+        command_args=None,
+        feature_map_filepath=None,
+        need_map_features=False,
+        sparse_features=False,
     ):
         """Execute the feature extraction"""
         self._create_feature_map_file(feature_map_filepath)
         self.need_map_features = need_map_features
+        self.sparse_features = sparse_features
 
         super().execute(command_args=command_args)
 
@@ -113,29 +150,47 @@ class GraphFeatureExtractor(Neo4J3Processing):
         # Save the feature file if it exists
 
         # Update the feature version number
-        return join(self.dataset.feats_dir, "features.csv")
+        return join(self.dataset.feats_dir, FEATURES_STORE)
 
     def write_extraction_outputs(self, features):
-        """Write features to CSV file"""
-        output_file = join(self.dataset.feats_dir, "features.csv")
+        """Write features to the feature store"""
+        feature_store = FeatureStore(join(self.dataset.feats_dir, FEATURES_STORE))
 
-        with open(output_file, "w") as csv_file:
-            csv_writer = csv.writer(csv_file)
+        # FIXME developer will not know how to setup its features
+        labels = self.get_labels_from_feature_map() + ["result", "name"]
 
-            # FIXME developer will not know how to setup its features
-            labels = self.get_labels_from_feature_map() + ["result", "name"]
+        # Sparse features are already labelled
+        if isinstance(features, pd.DataFrame):
+            feature_count = features.shape[1]
+        else:
+            feature_count = len(features[0])
+
+        # Make sure the number of labels and the number of features are the
+        # same.
+        if len(labels) != feature_count:
+            raise IndexError(
+                "Number of labels (%d) differs from number of features (%d)"
+                % (len(labels), feature_count)
+            )
 
-            # Make sure the number of labels and the number of features are the
-            # same.
-            if len(labels) != len(features[0]):
-                raise IndexError(
-                    "Number of labels (%d) differs from number of features (%d)"
-                    % (len(labels), len(features[0]))
-                )
+        if not isinstance(features, pd.DataFrame):
+            features = pd.DataFrame(features, columns=labels)
+
+        # Write labels and content to the feature store, along with the test case of
+        # each row since file names are not unique.
+        feature_store.write(features, self.feature_test_cases)
 
-            # Write headers and content to CSV file
-            csv_writer.writerow(labels)
-            csv_writer.writerows(features)
+    @staticmethod
+    def get_entrypoint_test_case(entrypoint):
+        """Retrieve the test case an entrypoint belongs to.
+
+        Args:
+            entrypoint (dict): Entrypoint, with the path of its file in Joern.
+
+        Returns:
+            str: Test case, relative to the dataset.
+        """
+        return relpath(dirname(entrypoint["filepath"]), CODE_DIR)
 
     def save_labels_to_feature_map(self, labels):
         """Save all labels to feature map"""
@@ -233,6 +288,72 @@ class FlowGraphFeatureExtractor(GraphFeatureExtractor):
         """Finalize features."""
         return features
 
+    @staticmethod
+    def finalize_sparse_features(features, labels):
+        """Finalize sparse features.
+
+        Args:
+            features (sparse.csr_matrix): Features, without the output columns.
+            labels (list): Labels of the features.
+
+        Returns:
+            sparse.csr_matrix: Finalized features.
+        """
+        return features
+
+    @staticmethod
+    def normalize_sparse_features(features, label_flows, flow_labels):
+        """Divide every sparse feature by the total count of its flow, per sample.
+
+        Args:
+            features (sparse.csr_matrix): Features, without the output columns.
+            label_flows (list): Index of the flow of each label.
+            flow_labels (list): Indexes of the labels counted in the total of each
+                flow.
+
+        Returns:
+            sparse.csr_matrix: Normalized features.
+        """
+        flow_label_pairs = [
+            (label_index, flow_index)
+            for flow_index, label_indices in enumerate(flow_labels)
+            for label_index in label_indices
+        ]
+        flow_matrix = sparse.csr_matrix(
+            (
+                np.ones(len(flow_label_pairs)),
+                (
+                    [label_index for label_index, _ in flow_label_pairs],
+                    [flow_index for _, flow_index in flow_label_pairs],
+                ),
+            ),
+            shape=(features.shape[1], len(flow_labels)),
+        )
+
+        # Total count of each flow per sample, matched to every stored feature.
+        flow_totals = (features @ flow_matrix).toarray()
+        feature_rows = np.repeat(np.arange(features.shape[0]), np.diff(features.indptr))
+        feature_totals = flow_totals[
+            feature_rows, np.asarray(label_flows, dtype=int)[features.indices]
+        ]
+
+        normalized_features = sparse.csr_matrix(
+            (
+                np.divide(
+                    features.data,
+                    feature_totals,
+                    out=np.zeros(features.data.shape),
+                    where=feature_totals != 0,
+                ),
+                features.indices.copy(),
+                features.indptr.copy(),
+            ),
+            shape=features.shape,
+        )
+        normalized_features.eliminate_zeros()
+
+        return normalized_features
+
     def extract_features_worker(self, args):
         """Feature extraction worker for a single entrypoint"""
         entrypoint = args[0]
@@ -265,6 +386,100 @@ class FlowGraphFeatureExtractor(GraphFeatureExtractor):
 
         return features_row_entrypoint
 
+    def extract_sparse_features_worker(self, args):
+        """Sparse feature extraction worker for a single entrypoint. Only the
+        non-zero features are recorded.
+
+        Args:
+            args (tuple): Entrypoint and index of each label.
+
+        Returns:
+            tuple: Non-zero features indexed by label index, and output columns.
+        """
+        entrypoint = args[0]
+        label_indices = args[1]
+
+        features_row_entrypoint = {}
+
+        flowgraph_list = self.get_flowgraph_list_for_entrypoint(entrypoint)
+        LOGGER.debug(
+            "Retrieved %d flowgraphs for entrypoint %s.",
+            len(flowgraph_list),
+            entrypoint["function_id"],
+        )
+
+        # Record and count each unique flow graph
+        for flowgraph in flowgraph_list:
+            label = self.get_label_from_flowgraph(flowgraph)
+
+            if label not in label_indices:
+                LOGGER.debug(
+                    "Feature '%s' not found in label reference file and ignored.", label
+                )
+                continue
+
+            label_index = label_indices[label]
+            features_row_entrypoint[label_index] = features_row_entrypoint.get(
+                label_index, 0.0
+            ) + self.get_flowgraph_count(flowgraph)
+
+        return features_row_entrypoint, self.initialize_features(entrypoint, [])
+
+    def extract_sparse_features(self, entrypoint_list, labels):
+        """Extract features as a sparse matrix.
+
+        Args:
+            entrypoint_list (list): Entrypoints to extract features from.
+            labels (list): Labels of the features.
+
+        Returns:
+            pd.DataFrame: Features with sparse input columns.
+        """
+        label_indices = {label: label_index for label_index, label in enumerate(labels)}
+
+        with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+            res = executor.map(
+                self.extract_sparse_features_worker,
+                [(entrypoint, label_indices) for entrypoint in entrypoint_list],
+            )
+            rows = list(res)
+
+        # Build the CSR matrix from the non-zero features of each row.
+        features_indptr = np.cumsum([0] + [len(row[0]) for row in rows])
+        features_indices = np.fromiter(
+            itertools.chain.from_iterable(sorted(row[0].keys()) for row in rows),
+            dtype=np.int64,
+            count=features_indptr[-1],
+        )
+        features_data = np.fromiter(
+            itertools.chain.from_iterable(
+                (row[0][label_index] for label_index in sorted(row[0].keys()))
+                for row in rows
+            ),
+            dtype=float,
+            count=features_indptr[-1],
+        )
+        features_matrix = sparse.csr_matrix(
+            (features_data, features_indices, features_indptr),
+            shape=(len(rows), len(labels)),
+        )
+
+        LOGGER.info(
+            "Extracted %dx%d sparse features matrix (%d non-zero values). "
+            "Finalizing features...",
+            features_matrix.shape[0],
+            features_matrix.shape[1] + 2,
+            features_matrix.nnz,
+        )
+
+        features = pd.DataFrame.sparse.from_spmatrix(
+            self.finalize_sparse_features(features_matrix, labels), columns=labels
+        )
+        features["result"] = [row[1][0] for row in rows]
+        features["name"] = [row[1][1] for row in rows]
+
+        return features
+
     def extract_features(self):
         """Extract features"""
         labels = self.get_labels_from_feature_map()
@@ -280,6 +495,13 @@ class FlowGraphFeatureExtractor(GraphFeatureExtractor):
             len(labels),
         )
 
+        self.feature_test_cases = [
+            self.get_entrypoint_test_case(entrypoint) for entrypoint in entrypoint_list
+        ]
+
+        if self.sparse_features:
+            return self.extract_sparse_features(entrypoint_list, labels)
+
         with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
             res = executor.map(
                 self.extract_features_worker,
@@ -2,6 +2,25 @@
 """
 from bugfinder.base.processing import ProcessingDeprecation
 from bugfinder.features.extraction import FlowGraphFeatureExtractor
+from bugfinder.processing.neo4j.queries import register_query
+
+FLOWGRAPH_QUERY = register_query(
+    "extraction.any_hop_all_flows.flowgraph",
+    """
+    MATCH
+        (entry)-[:FLOWS_TO|REACHES|CONTROLS*0..5]->(root1:UpstreamNode)
+    WHERE entry.functionId=$function_id
+    WITH distinct root1
+    MATCH
+        p=(root1)-[
+            :FLOWS_TO|REACHES|CONTROLS*1..3
+        ]->(root2:DownstreamNode)
+    WHERE root1<>root2
+    WITH extract(r in relationships(p) | type(r)) as flow,
+        root1.ast as source, root2.ast as sink
+    RETURN source, flow, sink
+    """,
+)
 
 
 class FeatureExtractor(FlowGraphFeatureExtractor):
@@ -24,22 +43,9 @@ class FeatureExtractor(FlowGraphFeatureExtractor):
 
     def get_flowgraph_list_for_entrypoint(self, entrypoint):
         """Get list of flow graphs for a given entrypoint"""
-        flowgraph_command = """
-            MATCH 
-                (entry)-[:FLOWS_TO|REACHES|CONTROLS*0..5]->(root1:UpstreamNode)
-            WHERE entry.functionId="%s"
-            WITH distinct root1
-            MATCH 
-                p=(root1)-[
-                    :FLOWS_TO|REACHES|CONTROLS*1..3
-                ]->(root2:DownstreamNode)
-            WHERE root1<>root2
-            WITH extract(r in relationships(p) | type(r)) as flow, 
-                root1.ast as source, root2.ast as sink
-            RETURN source, flow, sink
-        """
-
-        return self.neo4j_db.run(flowgraph_command % entrypoint["function_id"]).data()
+        return FLOWGRAPH_QUERY.run(
+            self.neo4j_db, function_id=entrypoint["function_id"]
+        ).data()
 
     def get_flowgraph_count(self, flowgraph):
         """Count the number of flowgraphs"""
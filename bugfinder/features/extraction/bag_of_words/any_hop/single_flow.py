@@ -1,6 +1,17 @@
 """ Any hop single flow feature extractor module
 """
 from bugfinder.features.extraction import FlowGraphFeatureExtractor
+from bugfinder.processing.neo4j.queries import register_query
+
+FLOWGRAPH_TEMPLATE = """
+    MATCH p = (root1:UpstreamNode)-[:%s*]->(root2:DownstreamNode)
+    WHERE root1.functionId=$function_id
+    RETURN distinct root1.ast AS source, root2.ast AS sink,
+        count(p) as count
+"""
+""" str: Flowgraph query, for a given relationship type. Relationship types cannot be
+bound as parameters, a query is registered for each flow.
+"""
 
 
 class FeatureExtractor(FlowGraphFeatureExtractor):
@@ -8,6 +19,14 @@ class FeatureExtractor(FlowGraphFeatureExtractor):
 
     FLOWS = ["CONTROLS", "FLOWS_TO", "REACHES"]
 
+    FLOWGRAPH_QUERIES = {
+        flow: register_query(
+            "extraction.any_hop_single_flow.flowgraph.%s" % flow,
+            FLOWGRAPH_TEMPLATE % flow,
+        )
+        for flow in FLOWS
+    }
+
     def configure_container(self):
         """Configure container variable"""
         super().configure_container()
@@ -15,19 +34,15 @@ class FeatureExtractor(FlowGraphFeatureExtractor):
 
     def get_flowgraph_list_for_entrypoint(self, entrypoint):
         """Create list of flow graphs for a given entrypoint"""
-        flowgraph_command = """
-               MATCH p = (root1:UpstreamNode)-[:%s*]->(root2:DownstreamNode)
-               WHERE root1.functionId="%s"
-               RETURN distinct root1.ast AS source, root2.ast AS sink,
-                   count(p) as count
-           """
         flowgraph_list = []
 
         for flow in self.FLOWS:
             flow_information = {"flow": flow}
-            flowgraph_data_list = self.neo4j_db.run(
-                flowgraph_command % (flow, entrypoint["function_id"])
-            ).data()
+            flowgraph_data_list = (
+                self.FLOWGRAPH_QUERIES[flow]
+                .run(self.neo4j_db, function_id=entrypoint["function_id"])
+                .data()
+            )
 
             for flowgraph_data in flowgraph_data_list:
                 flowgraph_data.update(flow_information)
@@ -90,3 +105,24 @@ class FeatureExtractor(FlowGraphFeatureExtractor):
             )
 
         return normalized_features
+
+    @staticmethod
+    def finalize_sparse_features(features, labels):
+        """Finalize sparse features before exporting to the feature store"""
+        flows = ["CONTROLS", "REACHES", "FLOWS_TO"]
+
+        # Find all labels related to each type of flow
+        labels_in_flow = [
+            [label_index for label_index, label in enumerate(labels) if flow in label]
+            for flow in flows
+        ]
+
+        # Determine index of each labels
+        labels_index = [0] * len(labels)
+        for flow_index in range(len(labels_in_flow) - 1):
+            for label_index in labels_in_flow[flow_index + 1]:
+                labels_index[label_index] = flow_index + 1
+
+        return FlowGraphFeatureExtractor.normalize_sparse_features(
+            features, labels_index, labels_in_flow
+        )
@@ -4,8 +4,19 @@ from sys import exit
 from copy import deepcopy
 
 from bugfinder.features.extraction import FlowGraphFeatureExtractor
+from bugfinder.processing.neo4j.queries import register_query
 from bugfinder.settings import LOGGER
 
+FLOWGRAPH_QUERY = register_query(
+    "extraction.hops_n_flows.flowgraph",
+    """
+    MATCH (n) WHERE id(n)=$entry_id
+    CALL apoc.path.subgraphAll(n, {relationshipFilter: $relationship_filter})
+    YIELD nodes, relationships
+    RETURN nodes, relationships
+    """,
+)
+
 
 class FeatureExtractor(FlowGraphFeatureExtractor):
     """HopNFlows feature extractor"""
@@ -27,6 +38,7 @@ class FeatureExtractor(FlowGraphFeatureExtractor):
         max_hops=-1,
         feature_map_filepath=None,
         need_map_features=False,
+        sparse_features=False,
     ):
         """Run the feature extraction algorithm"""
         if not flows:
@@ -48,20 +60,17 @@ class FeatureExtractor(FlowGraphFeatureExtractor):
         LOGGER.debug(
             "flows: %s, min_hops: %d, max_hops: %d", str(flows), min_hops, max_hops
         )
-        super().execute(command_args, feature_map_filepath, need_map_features)
+        super().execute(
+            command_args, feature_map_filepath, need_map_features, sparse_features
+        )
 
     def get_flowgraph_list_for_entrypoint(self, entrypoint):
         """Extract flowgraphs for a given entrypoint"""
-        flowgraph_command = f"""
-            MATCH (n) WHERE id(n)={entrypoint["entry_id"]}
-            CALL apoc.path.subgraphAll(
-                n, {{relationshipFilter: "{'|'.join(self.flows)}"}}
-            )
-            YIELD nodes, relationships
-            RETURN nodes, relationships
-        """
-
-        flowgraph_data_list = self.neo4j_db.run(flowgraph_command).data()
+        flowgraph_data_list = FLOWGRAPH_QUERY.run(
+            self.neo4j_db,
+            entry_id=entrypoint["entry_id"],
+            relationship_filter="|".join(self.flows),
+        ).data()
 
         # Ensure the command returned only one subgraph per entrypoint
         assert len(flowgraph_data_list) == 1
@@ -214,3 +223,28 @@ class FeatureExtractor(FlowGraphFeatureExtractor):
             )
 
         return normalized_features
+
+    def finalize_sparse_features(self, features, labels):
+        """Normalize the sparse features per sample and per type of flow.
+
+        Args:
+            features (sparse.csr_matrix): Features, without the output columns.
+            labels (list): Labels of the features.
+
+        Returns:
+            sparse.csr_matrix: Normalized features.
+        """
+        labels_per_flow = [
+            [label_index for label_index, label in enumerate(labels) if flow in label]
+            for flow in self.flows
+        ]
+        label_flow_map = [
+            next(
+                flow_index
+                for flow_index, flow in enumerate(self.flows)
+                if flow in label
+            )
+            for label in labels
+        ]
+
+        return self.normalize_sparse_features(features, label_flow_map, labels_per_flow)
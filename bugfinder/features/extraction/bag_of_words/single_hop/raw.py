@@ -1,6 +1,19 @@
 """ Single hop raw extractor module
 """
 from bugfinder.features.extraction import FlowGraphFeatureExtractor
+from bugfinder.processing.neo4j.queries import register_query
+
+FLOWGRAPH_QUERY = register_query(
+    "extraction.single_hop_raw.flowgraph",
+    """
+    MATCH p = (root1:UpstreamNode)-[
+        rel:FLOWS_TO|:REACHES|:CONTROLS
+    ]->(root2:DownstreamNode)
+    WHERE root1.functionId=$function_id
+    RETURN distinct root1.ast AS source, root2.ast AS sink,
+        type(rel) AS flow, count(p) AS count
+    """,
+)
 
 
 class FeatureExtractor(FlowGraphFeatureExtractor):
@@ -13,16 +26,9 @@ class FeatureExtractor(FlowGraphFeatureExtractor):
 
     def get_flowgraph_list_for_entrypoint(self, entrypoint):
         """Retrieve flowgraphs for a given entrypoint"""
-        flowgraph_command = """
-            MATCH p = (root1:UpstreamNode)-[
-                rel:FLOWS_TO|:REACHES|:CONTROLS
-            ]->(root2:DownstreamNode)
-            WHERE root1.functionId="%s"
-            RETURN distinct root1.ast AS source, root2.ast AS sink, 
-                type(rel) AS flow, count(p) AS count
-        """
-
-        return self.neo4j_db.run(flowgraph_command % entrypoint["function_id"]).data()
+        return FLOWGRAPH_QUERY.run(
+            self.neo4j_db, function_id=entrypoint["function_id"]
+        ).data()
 
     def get_flowgraph_count(self, flowgraph):
         """Count the number of flowgraphs"""
@@ -8,7 +8,7 @@ import pandas as pd
 from gensim.models import Word2Vec
 
 from bugfinder import settings
-from bugfinder.base.processing import AbstractProcessing
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
 from bugfinder.settings import LOGGER
 
 
@@ -17,6 +17,10 @@ class Node2VecEmbeddings(AbstractProcessing):
     trained with the output of the node2vec algorithm.
     """
 
+    reads = {DatasetArtifact.JOERN, DatasetArtifact.MODELS}
+    writes = {DatasetArtifact.EMBEDDINGS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
     embedding_length = 50
     vector_length = 64
 
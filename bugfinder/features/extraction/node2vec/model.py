@@ -6,7 +6,7 @@ import networkx as nx
 import pandas as pd
 
 from bugfinder import settings
-from bugfinder.base.processing import AbstractProcessing
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
 from bugfinder.features.extraction.node2vec.implementation import Node2VecImplementation
 from bugfinder.settings import LOGGER
 
@@ -16,6 +16,10 @@ class Node2VecModel(AbstractProcessing):
     algorithm to generate the corpus used as input
     """
 
+    reads = {DatasetArtifact.JOERN}
+    writes = {DatasetArtifact.MODELS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
     tokens = {}
     vector_length = 128
     walk_length = 50
@@ -0,0 +1,281 @@
+""" Token corpus shared by the Word2Vec processing.
+"""
+from os import listdir, makedirs, remove, replace
+from os.path import exists, join, splitext
+from uuid import uuid4
+
+import json
+import numpy as np
+
+from bugfinder import settings
+from bugfinder.processing.tokenizers.lexer import code_lexer
+from bugfinder.settings import LOGGER
+from bugfinder.utils.dirs import get_signature
+
+TOKEN_CACHE_VERSION = 1
+""" int: Version of the token cache format. Caches with a different version are
+rebuilt.
+"""
+
+TOKEN_CACHE_INDEX = "corpus.json"
+""" str: Name of the file listing the vocabulary and the cached files of the token
+cache.
+"""
+
+
+class TokenCorpus:
+    """Restartable iterable over the tokens of the C files of a dataset, yielding one
+    list of tokens per file. Tokens are stored as integer ids in a binary cache, next
+    to their offsets, and streamed from disk. Files are only tokenized again when
+    their signature changes.
+    """
+
+    def __init__(self, dataset):
+        """Class instantiation method
+
+        Args:
+            dataset (CodeWeaknessClassificationDataset): Dataset to read the files
+                from.
+        """
+        self.dataset = dataset
+        self.cache_dir = join(dataset.path, settings.DATASET_DIRS["tokens"])
+        self.index_filepath = join(self.cache_dir, TOKEN_CACHE_INDEX)
+
+        self.filepaths = self.get_filepaths()
+        self.vocabulary = []
+        self.positions = np.zeros((len(self.filepaths), 2), dtype=np.int64)
+        self.token_ids = np.zeros(0, dtype=np.int32)
+        self.tokenized_files = 0
+
+        self.update()
+
+    def get_filepaths(self):
+        """List the C files of the dataset, sorted to keep the corpus order stable.
+
+        Returns:
+            list: Paths of the files, relative to the dataset.
+        """
+        return sorted(
+            join(test_case, filename)
+            for test_case in self.dataset.test_cases
+            for filename in listdir(join(self.dataset.path, test_case))
+            if splitext(filename)[1] in [".c", ".h"]
+        )
+
+    def _load_cache(self):
+        """Load the index and the token ids of the cache. An empty cache is returned
+        if it does not exist or cannot be used.
+
+        Returns:
+            tuple: Cache index and array of token ids.
+        """
+        cache_index = {"version": TOKEN_CACHE_VERSION, "vocabulary": [], "files": {}}
+        token_ids = np.zeros(0, dtype=np.int32)
+
+        if not exists(self.index_filepath):
+            return cache_index, token_ids
+
+        try:
+            with open(self.index_filepath, "r", encoding="utf-8") as index_fp:
+                stored_cache_index = json.load(index_fp)
+
+            if stored_cache_index.get("version") != TOKEN_CACHE_VERSION:
+                LOGGER.debug("Token cache version is outdated. Ignoring cache...")
+                return cache_index, token_ids
+
+            token_ids = self._load_token_ids(stored_cache_index["tokens"])
+        except (OSError, ValueError, KeyError) as exc:
+            LOGGER.debug("Token cache could not be read: %s.", str(exc))
+            return cache_index, token_ids
+
+        return stored_cache_index, token_ids
+
+    def _load_token_ids(self, tokens_filename):
+        """Open the array of token ids, without reading it in memory.
+
+        Args:
+            tokens_filename (str): Name of the array file in the cache directory.
+
+        Returns:
+            np.ndarray: Token ids.
+        """
+        return np.load(join(self.cache_dir, tokens_filename), mmap_mode="r")
+
+    def _save_cache(self, cache_index, token_ids):
+        """Save the token ids in a new array file, then replace the cache index. The
+        array of the previous cache is removed once the index has been replaced.
+
+        Args:
+            cache_index (dict): Vocabulary and cached files.
+            token_ids (np.ndarray): Token ids of every file.
+
+        Returns:
+            bool: True if the cache has been saved, False otherwise.
+        """
+        previous_tokens_filename = cache_index.get("tokens")
+        cache_id = uuid4().hex
+        cache_index["tokens"] = "tokens.%s.npy" % cache_id
+        # Each corpus writes its own temporary index, since several processing can
+        # update the cache concurrently.
+        tmp_index_filepath = "%s.%s.tmp" % (self.index_filepath, cache_id)
+
+        try:
+            makedirs(self.cache_dir, exist_ok=True)
+            np.save(join(self.cache_dir, cache_index["tokens"]), token_ids)
+
+            with open(tmp_index_filepath, "w", encoding="utf-8") as index_fp:
+                json.dump(cache_index, index_fp)
+
+            replace(tmp_index_filepath, self.index_filepath)
+        except OSError as exc:
+            LOGGER.debug("Token cache could not be saved: %s.", str(exc))
+
+            for tmp_filepath in [
+                tmp_index_filepath,
+                join(self.cache_dir, cache_index["tokens"]),
+            ]:
+                if exists(tmp_filepath):
+                    remove(tmp_filepath)
+
+            return False
+
+        if previous_tokens_filename not in [None, cache_index["tokens"]]:
+            try:
+                remove(join(self.cache_dir, previous_tokens_filename))
+            except OSError:
+                pass
+
+        return True
+
+    def update(self):
+        """Tokenize the files that changed since the cache was built, and store their
+        tokens in the cache. Cached files that are not part of the corpus, such as
+        the files of other views of the dataset, are kept as long as they exist.
+        """
+        cache_index, cached_token_ids = self._load_cache()
+
+        vocabulary = cache_index["vocabulary"]
+        token_map = {token: token_id for token_id, token in enumerate(vocabulary)}
+        files = {}
+        file_token_ids = []
+        self.tokenized_files = 0
+
+        for filepath in self.filepaths:
+            signature = get_signature(join(self.dataset.path, filepath))
+            cached_file = cache_index["files"].get(filepath)
+
+            if (
+                signature is not None
+                and cached_file is not None
+                and cached_file[0] == signature
+            ):
+                files[filepath] = cached_file
+                continue
+
+            with open(join(self.dataset.path, filepath), "r") as in_file:
+                tokens = code_lexer.tokenize(in_file.read())
+
+            for token in tokens:
+                if token not in token_map:
+                    token_map[token] = len(vocabulary)
+                    vocabulary.append(token)
+
+            files[filepath] = [signature, None, len(tokens)]
+            file_token_ids.append(
+                (filepath, np.array([token_map[token] for token in tokens], np.int32))
+            )
+            self.tokenized_files += 1
+
+        for filepath, cached_file in cache_index["files"].items():
+            if filepath not in files and exists(join(self.dataset.path, filepath)):
+                files[filepath] = cached_file
+
+        self.vocabulary = vocabulary
+
+        LOGGER.debug(
+            "%d/%d files tokenized, %d retrieved from cache.",
+            self.tokenized_files,
+            len(self.filepaths),
+            len(self.filepaths) - self.tokenized_files,
+        )
+
+        # The cache is left untouched if every file has been retrieved from it.
+        if self.tokenized_files == 0 and len(files) == len(cache_index["files"]):
+            self.token_ids = cached_token_ids
+        else:
+            self.token_ids = self._build_token_ids(
+                files, cached_token_ids, dict(file_token_ids)
+            )
+            cache_index["files"] = files
+
+            if self._save_cache(cache_index, self.token_ids):
+                self.token_ids = self._load_token_ids(cache_index["tokens"])
+
+        self.positions = np.array(
+            [files[filepath][1:] for filepath in self.filepaths], dtype=np.int64
+        ).reshape(-1, 2)
+
+    @staticmethod
+    def _build_token_ids(files, cached_token_ids, file_token_ids):
+        """Concatenate the token ids of the cached and tokenized files, and record the
+        new position of each file.
+
+        Args:
+            files (dict): Signature, position and number of tokens of each file.
+                Positions are updated.
+            cached_token_ids (np.ndarray): Token ids of the previous cache.
+            file_token_ids (dict): Token ids of the tokenized files.
+
+        Returns:
+            np.ndarray: Token ids of every file.
+        """
+        token_id_chunks = []
+        position = 0
+
+        for filepath, cached_file in files.items():
+            if filepath in file_token_ids:
+                token_id_chunks.append(file_token_ids[filepath])
+            else:
+                token_id_chunks.append(
+                    cached_token_ids[cached_file[1] : cached_file[1] + cached_file[2]]
+                )
+
+            files[filepath] = [cached_file[0], position, cached_file[2]]
+            position += cached_file[2]
+
+        if len(token_id_chunks) == 0:
+            return np.zeros(0, dtype=np.int32)
+
+        return np.concatenate(token_id_chunks).astype(np.int32, copy=False)
+
+    def get_tokens(self, file_index):
+        """Retrieve the tokens of a single file.
+
+        Args:
+            file_index (int): Position of the file in `filepaths`.
+
+        Returns:
+            list: Tokens of the file.
+        """
+        position, token_count = self.positions[file_index]
+
+        return [
+            self.vocabulary[token_id]
+            for token_id in self.token_ids[position : position + token_count]
+        ]
+
+    def iter_files(self):
+        """Iterate over the files of the corpus.
+
+        Returns:
+            iterator: Path and tokens of each file.
+        """
+        for file_index, filepath in enumerate(self.filepaths):
+            yield filepath, self.get_tokens(file_index)
+
+    def __iter__(self):
+        for _, tokens in self.iter_files():
+            yield tokens
+
+    def __len__(self):
+        return len(self.filepaths)
@@ -1,4 +1,5 @@
-from os import listdir, makedirs
+from hashlib import sha256
+from os import makedirs, remove
 from os.path import join, splitext, exists, dirname, abspath
 
 import numpy as np
@@ -6,11 +7,18 @@ import pandas as pd
 from abc import abstractmethod
 from gensim.models import Word2Vec
 
-from bugfinder.base.processing import AbstractProcessing
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
+from bugfinder.features.extraction.word2vec.corpus import TokenCorpus
 from bugfinder.settings import LOGGER
+from bugfinder.utils.dirs import link_file
+from bugfinder.utils.statistics import get_dedup_stats
 
 
 class Word2VecEmbeddings(AbstractProcessing):
+    reads = {DatasetArtifact.SOURCE, DatasetArtifact.MODELS}
+    writes = {DatasetArtifact.EMBEDDINGS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
     def __init__(self, dataset):
         """Class initialization method."""
         super().__init__(dataset)
@@ -19,9 +27,9 @@ class Word2VecEmbeddings(AbstractProcessing):
         self.vector_length = 50
 
     def execute(self, **kwargs):
-        """Run the processing. Retrieves each tokenized file as a dictionary, loads
-        the model, generates the embeddings for each token in the file,
-        and saves the embeddings in a CSV file for future processing.
+        """Run the processing. Streams the tokens of each file, loads the model,
+        generates the embeddings for each token in the file, and saves the embeddings
+        in a CSV file for future processing.
         """
         if "emb_length" in kwargs.keys():
             self.embedding_length = kwargs["emb_length"]
@@ -32,55 +40,124 @@ class Word2VecEmbeddings(AbstractProcessing):
 
         LOGGER.debug("Token list retrieved. Loading model...")
 
-        embeddings = list()
-
         model = Word2Vec.load(join(self.dataset.model_dir, kwargs["name"]))
 
-        for item, token in enumerate(token_list):
+        # Embeddings only depend on the first tokens, they are computed once for
+        # the files sharing them. Only the path of the embeddings file is kept, the
+        # other files sharing the same tokens are linked to it.
+        embeddings_files = {}
+        # Files with the same name and another extension share an embeddings file,
+        # the tokens hash of its current content is kept for each saved file.
+        saved_files = {}
+
+        for item, (filepath, tokens) in enumerate(token_list.iter_files()):
             LOGGER.debug(
                 "Creating the embeddings for %s. %d items left for processing...",
-                token["path"],
+                filepath,
                 (len(token_list) - item),
             )
 
-            try:
-                vectors = self.vectorize(model, token)
-            except:
+            token = {"path": splitext(filepath)[0], "tokens": tokens}
+            tokens_hash = sha256(
+                "\n".join(token["tokens"][: self.embedding_length]).encode("utf-8")
+            ).hexdigest()
+
+            embeddings_filepath = embeddings_files.get(tokens_hash)
+
+            if tokens_hash not in embeddings_files or (
+                embeddings_filepath is not None
+                and saved_files[embeddings_filepath] != tokens_hash
+            ):
+                try:
+                    vectors = self.vectorize(model, token)
+                except:
+                    vectors = None
+
+                embeddings_filepath = None
+
+                if vectors is not None:
+                    # Embeddings are saved as they are created, instead of being
+                    # kept in memory for the whole dataset.
+                    embeddings_filepath = self.save_dataframe(
+                        {"path": token["path"], "embeddings": vectors}
+                    )
+                    saved_files[embeddings_filepath] = tokens_hash
+
+                embeddings_files[tokens_hash] = embeddings_filepath
+            elif embeddings_filepath is not None:
+                linked_filepath = self.get_embeddings_filepath(token["path"])
+
+                if linked_filepath != embeddings_filepath:
+                    self.link_dataframe(embeddings_filepath, token["path"])
+                    saved_files[linked_filepath] = tokens_hash
+
+            if embeddings_files[tokens_hash] is None:
                 LOGGER.debug("Key not found. Skipping...")
-                continue
-
-            tmp = {"path": token["path"], "embeddings": vectors}
-
-            embeddings.append(tmp)
 
-        LOGGER.info("Embeddings created. Saving features...")
+        self.processing_stats["dedup"] = get_dedup_stats(
+            len(token_list), len(embeddings_files)
+        )
 
-        for item in range(len(embeddings)):
-            LOGGER.debug(
-                "Processing %s file. %d items remaining...",
-                embeddings[item]["path"],
-                (len(embeddings) - item),
-            )
-            self.save_dataframe(embeddings[item])
+        LOGGER.info("Embeddings created and saved.")
 
     def save_dataframe(self, embeddings):
         """Saving the generated embeddings in CSV format.
 
         Args:
             embeddings (pd.DataFrame): Dataframe containing the generated embeddings
+
+        Returns:
+            str: Path of the embeddings file.
         """
         df = pd.DataFrame(embeddings["embeddings"])
+        embeddings_filepath = self._prepare_embeddings_file(embeddings["path"])
 
-        dir_path = dirname(
-            abspath(join(self.dataset.embeddings_dir, embeddings["path"]))
-        )
+        df.to_csv(embeddings_filepath, index=False)
+
+        return embeddings_filepath
+
+    def link_dataframe(self, embeddings_filepath, path):
+        """Share an embeddings file already saved with another file of the dataset.
+
+        Args:
+            embeddings_filepath (str): Path of the saved embeddings file.
+            path (str): Path of the file sharing the embeddings, without extension.
+        """
+        link_file(embeddings_filepath, self._prepare_embeddings_file(path))
+
+    def get_embeddings_filepath(self, path):
+        """Retrieve the path of the embeddings file of a file of the dataset.
+
+        Args:
+            path (str): Path of the file, relative to the embeddings directory and
+                without extension.
+
+        Returns:
+            str: Path of the embeddings file.
+        """
+        return join(self.dataset.embeddings_dir, path) + ".csv"
+
+    def _prepare_embeddings_file(self, path):
+        """Create the directory of an embeddings file and remove the previous
+        version of the file, which can be linked to other embeddings files.
+
+        Args:
+            path (str): Path of the file, relative to the embeddings directory and
+                without extension.
+
+        Returns:
+            str: Path of the embeddings file.
+        """
+        embeddings_filepath = self.get_embeddings_filepath(path)
+        dir_path = dirname(abspath(embeddings_filepath))
 
         if not exists(dir_path):
             makedirs(dir_path)
 
-        df.to_csv(
-            join(self.dataset.embeddings_dir, embeddings["path"]) + ".csv", index=False
-        )
+        if exists(embeddings_filepath):
+            remove(embeddings_filepath)
+
+        return embeddings_filepath
 
     def vectorize(self, model, tokens):
         """Process the token list and generates a matrix containing the token's
@@ -105,43 +182,11 @@ class Word2VecEmbeddings(AbstractProcessing):
         return vectors
 
     def get_token_list(self):
-        """Reads each file, retrieves the tokens from it and concatenates them in a
-        single list which will be the corpus.
-        The difference between this function and the one in the Word2VecModel class is
-        this one saves the tokens as a
-        dictionary where the key is the name of the processed file, so it can be
-        identified later for testing/training.
+        """Retrieve the tokens of each file of the dataset. Tokens are streamed file
+        by file, along with the path of the file, so they can be identified later
+        for testing/training.
 
         Returns:
-            token_list: list of dictionaries containing all the tokens in the dataset,
-            processed from the files
+            TokenCorpus: Tokens of each file of the dataset.
         """
-        token_list = list()
-
-        file_processing_list = [
-            join(test_case, filepath)
-            for test_case in self.dataset.test_cases
-            for filepath in listdir(join(self.dataset.path, test_case))
-            if splitext(filepath)[1] in [".c", ".h"]
-        ]
-
-        while len(file_processing_list) != 0:
-            filepath = file_processing_list.pop(0)
-
-            processed_tokens = dict()
-            processed_tokens["path"] = splitext(filepath)[0]
-
-            with open(join(self.dataset.path, filepath), "r") as in_file:
-                code = in_file.readlines()
-
-                tokens = [token.strip() for token in code]
-
-                LOGGER.debug(
-                    "%s file read. Retrieved %d tokens.", filepath, len(tokens)
-                )
-
-                processed_tokens["tokens"] = tokens
-
-                token_list.append(processed_tokens)
-
-        return token_list
+        return TokenCorpus(self.dataset)
@@ -1,9 +1,10 @@
-from os import listdir, makedirs
-from os.path import join, splitext, exists
+from os import makedirs
+from os.path import join, exists
 
 from gensim.models import Word2Vec
 
-from bugfinder.base.processing import AbstractProcessing
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
+from bugfinder.features.extraction.word2vec.corpus import TokenCorpus
 from bugfinder.settings import LOGGER
 
 
@@ -12,6 +13,10 @@ class Word2VecModel(AbstractProcessing):
     generated by the tokenization of the dataset.
     """
 
+    reads = {DatasetArtifact.SOURCE}
+    writes = {DatasetArtifact.MODELS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
     tokens = {}
 
     word_dim = 50
@@ -22,8 +27,8 @@ class Word2VecModel(AbstractProcessing):
     seed = None
 
     def execute(self, name, **kwargs):
-        """Run the processing. This function reads each tokenized file in the dataset,
-        generates a corpus, trains the model and saves it.
+        """Run the processing. This function streams the tokens of each file in the
+        dataset, trains the model and saves it.
 
         Args:
             name (str): This parameter will be the name of the model saved in disk.
@@ -58,29 +63,10 @@ class Word2VecModel(AbstractProcessing):
         model.save(model_dir)
 
     def get_token_list(self):
-        """Reads each file, retrieves the tokens from it and concatenates them in a
-        single list which will be the corpus.
+        """Retrieve the corpus used to train the model. Tokens are streamed file by
+        file, and the corpus can be iterated over several times.
 
         Returns:
-            token_list: list containing all the tokens in the dataset, concatenated
-            to form the corpus
+            TokenCorpus: Tokens of each file of the dataset.
         """
-        token_list = list()
-
-        file_processing_list = [
-            join(test_case, filepath)
-            for test_case in self.dataset.test_cases
-            for filepath in listdir(join(self.dataset.path, test_case))
-            if splitext(filepath)[1] in [".c", ".h"]
-        ]
-
-        while len(file_processing_list) != 0:
-            filepath = file_processing_list.pop(0)
-
-            with open(join(self.dataset.path, filepath), "r") as in_file:
-                code = in_file.readlines()
-
-                tokens = [token.strip() for token in code]
-                token_list.append(tokens)
-
-        return token_list
+        return TokenCorpus(self.dataset)
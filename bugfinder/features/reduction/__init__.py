@@ -2,18 +2,23 @@
 """
 from os.path import join, realpath
 
+import numpy as np
 import pandas as pd
 from abc import abstractmethod
 from shutil import copy
 
 from bugfinder.base.dataset import ProcessingCategory
-from bugfinder.base.processing import AbstractProcessing
-from bugfinder.settings import LOGGER
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
+from bugfinder.settings import LOGGER, FEATURES_STORE
+from bugfinder.utils.feature_store import FeatureStore
 
 
 class AbstractFeatureSelector(AbstractProcessing):
     """Base class for feature selection."""
 
+    reads = {DatasetArtifact.FEATURES}
+    writes = {DatasetArtifact.FEATURES}
+
     def __init__(self, dataset):
         """Class instantiation method"""
         super().__init__(dataset)
@@ -23,19 +28,47 @@ class AbstractFeatureSelector(AbstractProcessing):
     def select_feature(self, *args, **kwargs) -> pd.DataFrame:
         raise NotImplementedError("Method 'select_feature' needs to be implemented.")
 
+    @staticmethod
+    def is_column_subset(input_features, output_features):
+        """Check if the output features are a subset of the input columns, with
+        unchanged values.
+
+        Args:
+            input_features (pd.DataFrame): Features given to the selector.
+            output_features (pd.DataFrame): Features returned by the selector.
+
+        Returns:
+            bool: True if every output column is an unchanged input column.
+        """
+        if not set(output_features.columns).issubset(input_features.columns):
+            return False
+
+        return all(
+            np.array_equal(
+                np.asarray(output_features[column]),
+                np.asarray(input_features[column]),
+            )
+            for column in output_features.columns
+        )
+
     def execute(self, dry_run, *args, **kwargs):
         drop_out_cols = ["result", "name"]
 
+        feature_store = FeatureStore(join(self.dataset.feats_dir, FEATURES_STORE))
+
         if not dry_run:  # Create a backup of the feature if running the selection
-            copy(
-                join(self.dataset.feats_dir, "features.csv"),
-                join(
-                    self.dataset.feats_dir,
-                    "features.%d.csv" % self.dataset.feats_version,
-                ),
-            )
+            if feature_store.exists():
+                feature_store.create_version()
+            else:
+                copy(
+                    join(self.dataset.feats_dir, "features.csv"),
+                    join(
+                        self.dataset.feats_dir,
+                        "features.%d.csv" % self.dataset.feats_version,
+                    ),
+                )
 
-            self.dataset.rebuild_index()
+            self.dataset.update_index()
 
         input_features = self.dataset.features.drop(drop_out_cols, axis=1)
         input_results = self.dataset.features["result"]
@@ -47,12 +80,15 @@ class AbstractFeatureSelector(AbstractProcessing):
             LOGGER.info("Executed a dry-run, no feature will be saved.")
             return
 
-        for col in drop_out_cols:
-            output_features[col] = self.dataset.features[col]
+        if feature_store.exists() and self.is_column_subset(
+            input_features, output_features
+        ):
+            # Selected columns reference the data of the previous version.
+            feature_store.select(list(output_features.columns) + drop_out_cols)
+        else:
+            for col in drop_out_cols:
+                output_features[col] = self.dataset.features[col]
 
-        output_features_filepath = realpath(
-            join(self.dataset.feats_dir, "features.csv")
-        )
-        output_features.to_csv(output_features_filepath, index=False)
+            feature_store.write(output_features, self.dataset.get_features_test_cases())
 
-        LOGGER.info("Feature file saved to %s.", output_features_filepath)
+        LOGGER.info("Feature file saved to %s.", realpath(feature_store.path))
@@ -8,7 +8,7 @@ from shutil import rmtree, copytree
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 
-from bugfinder.base.processing import AbstractProcessing
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
 from bugfinder.base.dataset import ProcessingCategory
 from bugfinder.settings import LOGGER
 from bugfinder.utils.statistics import has_better_metrics
@@ -17,6 +17,10 @@ from bugfinder.utils.statistics import has_better_metrics
 class ClassifierModel(AbstractProcessing):
     """Abstract class for classifier models"""
 
+    reads = {DatasetArtifact.FEATURES}
+    writes = {DatasetArtifact.MODELS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
     def __init__(self, dataset):
         """Class instantiation method"""
         super().__init__(dataset)
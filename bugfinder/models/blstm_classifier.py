@@ -15,7 +15,7 @@ from tensorflow.keras.models import Sequential
 from tensorflow.keras.optimizers import Adamax
 from tensorflow.keras.utils import to_categorical
 
-from bugfinder.base.processing import AbstractProcessing
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
 from bugfinder.settings import LOGGER
 
 
@@ -26,6 +26,10 @@ class BLSTMClassifierModel(AbstractProcessing):
         AbstractProcessing (_type_): _description_
     """
 
+    reads = {DatasetArtifact.EMBEDDINGS}
+    writes = {DatasetArtifact.MODELS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
     def __init__(self, dataset):
         """Class initialization method"""
         super().__init__(dataset)
@@ -5,7 +5,11 @@ import tensorflow.keras as keras
 from sklearn.metrics import classification_report
 from sklearn.model_selection import train_test_split
 
-from bugfinder.base.processing import AbstractProcessing, ProcessingCategory
+from bugfinder.base.processing import (
+    AbstractProcessing,
+    ProcessingCategory,
+    DatasetArtifact,
+)
 from bugfinder.settings import LOGGER
 
 
@@ -21,6 +25,11 @@ class SequenceGenerator(keras.utils.Sequence):
 
 
 class SequentialModel(AbstractProcessing):
+
+    reads = {DatasetArtifact.FEATURES}
+    writes = {DatasetArtifact.MODELS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
     def __init__(self, dataset):
         super().__init__(dataset)
 
@@ -1,22 +1,24 @@
 """ Module containing abstract AST processing classes.
 """
-
-import re
 from abc import abstractmethod
 
 from bugfinder.processing.neo4j import Neo4J3Processing
+from bugfinder.processing.neo4j.queries import register_query
 from bugfinder.settings import LOGGER
 
 
 class AbstractASTMarkup(Neo4J3Processing):
     """Abstract class to markup the AST"""
 
-    SET_AST_MARKUP_CMD = """
-       UNWIND %s as data
+    SET_AST_MARKUP_CMD = register_query(
+        "ast.set_ast_markup",
+        """
+       UNWIND $data as data
        MATCH (n)
        WHERE id(n) = data.id
        SET n.ast = data.ast
-    """
+    """,
+    )
 
     @abstractmethod
     def get_ast_information(self):
@@ -64,14 +66,9 @@ class AbstractASTMarkup(Neo4J3Processing):
                 self.build_ast_markup(ast_item) for ast_item in operation_list
             ]
 
-            # Cleanup dict to be parsed by Neo4J
-            ast_update_dict = str(operation_list)
-            ast_update_dict = re.sub(r"u\'([^\']*)\'", "'\\g<1>'", ast_update_dict)
-            ast_update_dict = re.sub(r"\'([^\']*)\':", "\\g<1>:", ast_update_dict)
-
             LOGGER.debug("Updating AST...")
             try:
-                self.neo4j_db.run(self.SET_AST_MARKUP_CMD % ast_update_dict)
+                self.SET_AST_MARKUP_CMD.run(self.neo4j_db, data=operation_list)
             except Exception as exc:
                 LOGGER.info("Command %e failed: %s", cmd_index, str(exc))
                 import traceback
@@ -1,6 +1,20 @@
 """ Module containing the second version of the AST markup algorithm.
 """
 from bugfinder.processing.ast import AbstractASTMarkup
+from bugfinder.processing.neo4j.queries import register_query
+
+GET_CHILD_NODES_QUERY = register_query(
+    "ast.v02.get_child_nodes",
+    """
+    MATCH (m)-[:IS_AST_PARENT*]->(n)
+    WHERE id(m)=$id
+    WITH collect(n) AS ast_nodes
+    UNWIND ast_nodes AS ast_node
+    MATCH (ast_node)<-[:IS_AST_PARENT]-(ast_parent)
+    RETURN ast_node.type AS type, id(ast_node) AS id,
+        id(ast_parent) AS parent, ast_node.childNum AS child_num
+    """,
+)
 
 
 class Neo4JASTMarkup(AbstractASTMarkup):
@@ -21,15 +35,6 @@ class Neo4JASTMarkup(AbstractASTMarkup):
             WHERE not exists(node.ast)
             RETURN DISTINCT id(node) as id, node.type as type
         """
-        get_child_nodes_info = """
-            MATCH (m)-[:IS_AST_PARENT*]->(n)
-            WHERE id(m)=%s
-            WITH collect(n) AS ast_nodes
-            UNWIND ast_nodes AS ast_node
-            MATCH (ast_node)<-[:IS_AST_PARENT]-(ast_parent)
-            RETURN ast_node.type AS type, id(ast_node) AS id, 
-                id(ast_parent) AS parent, ast_node.childNum AS child_num
-        """
 
         return [
             {
@@ -42,7 +47,9 @@ class Neo4JASTMarkup(AbstractASTMarkup):
                         "type": ast_node["type"],
                         "child_num": ast_node["child_num"],
                     }
-                    for ast_node in self.neo4j_db.run(get_child_nodes_info % node["id"])
+                    for ast_node in GET_CHILD_NODES_QUERY.run(
+                        self.neo4j_db, id=node["id"]
+                    )
                 ],
             }
             for node in self.neo4j_db.run(get_main_nodes_info).data()
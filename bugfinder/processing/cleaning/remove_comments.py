@@ -8,6 +8,12 @@ from bugfinder.settings import LOGGER
 class RemoveComments(AbstractCppFileProcessing):
     """Processing to remove comments from a certain dataset based on RegEx."""
 
+    deduplicate = True
+
+    rx_comments = re.compile(
+        r"(\".*?\"|\'.*?\')|(/\*.*?\*/|//[^\r\n]*$)", re.MULTILINE | re.DOTALL
+    )
+
     def execute(self):
         """Run the processing"""
         LOGGER.debug("Removing comments in dataset at '%s'...", self.dataset.path)
@@ -17,9 +23,23 @@ class RemoveComments(AbstractCppFileProcessing):
     def process_file(self, filepath):
         tmp_filepath = "%s.tmp" % filepath
 
-        rx_comments = re.compile(
-            r"(\".*?\"|\'.*?\')|(/\*.*?\*/|//[^\r\n]*$)", re.MULTILINE | re.DOTALL
-        )
+        with open(filepath, "r") as in_file:
+            code = in_file.read()
+
+        with open(tmp_filepath, "w") as out_file:
+            out_file.write(self.transform_code(code))
+
+        move(tmp_filepath, filepath)
+
+    def transform_code(self, code):
+        """Remove the comments and the empty lines of a piece of code.
+
+        Args:
+            code (str): Content of a file.
+
+        Returns:
+            str: Code without comments.
+        """
 
         def _replacer(match):
             if match.group(2) is not None:
@@ -27,16 +47,9 @@ class RemoveComments(AbstractCppFileProcessing):
 
             return match.group(1)
 
-        with open(filepath, "r") as in_file:
-            code = in_file.read()
-
-            stripped_code = rx_comments.sub(_replacer, code)
-
-            code_as_list = [line.strip() for line in stripped_code.splitlines()]
-            code_as_list = list(filter(None, code_as_list))
+        stripped_code = self.rx_comments.sub(_replacer, code)
 
-        with open(tmp_filepath, "w") as out_file:
-            for line in code_as_list:
-                out_file.write(f"{line}\n")
+        code_as_list = [line.strip() for line in stripped_code.splitlines()]
+        code_as_list = list(filter(None, code_as_list))
 
-        move(tmp_filepath, filepath)
+        return "".join(f"{line}\n" for line in code_as_list)
@@ -1,6 +1,7 @@
 """
 """
 
+from io import StringIO
 from shutil import move
 
 from bugfinder.processing import AbstractCppFileProcessing
@@ -10,6 +11,8 @@ from bugfinder.settings import LOGGER
 class RemoveMainFunction(AbstractCppFileProcessing):
     """Processing to remove the main function from a dataset."""
 
+    deduplicate = True
+
     main_fn_entry = "#ifdef INCLUDEMAIN\n"
     main_fn_exit = "#endif\n"
 
@@ -23,24 +26,38 @@ class RemoveMainFunction(AbstractCppFileProcessing):
         """Process a single file"""
         LOGGER.debug("Removing main function in '%s'.", filepath)
         tmp_filepath = f"{filepath}.tmp"
-        is_in_main_fn = False
-        out_lines = []
 
-        # Remove every line between `self.main_fn_entry` and
-        # `self.main_fn_exit`.
         with open(filepath, "r", encoding="utf-8") as in_file:
-            for line in in_file:
-                if not is_in_main_fn:
-                    if line != self.main_fn_entry:
-                        out_lines.append(line)
-                    else:
-                        is_in_main_fn = True
-                else:  # is_in_main_fn == True
-                    if line == self.main_fn_exit:
-                        is_in_main_fn = False
+            code = in_file.read()
 
         # Save transformations to the new file and replace the old file
         with open(tmp_filepath, "w", encoding="utf-8") as out_file:
-            out_file.writelines(out_lines)
+            out_file.write(self.transform_code(code))
 
         move(tmp_filepath, filepath)
+
+    def transform_code(self, code):
+        """Remove the main function of a piece of code.
+
+        Args:
+            code (str): Content of a file.
+
+        Returns:
+            str: Code without the main function.
+        """
+        is_in_main_fn = False
+        out_lines = []
+
+        # Remove every line between `self.main_fn_entry` and
+        # `self.main_fn_exit`.
+        for line in StringIO(code):
+            if not is_in_main_fn:
+                if line != self.main_fn_entry:
+                    out_lines.append(line)
+                else:
+                    is_in_main_fn = True
+            else:  # is_in_main_fn == True
+                if line == self.main_fn_exit:
+                    is_in_main_fn = False
+
+        return "".join(out_lines)
@@ -2,6 +2,7 @@
 """
 
 import re
+from io import StringIO
 from shutil import move
 
 from bugfinder.processing import AbstractCppFileProcessing
@@ -11,44 +12,78 @@ from bugfinder.settings import LOGGER
 class ReplaceLitterals(AbstractCppFileProcessing):
     """Replace unrecognized litterals in the test cases"""
 
+    deduplicate = True
+
     replacements = {
-        r"(.*)L\'([^\']*)\'(.*)": "\\g<1>L('\\g<2>')\\g<3>",
-        r'(.*)L"([^"]*)"(.*)': '\\g<1>L("\\g<2>")\\g<3>',
+        re.compile(r"(.*)L\'([^\']*)\'(.*)"): "\\g<1>L('\\g<2>')\\g<3>",
+        re.compile(r'(.*)L"([^"]*)"(.*)'): '\\g<1>L("\\g<2>")\\g<3>',
     }
+    """ dict: Replacement of each litteral pattern. Patterns are compiled once and
+    reused for every line.
+    """
 
     def execute(self):
         """Execute the processing"""
         LOGGER.debug("Replacing litterals in dataset...")
-        repl_count = -1
-
-        while repl_count != 0:
-            retcode = super().execute()
-            repl_count = sum(retcode)
-
-        LOGGER.info("Litterals successfully replaced.")
+        repl_count = sum(super().execute())
+        LOGGER.info("Litterals successfully replaced (%d replacements).", repl_count)
 
     def process_file(self, filepath):
         """Replace litteral in a single file"""
         tmp_filepath = f"{filepath}.tmp"
-        out_lines = []
-        repl_count = 0
 
-        # Matching regexp on every line and replace them.
         with open(filepath, "r", encoding="utf-8") as in_file:
-            for line in in_file:
-                for src, dest in list(self.replacements.items()):
-                    if re.match(src, line):
-                        repl_count += 1
-                        line = re.sub(src, dest, line)
-
-                out_lines.append(line)
+            code, repl_count = self.replace_litterals(in_file.read())
 
         # If replacement were performed, we save them to the new file and
         # replace the old file by the new one.
         if repl_count != 0:
             with open(tmp_filepath, "w", encoding="utf-8") as out_file:
-                out_file.writelines(out_lines)
+                out_file.write(code)
 
             move(tmp_filepath, filepath)
 
         return repl_count
+
+    def replace_litterals(self, code):
+        """Replace the litterals of a piece of code until no replacement is left.
+
+        Args:
+            code (str): Content of a file.
+
+        Returns:
+            tuple: Code with replaced litterals and number of replacements.
+        """
+        repl_count = 0
+        lines = list(StringIO(code))
+        lines_to_process = range(len(lines))
+
+        # Only lines modified during the previous pass can match again.
+        while len(lines_to_process) != 0:
+            modified_lines = []
+
+            for line_index in lines_to_process:
+                line = lines[line_index]
+
+                for src, dest in self.replacements.items():
+                    line, line_repl_count = src.subn(dest, line, count=1)
+                    repl_count += line_repl_count
+
+                if line != lines[line_index]:
+                    lines[line_index] = line
+                    modified_lines.append(line_index)
+
+            lines_to_process = modified_lines
+
+        return "".join(lines), repl_count
+
+    def transform_code(self, code):
+        """Replace the litterals of a piece of code until no replacement is left.
+
+        Args:
+            code (str): Content of a file.
+
+        Returns:
+            str: Code with replaced litterals.
+        """
+        return self.replace_litterals(code)[0]
@@ -1,4 +1,4 @@
-from os.path import exists
+from os.path import exists, join, realpath
 
 import os
 from shutil import rmtree, copytree
@@ -12,6 +12,7 @@ from bugfinder.base.processing import (
 )
 from bugfinder.processing.dataset.fix_rights import RightFixer
 from bugfinder.settings import LOGGER
+from bugfinder.utils.dirs import link_file
 
 
 class CopyDataset(AbstractProcessing):
@@ -22,13 +23,22 @@ class CopyDataset(AbstractProcessing):
 
         self.metadata["category"] = str(ProcessingCategory.__NONE__)
 
-    def execute(self, to_path, force=False):
-        """Run the processing"""
+    def execute(self, to_path, force=False, link_files=False):
+        """Run the processing
+
+        Args:
+            to_path (str): Path of the new dataset.
+            force (bool): Overwrite the new dataset if it exists.
+            link_files (bool): Share the test case files with the new dataset using
+                reflinks or hard links instead of copying them. Other files are
+                copied.
+        """
         LOGGER.debug(
-            "Copying dataset at %s to %s (force=%d)...",
+            "Copying dataset at %s to %s (force=%d, link_files=%d)...",
             self.dataset.path,
             to_path,
             int(force),
+            int(link_files),
         )
 
         # Fix rights of the original dataset
@@ -57,5 +67,24 @@ class CopyDataset(AbstractProcessing):
                     f"existing directory."
                 )
 
-        copytree(self.dataset.path, to_path)
+        if not link_files:
+            copytree(self.dataset.path, to_path)
+        else:
+
+            def _ignore_classes(dirpath, _):
+                """Class directories are linked separately."""
+                if realpath(dirpath) == realpath(self.dataset.path):
+                    return self.dataset.classes
+
+                return []
+
+            copytree(self.dataset.path, to_path, ignore=_ignore_classes)
+
+            for class_name in self.dataset.classes:
+                copytree(
+                    join(self.dataset.path, class_name),
+                    join(to_path, class_name),
+                    copy_function=link_file,
+                )
+
         LOGGER.info("Dataset copy succeeded.")
@@ -1,28 +1,62 @@
 from os.path import exists, join, basename
 
 import random
-from shutil import rmtree, copytree, copyfile
+from shutil import rmtree, copytree, copyfile, copy2
 
+from bugfinder.base.dataset_view import CodeWeaknessClassificationDatasetView
 from bugfinder.base.processing import (
     AbstractProcessing,
 )
 from bugfinder.settings import LOGGER
+from bugfinder.utils.dirs import link_file
 
 
 class ExtractSampleDataset(AbstractProcessing):
     """Processing to create a subset of a given dataset."""
 
-    def execute(self, to_path, sample_nb, shuffle=True, force=False):
-        """Run the processing."""
+    def execute(
+        self,
+        to_path,
+        sample_nb,
+        shuffle=True,
+        force=False,
+        link_files=False,
+        as_view=False,
+    ):
+        """Run the processing.
+
+        Args:
+            to_path (str): Path of the new dataset.
+            sample_nb (int): Number of test cases to extract.
+            shuffle (bool): Pick the test cases randomly.
+            force (bool): Overwrite the new dataset if it exists.
+            link_files (bool): Share the test case files with the new dataset using
+                reflinks or hard links instead of copying them.
+            as_view (bool): Create a view of the dataset, listing the extracted test
+                cases, instead of copying them.
+        """
         LOGGER.debug(
-            "Extracting %d samples from dataset %s to %s (shuffle=%d, " "force=%d)...",
+            "Extracting %d samples from dataset %s to %s (shuffle=%d, force=%d, "
+            "link_files=%d, as_view=%d)...",
             sample_nb,
             self.dataset.path,
             to_path,
             int(shuffle),
             int(force),
+            int(link_files),
+            int(as_view),
         )
 
+        if as_view:
+            CodeWeaknessClassificationDatasetView.create(
+                to_path,
+                self.dataset,
+                self.get_sample_test_cases(sample_nb, shuffle),
+                force=force,
+            )
+            LOGGER.info("Dataset view creation succeeded.")
+            return
+
         if exists(to_path):
             if force:
                 rmtree(to_path)
@@ -32,6 +66,36 @@ class ExtractSampleDataset(AbstractProcessing):
                     f"directory."
                 )
 
+        # Copy test cases to their destination
+        for class_file in self.get_sample_test_cases(sample_nb, shuffle):
+            orig_filepath = join(self.dataset.path, class_file)
+            dest_filepath = join(to_path, class_file)
+
+            copytree(
+                orig_filepath,
+                dest_filepath,
+                copy_function=link_file if link_files else copy2,
+            )
+
+        copyfile(
+            self.dataset.summary_filepath,
+            join(to_path, basename(self.dataset.summary_filepath)),
+        )
+
+        LOGGER.info("Dataset extraction succeeded.")
+
+    def get_sample_test_cases(self, sample_nb, shuffle=True):
+        """Pick test cases of each class, in proportion to the size of the class.
+
+        Args:
+            sample_nb (int): Number of test cases to extract.
+            shuffle (bool): Pick the test cases randomly.
+
+        Returns:
+            list: Extracted test cases.
+        """
+        sample_test_cases = []
+
         # Retrieve number of test cases per class. Approximated to simplify
         # computing.
         sample_nb = int(sample_nb)
@@ -56,17 +120,6 @@ class ExtractSampleDataset(AbstractProcessing):
 
             # Truncate test cases list
             class_test_cases = class_test_cases[: sample_nb_per_class[index]]
+            sample_test_cases += class_test_cases
 
-            # Copy test cases to their destination
-            for class_file in class_test_cases:
-                orig_filepath = join(self.dataset.path, class_file)
-                dest_filepath = join(to_path, class_file)
-
-                copytree(orig_filepath, dest_filepath)
-
-        copyfile(
-            self.dataset.summary_filepath,
-            join(to_path, basename(self.dataset.summary_filepath)),
-        )
-
-        LOGGER.info("Dataset extraction succeeded.")
+        return sample_test_cases
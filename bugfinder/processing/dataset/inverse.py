@@ -1,12 +1,16 @@
 from os.path import exists, join, isdir, basename
 
-from shutil import rmtree, copytree, copyfile
+from shutil import rmtree, copytree, copyfile, copy2
 
-from bugfinder.base.dataset import CodeWeaknessClassificationDataset as Dataset
+from bugfinder.base.dataset_view import (
+    CodeWeaknessClassificationDatasetView,
+    open_dataset,
+)
 from bugfinder.base.processing import (
     AbstractProcessing,
 )
 from bugfinder.settings import LOGGER
+from bugfinder.utils.dirs import link_file
 from bugfinder.utils.statistics import get_time
 
 
@@ -15,18 +19,31 @@ class InverseDataset(AbstractProcessing):
     are not present in a given subset.
     """
 
-    def execute(self, to_path, from_path, force=False):
-        """Run the processing"""
+    def execute(self, to_path, from_path, force=False, link_files=False, as_view=False):
+        """Run the processing
+
+        Args:
+            to_path (str): Path of the new dataset.
+            from_path (str): Path of the subset whose test cases are excluded.
+            force (bool): Overwrite the new dataset if it exists.
+            link_files (bool): Share the test case files with the new dataset using
+                reflinks or hard links instead of copying them.
+            as_view (bool): Create a view of the dataset, listing the test cases of
+                the inverse dataset, instead of copying them.
+        """
         LOGGER.debug(
-            "Extracting inverse dataset of %s from %s to %s (force=%d)",
+            "Extracting inverse dataset of %s from %s to %s (force=%d, "
+            "link_files=%d, as_view=%d)",
             self.dataset.path,
             from_path,
             to_path,
             int(force),
+            int(link_files),
+            int(as_view),
         )
         _time = get_time()
 
-        if exists(to_path):
+        if exists(to_path) and not as_view:
             if force:
                 rmtree(to_path)
             else:
@@ -41,18 +58,29 @@ class InverseDataset(AbstractProcessing):
         if not isdir(from_path):
             raise NotADirectoryError(f"{from_path} is not a directory.")
 
-        from_dataset = Dataset(from_path)
+        from_dataset = open_dataset(from_path)
         inverse_test_cases = [
             test_case
             for test_case in self.dataset.test_cases
             if test_case not in from_dataset.test_cases
         ]
 
+        if as_view:
+            CodeWeaknessClassificationDatasetView.create(
+                to_path, self.dataset, inverse_test_cases, force=force
+            )
+            LOGGER.info("Inverse dataset view creation succeeded.")
+            return
+
         for test_case in inverse_test_cases:
             orig_test_case = join(self.dataset.path, test_case)
             dest_test_case = join(to_path, test_case)
 
-            copytree(orig_test_case, dest_test_case)
+            copytree(
+                orig_test_case,
+                dest_test_case,
+                copy_function=link_file if link_files else copy2,
+            )
 
         copyfile(
             self.dataset.summary_filepath,
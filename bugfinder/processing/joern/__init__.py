@@ -1,18 +1,248 @@
 """ Module containing abstract classes for any Joern processing.
 """
+import heapq
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from os.path import exists, getsize, join
 
+from shutil import copytree, rmtree
+
+from bugfinder import settings
+from bugfinder.base.processing import DatasetArtifact
 from bugfinder.base.processing.containers import AbstractContainerProcessing
+from bugfinder.settings import LOGGER
+from bugfinder.utils.dirs import link_file
+
+CODE_DIR = "/code"
+""" str: Path of the parsed code inside the Joern containers.
+"""
+
+SHARDS_DIR = "shards"
+""" str: Name of the directory of the Joern database containing the shards being
+parsed.
+"""
 
 
 class AbstractJoernProcessing(AbstractContainerProcessing):
     """Abstract Joern processing class"""
 
+    reads = {DatasetArtifact.SOURCE}
+    writes = {DatasetArtifact.JOERN}
+
+    supports_shards = False
+    """ bool: Whether the databases created for several shards of the dataset can be
+    merged.
+    """
+
+    supports_incremental = False
+    """ bool: Whether the test cases changed since the last run can be parsed alone
+    and spliced into the existing database.
+    """
+
+    shard_path = None
+    """ str|None: Path of the shard parsed by the container, None if the whole dataset
+    is parsed.
+    """
+
+    def execute(
+        self, command_args=None, container_config=None, shards=1, incremental=False
+    ):
+        """Run the processing. The dataset is either parsed by a single container, or
+        split into shards parsed concurrently and merged afterwards. In incremental
+        mode, only the test cases changed since the last run are parsed.
+
+        Args:
+            command_args: Arguments of the container command.
+            container_config: Manual configuration of the container.
+            shards (int): Number of shards the test cases are split into.
+            incremental (bool): Only parse the test cases changed since the last run.
+        """
+        if incremental:
+            if not self.supports_incremental:
+                raise ValueError(
+                    "%s does not support incremental parsing." % self.__class__.__name__
+                )
+
+            self.update_database(command_args, container_config, shards)
+            return
+
+        if shards <= 1:
+            super().execute(command_args, container_config)
+            return
+
+        if not self.supports_shards:
+            raise ValueError(
+                "%s does not support parsing in shards." % self.__class__.__name__
+            )
+
+        shards_path = join(self.dataset.joern_dir, SHARDS_DIR)
+
+        try:
+            shard_paths = self.create_shards(shards_path, shards)
+            self.run_shards(shard_paths, command_args, container_config)
+            self.merge_shards(shard_paths)
+        finally:
+            rmtree(shards_path, ignore_errors=True)
+
+        self.send_commands()
+
     def configure_container(self):
         """Setup the properties of the container"""
-        self.volumes = {self.dataset.path: "/code"}
+        code_path = self.dataset.path if self.shard_path is None else self.shard_path
+        self.volumes = {code_path: CODE_DIR}
         self.detach = False
 
+    def get_shards(self, shards, test_cases=None):
+        """Split the test cases into shards of similar size. Test cases are sorted by
+        decreasing size and added to the smallest shard.
+
+        Args:
+            shards (int): Number of shards.
+            test_cases (iterable|None): Test cases to split, every test case of the
+                dataset if None.
+
+        Returns:
+            list: Sorted test cases of each non-empty shard.
+        """
+        test_case_sizes = sorted(
+            (
+                (
+                    sum(
+                        getsize(join(self.dataset.path, test_case, filename))
+                        for filename in self.dataset.test_case_files[test_case]
+                    ),
+                    test_case,
+                )
+                for test_case in (
+                    self.dataset.test_cases if test_cases is None else test_cases
+                )
+            ),
+            key=lambda test_case_size: (-test_case_size[0], test_case_size[1]),
+        )
+
+        shard_sizes = [(0, shard_index) for shard_index in range(shards)]
+        shard_test_cases = [[] for _ in range(shards)]
+
+        for test_case_size, test_case in test_case_sizes:
+            shard_size, shard_index = heapq.heappop(shard_sizes)
+            shard_test_cases[shard_index].append(test_case)
+            heapq.heappush(shard_sizes, (shard_size + test_case_size, shard_index))
+
+        return [sorted(test_cases) for test_cases in shard_test_cases if test_cases]
+
+    def create_shards(self, shards_path, shards, test_cases=None):
+        """Create a directory for each shard, sharing the files of its test cases
+        with the dataset.
+
+        Args:
+            shards_path (str): Directory containing the shards.
+            shards (int): Number of shards.
+            test_cases (iterable|None): Test cases to split, every test case of the
+                dataset if None.
+
+        Returns:
+            list: Paths of the shards.
+        """
+        if exists(shards_path):
+            rmtree(shards_path)
+
+        shard_paths = []
+        test_case_count = 0
+
+        for shard_index, shard_test_cases in enumerate(
+            self.get_shards(shards, test_cases)
+        ):
+            shard_path = join(shards_path, "%d" % shard_index)
+
+            for test_case in shard_test_cases:
+                copytree(
+                    join(self.dataset.path, test_case),
+                    join(shard_path, test_case),
+                    copy_function=link_file,
+                )
+
+            shard_paths.append(shard_path)
+            test_case_count += len(shard_test_cases)
+
+        LOGGER.debug(
+            "%d test cases split in %d shards.",
+            test_case_count,
+            len(shard_paths),
+        )
+
+        return shard_paths
+
+    def parse_shard(self, shard_path, command_args=None, container_config=None):
+        """Parse a single shard with its own container.
+
+        Args:
+            shard_path (str): Path of the shard.
+            command_args: Arguments of the container command.
+            container_config: Manual configuration of the container.
+        """
+        shard_processing = self.__class__(self.dataset)
+        shard_processing.shard_path = shard_path
+        shard_processing.mem_limit = settings.JOERN_SHARD_MEMORY
+        shard_processing.execute(command_args, container_config)
+
+    def run_shards(self, shard_paths, command_args=None, container_config=None):
+        """Parse the shards concurrently. The number of containers running at the
+        same time is limited by `POOL_SIZE` and by the memory budget of Joern.
+
+        Args:
+            shard_paths (list): Paths of the shards.
+            command_args: Arguments of the container command.
+            container_config: Manual configuration of the container.
+        """
+        max_workers = max(
+            1,
+            min(
+                len(shard_paths),
+                settings.POOL_SIZE,
+                settings.JOERN_MEMORY_BUDGET // settings.JOERN_SHARD_MEMORY,
+            ),
+        )
+
+        LOGGER.debug(
+            "Parsing %d shards with %d containers...", len(shard_paths), max_workers
+        )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Results are retrieved to raise the exceptions of the containers.
+            list(
+                executor.map(
+                    lambda shard_path: self.parse_shard(
+                        shard_path, command_args, container_config
+                    ),
+                    shard_paths,
+                )
+            )
+
+    def merge_shards(self, shard_paths):
+        """Merge the databases of the shards into the Joern database of the dataset.
+        Must be implemented by the subclasses supporting shards.
+
+        Args:
+            shard_paths (list): Paths of the shards.
+        """
+        raise NotImplementedError(
+            "%s does not support parsing in shards." % self.__class__.__name__
+        )
+
+    def update_database(self, command_args=None, container_config=None, shards=1):
+        """Parse the test cases changed since the last run and splice them into the
+        Joern database of the dataset. Must be implemented by the subclasses
+        supporting incremental parsing.
+
+        Args:
+            command_args: Arguments of the container command.
+            container_config: Manual configuration of the container.
+            shards (int): Number of shards the changed test cases are split into.
+        """
+        raise NotImplementedError(
+            "%s does not support incremental parsing." % self.__class__.__name__
+        )
+
     @abstractmethod
     def send_commands(self):
         """Send the commands. Must be implemented by subclasses."""
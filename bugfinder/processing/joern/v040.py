@@ -1,15 +1,50 @@
 """ Processing module for Joern v0.4.0
 """
-from os import makedirs, walk
-from os.path import join, exists, splitext
+import json
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from os import makedirs, replace, walk
+from os.path import join, exists, getsize, relpath, splitext
 
-from bugfinder.processing.joern import AbstractJoernProcessing
-from bugfinder.settings import LOGGER
+from shutil import rmtree
+
+from bugfinder.processing.joern import AbstractJoernProcessing, SHARDS_DIR
+from bugfinder.settings import DATASET_DIRS, LOGGER, POOL_SIZE
+from bugfinder.utils.dirs import get_file_hash, get_signature
+
+IMPORT_FILES = ["nodes", "edges"]
+""" list: Types of the CSV files merged into the import files.
+"""
+
+KEY_COLUMNS = {"nodes": ["key"], "edges": ["start", "end"]}
+""" dict: Columns containing node ids, for each type of CSV file.
+"""
+
+IMPORT_BUFFER_SIZE = 2**20
+""" int: Size (in bytes) of the write buffer of each import file.
+"""
+
+IMPORT_QUEUE_SIZE = 2**27
+""" int: Maximum size (in bytes) of the CSV files read ahead of the import files.
+"""
+
+PARSE_STATE_FILE = "parsed.json"
+""" str: Name of the file of the Joern database recording the parsed test cases.
+"""
+
+PARSE_STATE_VERSION = 1
+""" int: Version of the parse state format. Databases with a different version are
+parsed again.
+"""
 
 
 class JoernProcessing(AbstractJoernProcessing):
     """Processing class for Joern v0.4.0"""
 
+    supports_shards = True
+    supports_incremental = True
+
     def configure_container(self):
         """Set up the container properties"""
         super().configure_container()
@@ -17,13 +52,558 @@ class JoernProcessing(AbstractJoernProcessing):
         self.image_name = "joern-lite:0.4.0"
         self.container_name = "joern040"
 
+    @staticmethod
+    def filter_csv_file(filepath, skip_first_row=False):
+        """Read a CSV file generated by Joern and filter its rows. Directory rows are
+        ignored, Statement rows are reported as parsing errors.
+
+        Args:
+            filepath (str): Path of the CSV file.
+            skip_first_row (bool): Ignore the first row following the header.
+
+        Returns:
+            tuple: Header, list of kept rows, number of ignored Directory rows and
+                number of Statement rows.
+        """
+        rows = []
+        directory_count = 0
+        statement_count = 0
+
+        with open(filepath, "r", encoding="utf-8") as csv_file:
+            header = csv_file.readline()
+
+            if skip_first_row:
+                csv_file.readline()
+
+            for line in csv_file:
+                if "\tDirectory\t" in line:
+                    directory_count += 1
+                    LOGGER.debug("Ignoring '%s'", line[:-1].replace("\t", " ").strip())
+                    continue
+
+                if "\tStatement\t" in line:
+                    statement_count += 1
+                    LOGGER.warning(
+                        "Parsing error in '%s'", line[:-1].replace("\t", " ").strip()
+                    )
+
+                rows.append(line)
+
+        return header, rows, directory_count, statement_count
+
+    def iter_csv_files(self, csv_files):
+        """Read and filter CSV files generated by Joern in parallel, in the order of
+        the files. A bounded number and size of files are read ahead.
+
+        Args:
+            csv_files (list): Path of each CSV file, and whether the first row
+                following its header is ignored.
+
+        Returns:
+            iterator: Result of `filter_csv_file` for each file.
+        """
+        pending_files = deque()
+        pending_size = 0
+
+        with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+            for filepath, skip_first_row in csv_files:
+                file_size = getsize(filepath)
+                pending_files.append(
+                    (
+                        file_size,
+                        executor.submit(self.filter_csv_file, filepath, skip_first_row),
+                    )
+                )
+                pending_size += file_size
+
+                while (
+                    len(pending_files) >= 2 * POOL_SIZE
+                    or pending_size >= IMPORT_QUEUE_SIZE
+                ):
+                    file_size, future = pending_files.popleft()
+                    pending_size -= file_size
+                    yield future.result()
+
+            while len(pending_files) != 0:
+                _, future = pending_files.popleft()
+                yield future.result()
+
+    @staticmethod
+    def get_import_header(filetype, header):
+        """Convert the header of a Joern CSV file to the Neo4J import format.
+
+        Args:
+            filetype (str): Type of the CSV file, either "nodes" or "edges".
+            header (str): Header of the file.
+
+        Returns:
+            str: Converted header.
+        """
+        if filetype == "nodes":
+            header = header.replace("key", ":ID")
+        elif filetype == "edges":
+            header = header.replace("start", ":START_ID")
+            header = header.replace("end", ":END_ID")
+            header = header.replace("type", ":TYPE")
+
+        return header
+
+    @staticmethod
+    def offset_csv_file(in_filepath, out_filepath, filetype, key_offset):
+        """Copy a CSV file generated by Joern, shifting its node ids.
+
+        Args:
+            in_filepath (str): Path of the CSV file.
+            out_filepath (str): Path of the shifted CSV file.
+            filetype (str): Type of the CSV file, either "nodes" or "edges".
+            key_offset (int): Offset added to the node ids.
+
+        Returns:
+            int: Largest shifted node id of the file, -1 if the file has no row.
+        """
+        max_key = -1
+
+        with open(in_filepath, "r", encoding="utf-8") as in_file, open(
+            out_filepath, "w", encoding="utf-8", buffering=IMPORT_BUFFER_SIZE
+        ) as out_file:
+            header = in_file.readline()
+            out_file.write(header)
+            columns = header.rstrip("\n").split("\t")
+            key_indexes = [
+                columns.index(column)
+                for column in KEY_COLUMNS[filetype]
+                if column in columns
+            ]
+
+            for line in in_file:
+                row = line.rstrip("\n").split("\t")
+
+                for key_index in key_indexes:
+                    key = int(row[key_index]) + key_offset
+                    row[key_index] = str(key)
+                    max_key = max(max_key, key)
+
+                out_file.write("\t".join(row) + "\n")
+
+        return max_key
+
+    def copy_shard_csv_files(self, shard_path, key_offset):
+        """Copy the CSV files of a parsed shard into the Joern database of the
+        dataset, shifting its node ids.
+
+        Args:
+            shard_path (str): Path of the shard.
+            key_offset (int): Offset added to the node ids of the shard.
+
+        Returns:
+            int: First node id available after the shard.
+        """
+        code_path = join(self.dataset.joern_dir, "code")
+        shard_code_path = join(shard_path, DATASET_DIRS["joern"], "code")
+        max_key = key_offset - 1
+
+        for dirname, subdirs, filelist in walk(shard_code_path):
+            subdirs.sort()
+
+            for filename in sorted(filelist):
+                (filetype, fileext) = splitext(filename)
+
+                if fileext != ".csv" or filetype not in IMPORT_FILES:
+                    continue
+
+                out_dirname = join(code_path, relpath(dirname, shard_code_path))
+                makedirs(out_dirname, exist_ok=True)
+
+                max_key = max(
+                    max_key,
+                    self.offset_csv_file(
+                        join(dirname, filename),
+                        join(out_dirname, filename),
+                        filetype,
+                        key_offset,
+                    ),
+                )
+
+        return max_key + 1
+
+    def merge_shards(self, shard_paths):
+        """Merge the CSV files of the shards into the Joern database of the dataset.
+        Node ids of each shard are shifted after the ids of the previous shards, to
+        keep them unique.
+
+        Args:
+            shard_paths (list): Paths of the shards.
+        """
+        code_path = join(self.dataset.joern_dir, "code")
+
+        # Every test case has been parsed, previous CSV files are replaced.
+        if exists(code_path):
+            rmtree(code_path)
+
+        key_offset = 0
+
+        for shard_path in shard_paths:
+            key_offset = self.copy_shard_csv_files(shard_path, key_offset)
+
+        LOGGER.debug(
+            "%d shards merged, %d node ids used.", len(shard_paths), key_offset
+        )
+
+    @staticmethod
+    def get_key_range(filepath):
+        """Retrieve the smallest and largest node ids of a nodes CSV file.
+
+        Args:
+            filepath (str): Path of the CSV file.
+
+        Returns:
+            list|None: Smallest and largest node ids, None if the file has no row.
+        """
+        keys = []
+
+        with open(filepath, "r", encoding="utf-8") as csv_file:
+            key_index = csv_file.readline().rstrip("\n").split("\t").index("key")
+
+            for line in csv_file:
+                keys.append(int(line.rstrip("\n").split("\t")[key_index]))
+
+        if len(keys) == 0:
+            return None
+
+        return [min(keys), max(keys)]
+
+    def get_test_case_state(self, test_case, test_case_state=None):
+        """Record the content of the files of a test case, and the node ids of its
+        CSV files.
+
+        Args:
+            test_case (str): Test case, relative to the dataset.
+            test_case_state (dict|None): Previous state of the test case. Hashes of
+                the files whose signature did not change are reused.
+
+        Returns:
+            dict: Signature and hash of each file, and node id ranges of the test
+                case.
+        """
+        previous_files = {} if test_case_state is None else test_case_state["files"]
+        files = {}
+
+        for filename in sorted(self.dataset.test_case_files.get(test_case, [])):
+            filepath = join(self.dataset.path, test_case, filename)
+            signature = get_signature(filepath)
+            previous_file = previous_files.get(filename)
+
+            if (
+                signature is not None
+                and previous_file is not None
+                and previous_file[0] == signature
+            ):
+                files[filename] = previous_file
+            else:
+                files[filename] = [signature, get_file_hash(filepath)]
+
+        key_ranges = []
+
+        for dirname, _, filelist in walk(
+            join(self.dataset.joern_dir, "code", test_case)
+        ):
+            if "nodes.csv" in filelist:
+                key_range = self.get_key_range(join(dirname, "nodes.csv"))
+
+                if key_range is not None:
+                    key_ranges.append(key_range)
+
+        return {"files": files, "keys": sorted(key_ranges)}
+
+    def load_parse_state(self):
+        """Load the test cases recorded by the last run.
+
+        Returns:
+            dict|None: Parse state of the Joern database, None if it does not exist or
+                cannot be used.
+        """
+        parse_state_filepath = join(self.dataset.joern_dir, PARSE_STATE_FILE)
+
+        if not exists(parse_state_filepath):
+            return None
+
+        try:
+            with open(parse_state_filepath, "r", encoding="utf-8") as parse_state_fp:
+                parse_state = json.load(parse_state_fp)
+        except (OSError, ValueError) as exc:
+            LOGGER.debug("Parse state could not be read: %s.", str(exc))
+            return None
+
+        if parse_state.get("version") != PARSE_STATE_VERSION:
+            LOGGER.debug("Parse state version is outdated. Ignoring state...")
+            return None
+
+        return parse_state
+
+    def save_parse_state(self, parse_state):
+        """Save the test cases recorded by the current run.
+
+        Args:
+            parse_state (dict): Parse state of the Joern database.
+        """
+        parse_state_filepath = join(self.dataset.joern_dir, PARSE_STATE_FILE)
+        tmp_parse_state_filepath = "%s.tmp" % parse_state_filepath
+
+        with open(tmp_parse_state_filepath, "w", encoding="utf-8") as parse_state_fp:
+            json.dump(parse_state, parse_state_fp)
+
+        replace(tmp_parse_state_filepath, parse_state_filepath)
+
+    def build_parse_state(self):
+        """Record every test case of the dataset, after the whole dataset has been
+        parsed.
+
+        Returns:
+            dict: Parse state of the Joern database.
+        """
+        with ThreadPoolExecutor(max_workers=POOL_SIZE) as executor:
+            test_cases = sorted(self.dataset.test_cases)
+            test_case_states = dict(
+                zip(test_cases, executor.map(self.get_test_case_state, test_cases))
+            )
+
+        return {
+            "version": PARSE_STATE_VERSION,
+            "next_key": max(
+                [
+                    key_range[1] + 1
+                    for test_case_state in test_case_states.values()
+                    for key_range in test_case_state["keys"]
+                ],
+                default=0,
+            ),
+            "test_cases": test_case_states,
+        }
+
+    def get_changed_test_cases(self, parse_state):
+        """Compare the test cases of the dataset with the ones recorded by the last
+        run. Test cases with an added, removed or modified file are changed.
+
+        Args:
+            parse_state (dict): Parse state of the Joern database. The state of the
+                unchanged test cases is updated.
+
+        Returns:
+            tuple: Changed test cases of the dataset and removed test cases.
+        """
+        changed_test_cases = set()
+
+        for test_case in sorted(self.dataset.test_cases):
+            test_case_state = parse_state["test_cases"].get(test_case)
+
+            if test_case_state is None:
+                changed_test_cases.add(test_case)
+                continue
+
+            current_state = self.get_test_case_state(test_case, test_case_state)
+
+            if {
+                filename: file_state[1]
+                for filename, file_state in current_state["files"].items()
+            } != {
+                filename: file_state[1]
+                for filename, file_state in test_case_state["files"].items()
+            }:
+                changed_test_cases.add(test_case)
+            else:
+                # Signatures are updated to avoid hashing the files again.
+                test_case_state["files"] = current_state["files"]
+
+        removed_test_cases = set(parse_state["test_cases"].keys()) - set(
+            self.dataset.test_cases
+        )
+
+        return changed_test_cases, removed_test_cases
+
+    def splice_import_files(self, stale_key_ranges, test_cases):
+        """Remove the rows of the stale node ids from the import files, and append the
+        CSV files of the parsed test cases.
+
+        Args:
+            stale_key_ranges (list): Ranges of node ids to remove.
+            test_cases (iterable): Test cases whose CSV files are appended.
+
+        Returns:
+            tuple: Number of removed rows, number of ignored Directory rows and
+                number of Statement rows.
+        """
+        out_path = join(self.dataset.joern_dir, "import")
+        stale_key_ranges = sorted(stale_key_ranges)
+        stale_key_starts = [key_range[0] for key_range in stale_key_ranges]
+
+        def is_stale(key):
+            range_index = bisect_right(stale_key_starts, key) - 1
+            return range_index >= 0 and key <= stale_key_ranges[range_index][1]
+
+        csv_files = {filetype: [] for filetype in IMPORT_FILES}
+
+        for test_case in sorted(test_cases):
+            for dirname, subdirs, filelist in walk(
+                join(self.dataset.joern_dir, "code", test_case)
+            ):
+                subdirs.sort()
+
+                for filename in sorted(filelist):
+                    (filetype, fileext) = splitext(filename)
+
+                    if fileext == ".csv" and filetype in IMPORT_FILES:
+                        csv_files[filetype].append(join(dirname, filename))
+
+        removed_count = 0
+        directory_count = 0
+        statement_count = 0
+
+        for filetype in IMPORT_FILES:
+            import_filepath = join(out_path, "%s.csv" % filetype)
+            tmp_import_filepath = "%s.tmp" % import_filepath
+
+            with open(import_filepath, "r", encoding="utf-8") as in_file, open(
+                tmp_import_filepath, "w", encoding="utf-8", buffering=IMPORT_BUFFER_SIZE
+            ) as out_file:
+                header = in_file.readline()
+                out_file.write(header)
+                columns = header.rstrip("\n").split("\t")
+                key_indexes = [
+                    columns.index(self.get_import_header(filetype, column))
+                    for column in KEY_COLUMNS[filetype]
+                ]
+
+                for line in in_file:
+                    row = line.rstrip("\n").split("\t")
+
+                    if any(is_stale(int(row[key_index])) for key_index in key_indexes):
+                        removed_count += 1
+                        continue
+
+                    out_file.write(line)
+
+                for _, rows, dir_count, stmt_count in self.iter_csv_files(
+                    [(filepath, False) for filepath in csv_files[filetype]]
+                ):
+                    out_file.writelines(rows)
+                    directory_count += dir_count
+                    statement_count += stmt_count
+
+            replace(tmp_import_filepath, import_filepath)
+
+        return removed_count, directory_count, statement_count
+
+    def update_database(self, command_args=None, container_config=None, shards=1):
+        """Parse the test cases changed since the last run, in shards, and splice
+        their CSV files into the Joern database. The whole dataset is parsed if the
+        database has not been built by a previous run.
+
+        Args:
+            command_args: Arguments of the container command.
+            container_config: Manual configuration of the container.
+            shards (int): Number of shards the changed test cases are split into.
+        """
+        parse_state = self.load_parse_state()
+        import_filepaths = [
+            join(self.dataset.joern_dir, "import", "%s.csv" % filetype)
+            for filetype in IMPORT_FILES
+        ]
+
+        if parse_state is None or not all(
+            exists(import_filepath) for import_filepath in import_filepaths
+        ):
+            LOGGER.info("No previous Joern run found. Parsing the whole dataset...")
+            parse_state = {
+                "version": PARSE_STATE_VERSION,
+                "next_key": 0,
+                "test_cases": {},
+            }
+            is_spliced = False
+
+            rmtree(join(self.dataset.joern_dir, "code"), ignore_errors=True)
+        else:
+            is_spliced = True
+
+        changed_test_cases, removed_test_cases = self.get_changed_test_cases(
+            parse_state
+        )
+        self.processing_stats["test_cases_parsed"] = len(changed_test_cases)
+        self.processing_stats["test_cases_removed"] = len(removed_test_cases)
+
+        if len(changed_test_cases) == 0 and len(removed_test_cases) == 0:
+            LOGGER.info("Joern V0.4.0 database is up-to-date.")
+            return
+
+        LOGGER.debug(
+            "Parsing %d changed test cases, removing %d test cases...",
+            len(changed_test_cases),
+            len(removed_test_cases),
+        )
+
+        shards_path = join(self.dataset.joern_dir, SHARDS_DIR)
+        stale_key_ranges = []
+
+        try:
+            shard_paths = self.create_shards(shards_path, shards, changed_test_cases)
+            self.run_shards(shard_paths, command_args, container_config)
+
+            for test_case in changed_test_cases | removed_test_cases:
+                test_case_state = parse_state["test_cases"].pop(test_case, None)
+
+                if test_case_state is not None:
+                    stale_key_ranges += test_case_state["keys"]
+
+                rmtree(
+                    join(self.dataset.joern_dir, "code", test_case), ignore_errors=True
+                )
+
+            # Node ids of the parsed test cases follow the ids of the previous runs.
+            for shard_path in shard_paths:
+                parse_state["next_key"] = self.copy_shard_csv_files(
+                    shard_path, parse_state["next_key"]
+                )
+        finally:
+            rmtree(shards_path, ignore_errors=True)
+
+        for test_case in changed_test_cases:
+            parse_state["test_cases"][test_case] = self.get_test_case_state(test_case)
+
+        if is_spliced:
+            (
+                removed_count,
+                self.processing_stats["directories_ignored"],
+                self.processing_stats["parsing_errors"],
+            ) = self.splice_import_files(stale_key_ranges, changed_test_cases)
+
+            LOGGER.info(
+                "Joern V0.4.0 incremental processing done: %d test cases parsed, %d "
+                "test cases removed, %d stale rows removed.",
+                len(changed_test_cases),
+                len(removed_test_cases),
+                removed_count,
+            )
+        else:
+            self.merge_import_files()
+
+        self.save_parse_state(parse_state)
+
     def send_commands(self):
-        """Send commands"""
-        LOGGER.debug("Extracting Joern V0.4.0 DB...")
+        """Send commands. The CSV files are merged into the import files, and the
+        parsed test cases are recorded for later incremental runs.
+        """
+        # CSV files of the shards are merged once every shard is parsed.
+        if self.shard_path is not None:
+            return
 
-        content = {"edges": [], "nodes": []}
+        self.merge_import_files()
+        self.save_parse_state(self.build_parse_state())
 
-        warn_count = 0
+    def merge_import_files(self):
+        """Merge the CSV files into the import files. The CSV files of every source
+        file are read in parallel and streamed to the import files, a bounded number
+        and size of files being kept in memory.
+        """
+        LOGGER.debug("Extracting Joern V0.4.0 DB...")
 
         in_path = join(self.dataset.joern_dir, "code")
         out_path = join(self.dataset.joern_dir, "import")
@@ -32,49 +612,70 @@ class JoernProcessing(AbstractJoernProcessing):
         if not exists(out_path):
             makedirs(out_path)
 
-        for dirname, _, filelist in walk(in_path):
-            for filename in filelist:
-                (filetype, fileext) = splitext(filename)
+        csv_files = []
 
-                if fileext != ".csv":  # Only parse CSV files
-                    continue
+        # Directories and files are sorted to merge the CSV files in a stable order.
+        for dirname, subdirs, filelist in walk(in_path):
+            subdirs.sort()
 
-                filepath = join(dirname, filename)
+            for filename in sorted(filelist):
+                (filetype, fileext) = splitext(filename)
 
-                with open(filepath, "r", encoding="utf-8") as csv_file:
-                    if len(content[filetype]) == 0:
-                        headers = csv_file.readline()
+                if fileext != ".csv" or filetype not in IMPORT_FILES:
+                    continue  # Only parse nodes and edges CSV files
 
-                        if filetype == "nodes":
-                            headers = headers.replace("key", ":ID")
-                        elif filetype == "edges":
-                            headers = headers.replace("start", ":START_ID")
-                            headers = headers.replace("end", ":END_ID")
-                            headers = headers.replace("type", ":TYPE")
+                csv_files.append((filetype, join(dirname, filename)))
 
-                        content[filetype].append(headers)
+        # The row following the header of the first file is not imported.
+        first_files = {
+            filetype: next(
+                (filepath for csv_type, filepath in csv_files if csv_type == filetype),
+                None,
+            )
+            for filetype in IMPORT_FILES
+        }
+        out_files = {}
+        directory_count = 0
+        statement_count = 0
 
-                    for line in csv_file.readlines()[1:]:
-                        if "\tDirectory\t" in line:
-                            LOGGER.debug(
-                                "Ignoring '%s'", line[:-1].replace("\t", " ").strip()
-                            )
-                            continue
+        try:
+            for filetype in IMPORT_FILES:
+                out_files[filetype] = open(
+                    join(out_path, "%s.csv" % filetype),
+                    "w",
+                    encoding="utf-8",
+                    buffering=IMPORT_BUFFER_SIZE,
+                )
 
-                        if "\tStatement\t" in line:
-                            warn_count += 1
-                            LOGGER.warning(
-                                "Parsing error in '%s'",
-                                line[:-1].replace("\t", " ").strip(),
-                            )
+            csv_results = self.iter_csv_files(
+                [
+                    (filepath, filepath == first_files[filetype])
+                    for filetype, filepath in csv_files
+                ]
+            )
 
-                        content[filetype].append(line)
+            # Files are written in order, as soon as they are read.
+            for (filetype, filepath), (header, rows, dir_count, stmt_count) in zip(
+                csv_files, csv_results
+            ):
+                if filepath == first_files[filetype]:
+                    out_files[filetype].write(self.get_import_header(filetype, header))
 
-        with open(join(out_path, "nodes.csv"), "w", encoding="utf-8") as nodes_file:
-            nodes_file.writelines(content["nodes"])
+                out_files[filetype].writelines(rows)
+                directory_count += dir_count
+                statement_count += stmt_count
+        finally:
+            for out_file in out_files.values():
+                out_file.close()
 
-        with open(join(out_path, "edges.csv"), "w", encoding="utf-8") as nodes_file:
-            nodes_file.writelines(content["edges"])
+        self.processing_stats["directories_ignored"] = directory_count
+        self.processing_stats["parsing_errors"] = statement_count
 
-        LOGGER.info("Joern V0.4.0 processing done.")
+        LOGGER.info(
+            "Joern V0.4.0 processing done: %d CSV files merged, %d directories "
+            "ignored, %d parsing errors.",
+            len(csv_files),
+            directory_count,
+            statement_count,
+        )
         LOGGER.debug("Stopping '%s'...", self.container_name)
@@ -1,17 +1,163 @@
 """ Module containing all Neo4J processing classes.
 """
 from abc import abstractmethod
+from os import getpid
+from threading import Lock
+
 from py2neo import Graph
 
 from bugfinder import settings
+from bugfinder.base.processing import DatasetArtifact
 from bugfinder.base.processing.containers import AbstractContainerProcessing
 from bugfinder.processing.dataset.fix_rights import RightFixer
 from bugfinder.utils.containers import wait_log_display
+from bugfinder.utils.statistics import get_time
+
+NEO4J_HOST = "0.0.0.0"
+""" str: Host of the Neo4J containers.
+"""
+
+BOLT_PORT = "7687"
+""" str: Container port of the Bolt interface of Neo4J.
+"""
+
+_graphs = {}
+""" dict: Bolt clients of the current process, indexed by process id, host and port.
+"""
+
+_graphs_lock = Lock()
+
+
+def get_graph(port, host=NEO4J_HOST):
+    """Retrieve the Bolt client of a Neo4J database. A single client is created per
+    process and database, and its connection pool is shared by every task of the
+    process. Clients inherited from a parent process are never reused.
+
+    Args:
+        port (str|int): Machine port of the Bolt interface.
+        host (str): Host of the database.
+
+    Returns:
+        Graph: Client of the database.
+    """
+    graph_key = (getpid(), host, str(port))
+
+    with _graphs_lock:
+        graph = _graphs.get(graph_key)
+
+        if graph is None:
+            graph = Graph(
+                scheme="bolt",
+                host=host,
+                port=int(port),
+                max_size=settings.NEO4J_CONNECTIONS,
+            )
+            _graphs[graph_key] = graph
+
+    return graph
+
+
+def close_graph(port, host=NEO4J_HOST):
+    """Close the connections of the Bolt client of a Neo4J database, for the current
+    process.
+
+    Args:
+        port (str|int): Machine port of the Bolt interface.
+        host (str): Host of the database.
+    """
+    with _graphs_lock:
+        graph = _graphs.pop((getpid(), host, str(port)), None)
+
+    if graph is not None:
+        graph.service.connector.close()
+
+
+class ProfiledGraph:
+    """Wrapper around a Neo4J graph counting the Cypher queries sent to the database
+    and their latency. Other attributes are delegated to the graph.
+    """
+
+    def __init__(self, graph, query_stats):
+        """Class instantiation method
+
+        Args:
+            graph (Graph): Graph to wrap.
+            query_stats (dict): Dictionary updated with the number of queries
+                (`cypher_queries`) and their total latency in ms (`cypher_time`).
+                Executions and latency of the registered queries are recorded
+                under `cypher_templates`.
+        """
+        self.graph = graph
+        self.query_stats = query_stats
+        self.query_stats.setdefault("cypher_queries", 0)
+        self.query_stats.setdefault("cypher_time", 0)
+        self.query_stats.setdefault("cypher_templates", {})
+        self._lock = Lock()
+
+    def run(self, *args, **kwargs):
+        """Run a Cypher query, see `py2neo.Graph.run`."""
+        query_start_time = get_time()
+
+        try:
+            return self.graph.run(*args, **kwargs)
+        finally:
+            query_time = get_time() - query_start_time
+
+            with self._lock:
+                self.query_stats["cypher_queries"] += 1
+                self.query_stats["cypher_time"] += query_time
+
+    def run_query(self, query, parameters):
+        """Run a registered query with bound parameters, see `CypherQuery.run`.
+
+        Args:
+            query (CypherQuery): Query to run.
+            parameters (dict): Values bound to the parameters of the query.
+
+        Returns:
+            Cursor: Results of the query.
+        """
+        query_start_time = get_time()
+
+        try:
+            return self.run(query.template, parameters)
+        finally:
+            query_time = get_time() - query_start_time
+
+            with self._lock:
+                template_stats = self.query_stats["cypher_templates"].setdefault(
+                    query.name, {"queries": 0, "time": 0}
+                )
+                template_stats["queries"] += 1
+                template_stats["time"] += query_time
+
+    def merge_query_stats(self, query_stats):
+        """Add the queries recorded by another graph, e.g. in a worker process.
+
+        Args:
+            query_stats (dict): Query statistics of the other graph.
+        """
+        with self._lock:
+            self.query_stats["cypher_queries"] += query_stats.get("cypher_queries", 0)
+            self.query_stats["cypher_time"] += query_stats.get("cypher_time", 0)
+
+            for name, stats in query_stats.get("cypher_templates", {}).items():
+                template_stats = self.query_stats["cypher_templates"].setdefault(
+                    name, {"queries": 0, "time": 0}
+                )
+                template_stats["queries"] += stats["queries"]
+                template_stats["time"] += stats["time"]
+
+    def __getattr__(self, name):
+        return getattr(self.graph, name)
 
 
 class Neo4J3Processing(AbstractContainerProcessing):
     """Data processing calss for Neo4J v3.x"""
 
+    reads = {DatasetArtifact.NEO4J}
+    writes = {DatasetArtifact.NEO4J}
+
     environment = {}
     start_string = "Remote interface available"
     neo4j_db = None
@@ -28,11 +174,33 @@ class Neo4J3Processing(AbstractContainerProcessing):
             "NEO4J_dbms_transaction_timeout": settings.NEO4J_DEFAULT_TIMEOUT,
             "NEO4J_AUTH": "none",
         }
-        self.container_ports = ["7474", "7687", "7473"]
+        self.container_ports = ["7474", BOLT_PORT, "7473"]
         self.volumes = {
             self.dataset.neo4j_dir: "/data/databases/graph.db",
         }
 
+    def execute(self, command_args=None, container_config=None):
+        """Execute the processing. The connections to the database are closed once
+        the container is stopped.
+
+        Args:
+            command_args: Arguments of the container command.
+            container_config: Manual configuration of the container.
+        """
+        try:
+            super().execute(command_args, container_config)
+        finally:
+            if self.machine_ports is not None:
+                close_graph(self.get_bolt_port())
+
+    def get_bolt_port(self):
+        """Retrieve the machine port of the Bolt interface of the container.
+
+        Returns:
+            str: Machine port of the Bolt interface.
+        """
+        return self.machine_ports[self.container_ports.index(BOLT_PORT)]
+
     def fix_data_folder_rights(self):
         """Fix rights to ensure the neo4j folder can be read."""
         current_ops_queue = self.dataset.ops_queue
@@ -51,8 +219,6 @@ class Neo4J3Processing(AbstractContainerProcessing):
         """Send commands to the container."""
         wait_log_display(self.container, self.start_string)
 
-        self.neo4j_db = Graph(
-            scheme="http",
-            host="0.0.0.0",
-            port=self.machine_ports[self.container_ports.index("7474")],
+        self.neo4j_db = ProfiledGraph(
+            get_graph(self.get_bolt_port()), self.resource_stats
         )
@@ -3,6 +3,7 @@
 from os import makedirs, walk, remove
 from os.path import join, splitext
 
+from bugfinder.base.processing import DatasetArtifact
 from bugfinder.base.processing.containers import AbstractContainerProcessing
 from bugfinder.processing.neo4j import Neo4J3Processing
 from bugfinder.settings import LOGGER
@@ -13,6 +14,9 @@ from bugfinder.utils.dirs import copy_dir
 class Neo4J2Converter(AbstractContainerProcessing):
     """Converter to Neo4J version 2.x"""
 
+    reads = {DatasetArtifact.JOERN}
+    writes = {DatasetArtifact.NEO4J}
+
     START_STRING = "Remote interface ready"
 
     def configure_container(self):
@@ -2,6 +2,7 @@
 """
 from os.path import join
 
+from bugfinder.base.processing import DatasetArtifact
 from bugfinder.processing.neo4j import Neo4J3Processing
 from bugfinder.settings import LOGGER
 
@@ -9,6 +10,9 @@ from bugfinder.settings import LOGGER
 class Neo4J3Importer(Neo4J3Processing):
     """Importer class to Neo4J v3.x"""
 
+    reads = {DatasetArtifact.JOERN}
+    writes = {DatasetArtifact.NEO4J}
+
     db_name = "import.db"
     import_dir = "/var/lib/neo4j/import"
 
@@ -0,0 +1,68 @@
+""" Registry of the parameterized Cypher queries sent to Neo4J.
+"""
+from bugfinder.processing.neo4j import ProfiledGraph
+
+QUERY_REGISTRY = {}
+""" dict: Registered query templates, indexed by name.
+"""
+
+
+class CypherQuery:
+    """Cypher query template, run with bound parameters. Since the template never
+    contains any value, the execution plan cached by Neo4J is reused by every run of
+    the query.
+    """
+
+    def __init__(self, name, template):
+        """Class instantiation method
+
+        Args:
+            name (str): Unique name of the query.
+            template (str): Cypher query, with `$parameter` placeholders.
+        """
+        self.name = name
+        self.template = template
+
+    def run(self, graph, **parameters):
+        """Run the query. Executions and latency are recorded per template when the
+        graph is profiled.
+
+        Args:
+            graph (Graph|ProfiledGraph): Graph to run the query on.
+            **parameters: Values bound to the parameters of the template.
+
+        Returns:
+            Cursor: Results of the query.
+        """
+        if isinstance(graph, ProfiledGraph):
+            return graph.run_query(self, parameters)
+
+        return graph.run(self.template, parameters)
+
+    def __repr__(self):
+        return "%s(%r)" % (self.__class__.__name__, self.name)
+
+
+def register_query(name, template):
+    """Define a query template. Each template is registered once, when its module is
+    imported.
+
+    Args:
+        name (str): Unique name of the query.
+        template (str): Cypher query, with `$parameter` placeholders.
+
+    Returns:
+        CypherQuery: Registered query.
+    """
+    query = QUERY_REGISTRY.get(name)
+
+    if query is not None:
+        if query.template != template:
+            raise ValueError("Query '%s' is already registered." % name)
+
+        return query
+
+    query = CypherQuery(name, template)
+    QUERY_REGISTRY[name] = query
+
+    return query
@@ -0,0 +1,124 @@
+""" Processing chaining several source code transformations in a single pass.
+"""
+from importlib import import_module
+from shutil import move
+from time import perf_counter
+
+from bugfinder.base.dataset import DatasetQueueRetCode
+from bugfinder.processing import AbstractCppFileProcessing
+from bugfinder.settings import LOGGER
+
+
+class SourceTransformPipeline(AbstractCppFileProcessing):
+    """Processing applying the transformations of several cleaning and tokenizing
+    processing to the dataset. Each file is read and written once, the
+    transformations being chained in memory. A summary entry is recorded for every
+    step of the pipeline.
+    """
+
+    deduplicate = True
+
+    def __init__(self, dataset):
+        """Class instantiation method
+
+        Args:
+            dataset (CodeWeaknessClassificationDataset): Dataset to process.
+        """
+        super().__init__(dataset)
+        self.steps = []
+
+    @staticmethod
+    def get_step(step_path):
+        """Instantiate a step of the pipeline.
+
+        Args:
+            step_path (str): Full path of the processing class, such as
+                `bugfinder.processing.cleaning.remove_comments.RemoveComments`.
+
+        Returns:
+            AbstractProcessing: Processing with a `transform_code` method.
+        """
+        step_module, _, step_class_name = step_path.rpartition(".")
+        step_class = getattr(import_module(step_module), step_class_name)
+
+        if not callable(getattr(step_class, "transform_code", None)):
+            raise ValueError(f"Processing {step_path} cannot be used in a pipeline.")
+
+        # Steps only transform code in memory and never access the dataset.
+        return step_class(None)
+
+    def execute(self, steps):
+        """Run the pipeline.
+
+        Args:
+            steps (list): Full paths of the processing classes to apply, in order.
+        """
+        LOGGER.debug("Running %d transformations on the dataset...", len(steps))
+        self.steps = [self.get_step(step_path) for step_path in steps]
+
+        file_stats_list = super().execute()
+
+        for step_index, step_path in enumerate(steps):
+            step_stats_list = [
+                file_stats[step_index]
+                for file_stats in file_stats_list
+                if file_stats[step_index] is not None
+            ]
+
+            # Step time is the time spent in the step by every process.
+            self.dataset.append_summary(
+                {"class": step_path, "args": {}},
+                self.metadata["category"],
+                int(round(sum(step_time for step_time, _ in step_stats_list) * 1000)),
+                {
+                    "pipeline": "%s.%s"
+                    % (self.__class__.__module__, self.__class__.__name__),
+                    "files_processed": len(step_stats_list),
+                    "files_modified": sum(
+                        is_modified for _, is_modified in step_stats_list
+                    ),
+                },
+                DatasetQueueRetCode.OK,
+            )
+
+        LOGGER.info("Transformations successfully applied.")
+
+    def match_file(self, filepath) -> bool:
+        """Process the files matched by at least one step."""
+        return any(step.match_file(filepath) for step in self.steps)
+
+    def process_file(self, filepath):
+        """Apply every matching step to a single file.
+
+        Args:
+            filepath (str): Path of the file to be processed.
+
+        Returns:
+            list: Time spent and modification status of the file for each step, None
+                if the step does not process the file.
+        """
+        tmp_filepath = f"{filepath}.tmp"
+        file_stats = []
+
+        with open(filepath, "r", encoding="utf-8") as in_file:
+            original_code = in_file.read()
+
+        code = original_code
+
+        for step in self.steps:
+            if not step.match_file(filepath):
+                file_stats.append(None)
+                continue
+
+            step_start_time = perf_counter()
+            step_code = step.transform_code(code)
+            file_stats.append((perf_counter() - step_start_time, step_code != code))
+            code = step_code
+
+        if code != original_code:
+            with open(tmp_filepath, "w", encoding="utf-8") as out_file:
+                out_file.write(code)
+
+            move(tmp_filepath, filepath)
+
+        return file_stats
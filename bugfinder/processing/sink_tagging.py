@@ -3,83 +3,319 @@
 from multiprocessing import Pool
 
 import os
+import pickle
+from os import replace
+from os.path import exists
 from http.client import RemoteDisconnected
-from py2neo import Graph
+from py2neo.errors import ConnectionBroken, TransientError
 from time import sleep
 from urllib3.exceptions import ProtocolError
 
-from bugfinder.processing.neo4j import Neo4J3Processing
+from bugfinder import settings
+from bugfinder.processing.neo4j import Neo4J3Processing, ProfiledGraph, get_graph
+from bugfinder.processing.neo4j.queries import register_query
 from bugfinder.settings import LOGGER, POOL_SIZE
+from bugfinder.utils.dirs import get_signature
 from bugfinder.utils.progressbar import MultiBar
 
+SINK_MANIFEST_CACHE_EXT = ".index.pkl"
+""" str: Extension added to the path of a sinks file to store its cached index.
+"""
+
+SINK_MANIFEST_CACHE_VERSION = 1
+""" int: Version of the sink index cache format. Caches with a different version are
+rebuilt.
+"""
+
+# FIXME Note that the line number for mixed test case can be wrong because the good
+#   code was removed from bad test cases. In Juliet, the bad code comes first, so the
+#   line number is usually correct, even after removing the good code.
+TAG_SINKS_QUERY = register_query(
+    "sink_tagging.tag_sinks",
+    """
+    UNWIND $sinks AS sink
+    MATCH (tc:GenericNode {type:"Testcase",label:"bad",name:sink.name})
+    WHERE ID(tc)=sink.tcid
+    MATCH (tc)<-[:IS_FILE_OF]-(
+        :GenericNode {type:"File",basename:sink.basename}
+    )-[:IS_FILE_OF]->(:GenericNode {type:"Function"})-[
+        :IS_FUNCTION_OF_CFG
+    ]->(e:UpstreamNode {type:"CFGEntryNode"})
+    WITH DISTINCT sink, e
+    MATCH (e)-[:CONTROLS*]->(n1:GenericNode)
+    WHERE EXISTS(n1.lineno) AND n1.lineno=sink.lineno
+    SET n1:BugSinkNode
+    """,
+)
+
+
+def get_sink_batches(tc_list, batch_size):
+    """Group the sinks of the test cases into batches. A batch can contain the sinks
+    of several test cases, and the sinks of a test case can be split across batches.
+
+    Args:
+        tc_list (dict): Identifier and sinks of each test case, indexed by name.
+        batch_size (int): Maximum number of sinks per batch.
+
+    Returns:
+        list: Name, test case identifier, file basename and line number of the sinks
+            of each batch.
+    """
+    sinks = [
+        {
+            "name": tc_name,
+            "tcid": tc_info["tcid"],
+            "basename": sink["basename"],
+            "lineno": sink["lineno"],
+        }
+        for tc_name, tc_info in tc_list.items()
+        for sink in tc_info["sinks"]
+    ]
+
+    return [
+        sinks[batch_start : batch_start + batch_size]
+        for batch_start in range(0, len(sinks), batch_size)
+    ]
+
+
+def sinktagging_worker(progress_bar, sinks, port):
+    """Tag a batch of sinks with a single query, committed in its own transaction.
+
+    Args:
+        progress_bar (MultiBar): Progress bar shared by the workers.
+        sinks (list): Sinks of the batch, see `get_sink_batches`.
+        port (str): Machine port of the Bolt interface.
+
+    Returns:
+        tuple: Identifier, name and error of the test cases of the batch if it
+            failed, and statistics of the queries sent by the worker.
+    """
+    query_stats = {}
+    db = ProfiledGraph(get_graph(port), query_stats)
+    failure = None
+
+    progress_bar.subscribe(len(sinks))
+    for tries in range(4):
+        try:
+            sleep(tries**2)
+            TAG_SINKS_QUERY.run(db, sinks=sinks)
+            break
+        except (RemoteDisconnected, ProtocolError, ConnectionBroken, TransientError):
+            continue
+        except (KeyboardInterrupt, Exception) as e:
+            failure = str(e)
+            break
+    else:
+        failure = "All tries exhausted."
+
+    progress_bar.next(n=len(sinks))
+    progress_bar.unsubscribe()
 
-def sinktagging_worker(progress_bar, tc_name, tc_info, port):
-    db = Graph(
-        scheme="http",
-        host="0.0.0.0",
-        port=port,
+    if failure is None:
+        return [], query_stats
+
+    # The whole batch is rolled back, so each of its test cases has to be tagged again.
+    failed_test_cases = sorted({(sink["tcid"], sink["name"]) for sink in sinks})
+    LOGGER.debug(
+        "Sink tagging failed for %d testcases: %s", len(failed_test_cases), failure
     )
+    return [
+        (tcid, tc_name, failure) for tcid, tc_name in failed_test_cases
+    ], query_stats
+
+
+class SinkManifest:
+    """Index of the sinks of a CSV file formatted as `<SARD id, file path, line
+    number>`. Sinks are indexed by SARD test case and by Juliet test case in a single
+    pass over the file. The index can be cached in a binary file next to the CSV
+    file, and is only rebuilt when the signature of the CSV file changes.
+    """
+
+    def __init__(self, sinks_path, use_cache=True):
+        """Class instantiation method
+
+        Args:
+            sinks_path (str): Path of the CSV file.
+            use_cache (bool): Read and write the index from the cache file.
+        """
+        self.sinks_path = sinks_path
+        self.cache_path = "%s%s" % (sinks_path, SINK_MANIFEST_CACHE_EXT)
+        self.use_cache = use_cache
+
+        self.sard_sinks = {}
+        self.juliet_sinks = {}
+        self.sink_count = 0
+
+        self.load()
+
+    def load(self):
+        """Load the index from the cache if it is up-to-date, build it from the CSV
+        file otherwise.
+        """
+        signature = get_signature(self.sinks_path)
+
+        if self.use_cache and signature is not None and self._load_cache(signature):
+            LOGGER.debug("Sink index retrieved from cache.")
+            return
+
+        self.parse()
+
+        if self.use_cache and signature is not None:
+            self._save_cache(signature)
+
+    def parse(self):
+        """Build the indexes from the CSV file. Sinks are stored as basename and line
+        number, without duplicates.
+        """
+        sard_sinks = {}
+        juliet_sinks = {}
+        self.sink_count = 0
+
+        with open(self.sinks_path, "r") as sink_fp:
+            for sink in sink_fp:
+                self.sink_count += 1
+
+                try:
+                    fields = sink.split(",")
+                    assert len(fields) == 3
+                    sardid = int(fields[0])
+                    basnam = os.path.basename(fields[1])
+                    lineno = int(fields[2])
+                    jtcnam = basnam.rsplit(".", 1)[0]
+                    jtcnam = (
+                        jtcnam[:-1]
+                        if jtcnam[-1] in ["a", "b", "c", "d", "e", "f"]
+                        else jtcnam
+                    )
+                except Exception as e:
+                    LOGGER.warning("Problem parsing line '%s': %s", sink[:-1], str(e))
+                    continue
+
+                # Dictionaries are used as ordered sets of sinks.
+                sard_sinks.setdefault("%06d" % sardid, {})[(basnam, lineno)] = None
+                juliet_sinks.setdefault(jtcnam, {}).setdefault(sardid, {})[
+                    (basnam, lineno)
+                ] = None
+
+        self.sard_sinks = {sardtc: list(sinks) for sardtc, sinks in sard_sinks.items()}
+        self.juliet_sinks = {
+            jtcnam: {sardid: list(sinks) for sardid, sinks in versions.items()}
+            for jtcnam, versions in juliet_sinks.items()
+        }
 
-    tcid = tc_info["tcid"]
-    if not tc_info["sinks"]:
-        LOGGER.warning("No sinks for test case: %s / %d", tc_name, tcid)
-
-    sinks_left = len(tc_info["sinks"])
-    if sinks_left > 1:
-        LOGGER.debug("> Sinks for %s: %d", tc_name, sinks_left)
-    progress_bar.subscribe(sinks_left)
-    for sink in tc_info["sinks"]:
-        for tries in range(4):
-            try:
-                sleep(tries**2)
-                # FIXME Note that the line number for mixed test case can
-                #   be wrong because the good code was removed from bad test
-                #   cases. In Juliet, the bad code comes first, so the line
-                #   number is usually correct, even after removing the good
-                #   code.
-                query = """
-                    MATCH (tc:GenericNode {type:"Testcase",label:"bad",name:"%s"})
-                    WHERE ID(tc)=%d
-                    MATCH (tc)<-[:IS_FILE_OF]-(
-                        :GenericNode {type:"File",basename:"%s"}
-                    )-[:IS_FILE_OF]->(:GenericNode {type:"Function"})-[
-                        :IS_FUNCTION_OF_CFG
-                    ]->(e:UpstreamNode {type:"CFGEntryNode"})
-                    WITH DISTINCT e
-                    MATCH (e)-[:CONTROLS*]->(n1:GenericNode)
-                    WHERE EXISTS(n1.lineno) AND n1.lineno=%d
-                    SET n1:BugSinkNode
-                    """ % (
-                    tc_name,
-                    tcid,
-                    sink["basename"],
-                    sink["lineno"],
+    def _load_cache(self, signature):
+        """Load the indexes from the cache file.
+
+        Args:
+            signature (list): Signature of the CSV file.
+
+        Returns:
+            bool: True if the cache is up-to-date and has been loaded, False otherwise.
+        """
+        if not exists(self.cache_path):
+            return False
+
+        try:
+            with open(self.cache_path, "rb") as cache_fp:
+                cache = pickle.load(cache_fp)
+
+            if (
+                cache.get("version") != SINK_MANIFEST_CACHE_VERSION
+                or cache.get("signature") != signature
+            ):
+                LOGGER.debug("Sink index cache is outdated. Ignoring cache...")
+                return False
+
+            self.sard_sinks = cache["sard_sinks"]
+            self.juliet_sinks = cache["juliet_sinks"]
+            self.sink_count = cache["sink_count"]
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError) as exc:
+            LOGGER.debug("Sink index cache could not be read: %s.", str(exc))
+            return False
+
+        return True
+
+    def _save_cache(self, signature):
+        """Save the indexes in the cache file.
+
+        Args:
+            signature (list): Signature of the CSV file.
+        """
+        tmp_cache_path = "%s.tmp" % self.cache_path
+
+        try:
+            with open(tmp_cache_path, "wb") as cache_fp:
+                pickle.dump(
+                    {
+                        "version": SINK_MANIFEST_CACHE_VERSION,
+                        "signature": signature,
+                        "sard_sinks": self.sard_sinks,
+                        "juliet_sinks": self.juliet_sinks,
+                        "sink_count": self.sink_count,
+                    },
+                    cache_fp,
                 )
-                # LOGGER.info(query)
-                db.run(query)
-                sinks_left -= 1
-                break
-            except (RemoteDisconnected, ProtocolError):
-                continue
-            except (KeyboardInterrupt, Exception) as e:
-                LOGGER.debug("Testcase %d sink tagging failed: %s", tcid, str(e))
-                progress_bar.next(n=sinks_left)
-                progress_bar.unsubscribe()
-                return tcid, tc_name, str(e)
-        else:
-            LOGGER.debug("Testcase %d sink tagging failed: timeout", tcid)
-            progress_bar.next(n=sinks_left)
-            progress_bar.unsubscribe()
-            return tcid, tc_name, "All tries exhausted."
-        progress_bar.next()
-    progress_bar.unsubscribe()
-    return None
+
+            replace(tmp_cache_path, self.cache_path)
+        except OSError as exc:
+            LOGGER.debug("Sink index cache could not be saved: %s.", str(exc))
+
+    def get_sinks(self, tc_name, tc_names):
+        """Retrieve the sinks of a test case. Sinks of SARD test cases are matched on
+        the SARD id. Sinks of Juliet test cases are matched on the file name, and
+        only the most recent version of Juliet is used.
+
+        Args:
+            tc_name (str): Name of the test case.
+            tc_names (set|dict): Names of every test case being tagged. Sinks matching
+                a SARD test case are never used for a Juliet test case.
+
+        Returns:
+            list: Basename, line number and SARD id of the sinks.
+        """
+        if tc_name in self.sard_sinks:
+            sardid = int(tc_name)
+            return [
+                {"basename": basnam, "lineno": lineno, "sardid": sardid}
+                for basnam, lineno in self.sard_sinks[tc_name]
+            ]
+
+        versions = [
+            sardid
+            for sardid in self.juliet_sinks.get(tc_name, {})
+            if "%06d" % sardid not in tc_names
+        ]
+
+        if not versions:
+            return []
+
+        sardid = max(versions)
+
+        # Line numbers are shifted because we remove line #ifndef OMITBAD
+        return [
+            {"basename": basnam, "lineno": lineno - 1, "sardid": sardid}
+            for basnam, lineno in self.juliet_sinks[tc_name][sardid]
+        ]
+
+    def assign_sinks(self, tc_list):
+        """Set the sinks of each test case.
+
+        Args:
+            tc_list (dict): Identifier and sinks of each test case, indexed by name.
+                Sinks are updated.
+        """
+        for tc_name, tc_info in tc_list.items():
+            tc_info["sinks"] = self.get_sinks(tc_name, tc_list)
 
 
 class SinkTaggingProcessing(Neo4J3Processing):
+    output_args = {"log_output"}
+
     log_input = None
     log_output = None
     sinksfile = None
+    batch_size = settings.SINK_TAGGING_BATCH_SIZE
+    cache_sinks = True
 
     def assign_ports(self):
         assigned_ports = None
@@ -92,6 +328,14 @@ class SinkTaggingProcessing(Neo4J3Processing):
         self.log_input = command["log_input"]
         self.log_output = command["log_output"]
         self.sinksfile = command["sinks"]
+        self.batch_size = command.get("batch_size", settings.SINK_TAGGING_BATCH_SIZE)
+
+        if self.batch_size < 1:
+            raise ValueError(
+                "Sink tagging batch size must be at least 1, got %d." % self.batch_size
+            )
+
+        self.cache_sinks = command.get("cache_sinks", True)
 
     def configure_container_with_dict(self, container_config):
         self.configure_container()
@@ -135,57 +379,31 @@ class SinkTaggingProcessing(Neo4J3Processing):
         LOGGER.debug("%d testcases retrieved.", len(tc_list))
 
         LOGGER.info("Loading sinks...")
-        with open(self.sinksfile, "r") as sink_fp:
-            sinklist = list(sink_fp)
-        for sink in sinklist:
-            try:
-                fields = sink.split(",")
-                assert len(fields) == 3
-                sardid = int(fields[0])
-                sardtc = "%06d" % sardid
-                basnam = os.path.basename(fields[1])
-                lineno = int(fields[2])
-                jtcnam = basnam.rsplit(".", 1)[0]
-                jtcnam = (
-                    jtcnam[:-1]
-                    if jtcnam[-1] in ["a", "b", "c", "d", "e", "f"]
-                    else jtcnam
+        sink_manifest = SinkManifest(self.sinksfile, self.cache_sinks)
+        sink_manifest.assign_sinks(tc_list)
+        LOGGER.info("%d sinks loaded.", sink_manifest.sink_count)
+
+        for tc_name, tc_info in tc_list.items():
+            if not tc_info["sinks"]:
+                LOGGER.warning(
+                    "No sinks for test case: %s / %d", tc_name, tc_info["tcid"]
                 )
-                entry = {"basename": basnam, "lineno": lineno, "sardid": sardid}
-                if sardtc in tc_list:
-                    # This block is for general SARD test cases
-                    if entry not in tc_list[sardtc]["sinks"]:
-                        tc_list[sardtc]["sinks"].append(entry)
-                elif jtcnam in tc_list:
-                    # This block is Juliet-specific
-                    entry["lineno"] -= 1  # Because we remove line #ifndef OMITBAD
-                    if (
-                        not tc_list[jtcnam]["sinks"]
-                        or tc_list[jtcnam]["sinks"][0]["sardid"] < sardid
-                    ):
-                        # This is a more recent version of Juliet, use it
-                        tc_list[jtcnam]["sinks"] = [entry]
-                    elif (
-                        tc_list[jtcnam]["sinks"][0]["sardid"] == sardid
-                        and entry not in tc_list[jtcnam]["sinks"]
-                    ):
-                        tc_list[jtcnam]["sinks"].append(entry)
-            except Exception as e:
-                LOGGER.warning("Problem parsing line '%s': %s", sink[:-1], str(e))
-                continue
-        LOGGER.info("%d sinks loaded.", len(sinklist))
-
-        port = self.machine_ports[self.container_ports.index("7474")]
+
+        sink_batches = get_sink_batches(tc_list, self.batch_size)
+        LOGGER.debug(
+            "%d sinks split in %d batches.",
+            sum(len(sinks) for sinks in sink_batches),
+            len(sink_batches),
+        )
+
+        port = self.get_bolt_port()
 
         LOGGER.debug("Processing...")
         progress_bar = MultiBar("Processing", max=1)
         pool = Pool(POOL_SIZE)
         status = pool.starmap_async(
             sinktagging_worker,
-            [
-                [progress_bar, tc_name, tc_info, port]
-                for tc_name, tc_info in tc_list.items()
-            ],
+            [[progress_bar, sinks, port] for sinks in sink_batches],
             chunksize=1,
         )
         pool.close()
@@ -199,9 +417,14 @@ class SinkTaggingProcessing(Neo4J3Processing):
         progress_bar.finish()
         pool.join()
 
+        results = status.get()
+
+        for _, query_stats in results:
+            self.neo4j_db.merge_query_stats(query_stats)
+
         # Write failed queries to a log file if specified
         if self.log_output:
-            failed = filter(None, status.get())
+            failed = [failure for failures, _ in results for failure in failures]
             with open(self.log_output, "a") as outlog:
                 for query in failed:
                     outlog.write(
@@ -1,6 +1,8 @@
+import re
 from abc import abstractmethod
+from os.path import splitext
 
-from bugfinder.base.processing import AbstractProcessing
+from bugfinder.base.processing import AbstractProcessing, DatasetArtifact
 
 single_char_ops = {
     "(",
@@ -197,8 +199,38 @@ main_func = frozenset({"main"})
 
 main_vars = frozenset({"argc", "argv"})
 
+string_litteral_rx = re.compile(r'".*?"')
+
+hex_litteral_rx = re.compile(r"0[xX][0-9a-fA-F]+")
+
+non_ascii_rx = re.compile(r"[^\x00-\x7f]")
+
+
+def simplify_litterals(code):
+    """Remove string litterals and non-ASCII characters from a piece of code, and
+    replace hexadecimal numbers with a token HEX.
+
+    Args:
+        code (str): Code to simplify.
+
+    Returns:
+        str: Simplified code.
+    """
+    code = string_litteral_rx.sub("", code)
+    code = hex_litteral_rx.sub("HEX", code)
+    return non_ascii_rx.sub("", code)
+
 
 class AbstractTokenizer(AbstractProcessing):
+
+    reads = {DatasetArtifact.SOURCE}
+    writes = {DatasetArtifact.SOURCE}
+
+    @staticmethod
+    def match_file(filepath) -> bool:
+        """Only tokenize C source and header files."""
+        return splitext(filepath)[1] in [".c", ".h"]
+
     @abstractmethod
     def execute(self, *args, **kwargs):  # pragma: no cover
         """Execute the processing. Needs to be implemented by the subclass.
@@ -0,0 +1,103 @@
+""" Lexer splitting C code in tokens, shared by the tokenizers.
+"""
+import re
+
+from bugfinder.processing.tokenizers import (
+    triple_char_ops,
+    double_char_ops,
+    single_char_ops,
+    keywords,
+)
+
+
+class TokenType:
+    """Types of the tokens returned by the lexer"""
+
+    KEYWORD = "keyword"
+    IDENTIFIER = "identifier"
+    OPERATOR = "operator"
+    OTHER = "other"
+
+
+class CodeLexer:
+    """Lexer transforming C code in a list of tokens. Operators are kept as single
+    tokens, the longest operator being matched first. Escaped newlines, backslashes,
+    tabulations and carriage returns are removed before the split, other blank
+    characters separate the tokens. The regular expressions are compiled once, when
+    the lexer is created.
+    """
+
+    removed_chars_rx = re.compile(r"\\n|\\|\t|\r")
+
+    identifier_rx = re.compile(r"[_A-Za-z]\w*")
+
+    def __init__(self, operators=None, code_keywords=None):
+        """Class instantiation method
+
+        Args:
+            operators (set|None): Operators to keep as single tokens. Defaults to the
+                single, double and triple characters operators.
+            code_keywords (set|None): Reserved words of the language. Defaults to
+                `keywords`.
+        """
+        if operators is None:
+            operators = triple_char_ops | double_char_ops | single_char_ops
+
+        if code_keywords is None:
+            code_keywords = keywords
+
+        self.operators = frozenset(operators)
+        self.keywords = frozenset(code_keywords)
+
+        # Longest operators first, sorted for a deterministic alternation.
+        operators_regex = "|".join(
+            re.escape(operator)
+            for operator in sorted(self.operators, key=lambda op: (-len(op), op))
+        )
+        operator_chars = re.escape(
+            "".join(sorted({operator[0] for operator in self.operators}))
+        )
+
+        # Characters starting an operator only belong to a token when no operator
+        # starts at their position.
+        self.token_rx = re.compile(
+            rf"{operators_regex}"
+            rf"|(?:[^\s{operator_chars}]|(?!{operators_regex})[{operator_chars}])+"
+        )
+
+    def tokenize(self, code):
+        """Split a piece of code in tokens.
+
+        Args:
+            code (str): Code to split, possibly spanning several lines.
+
+        Returns:
+            list: Tokens of the code.
+        """
+        return self.token_rx.findall(self.removed_chars_rx.sub("", code))
+
+    def get_token_type(self, token):
+        """Classify a token returned by `tokenize`.
+
+        Args:
+            token (str): Token to classify.
+
+        Returns:
+            str: One of the `TokenType` values.
+        """
+        if token in self.operators:
+            return TokenType.OPERATOR
+
+        if token in self.keywords:
+            return TokenType.KEYWORD
+
+        if self.identifier_rx.fullmatch(token):
+            return TokenType.IDENTIFIER
+
+        return TokenType.OTHER
+
+
+code_lexer = CodeLexer()
+""" CodeLexer: Lexer using the default operators and keywords, shared by the
+processing needing C tokens.
+"""
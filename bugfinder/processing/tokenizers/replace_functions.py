@@ -1,11 +1,20 @@
 import re
 from os import listdir
-from os.path import join, splitext
+from os.path import join
 from shutil import move
 
-from bugfinder.processing.tokenizers import main_func, keywords, AbstractTokenizer
+from bugfinder.processing.tokenizers import (
+    main_func,
+    keywords,
+    simplify_litterals,
+    AbstractTokenizer,
+)
 from bugfinder.settings import LOGGER
 
+function_call_rx = re.compile(r"\b([_A-Za-z]\w*)\b(?=[^\S\n]*\()")
+""" re.Pattern: Identifier followed by an opening parenthesis on the same line.
+"""
+
 
 class ReplaceFunctions(AbstractTokenizer):
     """Processing to replace user-created functions from a dataset."""
@@ -18,7 +27,7 @@ class ReplaceFunctions(AbstractTokenizer):
             join(test_case, filepath)
             for test_case in self.dataset.test_cases
             for filepath in listdir(join(self.dataset.path, test_case))
-            if splitext(filepath)[1] in [".c", ".h"]
+            if self.match_file(filepath)
         ]
 
         while len(file_processing_list) != 0:
@@ -44,46 +53,56 @@ class ReplaceFunctions(AbstractTokenizer):
         """
         tmp_filepath = "%s.tmp" % filepath
 
-        function_symbols = dict()
-        function_count = 0
+        with open(filepath, "r") as in_file:
+            replaced_code, function_count = ReplaceFunctions.replace_functions(
+                in_file.read()
+            )
 
-        replaced_code = []
+        LOGGER.debug("%d functions replaced in %s", function_count, filepath)
 
-        with open(filepath, "r") as in_file:
-            code = in_file.readlines()
+        with open(tmp_filepath, "w") as out_file:
+            out_file.write(replaced_code)
+
+        move(tmp_filepath, filepath)
+
+        return function_count
+
+    @staticmethod
+    def replace_functions(code):
+        """Replace the user-created functions of a piece of code with FUN tokens, in
+        a single scan of the code.
 
-            for line in code:
-                # TODO: Remove these replacements and put it in a separate function
-                str_lit_line = re.sub(r'".*?"', "", line)
-                hex_line = re.sub(r"0[xX][0-9a-fA-F]+", "HEX", str_lit_line)
-                ascii_line = re.sub(r"[^\x00-\x7f]", r"", hex_line)
+        Args:
+            code (str): Content of a file.
 
-                line_functions = re.findall(r"\b([_A-Za-z]\w*)\b(?=\s*\()", ascii_line)
+        Returns:
+            tuple: Code with replaced functions and number of functions replaced.
+        """
+        function_symbols = dict()
 
-                for function_name in line_functions:
-                    if (len({function_name}.difference(main_func)) != 0) and (
-                        len({function_name}.difference(keywords)) != 0
-                    ):
-                        if function_name not in function_symbols.keys():
-                            function_count += 1
+        def _replacer(match):
+            function_name = match.group(1)
 
-                            function_symbols[function_name] = "FUN" + str(
-                                function_count
-                            )
+            if function_name in main_func or function_name in keywords:
+                return function_name
 
-                        ascii_line = re.sub(
-                            r"\b(" + function_name + r")\b(?=\s*\()",
-                            function_symbols[function_name],
-                            ascii_line,
-                        )
+            if function_name not in function_symbols.keys():
+                function_symbols[function_name] = "FUN%d" % (len(function_symbols) + 1)
 
-                replaced_code.append(ascii_line)
+            return function_symbols[function_name]
 
-        LOGGER.debug("%d functions replaced in %s", function_count, filepath)
+        replaced_code = function_call_rx.sub(_replacer, simplify_litterals(code))
 
-        with open(tmp_filepath, "w") as out_file:
-            out_file.writelines(replaced_code)
+        return replaced_code, len(function_symbols)
 
-        move(tmp_filepath, filepath)
+    @staticmethod
+    def transform_code(code):
+        """Replace the user-created functions of a piece of code with FUN tokens.
 
-        return function_count
+        Args:
+            code (str): Content of a file.
+
+        Returns:
+            str: Code with replaced functions.
+        """
+        return ReplaceFunctions.replace_functions(code)[0]
@@ -1,11 +1,27 @@
 import re
+from io import StringIO
 from os import listdir
-from os.path import join, splitext
+from os.path import join
 from shutil import move
 
-from bugfinder.processing.tokenizers import main_vars, keywords, AbstractTokenizer
+from bugfinder.processing.tokenizers import (
+    main_vars,
+    keywords,
+    simplify_litterals,
+    AbstractTokenizer,
+)
 from bugfinder.settings import LOGGER
 
+identifier_rx = re.compile(
+    r"\b(?P<name>[_A-Za-z]\w*)\b"
+    r"(?:(?P<var>(?!\s*\**\w+)(?!\s*\())|)"
+    r"(?:(?P<repl>(?:(?=\s*\w+\()|(?!\s*\w+))(?!\s*\())|)"
+)
+""" re.Pattern: Identifier of a line. The `var` group is matched if the identifier
+is a variable, the `repl` group if the identifier can be replaced by a variable
+token.
+"""
+
 
 class ReplaceVariables(AbstractTokenizer):
     """Processing to replace user-created functions from a dataset."""
@@ -18,7 +34,7 @@ class ReplaceVariables(AbstractTokenizer):
             join(test_case, filepath)
             for test_case in self.dataset.test_cases
             for filepath in listdir(join(self.dataset.path, test_case))
-            if splitext(filepath)[1] in [".c", ".h"]
+            if self.match_file(filepath)
         ]
 
         while len(file_processing_list) != 0:
@@ -43,47 +59,83 @@ class ReplaceVariables(AbstractTokenizer):
         """
         tmp_filepath = "%s.tmp" % filepath
 
-        var_symbols = dict()
-        var_count = 0
-
-        replaced_code = []
-
         with open(filepath, "r") as in_file:
-            code = in_file.readlines()
-
-            for line in code:
-                # TODO: Remove these replacements and put it in a separate function
-                str_lit_line = re.sub(r'".*?"', "", line)
-                hex_line = re.sub(r"0[xX][0-9a-fA-F]+", "HEX", str_lit_line)
-                ascii_line = re.sub(r"[^\x00-\x7f]", r"", hex_line)
-
-                line_vars = re.findall(
-                    r"\b([_A-Za-z]\w*)\b((?!\s*\**\w+))(?!\s*\()", ascii_line
-                )
-
-                for var_name in line_vars:
-                    if (len({var_name[0]}.difference(keywords)) != 0) and (
-                        len({var_name[0]}.difference(main_vars)) != 0
-                    ):
-                        if var_name[0] not in var_symbols.keys():
-                            var_count += 1
-                            var_symbols[var_name[0]] = "VAR" + str(var_count)
-
-                        ascii_line = re.sub(
-                            r"\b("
-                            + var_name[0]
-                            + r")\b(?:(?=\s*\w+\()|(?!\s*\w+))(?!\s*\()",
-                            var_symbols[var_name[0]],
-                            ascii_line,
-                        )
-
-                replaced_code.append(ascii_line)
+            replaced_code, var_count = ReplaceVariables.replace_variables(
+                in_file.read()
+            )
 
         LOGGER.debug("%d variables replaced in %s", var_count, filepath)
 
         with open(tmp_filepath, "w") as out_file:
-            out_file.writelines(replaced_code)
+            out_file.write(replaced_code)
 
         move(tmp_filepath, filepath)
 
         return var_count
+
+    @staticmethod
+    def replace_variables(code):
+        """Replace the user-created variables of a piece of code with VAR tokens, in
+        a single scan of each line.
+
+        Args:
+            code (str): Content of a file.
+
+        Returns:
+            tuple: Code with replaced variables and number of variables replaced.
+        """
+        var_symbols = dict()
+        replaced_code = []
+
+        for line in StringIO(simplify_litterals(code)):
+            line_identifiers = list(identifier_rx.finditer(line))
+
+            # Only variables found on the line are replaced, numbered by order of
+            # appearance.
+            line_vars = set()
+
+            for identifier in line_identifiers:
+                var_name = identifier.group("name")
+
+                if (
+                    identifier.group("var") is None
+                    or var_name in keywords
+                    or var_name in main_vars
+                ):
+                    continue
+
+                line_vars.add(var_name)
+
+                if var_name not in var_symbols.keys():
+                    var_symbols[var_name] = "VAR%d" % (len(var_symbols) + 1)
+
+            replaced_line = []
+            line_pos = 0
+
+            for identifier in line_identifiers:
+                if (
+                    identifier.group("repl") is None
+                    or identifier.group("name") not in line_vars
+                ):
+                    continue
+
+                replaced_line.append(line[line_pos : identifier.start()])
+                replaced_line.append(var_symbols[identifier.group("name")])
+                line_pos = identifier.end()
+
+            replaced_line.append(line[line_pos:])
+            replaced_code.append("".join(replaced_line))
+
+        return "".join(replaced_code), len(var_symbols)
+
+    @staticmethod
+    def transform_code(code):
+        """Replace the user-created variables of a piece of code with VAR tokens.
+
+        Args:
+            code (str): Content of a file.
+
+        Returns:
+            str: Code with replaced variables.
+        """
+        return ReplaceVariables.replace_variables(code)[0]
@@ -1,14 +1,10 @@
 import re
 from os import listdir
-from os.path import join, splitext
+from os.path import join
 from shutil import move
 
-from bugfinder.processing.tokenizers import (
-    triple_char_ops,
-    double_char_ops,
-    single_char_ops,
-    AbstractTokenizer,
-)
+from bugfinder.processing.tokenizers import AbstractTokenizer
+from bugfinder.processing.tokenizers.lexer import code_lexer
 from bugfinder.settings import LOGGER
 
 
@@ -36,7 +32,7 @@ class TokenizeCode(AbstractTokenizer):
             join(test_case, filepath)
             for test_case in self.dataset.test_cases
             for filepath in listdir(join(self.dataset.path, test_case))
-            if splitext(filepath)[1] in [".c", ".h"]
+            if self.match_file(filepath)
         ]
 
         while len(file_processing_list) != 0:
@@ -58,32 +54,22 @@ class TokenizeCode(AbstractTokenizer):
             filepath (str): Path of the file to be processed
         """
         tmp_filepath = "%s.tmp" % filepath
-        tokens = []
-
-        regex_split_operators = (
-            self.to_regex(triple_char_ops)
-            + self.to_regex(double_char_ops)
-            + self.to_regex(single_char_ops)
-        )
 
         with open(filepath, "r") as in_file:
-            code = in_file.readlines()
-
-            for line in code:
-                if line == "":
-                    continue
-
-                line = re.sub("(\n)|(\\\\n)|(\\\\)|(\\t)|(\\r)", "", line)
-                splitter = r" +|" + regex_split_operators + r"|(\/)|(\;)|(\-)|(\*)"
+            code = in_file.read()
 
-                line = re.split(splitter, line)
+        with open(tmp_filepath, "w") as out_file:
+            out_file.write(self.transform_code(code))
 
-                line = list(filter(None, line))
-                line = list(filter(str.strip, line))
+        move(tmp_filepath, filepath)
 
-                tokens.extend(line)
+    def transform_code(self, code):
+        """Transform a piece of code in tokens, one per line.
 
-        with open(tmp_filepath, "w") as out_file:
-            out_file.writelines(token + "\n" for token in tokens)
+        Args:
+            code (str): Content of a file.
 
-        move(tmp_filepath, filepath)
+        Returns:
+            str: Tokens of the code.
+        """
+        return "".join(token + "\n" for token in code_lexer.tokenize(code))
@@ -14,6 +14,11 @@ POOL_SIZE = int(os.getenv("POOL_SIZE", multiprocessing.cpu_count()))
 """ int: Number of CPU cores that can be used for multiprocessing tasks.
 """
 
+PROCESSING_WORKERS = int(os.getenv("PROCESSING_WORKERS", 1))
+""" int: Maximum number of dataset operations run concurrently. Operations are only
+run concurrently if they do not access the same dataset artifacts.
+"""
+
 # Neo4J configuration
 NEO4J_V3_MEMORY = "4G"
 """ str: Memory allocated to Neo4J databases.
@@ -27,6 +32,26 @@ NEO4J_DEFAULT_TIMEOUT = "2h"
 """ str: Default timeout for Neo4J queries.
 """
 
+NEO4J_CONNECTIONS = int(os.getenv("NEO4J_CONNECTIONS", POOL_SIZE))
+""" int: Maximum number of Bolt connections each process keeps open to a Neo4J
+database. Defaults to `POOL_SIZE`.
+"""
+
+SINK_TAGGING_BATCH_SIZE = int(os.getenv("SINK_TAGGING_BATCH_SIZE", 1000))
+""" int: Maximum number of sinks tagged by a single query.
+"""
+
+# Joern configuration
+JOERN_SHARD_MEMORY = int(os.getenv("JOERN_SHARD_MEMORY", 4 * 2**30))
+""" int: Memory (in bytes) allocated to each Joern container when parsing a dataset
+in shards.
+"""
+
+JOERN_MEMORY_BUDGET = int(os.getenv("JOERN_MEMORY_BUDGET", 16 * 2**30))
+""" int: Memory (in bytes) that Joern containers parsing shards can use
+concurrently.
+"""
+
 # Dataset configuration
 DATASET_DIRS = {
     "joern": "joern.db",
@@ -34,6 +59,7 @@ DATASET_DIRS = {
     "feats": "features",
     "models": "models",
     "embeddings": "embeddings",
+    "tokens": "tokens.cache",
 }
 """ dict: Dataset directory names used by the various scripts.
 """
@@ -42,11 +68,26 @@ SUMMARY_FILE = "summary.json"
 """ str: Name of the file storing dataset processing history and statistics.
 """
 
+INDEX_FILE = "index.json"
+""" str: Name of the file caching the dataset index (classes, test cases and files)
+between runs.
+"""
+
 FEATURES_FILE = "features.csv"
 """ str: Name of the CSV file containing the features that can be used for training 
 purposes.
 """
 
+FEATURES_STORE = "features.store"
+""" str: Name of the binary feature store. Takes precedence over the CSV feature file
+when more recent.
+"""
+
+VIEW_MANIFEST_FILE = "manifest.json"
+""" str: Name of the file listing the test cases of a dataset view, along with the
+path of the dataset it is built on.
+"""
+
 # Logging configuration
 LOGGER_CONFIG = {
     "version": 1,
@@ -16,6 +16,7 @@ def start_container(
     environment=None,
     command=None,
     detach=True,
+    mem_limit=None,
 ):
     """Start a container"""
     LOGGER.debug("Starting container '%s' (image '%s')...", container_name, image_name)
@@ -40,6 +41,9 @@ def start_container(
     if command is not None:
         extra_args["command"] = command
 
+    if mem_limit is not None:
+        extra_args["mem_limit"] = mem_limit
+
     run_result = docker_cli.containers.run(
         image_name,
         name=container_name,
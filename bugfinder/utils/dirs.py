@@ -1,11 +1,30 @@
 """ File management utilities.
 """
-from os.path import exists, isdir
+import fcntl
+import json
+from hashlib import sha256
+from os import link, remove, replace, scandir, stat
+from os.path import exists, isdir, join
+from time import time_ns
 
-from shutil import rmtree, copytree
+from shutil import rmtree, copytree, copy2, copystat
 
 from bugfinder.settings import LOGGER
 
+HASH_CHUNK_SIZE = 2**20
+""" int: Size (in bytes) of the chunks read when hashing files.
+"""
+
+MTIME_RESOLUTION_NS = 2 * 10**9
+""" int: Worst-case resolution of modification times (in nanoseconds). Paths
+modified less than this delay before being inspected are never trusted.
+"""
+
+FICLONE = 0x40049409
+""" int: Linux ioctl request sharing the content of a file with another file
+(reflink).
+"""
+
 
 def copy_dir(src, dest):
     """Copy a directory from source to destination. Ensure source and destination
@@ -24,3 +43,203 @@ def copy_dir(src, dest):
 
     LOGGER.debug("Succesfully copied '%s' into '%s'...", src, dest)
     return True
+
+
+def link_file(src, dest):
+    """Create a file sharing the content of another file, using a reflink if the
+    filesystem supports it and a hard link otherwise. The file is copied if neither
+    is possible. Can be used as `copy_function` of `shutil.copytree`.
+
+    Args:
+        src (str): Path of the source file.
+        dest (str): Path of the new file.
+
+    Returns:
+        str: Path of the new file.
+    """
+    try:
+        with open(src, "rb") as src_fp, open(dest, "wb") as dest_fp:
+            fcntl.ioctl(dest_fp.fileno(), FICLONE, src_fp.fileno())
+
+        copystat(src, dest)
+        return dest
+    except OSError:
+        if exists(dest):
+            remove(dest)
+
+    try:
+        link(src, dest)
+        return dest
+    except OSError:
+        return copy2(src, dest)
+
+
+def break_hard_link(path):
+    """Give a file hard linked to other paths its own copy of the content, so that
+    it can be modified without modifying the other paths.
+
+    Args:
+        path (str): Path of the file.
+
+    Returns:
+        bool: True if the file was hard linked, False otherwise.
+    """
+    if stat(path).st_nlink <= 1:
+        return False
+
+    tmp_path = "%s.cow" % path
+    copy2(path, tmp_path)
+    replace(tmp_path, path)
+
+    return True
+
+
+def get_signature(path):
+    """Retrieve the signature of a file or a directory, made of its modification
+    time, link count and size. The signature of a directory changes whenever an entry
+    is added to or removed from it.
+
+    Args:
+        path (str): Path of the file or directory.
+
+    Returns:
+        list|None: modification time (in ns), number of links and size of the path.
+        None if the path has been modified too recently for its signature to be
+        trusted.
+    """
+    path_stat = stat(path)
+
+    # Paths modified right before being inspected could be modified again
+    # without their modification time changing.
+    if path_stat.st_mtime_ns >= time_ns() - MTIME_RESOLUTION_NS:
+        return None
+
+    return [path_stat.st_mtime_ns, path_stat.st_nlink, path_stat.st_size]
+
+
+def scan_tree(root_path, rel_path):
+    """Browse a directory tree and record the signature of every directory as well
+    as the non-hidden files they contain. Symbolic links to directories are not
+    followed, similarly to `os.walk`.
+
+    Args:
+        root_path (str): Path used as reference for relative paths.
+        rel_path (str): Path of the tree to scan, relative to `root_path`.
+
+    Returns:
+        tuple: dictionary of directory signatures and dictionary of file names, both
+        indexed by directory path relative to `root_path`.
+    """
+    dir_signatures = {}
+    dir_files = {}
+    dirs_to_scan = [rel_path]
+
+    while len(dirs_to_scan) != 0:
+        current_dir = dirs_to_scan.pop()
+        current_path = join(root_path, current_dir)
+
+        # The signature is retrieved before listing the content so that any
+        # modification happening during the scan invalidates the signature.
+        dir_signatures[current_dir] = get_signature(current_path)
+        files = []
+
+        with scandir(current_path) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    if not entry.is_symlink():
+                        dirs_to_scan.append(join(current_dir, entry.name))
+                elif not entry.name.startswith("."):  # Ignore UNIX hidden files
+                    files.append(entry.name)
+
+        if len(files) > 0:
+            dir_files[current_dir] = sorted(files)
+
+    return dir_signatures, dir_files
+
+
+def is_tree_unchanged(root_path, dir_signatures):
+    """Check that none of the directories of a scanned tree has been modified.
+
+    Args:
+        root_path (str): Path used as reference for relative paths.
+        dir_signatures (dict): Signatures returned by `scan_tree`.
+
+    Returns:
+        bool: True if the tree can be trusted, False otherwise.
+    """
+    for rel_path, signature in dir_signatures.items():
+        if signature is None:
+            return False
+
+        try:
+            if get_signature(join(root_path, rel_path)) != signature:
+                return False
+        except OSError:
+            return False
+
+    return True
+
+
+def get_file_hash(path, file_hashes=None):
+    """Compute the SHA-256 hash of a file content. Hashes are reused from the
+    cache as long as the signature of the file did not change.
+
+    Args:
+        path (str): Path of the file.
+        file_hashes (dict|None): Cache of file signatures and hashes, indexed by
+            path. Updated with the hash of the file.
+
+    Returns:
+        str: Hexadecimal digest of the file.
+    """
+    signature = get_signature(path)
+
+    if file_hashes is not None and signature is not None:
+        cached_hash = file_hashes.get(path)
+
+        if cached_hash is not None and cached_hash[0] == signature:
+            return cached_hash[1]
+
+    file_hash = sha256()
+
+    with open(path, "rb") as file_fp:
+        for chunk in iter(lambda: file_fp.read(HASH_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+
+    if file_hashes is not None and signature is not None:
+        file_hashes[path] = (signature, file_hash.hexdigest())
+
+    return file_hash.hexdigest()
+
+
+def get_tree_hash(path, file_hashes=None):
+    """Compute the Merkle hash of a directory tree, i.e. a hash of the names and
+    hashes of its entries. The hash changes whenever a file of the tree is added,
+    removed, renamed or modified. Symbolic links to directories are not followed.
+
+    Args:
+        path (str): Path of the directory, or of a single file.
+        file_hashes (dict|None): Cache of file hashes, see `get_file_hash`.
+
+    Returns:
+        str|None: Hexadecimal digest of the tree, None if the path does not exist.
+    """
+    if not exists(path):
+        return None
+
+    if not isdir(path):
+        return get_file_hash(path, file_hashes)
+
+    entry_hashes = {}
+
+    with scandir(path) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                if not entry.is_symlink():
+                    entry_hashes["%s/" % entry.name] = get_tree_hash(
+                        entry.path, file_hashes
+                    )
+            else:
+                entry_hashes[entry.name] = get_file_hash(entry.path, file_hashes)
+
+    return sha256(json.dumps(entry_hashes, sort_keys=True).encode("utf-8")).hexdigest()
@@ -0,0 +1,622 @@
+""" Columnar feature storage. Features are stored as one NumPy array per column type
+along with a column dictionary, so that columns can be memory-mapped and read
+without parsing the whole feature file. Sparse columns are stored together in a
+compressed sparse column matrix.
+
+Blocks are never modified once written. Each version of the features is a column
+dictionary referencing the blocks of its columns, so that versions made of a subset
+of the columns of their parent do not duplicate any data.
+"""
+import json
+from os import listdir, makedirs, remove, replace
+from os.path import exists, join, splitext
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from shutil import copytree
+
+from bugfinder.settings import LOGGER
+
+FEATURE_STORE_VERSION = 2
+""" int: Version of the feature store layout. Stores with a different version are
+not read.
+"""
+
+COLUMNS_FILE = "columns.json"
+""" str: Name of the file describing the columns of a feature store.
+"""
+
+BLOCKS_DIR = "blocks"
+""" str: Name of the directory containing the blocks of a feature store.
+"""
+
+VERSIONS_DIR = "versions"
+""" str: Name of the directory containing the column dictionaries of the previous
+feature versions.
+"""
+
+SPARSE_BLOCK = "sparse"
+""" str: Type of the blocks containing the sparse columns of a feature store.
+"""
+
+
+class FeatureStore:
+    """Binary, columnar storage of a feature matrix. Columns of the same type are
+    grouped in a column-major block, memory-mapped when the store is read.
+    """
+
+    def __init__(self, path, version=None):
+        """Class instantiation method
+
+        Args:
+            path (str): Path of the store directory.
+            version (int|None): Previous feature version to open. The current
+                version is opened if None. Previous versions are read-only.
+        """
+        self.path = path
+        self.version = version
+        self.blocks_path = join(self.path, BLOCKS_DIR)
+        self.versions_path = join(self.path, VERSIONS_DIR)
+
+        if version is None:
+            self.columns_filepath = join(self.path, COLUMNS_FILE)
+        else:
+            self.columns_filepath = join(self.versions_path, "%d.json" % version)
+
+        self._columns_info = None
+        self._column_index = {}
+        self._blocks = {}
+
+    def exists(self):
+        """Check that the store has been written to disk.
+
+        Returns:
+            bool: True if the store exists, False otherwise.
+        """
+        return exists(self.columns_filepath)
+
+    def _load_columns_info(self):
+        """Load the column dictionary, if not already loaded."""
+        if self._columns_info is not None:
+            return
+
+        with open(self.columns_filepath, "r", encoding="utf-8") as columns_fp:
+            columns_info = json.load(columns_fp)
+
+        if columns_info.get("version") != FEATURE_STORE_VERSION:
+            raise ValueError(
+                "Unsupported feature store version %s" % columns_info.get("version")
+            )
+
+        self._columns_info = columns_info
+        self._column_index = {
+            column["name"]: column for column in self._columns_info["columns"]
+        }
+        self._blocks = {}
+
+    def reload(self):
+        """Discard the column dictionary and blocks loaded so far."""
+        self._columns_info = None
+        self._column_index = {}
+        self._blocks = {}
+
+    @property
+    def columns(self):
+        """list: Names of the columns, in order."""
+        self._load_columns_info()
+        return [column["name"] for column in self._columns_info["columns"]]
+
+    @property
+    def dtypes(self):
+        """dict: Type of each column, indexed by column name."""
+        self._load_columns_info()
+        return {
+            column["name"]: column["dtype"] for column in self._columns_info["columns"]
+        }
+
+    @property
+    def shape(self):
+        """tuple: Number of rows and columns of the store."""
+        self._load_columns_info()
+        return self._columns_info["rows"], len(self._columns_info["columns"])
+
+    @property
+    def feature_version(self):
+        """int: Version number of the features."""
+        self._load_columns_info()
+        return self._columns_info["feature_version"]
+
+    @property
+    def parent(self):
+        """int|None: Version number of the features this version derives from."""
+        self._load_columns_info()
+        return self._columns_info["parent"]
+
+    @property
+    def versions(self):
+        """list: Version numbers of the previous feature versions, in order."""
+        if not exists(self.versions_path):
+            return []
+
+        return sorted(
+            int(splitext(version_file)[0])
+            for version_file in listdir(self.versions_path)
+            if version_file.endswith(".json")
+        )
+
+    @property
+    def test_cases(self):
+        """np.ndarray|None: Test case each row has been extracted from, None if
+        the test cases have not been recorded.
+        """
+        self._load_columns_info()
+        block_id = self._columns_info.get("test_cases")
+
+        if block_id is None:
+            return None
+
+        return self._get_block({"block": block_id, "dtype": "str"}).astype(object)
+
+    def get_version(self, version):
+        """Open a previous version of the features. The version is materialized
+        on demand, by reading it as any other store.
+
+        Args:
+            version (int): Version number.
+
+        Returns:
+            FeatureStore: Read-only store of the version.
+        """
+        version_store = FeatureStore(self.path, version)
+
+        if not version_store.exists():
+            raise KeyError("Feature version %d not in feature store" % version)
+
+        return version_store
+
+    def _get_block(self, column):
+        """Memory-map the block of a column. Blocks are opened copy-on-write so that
+        changes made to the returned arrays never reach the disk.
+        """
+        block_id = column["block"]
+
+        if block_id in self._blocks:
+            return self._blocks[block_id]
+
+        if column["dtype"] == SPARSE_BLOCK:
+            self._blocks[block_id] = sparse.load_npz(
+                join(self.blocks_path, "%s.npz" % block_id)
+            )
+        else:
+            self._blocks[block_id] = np.load(
+                join(self.blocks_path, "%s.npy" % block_id), mmap_mode="c"
+            )
+
+        return self._blocks[block_id]
+
+    def get_column(self, name):
+        """Retrieve a single column from the store, without reading the others.
+
+        Args:
+            name (str): Name of the column.
+
+        Returns:
+            np.ndarray|pd.arrays.SparseArray: Values of the column.
+        """
+        self._load_columns_info()
+
+        if name not in self._column_index:
+            raise KeyError("Column '%s' not in feature store" % name)
+
+        column = self._column_index[name]
+        column_values = self._get_block(column)[:, column["index"]]
+
+        if column["dtype"] == SPARSE_BLOCK:
+            return pd.arrays.SparseArray.from_spmatrix(column_values)
+
+        if column["dtype"] == "str":
+            return column_values.astype(object)
+
+        return column_values
+
+    def _get_sparse_matrix(self, columns):
+        """Retrieve sparse columns as a compressed sparse column matrix.
+
+        Args:
+            columns (list): Names of the sparse columns.
+
+        Returns:
+            sparse.csc_matrix: Matrix of the columns.
+        """
+        block_columns = {}
+
+        for column in columns:
+            block_columns.setdefault(self._column_index[column]["block"], []).append(
+                column
+            )
+
+        matrix_blocks = [
+            self._get_block(self._column_index[block_column_list[0]])[
+                :,
+                [self._column_index[column]["index"] for column in block_column_list],
+            ]
+            for block_column_list in block_columns.values()
+        ]
+        matrix = sparse.hstack(matrix_blocks, format="csc")
+        matrix_columns = [
+            column
+            for block_column_list in block_columns.values()
+            for column in block_column_list
+        ]
+
+        if matrix_columns != columns:
+            column_positions = {
+                column: position for position, column in enumerate(matrix_columns)
+            }
+            matrix = matrix[:, [column_positions[column] for column in columns]]
+
+        return matrix
+
+    def get_matrix(self, columns=None):
+        """Retrieve numeric columns as a sparse matrix, without building a
+        dataframe.
+
+        Args:
+            columns (list|None): Names of the columns to read. All the columns are
+                read if None.
+
+        Returns:
+            sparse.csr_matrix: Matrix of the columns.
+        """
+        if columns is None:
+            columns = self.columns
+
+        self._load_columns_info()
+
+        sparse_columns = [
+            column
+            for column in columns
+            if self._column_index[column]["dtype"] == SPARSE_BLOCK
+        ]
+        sparse_column_set = set(sparse_columns)
+        dense_columns = [
+            column for column in columns if column not in sparse_column_set
+        ]
+        matrix_blocks = []
+
+        if len(sparse_columns) > 0:
+            matrix_blocks.append(self._get_sparse_matrix(sparse_columns))
+
+        if len(dense_columns) > 0:
+            matrix_blocks.append(
+                sparse.csc_matrix(
+                    np.column_stack(
+                        [self.get_column(column) for column in dense_columns]
+                    ).astype(float)
+                )
+            )
+
+        if len(matrix_blocks) == 0:
+            return sparse.csr_matrix((self.shape[0], 0))
+
+        matrix = sparse.hstack(matrix_blocks, format="csc")
+        matrix_columns = sparse_columns + dense_columns
+
+        # Restore the requested column order
+        if matrix_columns != columns:
+            column_positions = {
+                column: position for position, column in enumerate(matrix_columns)
+            }
+            matrix = matrix[:, [column_positions[column] for column in columns]]
+
+        return matrix.tocsr()
+
+    def read(self, columns=None):
+        """Read the store as a dataframe.
+
+        Args:
+            columns (list|None): Names of the columns to read. All the columns are
+                read if None.
+
+        Returns:
+            pd.DataFrame: Feature dataframe.
+        """
+        if columns is None:
+            columns = self.columns
+
+        self._load_columns_info()
+
+        sparse_columns = [
+            column
+            for column in columns
+            if self._column_index[column]["dtype"] == SPARSE_BLOCK
+        ]
+
+        if len(sparse_columns) == 0:
+            return pd.DataFrame(
+                {column: self.get_column(column) for column in columns},
+                columns=columns,
+            )
+
+        # Sparse columns are read at once, which is much faster than reading them
+        # one by one.
+        sparse_features = pd.DataFrame.sparse.from_spmatrix(
+            self._get_sparse_matrix(sparse_columns), columns=sparse_columns
+        )
+        sparse_column_set = set(sparse_columns)
+        dense_features = pd.DataFrame(
+            {
+                column: self.get_column(column)
+                for column in columns
+                if column not in sparse_column_set
+            }
+        )
+        features = pd.concat([sparse_features, dense_features], axis=1)
+
+        if list(features.columns) != columns:
+            features = features[columns]
+
+        return features
+
+    def _check_writable(self):
+        """Ensure the store can be modified, i.e. it is not a previous version."""
+        if self.version is not None:
+            raise ValueError("Feature version %d is read-only" % self.version)
+
+    def _get_current_version_info(self):
+        """Retrieve the version number and parent of the current features.
+
+        Returns:
+            tuple: Version number and parent version of the current features.
+        """
+        if not self.exists():
+            return 1, None
+
+        try:
+            self._load_columns_info()
+        except ValueError:
+            LOGGER.warning("Overwriting unsupported feature store %s.", self.path)
+            return 1, None
+
+        return self._columns_info["feature_version"], self._columns_info["parent"]
+
+    def _commit(self, columns_info):
+        """Replace the current column dictionary and remove the blocks not referenced
+        by any version.
+
+        Args:
+            columns_info (dict): New column dictionary.
+        """
+        tmp_columns_filepath = "%s.tmp" % self.columns_filepath
+
+        with open(tmp_columns_filepath, "w", encoding="utf-8") as columns_fp:
+            json.dump(columns_info, columns_fp)
+
+        replace(tmp_columns_filepath, self.columns_filepath)
+        self.reload()
+        self._remove_unused_blocks()
+
+    def _remove_unused_blocks(self):
+        """Remove the blocks that are not referenced by any version."""
+        column_filepaths = [self.columns_filepath] + [
+            join(self.versions_path, "%d.json" % version) for version in self.versions
+        ]
+        used_blocks = set()
+
+        for column_filepath in column_filepaths:
+            with open(column_filepath, "r", encoding="utf-8") as columns_fp:
+                columns_info = json.load(columns_fp)
+
+            used_blocks.update(column["block"] for column in columns_info["columns"])
+
+            if columns_info.get("test_cases") is not None:
+                used_blocks.add(columns_info["test_cases"])
+
+        for block_file in listdir(self.blocks_path):
+            if splitext(block_file)[0] not in used_blocks:
+                remove(join(self.blocks_path, block_file))
+
+    def write(self, dataframe, test_cases=None):
+        """Write a dataframe to the store. Columns are grouped by type and each group
+        is saved as a column-major array. The previous content of the store is only
+        replaced once every array has been written.
+
+        Args:
+            dataframe (pd.DataFrame): Dataframe to save.
+            test_cases (list|np.ndarray|None): Test case each row has been extracted
+                from, not recorded if None.
+        """
+        self._check_writable()
+        makedirs(self.blocks_path, exist_ok=True)
+        feature_version, parent = self._get_current_version_info()
+
+        columns_info = {
+            "version": FEATURE_STORE_VERSION,
+            "feature_version": feature_version,
+            "parent": parent,
+            "rows": dataframe.shape[0],
+            "columns": [],
+            "test_cases": None,
+        }
+        block_columns = {}
+
+        if test_cases is not None:
+            if len(test_cases) != dataframe.shape[0]:
+                raise IndexError(
+                    "Number of test cases (%d) differs from number of rows (%d)"
+                    % (len(test_cases), dataframe.shape[0])
+                )
+
+            columns_info["test_cases"] = uuid4().hex
+            np.save(
+                join(self.blocks_path, "%s.npy" % columns_info["test_cases"]),
+                np.asarray(test_cases, dtype=str).reshape(-1),
+            )
+
+        for column in dataframe.columns:
+            column_dtype = dataframe[column].dtype
+
+            if isinstance(column_dtype, pd.SparseDtype):
+                block_dtype = SPARSE_BLOCK
+            elif column_dtype.kind in "biuf":
+                block_dtype = str(column_dtype)
+            else:
+                block_dtype = "str"
+
+            if block_dtype not in block_columns:
+                block_columns[block_dtype] = (uuid4().hex, [])
+
+            block_id, block_column_list = block_columns[block_dtype]
+            block_column_list.append(column)
+            columns_info["columns"].append(
+                {
+                    "name": str(column),
+                    "dtype": block_dtype,
+                    "block": block_id,
+                    "index": len(block_column_list) - 1,
+                }
+            )
+
+        for block_dtype, (block_id, block_column_list) in block_columns.items():
+            if block_dtype == SPARSE_BLOCK:
+                sparse.save_npz(
+                    join(self.blocks_path, "%s.npz" % block_id),
+                    self._to_csc_matrix(dataframe, block_column_list),
+                )
+                continue
+
+            if block_dtype == "str":
+                block = dataframe[block_column_list].astype(str).to_numpy(dtype=str)
+            else:
+                block = dataframe[block_column_list].to_numpy(dtype=block_dtype)
+
+            np.save(
+                join(self.blocks_path, "%s.npy" % block_id), np.asfortranarray(block)
+            )
+
+        # The column dictionary is written last, so that a store is only considered
+        # to exist once fully written.
+        self._commit(columns_info)
+
+        LOGGER.debug(
+            "Wrote %dx%d features to %s.",
+            dataframe.shape[0],
+            dataframe.shape[1],
+            self.path,
+        )
+
+    def select(self, columns):
+        """Keep a subset of the columns of the store. The selected columns keep
+        referencing the existing blocks, so that no data is written.
+
+        Args:
+            columns (list): Names of the columns to keep, in order.
+        """
+        self._check_writable()
+        self._load_columns_info()
+
+        missing_columns = [
+            column for column in columns if column not in self._column_index
+        ]
+
+        if len(missing_columns) > 0:
+            raise KeyError("Columns %s not in feature store" % str(missing_columns))
+
+        columns_info = dict(self._columns_info)
+        columns_info["columns"] = [self._column_index[column] for column in columns]
+
+        self._commit(columns_info)
+
+        LOGGER.debug("Selected %d columns of %s.", len(columns), self.path)
+
+    def create_version(self):
+        """Save the current features as a previous version, before modifying them.
+        Only the column dictionary is saved, the blocks are shared between versions.
+
+        Returns:
+            int: Number of the saved version.
+        """
+        self._check_writable()
+        self._load_columns_info()
+
+        feature_version = self._columns_info["feature_version"]
+        makedirs(self.versions_path, exist_ok=True)
+
+        with open(
+            join(self.versions_path, "%d.json" % feature_version), "w", encoding="utf-8"
+        ) as version_fp:
+            json.dump(self._columns_info, version_fp)
+
+        columns_info = dict(self._columns_info)
+        columns_info["feature_version"] = feature_version + 1
+        columns_info["parent"] = feature_version
+        self._commit(columns_info)
+
+        LOGGER.debug("Saved feature version %d of %s.", feature_version, self.path)
+        return feature_version
+
+    @staticmethod
+    def _to_csc_matrix(dataframe, columns):
+        """Build a compressed sparse column matrix from sparse dataframe columns.
+
+        Args:
+            dataframe (pd.DataFrame): Dataframe containing the columns.
+            columns (list): Names of the sparse columns.
+
+        Returns:
+            sparse.csc_matrix: Matrix of the columns.
+        """
+        matrix_indices = []
+        matrix_data = []
+        matrix_indptr = [0]
+
+        for column in columns:
+            column_values = dataframe[column].array
+
+            if column_values.fill_value != 0:
+                column_values = pd.arrays.SparseArray(
+                    np.asarray(column_values), fill_value=0
+                )
+
+            matrix_indices.append(column_values.sp_index.indices)
+            matrix_data.append(column_values.sp_values)
+            matrix_indptr.append(matrix_indptr[-1] + column_values.sp_index.npoints)
+
+        return sparse.csc_matrix(
+            (
+                np.concatenate(matrix_data).astype(float),
+                np.concatenate(matrix_indices),
+                np.array(matrix_indptr),
+            ),
+            shape=(dataframe.shape[0], len(columns)),
+        )
+
+    def copy(self, dest_path):
+        """Copy the store to another location.
+
+        Args:
+            dest_path (str): Path of the copy.
+
+        Returns:
+            FeatureStore: Store at the new location.
+        """
+        copytree(self.path, dest_path)
+        return FeatureStore(dest_path)
+
+    def import_csv(self, csv_filepath):
+        """Replace the content of the store with a CSV file.
+
+        Args:
+            csv_filepath (str): Path of the CSV file.
+        """
+        self.write(pd.read_csv(csv_filepath))
+
+    def export_csv(self, csv_filepath):
+        """Export the content of the store to a CSV file.
+
+        Args:
+            csv_filepath (str): Path of the CSV file.
+        """
+        self.read().to_csv(csv_filepath, index=False)
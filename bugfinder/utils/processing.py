@@ -46,3 +46,50 @@ def is_processing_stack_valid(operation_list, silent=False):
         "Operation queue validated in %s.", display_time(get_time() - _time)
     )
     return True
+
+
+def are_artifacts_overlapping(artifacts, other_artifacts):
+    """Check if two sets of artifacts share at least one artifact. Artifacts overlap
+    with their named items, e.g. `models` and `models/name`.
+
+    Args:
+        artifacts (set): First set of artifacts.
+        other_artifacts (set): Second set of artifacts.
+
+    Returns:
+        bool: True if the sets overlap, False otherwise.
+    """
+    for artifact in artifacts:
+        for other_artifact in other_artifacts:
+            if (
+                artifact == other_artifact
+                or artifact.startswith("%s/" % other_artifact)
+                or other_artifact.startswith("%s/" % artifact)
+            ):
+                return True
+
+    return False
+
+
+def are_operations_conflicting(op_artifacts, other_op_artifacts):
+    """Check if two operations cannot run concurrently, i.e. one of them writes an
+    artifact the other one reads or writes. Operations with undeclared artifacts
+    conflict with every other operation.
+
+    Args:
+        op_artifacts (tuple): Artifacts read and written by the first operation.
+        other_op_artifacts (tuple): Artifacts read and written by the second
+            operation.
+
+    Returns:
+        bool: True if the operations conflict, False otherwise.
+    """
+    op_reads, op_writes = op_artifacts
+    other_op_reads, other_op_writes = other_op_artifacts
+
+    if None in [op_reads, op_writes, other_op_reads, other_op_writes]:
+        return True
+
+    return are_artifacts_overlapping(
+        op_writes, other_op_reads | other_op_writes
+    ) or are_artifacts_overlapping(other_op_writes, op_reads | op_writes)
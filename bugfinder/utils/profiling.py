@@ -0,0 +1,327 @@
+""" Utilities to measure the resources used by processing operations.
+"""
+import resource
+from os import scandir, stat
+from os.path import exists, isdir
+from threading import Lock
+
+from bugfinder.settings import LOGGER
+from bugfinder.utils.statistics import display_time
+
+PROC_IO_FILE = "/proc/self/io"
+""" str: File containing the I/O counters of the current process.
+"""
+
+PROC_STATUS_FILE = "/proc/self/status"
+""" str: File containing the memory counters of the current process.
+"""
+
+PROC_CLEAR_REFS_FILE = "/proc/self/clear_refs"
+""" str: File used to reset the peak memory usage of the current process.
+"""
+
+RESOURCES_TABLE_COLUMNS = [
+    ("stage", "Stage"),
+    ("operation", "Operation"),
+    ("runs", "Runs"),
+    ("time", "Time"),
+    ("cpu_user", "CPU user"),
+    ("cpu_system", "CPU sys"),
+    ("peak_rss", "Peak RSS"),
+    ("read_bytes", "Read"),
+    ("write_bytes", "Written"),
+    ("files_touched", "Files"),
+    ("cypher_queries", "Queries"),
+    ("cypher_time", "Query time"),
+]
+""" list: Keys and headers of the columns of the resources table.
+"""
+
+
+def get_io_counters():
+    """Retrieve the number of bytes read and written by the current process and
+    its terminated children.
+
+    Returns:
+        tuple: Bytes read and written, (None, None) if the counters are not
+            available.
+    """
+    try:
+        with open(PROC_IO_FILE, "r", encoding="utf-8") as io_fp:
+            io_counters = dict(line.split(":") for line in io_fp if ":" in line)
+
+        return int(io_counters["rchar"]), int(io_counters["wchar"])
+    except (OSError, KeyError, ValueError):
+        return None, None
+
+
+def reset_peak_rss():
+    """Reset the peak memory usage of the current process.
+
+    Returns:
+        bool: True if the peak has been reset, False otherwise.
+    """
+    try:
+        with open(PROC_CLEAR_REFS_FILE, "w", encoding="utf-8") as clear_refs_fp:
+            clear_refs_fp.write("5")
+
+        return True
+    except OSError:
+        return False
+
+
+def get_peak_rss():
+    """Retrieve the peak memory usage of the current process since the last reset.
+
+    Returns:
+        int: Peak resident set size (in bytes).
+    """
+    try:
+        with open(PROC_STATUS_FILE, "r", encoding="utf-8") as status_fp:
+            for line in status_fp:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def get_files_snapshot(paths):
+    """Record the modification time and size of every file under a list of paths.
+
+    Args:
+        paths (list): Paths of files or directories.
+
+    Returns:
+        dict: Modification time (in ns) and size of each file, indexed by path.
+    """
+    files_snapshot = {}
+    dirs_to_scan = []
+
+    for path in paths:
+        if not exists(path):
+            continue
+
+        if isdir(path):
+            dirs_to_scan.append(path)
+        else:
+            path_stat = stat(path)
+            files_snapshot[path] = (path_stat.st_mtime_ns, path_stat.st_size)
+
+    while len(dirs_to_scan) != 0:
+        with scandir(dirs_to_scan.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    dirs_to_scan.append(entry.path)
+                    continue
+
+                entry_stat = entry.stat(follow_symlinks=False)
+                files_snapshot[entry.path] = (
+                    entry_stat.st_mtime_ns,
+                    entry_stat.st_size,
+                )
+
+    return files_snapshot
+
+
+class ResourceProfiler:
+    """Measure the resources used by the process while an operation runs. CPU time,
+    memory and I/O are measured for the whole process, including terminated child
+    processes. They include the resources used by other operations running at the
+    same time. The peak memory usage is only reset when no other profiler is
+    running, so the peak of concurrent operations is the peak of the process since
+    the first of them started.
+    """
+
+    active_profilers = 0
+    """ int: Number of profilers started and not stopped yet, in every thread.
+    """
+
+    _active_profilers_lock = Lock()
+
+    def __init__(self, paths=None):
+        """Class instantiation method
+
+        Args:
+            paths (list|None): Paths where the files touched by the operation are
+                counted. Files are not counted if None.
+        """
+        self.paths = paths
+        self._start_usage = None
+        self._start_io = None
+        self._start_files = None
+        self._peak_rss_reset = False
+
+    def start(self):
+        """Take the initial measurements."""
+        self._start_files = (
+            get_files_snapshot(self.paths) if self.paths is not None else None
+        )
+        self._start_usage = (
+            resource.getrusage(resource.RUSAGE_SELF),
+            resource.getrusage(resource.RUSAGE_CHILDREN),
+        )
+        self._start_io = get_io_counters()
+
+        with ResourceProfiler._active_profilers_lock:
+            # Resetting the peak would hide the peak of the running operations.
+            self._peak_rss_reset = (
+                reset_peak_rss() if ResourceProfiler.active_profilers == 0 else None
+            )
+            ResourceProfiler.active_profilers += 1
+
+    def stop(self):
+        """Take the final measurements.
+
+        Returns:
+            dict: Resources used since `start` was called.
+        """
+        with ResourceProfiler._active_profilers_lock:
+            ResourceProfiler.active_profilers -= 1
+
+        self_usage = resource.getrusage(resource.RUSAGE_SELF)
+        children_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+        read_bytes, write_bytes = get_io_counters()
+        start_self_usage, start_children_usage = self._start_usage
+
+        peak_rss = get_peak_rss()
+
+        if self._peak_rss_reset is False:
+            LOGGER.debug("Peak memory usage could not be reset.")
+
+        # Children peak is only known for the biggest child since the process start.
+        if children_usage.ru_maxrss > start_children_usage.ru_maxrss:
+            peak_rss = max(peak_rss, children_usage.ru_maxrss * 1024)
+
+        resources = {
+            "cpu_user": (self_usage.ru_utime - start_self_usage.ru_utime)
+            + (children_usage.ru_utime - start_children_usage.ru_utime),
+            "cpu_system": (self_usage.ru_stime - start_self_usage.ru_stime)
+            + (children_usage.ru_stime - start_children_usage.ru_stime),
+            "peak_rss": peak_rss,
+            "read_bytes": None,
+            "write_bytes": None,
+            "files_touched": None,
+        }
+
+        if read_bytes is not None and self._start_io[0] is not None:
+            resources["read_bytes"] = read_bytes - self._start_io[0]
+            resources["write_bytes"] = write_bytes - self._start_io[1]
+
+        if self._start_files is not None:
+            end_files = get_files_snapshot(self.paths)
+            resources["files_touched"] = (
+                len(end_files.keys() - self._start_files.keys())
+                + len(self._start_files.keys() - end_files.keys())
+                + len(
+                    [
+                        filepath
+                        for filepath in end_files.keys() & self._start_files.keys()
+                        if end_files[filepath] != self._start_files[filepath]
+                    ]
+                )
+            )
+
+        return resources
+
+
+def display_bytes(size):
+    """Display a size in a human friendly manner."""
+    for unit in ["B", "KB", "MB", "GB"]:
+        if abs(size) < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+
+        size /= 1024
+
+    return f"{size:.1f}TB"
+
+
+def get_resources_table(summary):
+    """Aggregate the resources recorded in a dataset summary by operation.
+
+    Args:
+        summary (dict): Dataset summary.
+
+    Returns:
+        list: One dictionary per stage and operation.
+    """
+    table_rows = {}
+
+    for stage, stage_records in summary.items():
+        if stage == "metadata":
+            continue
+
+        if isinstance(stage_records, dict):  # Training sessions are grouped by model
+            stage_records = [
+                session
+                for model_summary in stage_records.values()
+                for session in model_summary["sessions"]
+            ]
+
+        for record in stage_records:
+            if "resources" not in record:
+                continue
+
+            operation = record["operation"]["class"].split(".")[-1]
+            table_row = table_rows.setdefault(
+                (stage, operation),
+                {"stage": stage, "operation": operation, "runs": 0, "time": 0},
+            )
+            table_row["runs"] += 1
+            table_row["time"] += record["time"]
+
+            for key, value in record["resources"].items():
+                if value is None:
+                    continue
+
+                if key == "peak_rss":
+                    table_row[key] = max(table_row.get(key, 0), value)
+                else:
+                    table_row[key] = table_row.get(key, 0) + value
+
+    return list(table_rows.values())
+
+
+def format_resources_table(summary):
+    """Format the resources recorded in a dataset summary as a text table, with one
+    line per stage and operation.
+
+    Args:
+        summary (dict): Dataset summary.
+
+    Returns:
+        str: Resources table.
+    """
+    formatters = {
+        "time": display_time,
+        "cpu_user": lambda value: display_time(int(value * 1000)),
+        "cpu_system": lambda value: display_time(int(value * 1000)),
+        "peak_rss": display_bytes,
+        "read_bytes": display_bytes,
+        "write_bytes": display_bytes,
+        "cypher_time": display_time,
+    }
+
+    table_lines = [[header for _, header in RESOURCES_TABLE_COLUMNS]]
+
+    for table_row in get_resources_table(summary):
+        table_lines.append(
+            [
+                formatters.get(key, str)(table_row[key]) if key in table_row else "-"
+                for key, _ in RESOURCES_TABLE_COLUMNS
+            ]
+        )
+
+    column_widths = [
+        max(len(table_line[column_index]) for table_line in table_lines)
+        for column_index in range(len(RESOURCES_TABLE_COLUMNS))
+    ]
+
+    return "\n".join(
+        "  ".join(
+            cell.ljust(width) if column_index < 2 else cell.rjust(width)
+            for column_index, (cell, width) in enumerate(zip(table_line, column_widths))
+        ).rstrip()
+        for table_line in table_lines
+    )
@@ -61,3 +61,22 @@ def has_better_metrics(
             return False
 
     return True
+
+
+def get_dedup_stats(files_count, unique_files_count):
+    """Compute the deduplication statistics of a set of files.
+
+    Args:
+        files_count (int): Number of files.
+        unique_files_count (int): Number of files with a distinct content.
+
+    Returns:
+        dict: Number of files, of unique files and ratio between both.
+    """
+    return {
+        "files": files_count,
+        "unique_files": unique_files_count,
+        "dedup_ratio": files_count / unique_files_count
+        if unique_files_count > 0
+        else 1.0,
+    }
@@ -0,0 +1,92 @@
+""" Micro-benchmark comparing the lexer used by TokenizeCode with the previous
+line-by-line tokenization.
+"""
+from os.path import dirname, join
+
+import sys
+
+sys.path.append(join(dirname(__file__), ".."))
+
+import argparse
+import re
+from os import listdir
+from timeit import repeat
+
+from bugfinder.base.dataset import CodeWeaknessClassificationDataset as Dataset
+from bugfinder.processing.tokenizers import (
+    AbstractTokenizer,
+    triple_char_ops,
+    double_char_ops,
+    single_char_ops,
+)
+from bugfinder.processing.tokenizers.lexer import code_lexer
+
+
+def to_regex(ops):
+    return r"|".join([f"({re.escape(op)})" for op in ops])
+
+
+def line_tokenize(code):
+    """Previous tokenization, splitting every line with a regex built per file."""
+    tokens = []
+
+    regex_split_operators = (
+        to_regex(triple_char_ops)
+        + to_regex(double_char_ops)
+        + to_regex(single_char_ops)
+    )
+
+    for line in code.splitlines(keepends=True):
+        line = re.sub("(\n)|(\\\\n)|(\\\\)|(\\t)|(\\r)", "", line)
+        splitter = r" +|" + regex_split_operators + r"|(\/)|(\;)|(\-)|(\*)"
+
+        line = re.split(splitter, line)
+
+        line = list(filter(None, line))
+        line = list(filter(str.strip, line))
+
+        tokens.extend(line)
+
+    return tokens
+
+
+def lexer_tokenize(code):
+    """Tokenization with the compiled lexer."""
+    return code_lexer.tokenize(code)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("dataset_path", help="path to the dataset to tokenize")
+    parser.add_argument(
+        "--repeat", "-r", type=int, default=5, help="number of measurements"
+    )
+
+    args = parser.parse_args()
+
+    dataset = Dataset(args.dataset_path)
+    corpus = []
+
+    for test_case in dataset.test_cases:
+        for filename in listdir(join(dataset.path, test_case)):
+            if AbstractTokenizer.match_file(filename):
+                with open(join(dataset.path, test_case, filename), "r") as in_file:
+                    corpus.append(in_file.read())
+
+    print(f"Tokenizing {len(corpus)} files, best of {args.repeat} runs:")
+    timings = {}
+
+    for tokenize_fn in [line_tokenize, lexer_tokenize]:
+        timings[tokenize_fn.__name__] = min(
+            repeat(
+                lambda: [tokenize_fn(code) for code in corpus],
+                number=1,
+                repeat=args.repeat,
+            )
+        )
+        print(f"  {tokenize_fn.__name__}: {timings[tokenize_fn.__name__]:.4f}s")
+
+    print(
+        "Speedup: %.1fx"
+        % (timings["line_tokenize"] / max(timings["lexer_tokenize"], 1e-9))
+    )
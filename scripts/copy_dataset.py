@@ -28,6 +28,13 @@ if __name__ == "__main__":
     parser.add_argument(
         "--force", "-f", action="store_true", help="force copy if output path exists"
     )
+    parser.add_argument(
+        "--link",
+        "-l",
+        action="store_true",
+        help="share the test case files with reflinks or hard links instead of "
+        "copying them",
+    )
 
     # Parse input arguments
     args = parser.parse_args()
@@ -35,6 +42,7 @@ if __name__ == "__main__":
     # Create a copy of the annotated dataset to avoid overwriting
     input_dataset = Dataset(args.input)
     input_dataset.queue_operation(
-        CopyDataset, {"to_path": args.output, "force": args.force}
+        CopyDataset,
+        {"to_path": args.output, "force": args.force, "link_files": args.link},
     )
     input_dataset.process()
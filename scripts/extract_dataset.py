@@ -36,6 +36,19 @@ if __name__ == "__main__":
     parser.add_argument(
         "--force", "-f", action="store_true", help="force copy if output path exists"
     )
+    parser.add_argument(
+        "--link",
+        "-l",
+        action="store_true",
+        help="share the test case files with reflinks or hard links instead of "
+        "copying them",
+    )
+    parser.add_argument(
+        "--view",
+        "-v",
+        action="store_true",
+        help="create a view listing the extracted test cases instead of copying them",
+    )
 
     # Parse input arguments
     args = parser.parse_args()
@@ -44,7 +57,13 @@ if __name__ == "__main__":
     input_dataset = Dataset(args.input)
     input_dataset.queue_operation(
         ExtractSampleDataset,
-        {"to_path": args.output, "sample_nb": args.number, "force": args.force},
+        {
+            "to_path": args.output,
+            "sample_nb": args.number,
+            "force": args.force,
+            "link_files": args.link,
+            "as_view": args.view,
+        },
     )
 
     input_dataset.process()
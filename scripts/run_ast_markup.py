@@ -43,6 +43,12 @@ if __name__ == "__main__":
         help="path to the dataset to clean",
     )
 
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = parser.parse_args()
 
     # Instantiate dataset class and run AST markup processing
@@ -57,4 +63,4 @@ if __name__ == "__main__":
         else:  # operation is a DataProcessing class
             dataset.queue_operation(operation)
 
-    dataset.process()
+    dataset.process(force=args.force)
@@ -52,6 +52,12 @@ if __name__ == "__main__":
         help="Size of the embedding vector to be created",
     )
 
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = parser.parse_args()
     kwargs = dict()
 
@@ -74,4 +80,4 @@ if __name__ == "__main__":
 
     dataset.queue_operation(operation["class"], operation["args"])
 
-    dataset.process()
+    dataset.process(force=args.force)
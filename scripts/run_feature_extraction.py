@@ -67,6 +67,18 @@ if __name__ == "__main__":
         action="store_true",
         help="map features only (does not create csv file)",
     )
+    parser.add_argument(
+        "--sparse",
+        "-s",
+        action="store_true",
+        help="extract features as a sparse matrix",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
 
     args = parser.parse_args()
 
@@ -90,6 +102,9 @@ if __name__ == "__main__":
     if args.map_features:
         operation_params["need_map_features"] = True
 
+    if args.sparse:
+        operation_params["sparse_features"] = True
+
     # FIXME modify docker processing to have extra container configuration without
     #   raising error.
     if args.timeout and args.extractor == "iprc":
@@ -100,4 +115,4 @@ if __name__ == "__main__":
     else:
         dataset.queue_operation(operation_class)
 
-    dataset.process()
+    dataset.process(force=args.force)
@@ -189,6 +189,12 @@ if __name__ == "__main__":
     for option in options_map.values():
         parser.add_argument(*option["args"], **option["kwargs"])
 
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = parser.parse_args()
 
     # Check required arguments are all present and forbidden arguments are not defined
@@ -228,4 +234,4 @@ if __name__ == "__main__":
     is_operation_valid(operation_class)
     dataset.queue_operation(operation_class, operation_args)
 
-    dataset.process()
+    dataset.process(force=args.force)
@@ -30,6 +30,12 @@ if __name__ == "__main__":
     parser.add_argument(
         "--timeout", help="timeout for Neo4J queries", type=str, default="2h"
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = parser.parse_args()
 
     dataset = Dataset(args.dataset_path)
@@ -46,4 +52,4 @@ if __name__ == "__main__":
             },
         },
     )
-    dataset.process()
+    dataset.process(force=args.force)
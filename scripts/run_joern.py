@@ -46,11 +46,46 @@ if __name__ == "__main__":
         help="path to the dataset to clean",
     )
 
+    parser.add_argument(
+        "--shards",
+        "-s",
+        type=int,
+        default=1,
+        help="number of shards parsed concurrently by Joern (0.4.0 only)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        "-i",
+        action="store_true",
+        help="only parse the test cases changed since the last run (0.4.0 only)",
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = parser.parse_args()
 
     # Instantiate dataset class and run joern processing
     dataset = Dataset(args.dataset_path)
 
+    joern_args = {}
+
+    if args.shards > 1:
+        joern_args["shards"] = args.shards
+
+    if args.incremental:
+        joern_args["incremental"] = True
+
+    if len(joern_args) != 0:
+        options[args.version][0] = {
+            "class": options[args.version][0],
+            "args": joern_args,
+        }
+
     if not is_processing_stack_valid(options[args.version]):
         raise TypeError("Invalid processing stack.")
 
@@ -60,4 +95,4 @@ if __name__ == "__main__":
         else:  # operation is a DataProcessing class
             dataset.queue_operation(operation)
 
-    dataset.process()
+    dataset.process(force=args.force)
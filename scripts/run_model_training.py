@@ -128,6 +128,12 @@ if __name__ == "__main__":
         help="file containing the feature map",
     )
 
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = parser.parse_args()
     kwargs = dict()
 
@@ -162,4 +168,4 @@ if __name__ == "__main__":
 
     dataset.queue_operation(operation["class"], operation["args"])
 
-    dataset.process()
+    dataset.process(force=args.force)
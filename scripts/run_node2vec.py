@@ -85,6 +85,12 @@ if __name__ == "__main__":
         help="seed for the training for reproducibility purposes",
     )
 
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = parser.parse_args()
     kwargs = dict()
 
@@ -111,4 +117,4 @@ if __name__ == "__main__":
 
     dataset.queue_operation(operation["class"], operation["args"])
 
-    dataset.process()
+    dataset.process(force=args.force)
@@ -36,21 +36,47 @@ if __name__ == "__main__":
         type=str,
         required=True,
     )
+    parser.add_argument(
+        "--batch_size",
+        help="maximum number of sinks tagged by a single query",
+        type=int,
+        default=None,
+    )
+    parser.add_argument(
+        "--no_sinks_cache",
+        action="store_true",
+        help="do not read or write the cached index of the sinks file",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = parser.parse_args()
 
+    if args.batch_size is not None and args.batch_size < 1:
+        parser.error("argument --batch_size: must be at least 1")
+
+    command_args = {
+        "log_input": args.run_failed,
+        "log_output": args.log_failed,
+        "sinks": args.sinks,
+        "cache_sinks": not args.no_sinks_cache,
+    }
+
+    if args.batch_size is not None:
+        command_args["batch_size"] = args.batch_size
+
     dataset = Dataset(args.dataset_path)
     dataset.queue_operation(RightFixer, {"command_args": "neo4j_v3.db 101 101"})
     dataset.queue_operation(
         SinkTaggingProcessing,
         {
-            "command_args": {
-                "log_input": args.run_failed,
-                "log_output": args.log_failed,
-                "sinks": args.sinks,
-            },
+            "command_args": command_args,
             "container_config": {
                 "timeout": args.timeout,
             },
         },
     )
-    dataset.process()
+    dataset.process(force=args.force)
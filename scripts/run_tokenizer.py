@@ -7,6 +7,7 @@ sys.path.append(join(dirname(__file__), ".."))
 import argparse
 
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset as Dataset
+from bugfinder.processing.pipeline import SourceTransformPipeline
 
 from bugfinder.processing.tokenizers.replace_functions import ReplaceFunctions
 from bugfinder.processing.tokenizers.replace_variables import ReplaceVariables
@@ -26,12 +27,35 @@ if __name__ == "__main__":
     for option in options.keys():
         parser.add_argument("--%s" % option.replace("_", "-"), action="store_true")
 
+    parser.add_argument(
+        "--fused",
+        action="store_true",
+        help="apply the code transformations in a single pass over the files",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="run the operations even if they are up-to-date",
+    )
+
     args = vars(parser.parse_args())
 
     dataset = Dataset(args["dataset_path"])
 
+    pipeline_steps = []
+
     for option_name, option_class in options.items():
-        if args[option_name]:
+        if not args[option_name]:
+            continue
+
+        if args["fused"]:
+            pipeline_steps.append(
+                "%s.%s" % (option_class.__module__, option_class.__name__)
+            )
+        else:
             dataset.queue_operation(option_class)
 
-    dataset.process()
+    if len(pipeline_steps) != 0:
+        dataset.queue_operation(SourceTransformPipeline, {"steps": pipeline_steps})
+
+    dataset.process(force=args["force"])
@@ -0,0 +1,24 @@
+from os.path import dirname, join
+import sys
+
+sys.path.append(join(dirname(__file__), ".."))
+
+import argparse
+import json
+
+from bugfinder.settings import SUMMARY_FILE
+from bugfinder.utils.profiling import format_resources_table
+
+if __name__ == "__main__":
+    # Setup the argument parser
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "dataset_path", help="path to the dataset to display the resources of"
+    )
+
+    args = parser.parse_args()
+
+    with open(join(args.dataset_path, SUMMARY_FILE), "r") as summary_fp:
+        summary = json.load(summary_fp)
+
+    print(format_resources_table(summary))
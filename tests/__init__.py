@@ -7,7 +7,7 @@ from os.path import join
 from unittest.mock import patch
 
 from bugfinder.base.processing import AbstractProcessing
-from bugfinder.settings import SUMMARY_FILE
+from bugfinder.settings import SUMMARY_FILE, INDEX_FILE
 
 
 class MockAbstractProcessing(AbstractProcessing):
@@ -26,7 +26,7 @@ def directory_shasum(directory):
 
     for root, dirs, files in os.walk(directory):
         for f in files:
-            if f == SUMMARY_FILE:  # Ignore summary.json file
+            if f in [SUMMARY_FILE, INDEX_FILE]:  # Ignore dataset metadata files
                 continue
 
             fpath = join(root, f)
@@ -1,5 +1,9 @@
-from os import remove
-from os.path import join
+import json
+from os import makedirs, remove, utime
+from os.path import join, exists
+from shutil import copytree
+from tempfile import TemporaryDirectory
+from threading import Barrier
 from unittest import TestCase
 
 import pandas as pd
@@ -10,10 +14,54 @@ from bugfinder.base.dataset import (
     CodeWeaknessClassificationDataset,
     DatasetQueueRetCode,
 )
+from bugfinder.base.processing import DatasetArtifact, ProcessingCategory
 from bugfinder.settings import DATASET_DIRS
+from bugfinder.utils.feature_store import FeatureStore
 from tests import MockAbstractProcessing, patch_paths
 
 
+class MockFeaturesProcessing(MockAbstractProcessing):
+    reads = {DatasetArtifact.FEATURES}
+    writes = {DatasetArtifact.MODELS}
+    named_artifacts = {DatasetArtifact.MODELS}
+    events = []
+    barrier = None
+
+    def execute(self, name):
+        self.events.append("start %s" % name)
+
+        if self.barrier is not None:
+            self.barrier.wait()
+
+        self.events.append("end %s" % name)
+
+
+class MockGraphProcessing(MockAbstractProcessing):
+    reads = {DatasetArtifact.NEO4J}
+    writes = {DatasetArtifact.NEO4J}
+    output_args = {"log_output"}
+    write_mode = "a"
+    events = []
+
+    def execute(self, step, sinks=None, log_output=None):
+        self.events.append(step)
+
+        graph_path = join(self.dataset.path, DATASET_DIRS["neo4j"])
+        makedirs(graph_path, exist_ok=True)
+
+        with open(join(graph_path, "graph.txt"), self.write_mode) as graph_fp:
+            graph_fp.write("%s\n" % step)
+
+        if log_output is not None:
+            with open(log_output, "a") as log_fp:
+                log_fp.write("%s\n" % step)
+
+
+class MockGraphImporter(MockGraphProcessing):
+    reads = {DatasetArtifact.JOERN}
+    write_mode = "w"
+
+
 class TestCodeWeaknessClassificationDatasetInit(TestCase):
     dataset_path = "mock_dataset_path/"
 
@@ -33,6 +81,7 @@ class TestCodeWeaknessClassificationDatasetInit(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -82,10 +131,12 @@ class TestCodeWeaknessClassificationDatasetRebuildIndex(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join("./tests/fixtures/dataset01", settings.SUMMARY_FILE))
+            remove(join("./tests/fixtures/dataset01", settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
         try:
             remove(join("./tests/fixtures/dataset02", settings.SUMMARY_FILE))
+            remove(join("./tests/fixtures/dataset02", settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -139,6 +190,255 @@ class TestCodeWeaknessClassificationDatasetRebuildIndex(TestCase):
         self.assertEqual(len(dataset.test_cases), 0)
 
 
+class TestCodeWeaknessClassificationDatasetIndexCache(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self, ["bugfinder.base.dataset.LOGGER", "bugfinder.utils.processing.LOGGER"]
+        )
+
+        self.dataset_path = "./tests/fixtures/dataset01"
+
+    def tearDown(self) -> None:
+        try:
+            remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
+        except FileNotFoundError:
+            pass  # Ignore FileNotFound errors
+
+    def test_index_file_is_created(self):
+        CodeWeaknessClassificationDataset(self.dataset_path)
+
+        self.assertTrue(exists(join(self.dataset_path, settings.INDEX_FILE)))
+
+    @patch("bugfinder.base.dataset.is_tree_unchanged")
+    def test_unchanged_classes_are_not_scanned(self, mock_is_tree_unchanged):
+        mock_is_tree_unchanged.return_value = True
+        dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        with patch("bugfinder.base.dataset.scan_tree") as mock_scan_tree:
+            cached_dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        self.assertFalse(mock_scan_tree.called)
+        self.assertEqual(cached_dataset.classes, dataset.classes)
+        self.assertEqual(cached_dataset.test_cases, dataset.test_cases)
+        self.assertEqual(cached_dataset.test_case_files, dataset.test_case_files)
+        self.assertEqual(cached_dataset.stats, dataset.stats)
+
+    @patch("bugfinder.base.dataset.is_tree_unchanged")
+    def test_changed_classes_are_scanned(self, mock_is_tree_unchanged):
+        mock_is_tree_unchanged.side_effect = lambda path, dirs: ("class02" not in dirs)
+        CodeWeaknessClassificationDataset(self.dataset_path)
+
+        with patch("bugfinder.base.dataset.scan_tree") as mock_scan_tree:
+            mock_scan_tree.return_value = ({}, {})
+            dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        mock_scan_tree.assert_called_once_with(dataset.path, "class02")
+        self.assertEqual(
+            dataset.test_cases,
+            {"class01/tc02", "class01/tc03", "class03/tc01"},
+        )
+
+    def test_invalid_index_file_is_ignored(self):
+        with open(join(self.dataset_path, settings.INDEX_FILE), "w") as index_fp:
+            index_fp.write("{invalid json")
+
+        dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        self.assertEqual(len(dataset.test_cases), 6)
+
+    def test_test_case_files_are_correct(self):
+        dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        self.assertEqual(dataset.test_case_files["class01/tc02"], ["item.c", "item.h"])
+        self.assertEqual(
+            dataset.test_case_files["class03/tc01"], ["item_01a.c", "item_01b.c"]
+        )
+
+
+class TestCodeWeaknessClassificationDatasetUpdateIndex(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self, ["bugfinder.base.dataset.LOGGER", "bugfinder.utils.processing.LOGGER"]
+        )
+
+        self.dataset_path = "./tests/fixtures/dataset01"
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+    def tearDown(self) -> None:
+        try:
+            remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
+        except FileNotFoundError:
+            pass  # Ignore FileNotFound errors
+
+    def test_only_given_test_cases_are_scanned(self):
+        with patch("bugfinder.base.dataset.scan_tree") as mock_scan_tree:
+            mock_scan_tree.return_value = ({}, {"class01/tc02": ["item.c"]})
+            self.dataset.update_index(modified=["class01/tc02"])
+
+        mock_scan_tree.assert_called_once_with(self.dataset.path, "class01/tc02")
+        self.assertEqual(self.dataset.test_case_files["class01/tc02"], ["item.c"])
+
+    def test_removed_test_cases_are_not_indexed(self):
+        with patch("bugfinder.base.dataset.scan_tree") as mock_scan_tree:
+            self.dataset.update_index(removed=["class02/tc01"])
+
+        self.assertFalse(mock_scan_tree.called)
+        self.assertNotIn("class02/tc01", self.dataset.test_cases)
+        self.assertNotIn("class02/tc01", self.dataset.test_case_files)
+        self.assertEqual(len(self.dataset.test_cases), 5)
+
+    def test_stats_are_updated(self):
+        self.dataset.update_index(removed=["class02/tc01"])
+
+        self.assertEqual(self.dataset.stats, [0.4, 0.4, 0.2])
+
+    @patch("bugfinder.base.dataset.isdir")
+    def test_added_test_cases_are_indexed(self, mock_isdir):
+        mock_isdir.return_value = True
+
+        with patch("bugfinder.base.dataset.scan_tree") as mock_scan_tree:
+            mock_scan_tree.return_value = (
+                {"class01/tc05": [0, 1, 2]},
+                {"class01/tc05": ["item.c"]},
+            )
+            self.dataset.update_index(added=["class01/tc05"])
+
+        self.assertIn("class01/tc05", self.dataset.test_cases)
+        self.assertEqual(self.dataset.stats, [3 / 7, 3 / 7, 1 / 7])
+
+    def test_parent_signatures_are_invalidated(self):
+        self.dataset._index_cache["classes"]["class01"]["dirs"]["class01"] = [0, 0, 0]
+        self.dataset.update_index(removed=["class01/tc02"])
+
+        self.assertIsNone(
+            self.dataset._index_cache["classes"]["class01"]["dirs"]["class01"]
+        )
+
+    def test_unchanged_features_are_not_reloaded(self):
+        with patch("bugfinder.base.dataset.get_signature") as mock_get_signature:
+            mock_get_signature.return_value = [0, 1, 2]
+            self.dataset._features_signature = [0, 1, 2]
+
+            with patch("bugfinder.base.dataset.pd.read_csv") as mock_read_csv:
+                self.dataset.update_index()
+
+        self.assertFalse(mock_read_csv.called)
+
+    def test_changed_features_are_reloaded(self):
+        with patch("bugfinder.base.dataset.get_signature") as mock_get_signature:
+            mock_get_signature.return_value = [0, 1, 2]
+            self.dataset._features_signature = [3, 4, 5]
+
+            with patch("bugfinder.base.dataset.pd.read_csv") as mock_read_csv:
+                mock_read_csv.return_value = self.dataset.features
+                self.dataset.update_index()
+
+        self.assertTrue(mock_read_csv.called)
+
+    def test_summary_metadata_is_updated(self):
+        self.dataset.update_index(removed=["class02/tc01"])
+
+        self.assertEqual(self.dataset.summary["metadata"]["test_cases"], 5)
+
+    def test_large_deltas_rescan_the_class(self):
+        with patch("bugfinder.base.dataset.scan_tree") as mock_scan_tree:
+            mock_scan_tree.return_value = (
+                {"class02": [0, 1, 2]},
+                {"class02/tc01": ["item.c"], "class02/tc02": ["item.c"]},
+            )
+            self.dataset.update_index(modified=["class02/tc01", "class02/tc02"])
+
+        mock_scan_tree.assert_called_once_with(self.dataset.path, "class02")
+        self.assertNotIn("class02/tc03", self.dataset.test_cases)
+        self.assertIn("class02/tc01", self.dataset.test_cases)
+
+    def test_rescanned_class_excludes_removed_test_cases(self):
+        self.dataset.update_index(
+            removed=["class02/tc01"], modified=["class02/tc02", "class02/tc03"]
+        )
+
+        self.assertNotIn("class02/tc01", self.dataset.test_case_files)
+        self.assertEqual(len(self.dataset.test_cases), 5)
+
+
+class TestCodeWeaknessClassificationDatasetFeatureStore(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self, ["bugfinder.base.dataset.LOGGER", "bugfinder.utils.processing.LOGGER"]
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset01")
+        copytree("./tests/fixtures/dataset01", self.dataset_path)
+
+        self.csv_features = pd.read_csv(
+            join(self.dataset_path, "features", settings.FEATURES_FILE)
+        )
+        self.store_features = self.csv_features[["name", "result", "f01", "f02"]]
+        FeatureStore(
+            join(self.dataset_path, "features", settings.FEATURES_STORE)
+        ).write(self.store_features)
+
+    def test_recent_store_is_used(self):
+        dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        self.assertTrue(self.store_features.equals(dataset.features))
+
+    def test_store_is_read_on_first_access(self):
+        with patch("bugfinder.base.dataset.FeatureStore.read") as mock_read:
+            dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+            self.assertFalse(mock_read.called)
+            self.assertEqual(dataset.summary["metadata"]["features"]["number"], 4)
+
+            dataset.features
+            self.assertTrue(mock_read.called)
+
+    def test_recent_csv_file_is_used(self):
+        store_columns_filepath = join(
+            self.dataset_path, "features", settings.FEATURES_STORE, "columns.json"
+        )
+        utime(store_columns_filepath, ns=(0, 0))
+
+        dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        self.assertTrue(self.csv_features.equals(dataset.features))
+
+    def test_features_matrix_is_read_from_store(self):
+        dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        with patch("bugfinder.base.dataset.FeatureStore.read") as mock_read:
+            features_matrix = dataset.get_features_matrix()
+
+        self.assertFalse(mock_read.called)
+        self.assertEqual(
+            features_matrix.toarray().tolist(),
+            self.store_features[["f01", "f02"]].values.tolist(),
+        )
+
+    def test_features_matrix_is_built_from_features(self):
+        dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+        dataset.features = self.csv_features
+
+        self.assertEqual(
+            dataset.get_features_matrix().toarray().tolist(),
+            self.csv_features.drop(["result", "name"], axis=1).values.tolist(),
+        )
+
+    def test_store_backups_are_versioned(self):
+        FeatureStore(join(self.dataset_path, "features", settings.FEATURES_STORE)).copy(
+            join(self.dataset_path, "features", "features.4.store")
+        )
+
+        dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        self.assertEqual(dataset.feats_version, 5)
+
+
 class TestCodeWeaknessClassificationDatasetGetFeaturesInfo(TestCase):
     def setUp(self) -> None:
         patch_paths(
@@ -148,10 +448,12 @@ class TestCodeWeaknessClassificationDatasetGetFeaturesInfo(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join("./tests/fixtures/dataset01", settings.SUMMARY_FILE))
+            remove(join("./tests/fixtures/dataset01", settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
         try:
             remove(join("./tests/fixtures/dataset02", settings.SUMMARY_FILE))
+            remove(join("./tests/fixtures/dataset02", settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -168,6 +470,79 @@ class TestCodeWeaknessClassificationDatasetGetFeaturesInfo(TestCase):
             dataset.get_features_info()
 
 
+class TestCodeWeaknessClassificationDatasetGetFeaturesStats(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self, ["bugfinder.base.dataset.LOGGER", "bugfinder.utils.processing.LOGGER"]
+        )
+
+        self.dataset_path = "./tests/fixtures/dataset01"
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+        self.dataset._features_signature = [0, 1, 2]
+
+    def tearDown(self) -> None:
+        try:
+            remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
+        except FileNotFoundError:
+            pass  # Ignore FileNotFound errors
+
+    def test_stats_are_correct(self):
+        features_stats = self.dataset.get_features_stats()
+
+        self.assertEqual(features_stats["shape"], [2, 4])
+        self.assertEqual(features_stats["non_empty_cols"], 3)
+        self.assertEqual(features_stats["empty_cols"], 1)
+        self.assertEqual(features_stats["sparsity"], 0.25)
+        self.assertEqual(features_stats["classes"], {"class01": 1, "class02": 1})
+
+    def test_column_stats_are_correct(self):
+        column_stats = self.dataset.get_features_stats()["columns"]
+
+        self.assertEqual(column_stats["names"], ["f01", "f02", "f03", "f04"])
+        self.assertEqual(column_stats["nnz"], [2, 2, 0, 2])
+        self.assertEqual(column_stats["min"], [0.01, 0.02, 0, 0.03])
+        self.assertEqual(column_stats["max"], [0.04, 0.05, 0, 0.06])
+
+    def test_stats_are_cached_in_summary(self):
+        features_stats = self.dataset.get_features_stats()
+
+        with open(self.dataset.summary_filepath, "r") as summary_fp:
+            summary = json.load(summary_fp)
+
+        self.assertEqual(summary["metadata"]["features_stats"], features_stats)
+
+    def test_cached_stats_are_used(self):
+        self.dataset.get_features_stats()
+
+        with patch(
+            "bugfinder.base.dataset.CodeWeaknessClassificationDataset"
+            ".get_features_matrix"
+        ) as mock_get_features_matrix:
+            self.dataset.get_features_stats()
+
+        self.assertFalse(mock_get_features_matrix.called)
+
+    def test_new_feature_version_invalidates_stats(self):
+        self.dataset.get_features_stats()
+        self.dataset.feats_version += 1
+
+        with patch(
+            "bugfinder.base.dataset.CodeWeaknessClassificationDataset"
+            ".get_features_matrix"
+        ) as mock_get_features_matrix:
+            mock_get_features_matrix.side_effect = Exception()
+
+            with self.assertRaises(Exception):
+                self.dataset.get_features_stats()
+
+    def test_new_features_are_not_cached(self):
+        self.dataset.features = self.dataset.features.copy()
+        self.dataset.get_features_stats()
+
+        self.assertNotIn("features_stats", self.dataset.summary["metadata"])
+
+
 class TestCodeWeaknessClassificationDatasetQueueOperation(TestCase):
     def setUp(self) -> None:
         patch_paths(
@@ -180,6 +555,7 @@ class TestCodeWeaknessClassificationDatasetQueueOperation(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -206,6 +582,7 @@ class TestCodeWeaknessClassificationDatasetProcess(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -245,3 +622,344 @@ class TestCodeWeaknessClassificationDatasetProcess(TestCase):
         self.dataset.queue_operation(mock_operation)
 
         self.assertEqual(self.dataset.process(), DatasetQueueRetCode.INVALID_QUEUE)
+
+
+class TestCodeWeaknessClassificationDatasetProcessConcurrency(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self, ["bugfinder.base.dataset.LOGGER", "bugfinder.utils.processing.LOGGER"]
+        )
+
+        self.dataset_path = "./tests/fixtures/dataset01"
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+        self.events = []
+
+        for patch_attribute in [
+            patch.object(MockFeaturesProcessing, "events", self.events),
+            patch.object(MockFeaturesProcessing, "barrier", None),
+        ]:
+            patch_attribute.start()
+            self.addCleanup(patch_attribute.stop)
+
+    def tearDown(self) -> None:
+        try:
+            remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
+        except FileNotFoundError:
+            pass  # Ignore FileNotFound errors
+
+    def test_independent_operations_run_concurrently(self):
+        MockFeaturesProcessing.barrier = Barrier(2, timeout=10)
+
+        for name in ["model01", "model02"]:
+            self.dataset.queue_operation(MockFeaturesProcessing, {"name": name})
+
+        self.assertEqual(self.dataset.process(max_workers=2), DatasetQueueRetCode.OK)
+        self.assertListEqual(
+            sorted(self.events[:2]), ["start model01", "start model02"]
+        )
+
+    def test_conflicting_operations_run_in_order(self):
+        for name in ["model01", "model01"]:
+            self.dataset.queue_operation(MockFeaturesProcessing, {"name": name})
+
+        self.assertEqual(
+            self.dataset.process(max_workers=2, force=True), DatasetQueueRetCode.OK
+        )
+        self.assertListEqual(
+            self.events,
+            ["start model01", "end model01", "start model01", "end model01"],
+        )
+
+    @patch("tests.MockAbstractProcessing.execute")
+    def test_undeclared_operations_run_alone(self, mock_execute):
+        mock_execute.side_effect = lambda: self.events.append("undeclared")
+
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+        self.dataset.queue_operation(MockAbstractProcessing)
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model02"})
+
+        self.assertEqual(self.dataset.process(max_workers=3), DatasetQueueRetCode.OK)
+        self.assertListEqual(
+            self.events,
+            [
+                "start model01",
+                "end model01",
+                "undeclared",
+                "start model02",
+                "end model02",
+            ],
+        )
+
+    def test_all_operations_are_recorded(self):
+        for name in ["model01", "model02", "model03"]:
+            self.dataset.queue_operation(MockFeaturesProcessing, {"name": name})
+
+        self.dataset.process(max_workers=3)
+
+        self.assertEqual(
+            len(self.dataset.summary[str(ProcessingCategory.PROCESSING)]), 3
+        )
+
+    @patch("tests.MockAbstractProcessing.execute")
+    def test_operations_after_failure_are_not_run(self, mock_execute):
+        mock_execute.side_effect = Exception()
+
+        self.dataset.queue_operation(MockAbstractProcessing)
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+
+        self.assertEqual(
+            self.dataset.process(max_workers=2), DatasetQueueRetCode.OPERATION_FAIL
+        )
+        self.assertListEqual(self.events, [])
+        self.assertListEqual(self.dataset.ops_queue, [])
+
+
+class TestCodeWeaknessClassificationDatasetProcessCache(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self, ["bugfinder.base.dataset.LOGGER", "bugfinder.utils.processing.LOGGER"]
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset01")
+        copytree("./tests/fixtures/dataset01", self.dataset_path)
+
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+        self.events = []
+
+        patch_events = patch.object(MockFeaturesProcessing, "events", self.events)
+        patch_events.start()
+        self.addCleanup(patch_events.stop)
+
+    def process_twice(self, op_class, op_args=None, force=False):
+        for _ in range(2):
+            self.dataset.queue_operation(op_class, op_args)
+            self.assertEqual(self.dataset.process(force=force), DatasetQueueRetCode.OK)
+
+    def test_fingerprint_is_recorded(self):
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+        self.dataset.process()
+
+        self.assertEqual(
+            self.dataset.summary["processing"][-1]["fingerprint"],
+            self.dataset.get_operation_fingerprint(
+                MockFeaturesProcessing, {"name": "model01"}
+            ),
+        )
+
+    def test_resources_are_recorded(self):
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+        self.dataset.process()
+
+        self.assertSetEqual(
+            set(self.dataset.summary["processing"][-1]["resources"].keys()),
+            {
+                "cpu_user",
+                "cpu_system",
+                "peak_rss",
+                "read_bytes",
+                "write_bytes",
+                "files_touched",
+            },
+        )
+
+    def test_written_paths_are_profiled(self):
+        self.assertListEqual(
+            self.dataset.get_operation_written_paths(
+                MockFeaturesProcessing, {"name": "model01"}
+            ),
+            [join(self.dataset_path, "models", "model01")],
+        )
+
+    def test_undeclared_operation_has_no_fingerprint(self):
+        self.assertIsNone(
+            self.dataset.get_operation_fingerprint(MockAbstractProcessing)
+        )
+
+    def test_up_to_date_operation_is_skipped(self):
+        self.process_twice(MockFeaturesProcessing, {"name": "model01"})
+
+        self.assertListEqual(self.events, ["start model01", "end model01"])
+
+    def test_forced_operation_is_run(self):
+        self.process_twice(MockFeaturesProcessing, {"name": "model01"}, force=True)
+
+        self.assertEqual(len(self.events), 4)
+
+    def test_operation_with_different_args_is_run(self):
+        for name in ["model01", "model02"]:
+            self.dataset.queue_operation(MockFeaturesProcessing, {"name": name})
+            self.dataset.process()
+
+        self.assertEqual(len(self.events), 4)
+
+    def test_operation_with_modified_input_is_run(self):
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+        self.dataset.process()
+
+        with open(
+            join(self.dataset_path, "features", settings.FEATURES_FILE), "a"
+        ) as features_fp:
+            features_fp.write("\n")
+
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+        self.dataset.process()
+
+        self.assertEqual(len(self.events), 4)
+
+    def test_operation_with_modified_source_is_not_affected(self):
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+        self.dataset.process()
+
+        with open(join(self.dataset_path, "class01", "tc01", "item.c"), "w"):
+            pass
+
+        self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+        self.dataset.process()
+
+        self.assertEqual(len(self.events), 2)
+
+    @patch("tests.MockAbstractProcessing.execute")
+    def test_undeclared_operation_is_always_run(self, mock_execute):
+        self.process_twice(MockAbstractProcessing)
+
+        self.assertEqual(mock_execute.call_count, 2)
+
+    @patch.object(MockFeaturesProcessing, "execute")
+    def test_failed_operation_is_run_again(self, mock_execute):
+        mock_execute.side_effect = Exception()
+
+        for _ in range(2):
+            self.dataset.queue_operation(MockFeaturesProcessing, {"name": "model01"})
+            self.dataset.process()
+
+        self.assertEqual(mock_execute.call_count, 2)
+
+
+class TestCodeWeaknessClassificationDatasetProcessChain(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self, ["bugfinder.base.dataset.LOGGER", "bugfinder.utils.processing.LOGGER"]
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset01")
+        copytree("./tests/fixtures/dataset01", self.dataset_path)
+
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+        self.events = []
+
+        patch_events = patch.object(MockGraphProcessing, "events", self.events)
+        patch_events.start()
+        self.addCleanup(patch_events.stop)
+
+    def process_steps(self, steps, op_args=None):
+        if op_args is None:
+            op_args = {}
+
+        self.dataset.queue_operation(MockGraphImporter, {"step": steps[0]})
+
+        for step in steps[1:]:
+            self.dataset.queue_operation(MockGraphProcessing, {"step": step, **op_args})
+
+        self.assertEqual(self.dataset.process(), DatasetQueueRetCode.OK)
+
+    def test_processed_chain_is_skipped(self):
+        for _ in range(2):
+            self.process_steps(["import", "annotate", "tag"])
+
+        self.assertListEqual(self.events, ["import", "annotate", "tag"])
+
+    def test_extended_chain_runs_new_operations(self):
+        self.process_steps(["import", "annotate"])
+        self.process_steps(["import", "annotate", "tag"])
+
+        self.assertListEqual(self.events, ["import", "annotate", "tag"])
+
+    def test_modified_chain_is_run_again(self):
+        self.process_steps(["import", "annotate", "tag"])
+        self.process_steps(["import", "annotate", "retag"])
+
+        self.assertListEqual(
+            self.events, ["import", "annotate", "tag", "import", "annotate", "retag"]
+        )
+
+    def test_chain_on_modified_input_is_run_again(self):
+        self.process_steps(["import", "annotate"])
+
+        makedirs(join(self.dataset_path, DATASET_DIRS["joern"]))
+        self.process_steps(["import", "annotate"])
+
+        self.assertEqual(len(self.events), 4)
+
+    def test_modified_file_argument_is_run_again(self):
+        sinks_filepath = join(self.tmp_dir.name, "sinks.csv")
+
+        for sinks in ["sink01", "sink02"]:
+            with open(sinks_filepath, "w") as sinks_fp:
+                sinks_fp.write(sinks)
+
+            self.process_steps(["import", "tag"], {"sinks": sinks_filepath})
+
+        self.assertListEqual(self.events, ["import", "tag", "import", "tag"])
+
+    def test_output_argument_is_ignored(self):
+        log_filepath = join(self.tmp_dir.name, "tagging.log")
+
+        for _ in range(2):
+            self.process_steps(["import", "tag"], {"log_output": log_filepath})
+
+        self.assertListEqual(self.events, ["import", "tag"])
+
+
+class TestCodeWeaknessClassificationDatasetGetContentIndex(TestCase):
+    def setUp(self) -> None:
+        patch_paths(self, ["bugfinder.base.dataset.LOGGER"])
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset01")
+        copytree("./tests/fixtures/dataset01", self.dataset_path)
+
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+    def test_identical_files_are_grouped(self):
+        content_index = self.dataset.get_content_index()
+
+        self.assertEqual(sum(len(filepaths) for filepaths in content_index.values()), 9)
+        self.assertIn(
+            [
+                "class01/tc03/item.c",
+                "class02/tc04/item.cpp",
+                "class03/tc01/item_01a.c",
+                "class03/tc01/item_01b.c",
+            ],
+            content_index.values(),
+        )
+
+    def test_index_is_restricted_to_given_files(self):
+        content_index = self.dataset.get_content_index(
+            ["class01/tc02/item.c", "class01/tc03/item.c"]
+        )
+
+        self.assertListEqual(
+            sorted(content_index.values()),
+            [["class01/tc02/item.c"], ["class01/tc03/item.c"]],
+        )
+
+    def test_modified_files_are_hashed_again(self):
+        content_index = self.dataset.get_content_index(["class01/tc03/item.c"])
+
+        with open(join(self.dataset_path, "class01/tc03/item.c"), "w") as item_fp:
+            item_fp.write("int a;\n")
+
+        self.assertNotEqual(
+            self.dataset.get_content_index(["class01/tc03/item.c"]).keys(),
+            content_index.keys(),
+        )
@@ -0,0 +1,209 @@
+import json
+from os import listdir, makedirs
+from os.path import exists, join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import pandas as pd
+
+from bugfinder import settings
+from bugfinder.base.dataset import CodeWeaknessClassificationDataset
+from bugfinder.base.dataset_view import (
+    CodeWeaknessClassificationDatasetView,
+    is_dataset_view,
+    open_dataset,
+)
+from bugfinder.base.processing import DatasetArtifact
+from bugfinder.utils.feature_store import FeatureStore
+from tests import MockAbstractProcessing, patch_paths
+
+
+class MockModelProcessing(MockAbstractProcessing):
+    reads = {DatasetArtifact.FEATURES}
+    writes = {DatasetArtifact.MODELS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
+
+class MockFeaturesProcessing(MockAbstractProcessing):
+    reads = {DatasetArtifact.FEATURES}
+    writes = {DatasetArtifact.FEATURES}
+
+
+class TestCodeWeaknessClassificationDatasetView(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            [
+                "bugfinder.base.dataset.LOGGER",
+                "bugfinder.base.dataset_view.LOGGER",
+                "bugfinder.utils.processing.LOGGER",
+            ],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset")
+        self.view_path = join(self.tmp_dir.name, "view")
+
+        for test_case, filename in [
+            ("class01/tc01", "a.c"),
+            ("class01/tc02", "b.c"),
+            ("class02/tc01", "c.c"),
+            ("class02/tc02", "d.c"),
+        ]:
+            makedirs(join(self.dataset_path, test_case))
+
+            with open(join(self.dataset_path, test_case, filename), "w") as test_file:
+                test_file.write("int main() {}\n")
+
+        makedirs(join(self.dataset_path, settings.DATASET_DIRS["feats"]))
+        self.features = pd.DataFrame(
+            {
+                "f01": [1.0, 2.0, 3.0, 4.0],
+                "result": [0, 0, 1, 1],
+                "name": ["a.c", "b.c", "c.c", "d.c"],
+            }
+        )
+        self.features.to_csv(
+            join(
+                self.dataset_path,
+                settings.DATASET_DIRS["feats"],
+                settings.FEATURES_FILE,
+            ),
+            index=False,
+        )
+
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+        self.view = CodeWeaknessClassificationDatasetView.create(
+            self.view_path, self.dataset, ["class01/tc02", "class02/tc01"]
+        )
+
+    def test_manifest_lists_test_cases(self):
+        with open(join(self.view_path, settings.VIEW_MANIFEST_FILE)) as manifest_fp:
+            manifest = json.load(manifest_fp)
+
+        self.assertListEqual(manifest["test_cases"], ["class01/tc02", "class02/tc01"])
+        self.assertTrue(is_dataset_view(self.view_path))
+        self.assertFalse(is_dataset_view(self.dataset_path))
+
+    def test_test_cases_are_filtered(self):
+        view = open_dataset(self.view_path)
+
+        self.assertSetEqual(view.test_cases, {"class01/tc02", "class02/tc01"})
+        self.assertListEqual(view.classes, ["class01", "class02"])
+        self.assertListEqual(view.stats, [0.5, 0.5])
+
+    def test_parent_artifacts_are_shared(self):
+        self.assertEqual(self.view.path, self.dataset.path)
+        self.assertEqual(self.view.joern_dir, self.dataset.joern_dir)
+        self.assertEqual(self.view.feats_dir, self.dataset.feats_dir)
+        self.assertNotEqual(self.view.model_dir, self.dataset.model_dir)
+        self.assertFalse(exists(join(self.view_path, "class01")))
+
+    def test_summary_is_stored_in_view(self):
+        self.assertListEqual(
+            sorted(listdir(self.view_path)),
+            [settings.VIEW_MANIFEST_FILE, settings.SUMMARY_FILE],
+        )
+        self.assertEqual(self.view.summary["metadata"]["test_cases"], 2)
+
+    def test_features_are_filtered(self):
+        self.assertListEqual(self.view.features["name"].tolist(), ["b.c", "c.c"])
+        self.assertListEqual(
+            self.view.get_features_matrix().toarray().tolist(), [[2.0], [3.0]]
+        )
+        self.assertEqual(self.view.get_features_shape(), (2, 3))
+        self.assertEqual(len(self.dataset.features), 4)
+
+    def test_store_features_are_filtered(self):
+        FeatureStore(self.dataset.feature_store.path).write(self.features)
+
+        view = CodeWeaknessClassificationDatasetView(self.view_path)
+
+        self.assertEqual(view.get_features_shape(), (2, 3))
+        self.assertListEqual(
+            view.get_features_matrix().toarray().tolist(), [[2.0], [3.0]]
+        )
+        self.assertListEqual(view.features["f01"].tolist(), [2.0, 3.0])
+
+    def test_store_features_are_matched_on_test_cases(self):
+        features = pd.DataFrame(
+            {
+                "f01": [1.0, 2.0, 3.0],
+                "result": [0, 0, 1],
+                "name": ["item.c", "item.c", "item.c"],
+            }
+        )
+        FeatureStore(self.dataset.feature_store.path).write(
+            features, ["class01/tc02", "class01/tc01", "class02/tc02"]
+        )
+
+        view = CodeWeaknessClassificationDatasetView(self.view_path)
+        inverse_view = view.create_inverse(join(self.tmp_dir.name, "inverse"))
+
+        self.assertListEqual(view.features["f01"].tolist(), [1.0])
+        self.assertListEqual(inverse_view.features["f01"].tolist(), [2.0, 3.0])
+
+    def test_ambiguous_file_names_fail(self):
+        makedirs(join(self.dataset_path, "class01", "tc03"))
+
+        with open(join(self.dataset_path, "class01", "tc03", "b.c"), "w") as test_file:
+            test_file.write("int main() {}\n")
+
+        with self.assertRaises(ValueError):
+            CodeWeaknessClassificationDatasetView(self.view_path)
+
+    def test_features_stats_are_computed_on_view(self):
+        self.assertDictEqual(
+            self.view.get_features_stats()["classes"], {"class01": 1, "class02": 1}
+        )
+
+    def test_inverse_view_is_correct(self):
+        inverse_view = self.view.create_inverse(join(self.tmp_dir.name, "inverse"))
+
+        self.assertSetEqual(inverse_view.test_cases, {"class01/tc01", "class02/tc02"})
+        self.assertListEqual(inverse_view.features["name"].tolist(), ["a.c", "d.c"])
+
+    def test_view_of_view_uses_parent(self):
+        view = CodeWeaknessClassificationDatasetView.create(
+            join(self.tmp_dir.name, "subview"), self.view, ["class02/tc01"]
+        )
+
+        self.assertEqual(view.path, self.dataset.path)
+        self.assertListEqual(view.features["name"].tolist(), ["c.c"])
+
+    def test_unknown_test_cases_fail(self):
+        with self.assertRaises(ValueError):
+            CodeWeaknessClassificationDatasetView.create(
+                join(self.tmp_dir.name, "subview"), self.view, ["class01/tc01"]
+            )
+
+    def test_cannot_overwrite_without_force_true(self):
+        with self.assertRaises(FileExistsError):
+            CodeWeaknessClassificationDatasetView.create(
+                self.view_path, self.dataset, ["class01/tc01"]
+            )
+
+        view = CodeWeaknessClassificationDatasetView.create(
+            self.view_path, self.dataset, ["class01/tc01"], force=True
+        )
+        self.assertSetEqual(view.test_cases, {"class01/tc01"})
+
+    def test_model_operations_can_be_queued(self):
+        self.view.queue_operation(MockModelProcessing, {"name": "model"})
+
+        self.assertListEqual(
+            self.view.get_operation_written_paths(MockModelProcessing, {"name": "m"}),
+            [join(self.view_path, settings.DATASET_DIRS["models"], "m")],
+        )
+
+    def test_operations_writing_parent_artifacts_fail(self):
+        with self.assertRaises(ValueError):
+            self.view.queue_operation(MockFeaturesProcessing)
+
+        with self.assertRaises(ValueError):
+            self.view.queue_operation(MockAbstractProcessing)
+
+        self.view.queue_operation(MockFeaturesProcessing, {"dry_run": True})
+        self.assertEqual(len(self.view.ops_queue), 1)
@@ -1,12 +1,16 @@
-from os import remove
+import pickle
+from os import remove, replace
 from os.path import join
+from shutil import copytree
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 from bugfinder import settings
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
 from bugfinder.base.processing.files import AbstractFileProcessing
+from bugfinder.utils.dirs import link_file
 from tests import patch_paths
 
 
@@ -28,6 +32,7 @@ class TestDatasetFileProcessingExecute(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -48,10 +53,234 @@ class TestDatasetFileProcessingExecute(TestCase):
             ].sort(),
         )
 
-    def test_rebuild_index_is_called(self):
+    def test_update_index_is_called(self):
         dataset_obj = Mock(spec=CodeWeaknessClassificationDataset)
         dataset_obj.test_cases = list()
         data_processing = self.MockAbstractFileProcessing(dataset_obj)
 
         data_processing.execute()
-        dataset_obj.rebuild_index.assert_called()
+        dataset_obj.update_index.assert_called_with(modified=set())
+
+    def test_update_index_receives_modified_test_cases(self):
+        dataset_obj = CodeWeaknessClassificationDataset(self.dataset_path)
+        data_processing = self.MockAbstractFileProcessing(dataset_obj)
+
+        with patch.object(dataset_obj, "update_index") as mock_update_index:
+            data_processing.execute()
+
+        mock_update_index.assert_called_once_with(modified=dataset_obj.test_cases)
+
+
+class MockAppendFileProcessing(AbstractFileProcessing):
+    break_links = True
+
+    def process_file(self, filepath):
+        with open(filepath, "a") as item_fp:
+            item_fp.write("processed\n")
+
+        return filepath
+
+    def match_file(self, filepath) -> bool:
+        return filepath.endswith(".c")
+
+
+class MockReplaceFileProcessing(MockAppendFileProcessing):
+    break_links = False
+
+    def process_file(self, filepath):
+        tmp_filepath = "%s.tmp" % filepath
+
+        with open(filepath, "r") as in_file, open(tmp_filepath, "w") as out_file:
+            out_file.write(in_file.read() + "processed\n")
+
+        replace(tmp_filepath, filepath)
+
+        return filepath
+
+
+class TestDatasetFileProcessingParallelExecute(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            ["bugfinder.base.dataset.LOGGER", "bugfinder.base.processing.files.LOGGER"],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset01")
+        copytree("./tests/fixtures/dataset01", self.dataset_path)
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+        self.expected_retcodes = [
+            join(self.dataset.path, filepath)
+            for filepath in [
+                "class01/tc02/item.c",
+                "class01/tc03/item.c",
+                "class02/tc01/item.c",
+                "class02/tc03/item.c",
+                "class03/tc01/item_01a.c",
+                "class03/tc01/item_01b.c",
+            ]
+        ]
+
+    @patch("bugfinder.base.processing.files.settings.POOL_SIZE", 4)
+    def test_parallel_retcodes_are_ordered(self):
+        retcodes = MockAppendFileProcessing(self.dataset).execute()
+
+        self.assertListEqual(retcodes, self.expected_retcodes)
+
+    @patch("bugfinder.base.processing.files.settings.POOL_SIZE", 4)
+    def test_parallel_files_are_processed(self):
+        MockAppendFileProcessing(self.dataset).execute()
+
+        for filepath in self.expected_retcodes:
+            with open(filepath, "r") as item_fp:
+                self.assertTrue(item_fp.read().endswith("processed\n"))
+
+    @patch("bugfinder.base.processing.files.Pool")
+    @patch("bugfinder.base.processing.files.settings.POOL_SIZE", 1)
+    def test_single_process_does_not_use_pool(self, mock_pool):
+        retcodes = MockAppendFileProcessing(self.dataset).execute()
+
+        self.assertFalse(mock_pool.called)
+        self.assertListEqual(retcodes, self.expected_retcodes)
+
+    @patch("bugfinder.base.processing.files.Pool")
+    @patch("bugfinder.base.processing.files.settings.POOL_SIZE", 4)
+    def test_disabled_parallel_mode_does_not_use_pool(self, mock_pool):
+        data_processing = MockAppendFileProcessing(self.dataset)
+        data_processing.parallel = False
+
+        retcodes = data_processing.execute()
+
+        self.assertFalse(mock_pool.called)
+        self.assertListEqual(retcodes, self.expected_retcodes)
+
+    def test_dataset_is_not_pickled(self):
+        data_processing = pickle.loads(
+            pickle.dumps(MockAppendFileProcessing(self.dataset))
+        )
+
+        self.assertIsNone(data_processing.dataset)
+
+
+class MockDedupFileProcessing(MockAppendFileProcessing):
+    deduplicate = True
+
+    def match_file(self, filepath) -> bool:
+        return filepath.endswith(".c") or filepath.endswith(".h")
+
+
+class TestDatasetFileProcessingDeduplicate(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            ["bugfinder.base.dataset.LOGGER", "bugfinder.base.processing.files.LOGGER"],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset01")
+        copytree("./tests/fixtures/dataset01", self.dataset_path)
+
+        # Empty header, with the same content as the empty source files
+        open(join(self.dataset_path, "class01/tc03/empty.h"), "w").close()
+
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+        self.empty_filepaths = [
+            join(self.dataset.path, filepath)
+            for filepath in [
+                "class01/tc03/item.c",
+                "class03/tc01/item_01a.c",
+                "class03/tc01/item_01b.c",
+            ]
+        ]
+
+    def test_duplicates_are_processed_once(self):
+        retcodes = MockDedupFileProcessing(self.dataset).execute()
+
+        self.assertListEqual(
+            [retcodes[3], retcodes[6], retcodes[7]], [self.empty_filepaths[0]] * 3
+        )
+        self.assertEqual(len(set(retcodes)), 6)
+
+    def test_duplicates_receive_processed_content(self):
+        MockDedupFileProcessing(self.dataset).execute()
+
+        for filepath in self.empty_filepaths:
+            with open(filepath, "r") as item_fp:
+                self.assertEqual(item_fp.read(), "processed\n")
+
+    def test_duplicates_with_another_extension_are_processed(self):
+        retcodes = MockDedupFileProcessing(self.dataset).execute()
+
+        self.assertIn(join(self.dataset.path, "class01/tc03/empty.h"), retcodes)
+
+    def test_dedup_ratio_is_recorded(self):
+        data_processing = MockDedupFileProcessing(self.dataset)
+        data_processing.execute()
+
+        self.assertDictEqual(
+            data_processing.processing_stats["dedup"],
+            {"files": 8, "unique_files": 5, "dedup_ratio": 1.6},
+        )
+
+    @patch("bugfinder.base.processing.files.settings.POOL_SIZE", 4)
+    def test_parallel_duplicates_are_processed_once(self):
+        retcodes = MockDedupFileProcessing(self.dataset).execute()
+
+        self.assertEqual(len(set(retcodes)), 6)
+
+
+class TestDatasetFileProcessingBreakLinks(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            ["bugfinder.base.dataset.LOGGER", "bugfinder.base.processing.files.LOGGER"],
+        )
+
+        patch_ioctl = patch("bugfinder.utils.dirs.fcntl.ioctl")
+        patch_ioctl.start().side_effect = OSError("Operation not supported")
+        self.addCleanup(patch_ioctl.stop)
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.orig_path = join(self.tmp_dir.name, "orig")
+        self.dataset_path = join(self.tmp_dir.name, "dataset01")
+        copytree("./tests/fixtures/dataset01", self.orig_path)
+        copytree(self.orig_path, self.dataset_path, copy_function=link_file)
+
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+        self.filepath = "class01/tc02/item.c"
+
+        with open(join(self.orig_path, self.filepath), "r") as item_fp:
+            self.orig_content = item_fp.read()
+
+    def test_linked_files_are_not_modified(self):
+        MockAppendFileProcessing(self.dataset).execute()
+
+        with open(join(self.orig_path, self.filepath), "r") as item_fp:
+            self.assertEqual(item_fp.read(), self.orig_content)
+
+        with open(join(self.dataset_path, self.filepath), "r") as item_fp:
+            self.assertEqual(item_fp.read(), self.orig_content + "processed\n")
+
+    def test_disabled_break_links_modifies_linked_files(self):
+        data_processing = MockAppendFileProcessing(self.dataset)
+        data_processing.break_links = False
+        data_processing.execute()
+
+        with open(join(self.orig_path, self.filepath), "r") as item_fp:
+            self.assertEqual(item_fp.read(), self.orig_content + "processed\n")
+
+    def test_replaced_files_do_not_modify_linked_files(self):
+        MockReplaceFileProcessing(self.dataset).execute()
+
+        with open(join(self.orig_path, self.filepath), "r") as item_fp:
+            self.assertEqual(item_fp.read(), self.orig_content)
+
+        with open(join(self.dataset_path, self.filepath), "r") as item_fp:
+            self.assertEqual(item_fp.read(), self.orig_content + "processed\n")
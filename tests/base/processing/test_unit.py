@@ -3,12 +3,33 @@ from unittest import TestCase
 from unittest.mock import Mock
 
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
+from bugfinder.base.processing import DatasetArtifact
 from tests import MockAbstractProcessing
 
 
+class MockNamedProcessing(MockAbstractProcessing):
+    reads = {DatasetArtifact.FEATURES}
+    writes = {DatasetArtifact.MODELS}
+    named_artifacts = {DatasetArtifact.MODELS}
+
+
 class TestAbstractProcessingInit(TestCase):
     def test_dataset_path_is_correct(self):
         dataset_obj = Mock(spec=CodeWeaknessClassificationDataset)
         data_processing = MockAbstractProcessing(dataset_obj)
 
         self.assertEqual(data_processing.dataset, dataset_obj)
+
+
+class TestAbstractProcessingGetArtifacts(TestCase):
+    def test_undeclared_artifacts_are_none(self):
+        self.assertEqual(MockAbstractProcessing.get_artifacts(), (None, None))
+
+    def test_artifacts_are_strings(self):
+        self.assertEqual(MockNamedProcessing.get_artifacts(), ({"feats"}, {"models"}))
+
+    def test_named_artifacts_use_name_argument(self):
+        self.assertEqual(
+            MockNamedProcessing.get_artifacts({"name": "model01"}),
+            ({"feats"}, {"models/model01"}),
+        )
@@ -1,6 +1,9 @@
 from unittest import TestCase
 from unittest.mock import Mock, patch
 
+import numpy as np
+from scipy import sparse
+
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
 from bugfinder.features.extraction.bag_of_words.hops_n_flows import (
     FeatureExtractor as HopsNFlowsExtractor,
@@ -317,3 +320,31 @@ class TestFeatureExtractorFinalizeFeatures(TestCase):
         )
 
         self.assertListEqual(returned_features, expected_features)
+
+    def test_sparse_features_are_normalized_as_dense_features(self):
+        input_features = [
+            [4, 6, 3, 2, 6, 0],
+            [4, 8, 5, 5, 5, 5],
+            [3, 3, 11, 2, 4, 3],
+            [3, 0, 0, 0, 0, 0],
+        ]
+        labels = [
+            "a-CONTROLS-b",
+            "a-CONTROLS-c",
+            "a-FLOWS_TO-b",
+            "a-REACHES-b",
+            "a-REACHES-c",
+            "a-REACHES-d",
+        ]
+
+        expected_features = [
+            row[:-2]
+            for row in self.dataset_processing.finalize_features(
+                [row + [None, None] for row in input_features], labels
+            )
+        ]
+        returned_features = self.dataset_processing.finalize_sparse_features(
+            sparse.csr_matrix(input_features), labels
+        )
+
+        np.testing.assert_allclose(returned_features.toarray(), expected_features)
@@ -3,6 +3,9 @@ from os.path import join, basename, dirname
 from unittest import TestCase
 from unittest.mock import patch, Mock
 
+import pandas as pd
+from scipy import sparse
+
 from bugfinder import settings
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
 from bugfinder.features.extraction import (
@@ -119,6 +122,7 @@ class GraphFeatureExtractorCreateFeatureMapFile(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -376,7 +380,7 @@ class GraphFeatureExtractorCheckExtractionInputs(TestCase):
 
         self.dataset_processing.check_extraction_inputs()
 
-        mock_join.assert_called_with(self.dataset.feats_dir, "features.csv")
+        mock_join.assert_called_with(self.dataset.feats_dir, settings.FEATURES_STORE)
 
 
 class GraphFeatureExtractorWriteExtractionOutputs(TestCase):
@@ -390,6 +394,7 @@ class GraphFeatureExtractorWriteExtractionOutputs(TestCase):
                 "bugfinder.base.dataset.CodeWeaknessClassificationDataset._validate_features",
                 "bugfinder.features.extraction.join",
                 "bugfinder.features.extraction.open",
+                "bugfinder.features.extraction.FeatureStore",
                 "bugfinder.base.dataset.LOGGER",
             ],
         )
@@ -419,6 +424,21 @@ class GraphFeatureExtractorWriteExtractionOutputs(TestCase):
         with self.assertRaises(IndexError):
             self.dataset_processing.write_extraction_outputs(mock_features)
 
+    @patch("bugfinder.features.extraction.FeatureStore")
+    @patch(
+        "tests.features.extraction.bag_of_words.test_unit.GraphFeatureExtractor.get_labels_from_feature_map"
+    )
+    def test_features_are_written_to_store(
+        self, mock_get_labels_from_feature_map, mock_feature_store
+    ):
+        mock_get_labels_from_feature_map.return_value = ["f01"]
+        mock_features = [[0.5, 1, "mock_name"]]
+
+        self.dataset_processing.write_extraction_outputs(mock_features)
+
+        written_features = mock_feature_store.return_value.write.call_args[0][0]
+        self.assertListEqual(list(written_features.columns), ["f01", "result", "name"])
+
 
 class GraphFeatureExtractorSaveLabelsToFeatursMap(TestCase):
     def setUp(self) -> None:
@@ -599,7 +619,9 @@ class FlowGraphFeatureExtractorExtractFeatures(TestCase):
         mock_finalize_features.return_value = None
         mock_get_flowgraph_list_for_entrypoint.return_value = []
         mock_initialize_features.return_value = []
-        mock_get_entrypoint_list.return_value = [{"function_id": 12, "entry_id": 34}]
+        mock_get_entrypoint_list.return_value = [
+            {"function_id": 12, "entry_id": 34, "filepath": "/code/class/tc/item.c"}
+        ]
         mock_get_labels_from_feature_map.return_value = []
         self.dataset_processing.extract_features()
 
@@ -628,12 +650,43 @@ class FlowGraphFeatureExtractorExtractFeatures(TestCase):
         mock_finalize_features.return_value = None
         mock_get_flowgraph_list_for_entrypoint.return_value = []
         mock_initialize_features.return_value = []
-        mock_get_entrypoint_list.return_value = [{"function_id": 12, "entry_id": 34}]
+        mock_get_entrypoint_list.return_value = [
+            {"function_id": 12, "entry_id": 34, "filepath": "/code/class/tc/item.c"}
+        ]
         mock_get_labels_from_feature_map.return_value = []
         self.dataset_processing.extract_features()
 
         self.assertTrue(mock_get_flowgraph_list_for_entrypoint.called)
 
+    @patch(
+        "bugfinder.features.extraction.GraphFeatureExtractor.get_labels_from_feature_map"
+    )
+    @patch("bugfinder.features.extraction.GraphFeatureExtractor._get_entrypoint_list")
+    @patch(
+        "tests.features.extraction.bag_of_words.test_unit.MockFlowGraphFeatureExtractor"
+        ".get_flowgraph_list_for_entrypoint"
+    )
+    def test_test_case_of_each_row_is_recorded(
+        self,
+        mock_get_flowgraph_list_for_entrypoint,
+        mock_get_entrypoint_list,
+        mock_get_labels_from_feature_map,
+    ):
+        self.dataset_processing.dataset = Mock()
+        self.dataset_processing.dataset.classes = ["class01", "class02"]
+        mock_get_flowgraph_list_for_entrypoint.return_value = []
+        mock_get_entrypoint_list.return_value = [
+            {"function_id": 1, "entry_id": 2, "filepath": "/code/class01/tc02/item.c"},
+            {"function_id": 3, "entry_id": 4, "filepath": "/code/class02/tc01/item.c"},
+        ]
+        mock_get_labels_from_feature_map.return_value = []
+        self.dataset_processing.extract_features()
+
+        self.assertListEqual(
+            self.dataset_processing.feature_test_cases,
+            ["class01/tc02", "class02/tc01"],
+        )
+
     @patch(
         "bugfinder.features.extraction.GraphFeatureExtractor.get_labels_from_feature_map"
     )
@@ -663,7 +716,9 @@ class FlowGraphFeatureExtractorExtractFeatures(TestCase):
         mock_get_label_from_flowgraph.return_value = None
         mock_get_flowgraph_list_for_entrypoint.return_value = ["mock_flowgraph"]
         mock_initialize_features.return_value = []
-        mock_get_entrypoint_list.return_value = [{"function_id": 12, "entry_id": 34}]
+        mock_get_entrypoint_list.return_value = [
+            {"function_id": 12, "entry_id": 34, "filepath": "/code/class/tc/item.c"}
+        ]
         mock_get_labels_from_feature_map.return_value = []
         self.dataset_processing.extract_features()
 
@@ -704,7 +759,9 @@ class FlowGraphFeatureExtractorExtractFeatures(TestCase):
         mock_get_label_from_flowgraph.return_value = "mock_label"
         mock_get_flowgraph_list_for_entrypoint.return_value = ["mock_flowgraph"]
         mock_initialize_features.return_value = [0]
-        mock_get_entrypoint_list.return_value = [{"function_id": 12, "entry_id": 34}]
+        mock_get_entrypoint_list.return_value = [
+            {"function_id": 12, "entry_id": 34, "filepath": "/code/class/tc/item.c"}
+        ]
         mock_get_labels_from_feature_map.return_value = ["mock_label"]
         self.dataset_processing.extract_features()
 
@@ -733,7 +790,9 @@ class FlowGraphFeatureExtractorExtractFeatures(TestCase):
         mock_finalize_features.return_value = None
         mock_get_flowgraph_list_for_entrypoint.return_value = []
         mock_initialize_features.return_value = []
-        mock_get_entrypoint_list.return_value = [{"function_id": 12, "entry_id": 34}]
+        mock_get_entrypoint_list.return_value = [
+            {"function_id": 12, "entry_id": 34, "filepath": "/code/class/tc/item.c"}
+        ]
         mock_get_labels_from_feature_map.return_value = []
         self.dataset_processing.extract_features()
 
@@ -776,7 +835,9 @@ class FlowGraphFeatureExtractorExtractFeatures(TestCase):
             "mock_flowgraph_2",
         ]
         mock_initialize_features.return_value = [0]
-        mock_get_entrypoint_list.return_value = [{"function_id": 12, "entry_id": 34}]
+        mock_get_entrypoint_list.return_value = [
+            {"function_id": 12, "entry_id": 34, "filepath": "/code/class/tc/item.c"}
+        ]
         mock_get_labels_from_feature_map.return_value = ["mock_label_1"]
 
         returned_features = self.dataset_processing.extract_features()
@@ -784,6 +845,87 @@ class FlowGraphFeatureExtractorExtractFeatures(TestCase):
         self.assertEqual(returned_features, [[2]])
 
 
+class FlowGraphFeatureExtractorExtractSparseFeatures(TestCase):
+    def setUp(self) -> None:
+        patch_paths(self, ["bugfinder.features.extraction.LOGGER"])
+
+        dataset = Mock(spec=CodeWeaknessClassificationDataset)
+        dataset.classes = ["good", "bad"]
+        self.dataset_processing = MockFlowGraphFeatureExtractor(dataset)
+        self.dataset_processing.sparse_features = True
+
+    @patch(
+        "bugfinder.features.extraction.GraphFeatureExtractor.get_labels_from_feature_map"
+    )
+    @patch("bugfinder.features.extraction.GraphFeatureExtractor._get_entrypoint_list")
+    @patch(
+        "tests.features.extraction.bag_of_words.test_unit.MockFlowGraphFeatureExtractor"
+        ".get_flowgraph_list_for_entrypoint"
+    )
+    @patch(
+        "tests.features.extraction.bag_of_words.test_unit.MockFlowGraphFeatureExtractor"
+        ".get_label_from_flowgraph"
+    )
+    @patch(
+        "tests.features.extraction.bag_of_words.test_unit.MockFlowGraphFeatureExtractor"
+        ".get_flowgraph_count"
+    )
+    def test_sparse_features_are_correct(
+        self,
+        mock_get_flowgraph_count,
+        mock_get_label_from_flowgraph,
+        mock_get_flowgraph_list_for_entrypoint,
+        mock_get_entrypoint_list,
+        mock_get_labels_from_feature_map,
+    ):
+        mock_get_flowgraph_count.return_value = 2
+        mock_get_label_from_flowgraph.side_effect = lambda name: re.sub(
+            "flowgraph", "label", name
+        )
+        mock_get_flowgraph_list_for_entrypoint.side_effect = lambda entrypoint: {
+            12: ["mock_flowgraph_3", "mock_flowgraph_1", "mock_flowgraph_3"],
+            34: ["mock_flowgraph_2", "mock_flowgraph_4"],
+        }[entrypoint["function_id"]]
+        mock_get_entrypoint_list.return_value = [
+            {"function_id": 12, "filepath": "/code/good/tc01/file01.c"},
+            {"function_id": 34, "filepath": "/code/bad/tc02/file02.c"},
+        ]
+        mock_get_labels_from_feature_map.return_value = [
+            "mock_label_1",
+            "mock_label_2",
+            "mock_label_3",
+        ]
+
+        returned_features = self.dataset_processing.extract_features()
+
+        self.assertTrue(
+            all(
+                isinstance(dtype, pd.SparseDtype)
+                for dtype in returned_features.dtypes[:-2]
+            )
+        )
+        self.assertEqual(
+            returned_features.iloc[:, :-2].sparse.to_dense().values.tolist(),
+            [[2, 0, 4], [0, 2, 0]],
+        )
+        self.assertEqual(returned_features["result"].tolist(), [0, 1])
+        self.assertEqual(returned_features["name"].tolist(), ["file01.c", "file02.c"])
+
+
+class FlowGraphFeatureExtractorNormalizeSparseFeatures(TestCase):
+    def test_features_are_normalized_per_flow(self):
+        features = sparse.csr_matrix([[1, 3, 2, 0], [0, 0, 0, 5], [0, 0, 0, 0]])
+
+        returned_features = FlowGraphFeatureExtractor.normalize_sparse_features(
+            features, [0, 0, 1, 1], [[0, 1], [2, 3]]
+        )
+
+        self.assertEqual(
+            returned_features.toarray().tolist(),
+            [[0.25, 0.75, 1, 0], [0, 0, 0, 1], [0, 0, 0, 0]],
+        )
+
+
 class FlowGraphFeatureExtractorMapFeatures(TestCase):
     def setUp(self) -> None:
         patch_paths(self, ["bugfinder.features.extraction.LOGGER"])
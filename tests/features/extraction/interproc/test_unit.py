@@ -49,7 +49,7 @@ class FeatureExtractorGetFlowgraphListForEntrypoint(InterprocTestCase):
             def data():
                 return expected_flowgraphs
 
-        mock_neo4j_db.run.side_effect = lambda _: MockNeo4JRunData()
+        mock_neo4j_db.run.side_effect = lambda *_: MockNeo4JRunData()
         returned_flowgraphs = self.dataset_processing.get_flowgraph_list_for_entrypoint(
             {"id": None}
         )
@@ -126,7 +126,7 @@ class FeatureExtractorExtractFeaturesWorker(InterprocTestCase):
             def data():
                 return expected_flowgraphs
 
-        mock_neo4j_db.run.side_effect = lambda _: MockNeo4JRunData()
+        mock_neo4j_db.run.side_effect = lambda *_: MockNeo4JRunData()
 
         returned_seqs = self.dataset_processing.extract_features_worker({"id": None})
 
@@ -205,7 +205,7 @@ class FeatureExtractorGetEntrypointList(InterprocTestCase):
             def data():
                 return expected_entrypoints
 
-        mock_neo4j_db.run.side_effect = lambda _: MockNeo4JRunData()
+        mock_neo4j_db.run.side_effect = lambda *_: MockNeo4JRunData()
         returned_entrypoints = self.dataset_processing._get_entrypoint_list()
         self.assertListEqual(returned_entrypoints, expected_entrypoints)
 
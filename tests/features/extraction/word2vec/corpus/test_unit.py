@@ -0,0 +1,148 @@
+from os import listdir, makedirs, replace, utime
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from unittest.mock import Mock, patch
+
+from bugfinder import settings
+from bugfinder.base.dataset import CodeWeaknessClassificationDataset
+from bugfinder.features.extraction.word2vec.corpus import TokenCorpus
+from bugfinder.processing.tokenizers.lexer import code_lexer
+from tests import patch_paths
+
+
+class TestTokenCorpus(TestCase):
+    def setUp(self) -> None:
+        patch_paths(self, ["bugfinder.features.extraction.word2vec.corpus.LOGGER"])
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset = Mock(spec=CodeWeaknessClassificationDataset)
+        self.dataset.path = self.tmp_dir.name
+        self.dataset.test_cases = ["class01/tc01", "class02/tc01"]
+
+        self.files = {
+            "class01/tc01/item.c": "int main() { return 0; }\n",
+            "class01/tc01/item.h": "int fun(int a);\n",
+            "class01/tc01/item.txt": "not a c file\n",
+            "class02/tc01/item.c": "int fun(int a) { return a + 1; }\n",
+        }
+
+        for test_case in self.dataset.test_cases:
+            makedirs(join(self.tmp_dir.name, test_case))
+
+        for filepath, code in self.files.items():
+            self.write_file(filepath, code)
+
+    def write_file(self, filepath, code, mtime=1):
+        with open(join(self.tmp_dir.name, filepath), "w") as test_file:
+            test_file.write(code)
+
+        # Recently modified files are never trusted by the cache.
+        utime(join(self.tmp_dir.name, filepath), (mtime, mtime))
+
+    def test_tokens_are_streamed_per_file(self):
+        corpus = TokenCorpus(self.dataset)
+
+        self.assertListEqual(
+            list(corpus.iter_files()),
+            [
+                (filepath, code_lexer.tokenize(self.files[filepath]))
+                for filepath in [
+                    "class01/tc01/item.c",
+                    "class01/tc01/item.h",
+                    "class02/tc01/item.c",
+                ]
+            ],
+        )
+        self.assertEqual(len(corpus), 3)
+
+    def test_corpus_can_be_iterated_several_times(self):
+        corpus = TokenCorpus(self.dataset)
+
+        self.assertListEqual(list(corpus), list(corpus))
+        self.assertEqual(len(list(corpus)), 3)
+
+    def test_unchanged_files_are_read_from_cache(self):
+        tokens = list(TokenCorpus(self.dataset))
+
+        with patch(
+            "bugfinder.features.extraction.word2vec.corpus.code_lexer"
+        ) as mock_lexer:
+            corpus = TokenCorpus(self.dataset)
+
+        self.assertFalse(mock_lexer.tokenize.called)
+        self.assertEqual(corpus.tokenized_files, 0)
+        self.assertListEqual(list(corpus), tokens)
+
+    def test_modified_files_are_tokenized(self):
+        TokenCorpus(self.dataset)
+        self.write_file("class02/tc01/item.c", "int fun(int b) { return b; }\n", 2)
+
+        corpus = TokenCorpus(self.dataset)
+
+        self.assertEqual(corpus.tokenized_files, 1)
+        self.assertListEqual(
+            list(corpus)[2], code_lexer.tokenize("int fun(int b) { return b; }\n")
+        )
+
+    def test_files_of_other_test_cases_are_kept(self):
+        TokenCorpus(self.dataset)
+        self.dataset.test_cases = ["class02/tc01"]
+
+        self.assertEqual(TokenCorpus(self.dataset).tokenized_files, 0)
+
+        self.dataset.test_cases = ["class01/tc01", "class02/tc01"]
+        self.write_file("class02/tc01/item.c", "int fun(int b) { return b; }\n", 2)
+        TokenCorpus(self.dataset)
+        self.dataset.test_cases = ["class01/tc01"]
+
+        self.assertEqual(TokenCorpus(self.dataset).tokenized_files, 0)
+
+    def test_previous_token_arrays_are_removed(self):
+        TokenCorpus(self.dataset)
+        self.write_file("class01/tc01/item.c", "int main() {}\n", 2)
+        TokenCorpus(self.dataset)
+
+        self.assertEqual(
+            len(
+                [
+                    filename
+                    for filename in listdir(
+                        join(self.tmp_dir.name, settings.DATASET_DIRS["tokens"])
+                    )
+                    if filename.endswith(".npy")
+                ]
+            ),
+            1,
+        )
+
+    def get_cache_files(self):
+        return listdir(join(self.tmp_dir.name, settings.DATASET_DIRS["tokens"]))
+
+    def test_index_is_written_to_unique_temporary_files(self):
+        with patch(
+            "bugfinder.features.extraction.word2vec.corpus.replace",
+            wraps=replace,
+        ) as mock_replace:
+            TokenCorpus(self.dataset)
+            self.write_file("class01/tc01/item.c", "int main() {}\n", 2)
+            TokenCorpus(self.dataset)
+
+        tmp_filepaths = [call.args[0] for call in mock_replace.call_args_list]
+
+        self.assertEqual(len(set(tmp_filepaths)), 2)
+        self.assertFalse(
+            any(filename.endswith(".tmp") for filename in self.get_cache_files())
+        )
+
+    def test_temporary_files_are_removed_on_failure(self):
+        with patch(
+            "bugfinder.features.extraction.word2vec.corpus.replace"
+        ) as mock_replace:
+            mock_replace.side_effect = OSError("mock_error")
+            TokenCorpus(self.dataset)
+
+        self.assertListEqual(self.get_cache_files(), [])
@@ -6,6 +6,7 @@ from gensim.models import Word2Vec
 from shutil import rmtree
 from unittest.mock import Mock
 
+from bugfinder import settings
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
 from bugfinder.features.extraction.word2vec.model import Word2VecModel
 from tests import patch_paths
@@ -42,6 +43,10 @@ class Word2VecTrainingExecute(TestCase):
         self.dataset_processing = MockWord2VecModel(self.dataset)
 
     def tearDown(self) -> None:
+        rmtree(
+            join(self.dataset.path, settings.DATASET_DIRS["tokens"]), ignore_errors=True
+        )
+
         try:
             remove(join(self.dataset.model_dir, self.model_name))
             rmtree(self.dataset.model_dir)
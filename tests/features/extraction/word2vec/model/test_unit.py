@@ -2,10 +2,12 @@ from os import walk
 from os.path import join, exists, basename
 from unittest import TestCase
 
+import pandas as pd
 from gensim.models import Word2Vec
 from shutil import rmtree
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+from bugfinder import settings
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
 from bugfinder.features.extraction.word2vec.embeddings import Word2VecEmbeddings
 from tests import patch_paths
@@ -45,6 +47,10 @@ class TestWord2VecEmbeddingExecute(TestCase):
         self.model_kwargs = {"name": self.model_name}
 
     def tearDown(self) -> None:
+        rmtree(
+            join(self.dataset.path, settings.DATASET_DIRS["tokens"]), ignore_errors=True
+        )
+
         try:
             rmtree(self.dataset.embeddings_dir)
         except FileNotFoundError:
@@ -90,3 +96,69 @@ class TestWord2VecEmbeddingExecute(TestCase):
                     embeddings_files += 1
 
         self.assertEqual(embeddings_files, 4)
+
+    def execute_on_files(self, files):
+        token_list = Mock()
+        token_list.__len__ = Mock(return_value=len(files))
+        token_list.iter_files.return_value = files
+
+        with patch.object(
+            self.dataset_processing, "get_token_list", return_value=token_list
+        ), patch.object(
+            self.dataset_processing,
+            "vectorize",
+            wraps=self.dataset_processing.vectorize,
+        ) as mock_vectorize:
+            self.dataset_processing.execute(**self.model_kwargs)
+
+        return mock_vectorize.call_count
+
+    def read_embeddings(self, path):
+        return pd.read_csv(join(self.dataset.embeddings_dir, path))
+
+    def test_duplicate_files_share_embeddings(self):
+        with open(self.tokenized_file) as token_file:
+            tokens = token_file.read().splitlines()
+
+        vectorize_count = self.execute_on_files(
+            [("class01/tc05/item01.c", tokens), ("class02/tc05/item01.c", tokens)]
+        )
+
+        self.assertEqual(vectorize_count, 1)
+        self.assertTrue(
+            self.read_embeddings("class01/tc05/item01.csv").equals(
+                self.read_embeddings("class02/tc05/item01.csv")
+            )
+        )
+
+    def test_duplicate_files_with_same_name_are_saved(self):
+        with open(self.tokenized_file) as token_file:
+            tokens = token_file.read().splitlines()
+
+        vectorize_count = self.execute_on_files(
+            [("class01/tc05/item01.c", tokens), ("class01/tc05/item01.h", tokens)]
+        )
+
+        self.assertEqual(vectorize_count, 1)
+        self.assertTrue(
+            exists(join(self.dataset.embeddings_dir, "class01/tc05/item01.csv"))
+        )
+
+    def test_overwritten_embeddings_are_not_linked(self):
+        with open(self.tokenized_file) as token_file:
+            tokens = token_file.read().splitlines()
+
+        vectorize_count = self.execute_on_files(
+            [
+                ("class01/tc05/item01.c", tokens),
+                ("class01/tc05/item01.h", tokens[1:]),
+                ("class02/tc05/item01.c", tokens),
+            ]
+        )
+
+        self.assertEqual(vectorize_count, 3)
+        self.assertFalse(
+            self.read_embeddings("class01/tc05/item01.csv").equals(
+                self.read_embeddings("class02/tc05/item01.csv")
+            )
+        )
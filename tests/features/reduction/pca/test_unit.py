@@ -25,6 +25,11 @@ class FeatureExtractorExecute(TestCase):
             ],
         )
 
+        patch_feature_store = patch("bugfinder.features.reduction.FeatureStore")
+        self.mock_feature_store = patch_feature_store.start()
+        self.mock_feature_store.return_value.exists.return_value = False
+        self.addCleanup(patch_feature_store.stop)
+
         self.dataset = Mock(spec=CodeWeaknessClassificationDataset)
         self.dataset.feats_dir = "mock_feats_dir"
         self.dataset.feats_version = 1
@@ -46,6 +51,21 @@ class FeatureExtractorExecute(TestCase):
             ),
         )
 
+    @patch("bugfinder.features.reduction.copy")
+    def test_feature_store_version_is_created(self, mock_copy):
+        self.mock_feature_store.return_value.exists.return_value = True
+        self.data_processing.execute(**self.data_processing_kwargs)
+
+        self.assertFalse(mock_copy.called)
+        self.assertFalse(self.mock_feature_store.return_value.copy.called)
+        self.mock_feature_store.return_value.create_version.assert_called()
+
+    @patch("bugfinder.features.reduction.copy")
+    def test_output_features_are_written_to_store(self, mock_copy):
+        self.data_processing.execute(**self.data_processing_kwargs)
+
+        self.assertTrue(self.mock_feature_store.return_value.write.called)
+
     @patch("bugfinder.features.reduction.copy")
     def test_feature_version_is_updated(self, mock_copy):
         mock_copy.return_value = None
@@ -55,11 +75,11 @@ class FeatureExtractorExecute(TestCase):
 
     @patch("bugfinder.features.reduction.copy")
     @patch(
-        "tests.features.reduction.pca.test_unit.CodeWeaknessClassificationDataset.rebuild_index"
+        "tests.features.reduction.pca.test_unit.CodeWeaknessClassificationDataset.update_index"
     )
-    def test_index_is_rebuilt(self, mock_copy, mock_rebuild_index):
+    def test_index_is_updated(self, mock_copy, mock_update_index):
         mock_copy.return_value = None
 
         self.data_processing.execute(**self.data_processing_kwargs)
 
-        mock_rebuild_index.assert_called()
+        mock_update_index.assert_called()
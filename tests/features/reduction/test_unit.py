@@ -1,3 +1,129 @@
+from os import listdir, remove
+from os.path import join
+from shutil import copytree
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+import pandas as pd
+
+from bugfinder import settings
+from bugfinder.base.dataset import CodeWeaknessClassificationDataset
+from bugfinder.features.reduction import AbstractFeatureSelector
+from bugfinder.utils.feature_store import FeatureStore, BLOCKS_DIR
+from tests import patch_paths
+
+
 class MockEstimator:
     def fit(self, input_features, input_results):
         return self
+
+
+class MockColumnSelector(AbstractFeatureSelector):
+    def select_feature(self, input_features, input_results, dry_run, columns):
+        return input_features[columns]
+
+
+class MockTransformSelector(AbstractFeatureSelector):
+    def select_feature(self, input_features, input_results, dry_run):
+        return pd.DataFrame(
+            {"sum": input_features.sum(axis=1)}, index=input_features.index
+        )
+
+
+class TestAbstractFeatureSelectorIsColumnSubset(TestCase):
+    def setUp(self) -> None:
+        self.input_features = pd.DataFrame({"f01": [1, 2], "f02": [3, 4]})
+
+    def test_unchanged_columns_are_subset(self):
+        self.assertTrue(
+            AbstractFeatureSelector.is_column_subset(
+                self.input_features, self.input_features[["f02"]].astype(float)
+            )
+        )
+
+    def test_new_columns_are_not_subset(self):
+        self.assertFalse(
+            AbstractFeatureSelector.is_column_subset(
+                self.input_features, pd.DataFrame({"f03": [1, 2]})
+            )
+        )
+
+    def test_modified_columns_are_not_subset(self):
+        self.assertFalse(
+            AbstractFeatureSelector.is_column_subset(
+                self.input_features, pd.DataFrame({"f01": [2, 1]})
+            )
+        )
+
+
+class TestAbstractFeatureSelectorVersions(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            [
+                "bugfinder.base.dataset.LOGGER",
+                "bugfinder.features.reduction.LOGGER",
+            ],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset01")
+        copytree("./tests/fixtures/dataset01", self.dataset_path)
+
+        features_dir = join(self.dataset_path, "features")
+        self.feature_store = FeatureStore(join(features_dir, settings.FEATURES_STORE))
+        self.feature_store.import_csv(join(features_dir, settings.FEATURES_FILE))
+        remove(join(features_dir, settings.FEATURES_FILE))
+
+        self.blocks_path = join(self.feature_store.path, BLOCKS_DIR)
+        self.blocks = set(listdir(self.blocks_path))
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+    def test_column_selection_does_not_write_blocks(self):
+        MockColumnSelector(self.dataset).execute(False, columns=["f04", "f01"])
+
+        self.feature_store.reload()
+        self.assertListEqual(
+            self.feature_store.columns, ["f04", "f01", "result", "name"]
+        )
+        self.assertSetEqual(set(listdir(self.blocks_path)), self.blocks)
+
+    def test_transformation_writes_blocks(self):
+        MockTransformSelector(self.dataset).execute(False)
+
+        self.feature_store.reload()
+        self.assertListEqual(self.feature_store.columns, ["sum", "result", "name"])
+        self.assertNotEqual(set(listdir(self.blocks_path)), self.blocks)
+
+    def test_previous_version_is_kept(self):
+        original_features = self.feature_store.read()
+
+        MockColumnSelector(self.dataset).execute(False, columns=["f01"])
+        MockTransformSelector(
+            CodeWeaknessClassificationDataset(self.dataset_path)
+        ).execute(False)
+
+        self.feature_store.reload()
+        self.assertListEqual(self.feature_store.versions, [1, 2])
+        self.assertEqual(self.feature_store.feature_version, 3)
+        self.assertTrue(
+            original_features.equals(self.feature_store.get_version(1).read())
+        )
+        self.assertListEqual(
+            self.feature_store.get_version(2).columns, ["f01", "result", "name"]
+        )
+
+    def test_dataset_version_is_updated(self):
+        MockColumnSelector(self.dataset).execute(False, columns=["f01"])
+
+        self.assertEqual(
+            CodeWeaknessClassificationDataset(self.dataset_path).feats_version, 2
+        )
+
+    def test_dry_run_does_not_create_version(self):
+        MockColumnSelector(self.dataset).execute(True, columns=["f01"])
+
+        self.feature_store.reload()
+        self.assertListEqual(self.feature_store.versions, [])
@@ -59,3 +59,25 @@ class TestAbstractASTMarkupSendCommands(TestCase):
 
         self.dataset_processing.send_commands()
         self.assertTrue(mock_neo4j_db.run.called)
+
+    @patch.object(MockASTMarkup, "build_ast_markup")
+    @patch("bugfinder.processing.neo4j.Neo4J3Processing.neo4j_db")
+    @patch("bugfinder.processing.neo4j.Neo4J3Processing.send_commands")
+    def test_ast_markup_is_bound_as_parameter(
+        self, mock_send_commands, mock_neo4j_db, mock_build_ast_markup
+    ):
+        mock_build_ast_markup.side_effect = lambda ast_item: {
+            "id": 1,
+            "ast": "it's:%s",
+        }
+
+        self.dataset_processing.send_commands()
+
+        self.assertEqual(
+            mock_neo4j_db.run.call_args[0][0],
+            self.dataset_processing.SET_AST_MARKUP_CMD.template,
+        )
+        self.assertDictEqual(
+            mock_neo4j_db.run.call_args[0][1],
+            {"data": [{"id": 1, "ast": "it's:%s"}, {"id": 1, "ast": "it's:%s"}]},
+        )
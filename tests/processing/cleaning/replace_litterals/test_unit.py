@@ -38,6 +38,7 @@ class TestReplaceLitteralsExecute(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -48,6 +49,7 @@ class TestReplaceLitteralsExecute(TestCase):
         mock_process_file.return_value = 0
 
         dataset_processing = ReplaceLitterals(self.dataset)
+        dataset_processing.deduplicate = False
         dataset_processing.execute()
 
         mock_process_file_calls = [call(test_file) for test_file in self.test_files]
@@ -56,22 +58,14 @@ class TestReplaceLitteralsExecute(TestCase):
     @patch(
         "bugfinder.processing.cleaning.replace_litterals.ReplaceLitterals.process_file"
     )
-    def test_file_reprocessed_after_replacement(self, mock_process_file):
-        processed_args = []
-
-        def mock_process_file_fn(filepath):
-            if filepath in processed_args:
-                return 0
-            else:
-                processed_args.append(filepath)
-                return 1
-
-        mock_process_file.side_effect = mock_process_file_fn
+    def test_file_processed_once_after_replacement(self, mock_process_file):
+        mock_process_file.return_value = 1
 
         dataset_processing = ReplaceLitterals(self.dataset)
+        dataset_processing.deduplicate = False
         dataset_processing.execute()
 
-        self.assertEqual(mock_process_file.call_count, len(self.test_files) * 2)
+        self.assertEqual(mock_process_file.call_count, len(self.test_files))
 
 
 class TestReplaceLitteralsProcessFile(TestCase):
@@ -100,6 +94,7 @@ class TestReplaceLitteralsProcessFile(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.dataset_path, settings.INDEX_FILE))
             remove("%s.tmp" % self.file_with_litterals)
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
@@ -123,3 +118,29 @@ class TestReplaceLitteralsProcessFile(TestCase):
         repl_count = self.dataset_processing.process_file(self.file_with_litterals)
 
         self.assertEqual(repl_count, 2)
+
+
+class TestReplaceLitteralsReplaceLitterals(TestCase):
+    def setUp(self) -> None:
+        self.dataset_processing = ReplaceLitterals(None)
+
+    def test_clean_code_is_unchanged(self):
+        code = 'int a = 0;\nchar *b = "b";\n'
+
+        self.assertEqual(self.dataset_processing.replace_litterals(code), (code, 0))
+
+    def test_every_litteral_of_a_line_is_replaced(self):
+        code, repl_count = self.dataset_processing.replace_litterals(
+            "wchar_t a[] = {L'a', L'b', L'c'};\nint d = 0;\n"
+        )
+
+        self.assertEqual(code, "wchar_t a[] = {L('a'), L('b'), L('c')};\nint d = 0;\n")
+        self.assertEqual(repl_count, 3)
+
+    def test_mixed_litterals_are_replaced(self):
+        code, repl_count = self.dataset_processing.replace_litterals(
+            "wcscpy(a, L\"abc\"); a[3] = L'\\0';\n"
+        )
+
+        self.assertEqual(code, "wcscpy(a, L(\"abc\")); a[3] = L('\\0');\n")
+        self.assertEqual(repl_count, 2)
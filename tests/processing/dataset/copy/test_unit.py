@@ -1,8 +1,9 @@
 from os import remove
-from os.path import join
+from os.path import join, samefile
 from unittest import TestCase
 
 from shutil import rmtree
+from unittest.mock import patch
 
 from bugfinder import settings
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
@@ -31,6 +32,7 @@ class TestCopyDatasetExecute(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.input_dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.input_dataset_path, settings.INDEX_FILE))
             rmtree(self.output_dataset_path)
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
@@ -52,3 +54,23 @@ class TestCopyDatasetExecute(TestCase):
     def test_can_overwrite_with_force_true(self):
         self.dataset_processing.execute(self.output_dataset_path)
         self.dataset_processing.execute(self.output_dataset_path, True)
+
+    @patch("bugfinder.utils.dirs.fcntl.ioctl")
+    def test_linked_copy_shares_test_case_files(self, mock_ioctl):
+        mock_ioctl.side_effect = OSError("Operation not supported")
+        input_checksum = directory_shasum(self.input_dataset_path)
+        self.dataset_processing.execute(self.output_dataset_path, link_files=True)
+
+        self.assertEqual(directory_shasum(self.output_dataset_path), input_checksum)
+        self.assertTrue(
+            samefile(
+                join(self.input_dataset_path, "class01/tc02/item.c"),
+                join(self.output_dataset_path, "class01/tc02/item.c"),
+            )
+        )
+        self.assertFalse(
+            samefile(
+                join(self.input_dataset_path, "features/features.csv"),
+                join(self.output_dataset_path, "features/features.csv"),
+            )
+        )
@@ -1,11 +1,16 @@
-from os import remove
-from os.path import join
+from os import listdir, remove
+from os.path import join, samefile
 from unittest import TestCase
 
 from shutil import rmtree
+from unittest.mock import patch
 
 from bugfinder import settings
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
+from bugfinder.base.dataset_view import (
+    CodeWeaknessClassificationDatasetView,
+    open_dataset,
+)
 from bugfinder.processing.dataset.extract import ExtractSampleDataset
 from tests import patch_paths
 
@@ -31,6 +36,7 @@ class TestExtractSampleDatasetExecute(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.input_dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.input_dataset_path, settings.INDEX_FILE))
             rmtree(self.output_dataset_path)
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
@@ -95,3 +101,40 @@ class TestExtractSampleDatasetExecute(TestCase):
         ).test_cases
 
         self.assertEqual(test_case_01, test_case_02)
+
+    @patch("bugfinder.utils.dirs.fcntl.ioctl")
+    def test_linked_files_share_content(self, mock_ioctl):
+        mock_ioctl.side_effect = OSError("Operation not supported")
+        self.dataset_processing.execute(
+            self.output_dataset_path, self.sample_nb, link_files=True
+        )
+
+        output_dataset = CodeWeaknessClassificationDataset(self.output_dataset_path)
+
+        for test_case in output_dataset.test_cases:
+            for filename in listdir(join(self.output_dataset_path, test_case)):
+                self.assertTrue(
+                    samefile(
+                        join(self.input_dataset_path, test_case, filename),
+                        join(self.output_dataset_path, test_case, filename),
+                    )
+                )
+
+    def test_view_lists_sampled_test_cases(self):
+        self.dataset_processing.execute(
+            self.output_dataset_path, self.sample_nb, as_view=True
+        )
+
+        output_dataset = open_dataset(self.output_dataset_path)
+
+        self.assertIsInstance(output_dataset, CodeWeaknessClassificationDatasetView)
+        self.assertEqual(len(output_dataset.test_cases), self.sample_nb)
+        self.assertTrue(
+            output_dataset.test_cases.issubset(
+                self.dataset_processing.dataset.test_cases
+            )
+        )
+        self.assertListEqual(
+            sorted(listdir(self.output_dataset_path)),
+            [settings.VIEW_MANIFEST_FILE, settings.SUMMARY_FILE],
+        )
@@ -14,6 +14,7 @@ class TestRightFixer(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.input_dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.input_dataset_path, settings.INDEX_FILE))
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
 
@@ -1,5 +1,5 @@
-from os import remove
-from os.path import join
+from os import listdir, remove
+from os.path import join, samefile
 from unittest import TestCase
 
 from shutil import rmtree
@@ -7,6 +7,10 @@ from unittest.mock import patch
 
 from bugfinder import settings
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
+from bugfinder.base.dataset_view import (
+    CodeWeaknessClassificationDatasetView,
+    open_dataset,
+)
 from bugfinder.processing.dataset.inverse import InverseDataset
 from tests import patch_paths
 
@@ -32,7 +36,9 @@ class TestInverseDatasetExecute(TestCase):
     def tearDown(self) -> None:
         try:
             remove(join(self.input_dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.input_dataset_path, settings.INDEX_FILE))
             remove(join(self.from_dataset_path, settings.SUMMARY_FILE))
+            remove(join(self.from_dataset_path, settings.INDEX_FILE))
             rmtree(self.output_dataset_path)
         except FileNotFoundError:
             pass  # Ignore FileNotFound errors
@@ -94,3 +100,41 @@ class TestInverseDatasetExecute(TestCase):
             output_dataset.test_cases,
             self.dataset.test_cases.difference(from_dataset.test_cases),
         )
+
+    @patch("bugfinder.utils.dirs.fcntl.ioctl")
+    def test_linked_files_share_content(self, mock_ioctl):
+        mock_ioctl.side_effect = OSError("Operation not supported")
+        self.dataset_processing.execute(
+            self.output_dataset_path, self.from_dataset_path, link_files=True
+        )
+
+        output_dataset = CodeWeaknessClassificationDataset(self.output_dataset_path)
+        self.assertNotEqual(len(output_dataset.test_cases), 0)
+
+        for test_case in output_dataset.test_cases:
+            for filename in listdir(join(self.output_dataset_path, test_case)):
+                self.assertTrue(
+                    samefile(
+                        join(self.input_dataset_path, test_case, filename),
+                        join(self.output_dataset_path, test_case, filename),
+                    )
+                )
+
+    def test_view_of_view_inverse_is_correct(self):
+        view_path = join(self.output_dataset_path, "view")
+        inverse_view_path = join(self.output_dataset_path, "inverse_view")
+        # The compared dataset is not opened, its files are not removed in tearDown.
+        self.addCleanup(rmtree, self.output_dataset_path, ignore_errors=True)
+
+        view = CodeWeaknessClassificationDatasetView.create(
+            view_path, self.dataset, sorted(self.dataset.test_cases)[:3]
+        )
+
+        self.dataset_processing.execute(inverse_view_path, view_path, as_view=True)
+
+        inverse_view = open_dataset(inverse_view_path)
+
+        self.assertIsInstance(inverse_view, CodeWeaknessClassificationDatasetView)
+        self.assertEqual(
+            inverse_view.test_cases, self.dataset.test_cases.difference(view.test_cases)
+        )
@@ -1,5 +1,12 @@
+from os import listdir, makedirs
+from os.path import exists, join, samefile
+from tempfile import TemporaryDirectory
+from threading import Lock
+from time import sleep
 from unittest import TestCase
+from unittest.mock import Mock, patch
 
+from bugfinder.base.dataset import CodeWeaknessClassificationDataset
 from bugfinder.processing.joern import AbstractJoernProcessing
 from tests import patch_paths
 
@@ -34,3 +41,129 @@ class TestJoernDefaultDatasetProcessingConfigureContainer(TestCase):
         self.dataset_processing.configure_container()
 
         self.assertFalse(self.dataset_processing.detach)
+
+
+class TestJoernDatasetProcessingShards(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            [
+                "bugfinder.base.processing.LOGGER",
+                "bugfinder.processing.joern.LOGGER",
+            ],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset = Mock(spec=CodeWeaknessClassificationDataset)
+        self.dataset.path = self.tmp_dir.name
+        self.dataset.joern_dir = join(self.tmp_dir.name, "joern.db")
+        self.dataset.test_case_files = {
+            "class01/tc01": ["item.c"],
+            "class01/tc02": ["item.c"],
+            "class02/tc01": ["item.c"],
+            "class02/tc02": ["item.c", "item.h"],
+        }
+        self.dataset.test_cases = set(self.dataset.test_case_files.keys())
+
+        for test_case, size in [
+            ("class01/tc01", 40),
+            ("class01/tc02", 30),
+            ("class02/tc01", 20),
+            ("class02/tc02", 10),
+        ]:
+            makedirs(join(self.tmp_dir.name, test_case))
+
+            for filename in self.dataset.test_case_files[test_case]:
+                with open(join(self.tmp_dir.name, test_case, filename), "w") as fp:
+                    fp.write("x" * size)
+
+        self.dataset_processing = MockJoernDatasetProcessing(self.dataset)
+
+    def test_shards_are_balanced(self):
+        self.assertListEqual(
+            self.dataset_processing.get_shards(2),
+            [["class01/tc01", "class02/tc02"], ["class01/tc02", "class02/tc01"]],
+        )
+
+    def test_empty_shards_are_ignored(self):
+        self.assertEqual(len(self.dataset_processing.get_shards(6)), 4)
+
+    @patch("bugfinder.utils.dirs.fcntl.ioctl")
+    def test_shards_share_test_case_files(self, mock_ioctl):
+        mock_ioctl.side_effect = OSError("Operation not supported")
+        shards_path = join(self.dataset.joern_dir, "shards")
+
+        shard_paths = self.dataset_processing.create_shards(shards_path, 2)
+
+        self.assertListEqual(
+            shard_paths, [join(shards_path, "0"), join(shards_path, "1")]
+        )
+        self.assertTrue(
+            samefile(
+                join(self.tmp_dir.name, "class02/tc02/item.h"),
+                join(shards_path, "0", "class02/tc02/item.h"),
+            )
+        )
+        self.assertListEqual(
+            sorted(listdir(join(shards_path, "1"))), ["class01", "class02"]
+        )
+
+    def test_shard_volume_is_mounted(self):
+        self.dataset_processing.shard_path = "mock_shard_path"
+        self.dataset_processing.configure_container()
+
+        self.assertDictEqual(
+            self.dataset_processing.volumes, {"mock_shard_path": "/code"}
+        )
+
+    @patch("bugfinder.processing.joern.settings")
+    def test_containers_are_bounded_by_memory_budget(self, mock_settings):
+        mock_settings.POOL_SIZE = 8
+        mock_settings.JOERN_SHARD_MEMORY = 4
+        mock_settings.JOERN_MEMORY_BUDGET = 8
+        running_shards = []
+        max_running_shards = []
+        lock = Lock()
+
+        def mock_parse_shard(shard_path, command_args=None, container_config=None):
+            with lock:
+                running_shards.append(shard_path)
+                max_running_shards.append(len(running_shards))
+
+            sleep(0.05)
+
+            with lock:
+                running_shards.remove(shard_path)
+
+        self.dataset_processing.parse_shard = mock_parse_shard
+        self.dataset_processing.run_shards(["0", "1", "2", "3"])
+
+        self.assertEqual(max(max_running_shards), 2)
+
+    def test_unsupported_shards_fail(self):
+        with self.assertRaises(ValueError):
+            self.dataset_processing.execute(shards=2)
+
+    @patch("tests.processing.joern.test_unit.MockJoernDatasetProcessing.run_shards")
+    @patch("tests.processing.joern.test_unit.MockJoernDatasetProcessing.merge_shards")
+    def test_shards_are_merged_and_removed(self, mock_merge_shards, mock_run_shards):
+        self.dataset_processing.supports_shards = True
+        self.dataset_processing.execute(shards=2)
+
+        self.assertEqual(len(mock_run_shards.call_args[0][0]), 2)
+        self.assertListEqual(
+            mock_merge_shards.call_args[0][0], mock_run_shards.call_args[0][0]
+        )
+        self.assertFalse(exists(join(self.dataset.joern_dir, "shards")))
+
+    def test_unsupported_incremental_parsing_fails(self):
+        with self.assertRaises(ValueError):
+            self.dataset_processing.execute(incremental=True)
+
+    def test_shards_can_be_restricted_to_test_cases(self):
+        self.assertListEqual(
+            self.dataset_processing.get_shards(2, ["class01/tc02", "class02/tc02"]),
+            [["class01/tc02"], ["class02/tc02"]],
+        )
@@ -1,10 +1,13 @@
-from os import listdir, remove
-from os.path import join
+import json
+from os import listdir, makedirs, remove, walk
+from os.path import dirname as dirname_of, exists, join, relpath
+from shutil import rmtree
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 from unittest.mock import patch, Mock
 
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
-from bugfinder.processing.joern.v040 import JoernProcessing
+from bugfinder.processing.joern.v040 import JoernProcessing, PARSE_STATE_FILE
 from bugfinder.settings import ROOT_DIR
 from tests import patch_paths
 
@@ -46,6 +49,8 @@ class TestJoernDatasetProcessingSendCommands(TestCase):
             [
                 "bugfinder.processing.joern.v040.LOGGER",
                 "bugfinder.base.processing.LOGGER",
+                "bugfinder.processing.joern.v040.JoernProcessing.build_parse_state",
+                "bugfinder.processing.joern.v040.JoernProcessing.save_parse_state",
             ],
         )
 
@@ -102,3 +107,333 @@ class TestJoernDatasetProcessingSendCommands(TestCase):
                 expected_content = fp.read()
 
             self.assertEqual(returned_content, expected_content)
+
+
+class TestJoernDatasetProcessingMergeCsvFiles(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            [
+                "bugfinder.processing.joern.v040.LOGGER",
+                "bugfinder.base.processing.LOGGER",
+                "bugfinder.processing.joern.v040.JoernProcessing.build_parse_state",
+                "bugfinder.processing.joern.v040.JoernProcessing.save_parse_state",
+            ],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset = Mock(spec=CodeWeaknessClassificationDataset)
+        self.dataset.joern_dir = self.tmp_dir.name
+        self.dataset_processing = JoernProcessing(self.dataset)
+
+        for source_dir, nodes, edges in [
+            (
+                "file01.c",
+                ["1\tFile\tfile01.c\n", "2\tFunction\tmain\n"],
+                ["1\t2\tIS_FILE_OF\n"],
+            ),
+            (
+                "file02.c",
+                [
+                    "3\tDirectory\tcode\n",
+                    "4\tFunction\tfun\n",
+                    "5\tStatement\tx\n",
+                ],
+                ["3\t4\tIS_FILE_OF\n", "4\t5\tFLOWS_TO\n"],
+            ),
+        ]:
+            makedirs(join(self.tmp_dir.name, "code", source_dir))
+
+            for filetype, header, rows in [
+                ("nodes", "key\ttype\tcode\n", nodes),
+                ("edges", "start\tend\ttype\n", edges),
+            ]:
+                with open(
+                    join(self.tmp_dir.name, "code", source_dir, "%s.csv" % filetype),
+                    "w",
+                ) as csv_file:
+                    csv_file.writelines([header] + rows)
+
+    def read_import_file(self, filetype):
+        with open(join(self.tmp_dir.name, "import", "%s.csv" % filetype)) as csv_file:
+            return csv_file.readlines()
+
+    @patch("bugfinder.processing.joern.v040.POOL_SIZE", 1)
+    def test_files_are_merged_in_order(self):
+        self.dataset_processing.send_commands()
+
+        self.assertListEqual(
+            self.read_import_file("nodes"),
+            [
+                ":ID\ttype\tcode\n",
+                "2\tFunction\tmain\n",
+                "4\tFunction\tfun\n",
+                "5\tStatement\tx\n",
+            ],
+        )
+        self.assertListEqual(
+            self.read_import_file("edges"),
+            [":START_ID\t:END_ID\t:TYPE\n", "3\t4\tIS_FILE_OF\n", "4\t5\tFLOWS_TO\n"],
+        )
+
+    @patch("bugfinder.processing.joern.v040.IMPORT_QUEUE_SIZE", 1)
+    def test_files_are_merged_in_order_with_small_queue(self):
+        self.dataset_processing.send_commands()
+
+        self.assertListEqual(
+            self.read_import_file("nodes"),
+            [
+                ":ID\ttype\tcode\n",
+                "2\tFunction\tmain\n",
+                "4\tFunction\tfun\n",
+                "5\tStatement\tx\n",
+            ],
+        )
+
+    def test_filtered_rows_are_counted(self):
+        self.dataset_processing.send_commands()
+
+        self.assertEqual(
+            self.dataset_processing.processing_stats["directories_ignored"], 1
+        )
+        self.assertEqual(self.dataset_processing.processing_stats["parsing_errors"], 1)
+
+
+class TestJoernDatasetProcessingMergeShards(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            [
+                "bugfinder.processing.joern.v040.LOGGER",
+                "bugfinder.base.processing.LOGGER",
+            ],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset = Mock(spec=CodeWeaknessClassificationDataset)
+        self.dataset.joern_dir = join(self.tmp_dir.name, "joern.db")
+        self.dataset_processing = JoernProcessing(self.dataset)
+
+        self.shard_paths = []
+
+        for shard_index, test_case in enumerate(["class01/tc01", "class02/tc01"]):
+            shard_path = join(self.tmp_dir.name, "shards", str(shard_index))
+            csv_dir = join(shard_path, "joern.db", "code", test_case, "item.c")
+            makedirs(csv_dir)
+
+            with open(join(csv_dir, "nodes.csv"), "w") as nodes_file:
+                nodes_file.write("command\tkey\ttype\n")
+                nodes_file.write("ANR\t0\tFile\n")
+                nodes_file.write("ANR\t1\tFunction\n")
+
+            with open(join(csv_dir, "edges.csv"), "w") as edges_file:
+                edges_file.write("start\tend\ttype\n")
+                edges_file.write("0\t1\tIS_FILE_OF\n")
+
+            self.shard_paths.append(shard_path)
+
+    def read_csv_file(self, test_case, filetype):
+        with open(
+            join(self.dataset.joern_dir, "code", test_case, "item.c", filetype)
+        ) as csv_file:
+            return csv_file.readlines()
+
+    def test_node_ids_are_unique(self):
+        self.dataset_processing.merge_shards(self.shard_paths)
+
+        self.assertListEqual(
+            self.read_csv_file("class01/tc01", "nodes.csv")[1:],
+            ["ANR\t0\tFile\n", "ANR\t1\tFunction\n"],
+        )
+        self.assertListEqual(
+            self.read_csv_file("class02/tc01", "nodes.csv")[1:],
+            ["ANR\t2\tFile\n", "ANR\t3\tFunction\n"],
+        )
+
+    def test_edges_are_shifted(self):
+        self.dataset_processing.merge_shards(self.shard_paths)
+
+        self.assertListEqual(
+            self.read_csv_file("class02/tc01", "edges.csv"),
+            ["start\tend\ttype\n", "2\t3\tIS_FILE_OF\n"],
+        )
+
+    def test_previous_csv_files_are_replaced(self):
+        previous_dir = join(self.dataset.joern_dir, "code", "class03")
+        makedirs(previous_dir)
+
+        self.dataset_processing.merge_shards(self.shard_paths)
+
+        self.assertListEqual(
+            sorted(listdir(join(self.dataset.joern_dir, "code"))),
+            ["class01", "class02"],
+        )
+
+    @patch("bugfinder.processing.joern.v040.open")
+    def test_shard_commands_are_skipped(self, mock_open):
+        self.dataset_processing.shard_path = self.shard_paths[0]
+        self.dataset_processing.send_commands()
+
+        self.assertFalse(mock_open.called)
+
+
+class TestJoernDatasetProcessingUpdateDatabase(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            [
+                "bugfinder.processing.joern.v040.LOGGER",
+                "bugfinder.processing.joern.LOGGER",
+                "bugfinder.base.processing.LOGGER",
+            ],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset = Mock(spec=CodeWeaknessClassificationDataset)
+        self.dataset.path = self.tmp_dir.name
+        self.dataset.joern_dir = join(self.tmp_dir.name, "joern.db")
+        self.dataset.test_case_files = {}
+        self.dataset.test_cases = set()
+
+        for test_case in ["class01/tc01", "class01/tc02", "class02/tc01"]:
+            self.write_test_case(test_case, "int main() {}\n")
+
+        self.parsed_test_cases = []
+        self.dataset_processing = JoernProcessing(self.dataset)
+        self.dataset_processing.parse_shard = self.mock_parse_shard
+
+    def write_test_case(self, test_case, code):
+        makedirs(join(self.tmp_dir.name, test_case), exist_ok=True)
+
+        with open(join(self.tmp_dir.name, test_case, "item.c"), "w") as test_file:
+            test_file.write(code)
+
+        self.dataset.test_case_files[test_case] = ["item.c"]
+        self.dataset.test_cases = set(self.dataset.test_case_files.keys())
+
+    def remove_test_case(self, test_case):
+        rmtree(join(self.tmp_dir.name, test_case))
+        del self.dataset.test_case_files[test_case]
+        self.dataset.test_cases = set(self.dataset.test_case_files.keys())
+
+    def mock_parse_shard(self, shard_path, command_args=None, container_config=None):
+        # Node ids of each Joern run start at 0.
+        key = 0
+
+        for dirname, subdirs, filelist in walk(shard_path):
+            subdirs.sort()
+
+            for filename in sorted(filelist):
+                source_path = relpath(join(dirname, filename), shard_path)
+                csv_dir = join(shard_path, "joern.db", "code", source_path)
+                makedirs(csv_dir)
+
+                with open(join(csv_dir, "nodes.csv"), "w") as nodes_file:
+                    nodes_file.write("key\ttype\tcode\n")
+                    nodes_file.write("%d\tFile\t%s\n" % (key, source_path))
+                    nodes_file.write("%d\tFunction\tmain\n" % (key + 1))
+
+                with open(join(csv_dir, "edges.csv"), "w") as edges_file:
+                    edges_file.write("start\tend\ttype\n")
+                    edges_file.write("%d\t%d\tIS_FILE_OF\n" % (key, key + 1))
+
+                self.parsed_test_cases.append(dirname_of(source_path))
+                key += 2
+
+    def read_import_file(self, filetype):
+        with open(join(self.dataset.joern_dir, "import", "%s.csv" % filetype)) as fp:
+            return fp.readlines()
+
+    def test_whole_dataset_is_parsed_first(self):
+        self.dataset_processing.execute(incremental=True)
+
+        self.assertListEqual(
+            sorted(self.parsed_test_cases),
+            ["class01/tc01", "class01/tc02", "class02/tc01"],
+        )
+        self.assertEqual(len(self.read_import_file("nodes")), 6)
+        self.assertTrue(exists(join(self.dataset.joern_dir, PARSE_STATE_FILE)))
+        self.assertFalse(exists(join(self.dataset.joern_dir, "shards")))
+
+    def test_unchanged_dataset_is_not_parsed(self):
+        self.dataset_processing.execute(incremental=True)
+        self.parsed_test_cases = []
+
+        self.dataset_processing.execute(incremental=True)
+
+        self.assertListEqual(self.parsed_test_cases, [])
+        self.assertEqual(
+            self.dataset_processing.processing_stats["test_cases_parsed"], 0
+        )
+
+    def test_only_changed_test_cases_are_parsed(self):
+        self.dataset_processing.execute(incremental=True)
+        self.parsed_test_cases = []
+        self.write_test_case("class01/tc02", "int main() { return 1; }\n")
+        self.write_test_case("class02/tc02", "int main() {}\n")
+
+        self.dataset_processing.execute(incremental=True)
+
+        self.assertListEqual(
+            sorted(self.parsed_test_cases), ["class01/tc02", "class02/tc02"]
+        )
+
+    def test_stale_rows_are_replaced(self):
+        self.dataset_processing.execute(incremental=True)
+        self.write_test_case("class01/tc02", "int main() { return 1; }\n")
+
+        self.dataset_processing.execute(incremental=True)
+
+        self.assertListEqual(
+            self.read_import_file("nodes"),
+            [
+                ":ID\ttype\tcode\n",
+                "1\tFunction\tmain\n",
+                "4\tFile\tclass02/tc01/item.c\n",
+                "5\tFunction\tmain\n",
+                "6\tFile\tclass01/tc02/item.c\n",
+                "7\tFunction\tmain\n",
+            ],
+        )
+        self.assertListEqual(
+            self.read_import_file("edges"),
+            [
+                ":START_ID\t:END_ID\t:TYPE\n",
+                "4\t5\tIS_FILE_OF\n",
+                "6\t7\tIS_FILE_OF\n",
+            ],
+        )
+
+    def test_removed_test_cases_are_removed(self):
+        self.dataset_processing.execute(incremental=True)
+        self.remove_test_case("class02/tc01")
+
+        self.dataset_processing.execute(incremental=True)
+
+        self.assertNotIn(
+            "4\tFile\tclass02/tc01/item.c\n", self.read_import_file("nodes")
+        )
+        self.assertFalse(
+            exists(join(self.dataset.joern_dir, "code", "class02", "tc01"))
+        )
+        self.assertEqual(
+            self.dataset_processing.processing_stats["test_cases_removed"], 1
+        )
+
+    def test_outdated_state_parses_whole_dataset(self):
+        self.dataset_processing.execute(incremental=True)
+        self.parsed_test_cases = []
+
+        with open(join(self.dataset.joern_dir, PARSE_STATE_FILE), "w") as fp:
+            json.dump({"version": -1}, fp)
+
+        self.dataset_processing.execute(incremental=True)
+
+        self.assertEqual(len(self.parsed_test_cases), 3)
+        self.assertEqual(len(self.read_import_file("nodes")), 6)
@@ -0,0 +1,75 @@
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from bugfinder.processing.neo4j import ProfiledGraph
+from bugfinder.processing.neo4j.queries import CypherQuery, register_query
+
+
+class TestRegisterQuery(TestCase):
+    def setUp(self) -> None:
+        patch_registry = patch.dict(
+            "bugfinder.processing.neo4j.queries.QUERY_REGISTRY", clear=True
+        )
+        patch_registry.start()
+        self.addCleanup(patch_registry.stop)
+
+    def test_query_is_registered_once(self):
+        query = register_query("mock_query", "MATCH (n) WHERE id(n)=$id RETURN n")
+
+        self.assertIs(
+            register_query("mock_query", "MATCH (n) WHERE id(n)=$id RETURN n"), query
+        )
+
+    def test_conflicting_templates_fail(self):
+        register_query("mock_query", "MATCH (n) WHERE id(n)=$id RETURN n")
+
+        with self.assertRaises(ValueError):
+            register_query("mock_query", "MATCH (n) RETURN n")
+
+
+class TestCypherQueryRun(TestCase):
+    def setUp(self) -> None:
+        self.query = CypherQuery("mock_query", "MATCH (n) WHERE id(n)=$id RETURN n")
+        self.graph = Mock()
+        self.query_stats = {}
+
+    def test_parameters_are_bound(self):
+        self.query.run(self.graph, id=42)
+
+        self.graph.run.assert_called_with(
+            "MATCH (n) WHERE id(n)=$id RETURN n", {"id": 42}
+        )
+
+    def test_template_is_unchanged(self):
+        self.query.run(self.graph, id=1)
+        self.query.run(self.graph, id=2)
+
+        self.assertEqual(
+            self.graph.run.call_args_list[0][0][0],
+            self.graph.run.call_args_list[1][0][0],
+        )
+
+    def test_executions_are_counted_per_template(self):
+        profiled_graph = ProfiledGraph(self.graph, self.query_stats)
+
+        for query_id in range(3):
+            self.query.run(profiled_graph, id=query_id)
+
+        self.assertEqual(
+            self.query_stats["cypher_templates"]["mock_query"]["queries"], 3
+        )
+        self.assertGreaterEqual(
+            self.query_stats["cypher_templates"]["mock_query"]["time"], 0
+        )
+        self.assertEqual(self.query_stats["cypher_queries"], 3)
+
+    def test_failed_executions_are_counted(self):
+        self.graph.run.side_effect = Exception()
+        profiled_graph = ProfiledGraph(self.graph, self.query_stats)
+
+        with self.assertRaises(Exception):
+            self.query.run(profiled_graph, id=42)
+
+        self.assertEqual(
+            self.query_stats["cypher_templates"]["mock_query"]["queries"], 1
+        )
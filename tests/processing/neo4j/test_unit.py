@@ -2,7 +2,12 @@ from unittest import TestCase
 from unittest.mock import Mock, patch
 
 from bugfinder.base.dataset import CodeWeaknessClassificationDataset
-from bugfinder.processing.neo4j import Neo4J3Processing
+from bugfinder.processing.neo4j import (
+    Neo4J3Processing,
+    ProfiledGraph,
+    close_graph,
+    get_graph,
+)
 from bugfinder import settings
 
 
@@ -70,6 +75,10 @@ class TestNeo4J3ProcessingConfigureContainer(TestCase):
 
 class TestNeo4J3ProcessingSendCommands(TestCase):
     def setUp(self) -> None:
+        patch_graphs = patch.dict("bugfinder.processing.neo4j._graphs", clear=True)
+        patch_graphs.start()
+        self.addCleanup(patch_graphs.stop)
+
         self.dataset = Mock(spec=CodeWeaknessClassificationDataset)
         self.dataset.neo4j_dir = "mock_neo4j_dir"
         self.dataset_processing = MockNeo4J3Processing(self.dataset)
@@ -90,4 +99,121 @@ class TestNeo4J3ProcessingSendCommands(TestCase):
         mock_graph.return_value = "mock_graph"
         self.dataset_processing.send_commands()
 
-        self.assertEqual(self.dataset_processing.neo4j_db, "mock_graph")
+        self.assertEqual(self.dataset_processing.neo4j_db.graph, "mock_graph")
+
+    @patch("bugfinder.processing.neo4j.Graph")
+    @patch("bugfinder.processing.neo4j.wait_log_display")
+    def test_bolt_port_is_used(self, mock_wait_log_display, mock_graph):
+        self.dataset_processing.send_commands()
+
+        self.assertEqual(mock_graph.call_args[1]["scheme"], "bolt")
+        self.assertEqual(
+            mock_graph.call_args[1]["port"],
+            int(self.dataset_processing.machine_ports[1]),
+        )
+
+    @patch("bugfinder.processing.neo4j.Graph")
+    @patch("bugfinder.processing.neo4j.wait_log_display")
+    @patch("bugfinder.base.processing.containers.start_container")
+    @patch("bugfinder.base.processing.containers.stop_container_by_name")
+    def test_connections_are_closed_after_execution(
+        self, mock_stop_container, mock_start_container, mock_wait, mock_graph
+    ):
+        self.dataset_processing.execute()
+
+        self.assertTrue(mock_graph.return_value.service.connector.close.called)
+
+
+class TestGetGraph(TestCase):
+    def setUp(self) -> None:
+        patch_graphs = patch.dict("bugfinder.processing.neo4j._graphs", clear=True)
+        patch_graphs.start()
+        self.addCleanup(patch_graphs.stop)
+
+        patch_graph = patch("bugfinder.processing.neo4j.Graph")
+        self.mock_graph = patch_graph.start()
+        self.mock_graph.side_effect = lambda **kwargs: Mock()
+        self.addCleanup(patch_graph.stop)
+
+    def test_graph_is_reused_by_process(self):
+        self.assertIs(get_graph("7687"), get_graph(7687))
+        self.assertEqual(self.mock_graph.call_count, 1)
+
+    def test_graphs_are_created_per_port(self):
+        self.assertIsNot(get_graph("7687"), get_graph("7688"))
+
+    def test_graphs_of_parent_process_are_not_reused(self):
+        graph = get_graph("7687")
+
+        with patch("bugfinder.processing.neo4j.getpid") as mock_getpid:
+            mock_getpid.return_value = -1
+            self.assertIsNot(get_graph("7687"), graph)
+
+    def test_pool_size_is_configured(self):
+        get_graph("7687")
+
+        self.assertEqual(
+            self.mock_graph.call_args[1]["max_size"], settings.NEO4J_CONNECTIONS
+        )
+
+    def test_closed_graph_is_created_again(self):
+        graph = get_graph("7687")
+        close_graph("7687")
+
+        self.assertTrue(graph.service.connector.close.called)
+        self.assertIsNot(get_graph("7687"), graph)
+
+    def test_unknown_graph_can_be_closed(self):
+        close_graph("7687")
+
+        self.assertFalse(self.mock_graph.called)
+
+
+class TestProfiledGraph(TestCase):
+    def setUp(self) -> None:
+        self.graph = Mock()
+        self.query_stats = {}
+        self.profiled_graph = ProfiledGraph(self.graph, self.query_stats)
+
+    def test_queries_are_forwarded(self):
+        self.graph.run.return_value = "mock_cursor"
+
+        self.assertEqual(self.profiled_graph.run("MATCH (n) RETURN n"), "mock_cursor")
+        self.graph.run.assert_called_with("MATCH (n) RETURN n")
+
+    def test_queries_are_counted(self):
+        for _ in range(3):
+            self.profiled_graph.run("MATCH (n) RETURN n")
+
+        self.assertEqual(self.query_stats["cypher_queries"], 3)
+        self.assertGreaterEqual(self.query_stats["cypher_time"], 0)
+
+    def test_failed_queries_are_counted(self):
+        self.graph.run.side_effect = Exception()
+
+        with self.assertRaises(Exception):
+            self.profiled_graph.run("MATCH (n) RETURN n")
+
+        self.assertEqual(self.query_stats["cypher_queries"], 1)
+
+    def test_other_attributes_are_delegated(self):
+        self.graph.name = "mock_name"
+
+        self.assertEqual(self.profiled_graph.name, "mock_name")
+
+    def test_worker_stats_are_merged(self):
+        self.profiled_graph.run("MATCH (n) RETURN n")
+        self.profiled_graph.merge_query_stats(
+            {
+                "cypher_queries": 2,
+                "cypher_time": 10,
+                "cypher_templates": {"mock_query": {"queries": 2, "time": 10}},
+            }
+        )
+
+        self.assertEqual(self.query_stats["cypher_queries"], 3)
+        self.assertGreaterEqual(self.query_stats["cypher_time"], 10)
+        self.assertDictEqual(
+            self.query_stats["cypher_templates"],
+            {"mock_query": {"queries": 2, "time": 10}},
+        )
@@ -0,0 +1,117 @@
+from os import listdir, stat
+from os.path import join
+from shutil import copytree
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bugfinder.base.dataset import CodeWeaknessClassificationDataset
+from bugfinder.processing.cleaning.remove_comments import RemoveComments
+from bugfinder.processing.cleaning.remove_main_function import RemoveMainFunction
+from bugfinder.processing.cleaning.remove_cpp_files import RemoveCppFiles
+from bugfinder.processing.cleaning.replace_litterals import ReplaceLitterals
+from bugfinder.processing.pipeline import SourceTransformPipeline
+from bugfinder.processing.tokenizers.replace_functions import ReplaceFunctions
+from bugfinder.processing.tokenizers.replace_variables import ReplaceVariables
+from bugfinder.processing.tokenizers.tokenize_code import TokenizeCode
+from tests import patch_paths
+
+STEP_CLASSES = [
+    RemoveComments,
+    RemoveMainFunction,
+    ReplaceLitterals,
+    ReplaceFunctions,
+    ReplaceVariables,
+    TokenizeCode,
+]
+
+
+def get_step_path(step_class):
+    return "%s.%s" % (step_class.__module__, step_class.__name__)
+
+
+def read_dataset_files(dataset):
+    dataset_files = {}
+
+    for test_case in dataset.test_cases:
+        for filename in listdir(join(dataset.path, test_case)):
+            with open(join(dataset.path, test_case, filename), "r") as file_fp:
+                dataset_files[join(test_case, filename)] = file_fp.read()
+
+    return dataset_files
+
+
+class TestSourceTransformPipelineExecute(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            [
+                "bugfinder.base.dataset.LOGGER",
+                "bugfinder.processing.pipeline.LOGGER",
+                "bugfinder.processing.cleaning.remove_comments.LOGGER",
+                "bugfinder.processing.cleaning.remove_main_function.LOGGER",
+                "bugfinder.processing.cleaning.replace_litterals.LOGGER",
+                "bugfinder.processing.tokenizers.replace_functions.LOGGER",
+                "bugfinder.processing.tokenizers.replace_variables.LOGGER",
+                "bugfinder.processing.tokenizers.tokenize_code.LOGGER",
+            ],
+        )
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.dataset_path = join(self.tmp_dir.name, "dataset")
+        copytree("./tests/fixtures/dataset05", self.dataset_path)
+        self.dataset = CodeWeaknessClassificationDataset(self.dataset_path)
+
+    def test_result_is_identical_to_separate_processing(self):
+        sequential_path = join(self.tmp_dir.name, "sequential")
+        copytree("./tests/fixtures/dataset05", sequential_path)
+        sequential_dataset = CodeWeaknessClassificationDataset(sequential_path)
+
+        for step_class in STEP_CLASSES:
+            step_class(sequential_dataset).execute()
+
+        SourceTransformPipeline(self.dataset).execute(
+            [get_step_path(step_class) for step_class in STEP_CLASSES]
+        )
+
+        self.assertDictEqual(
+            read_dataset_files(self.dataset),
+            read_dataset_files(sequential_dataset),
+        )
+
+    def test_summary_entry_is_added_per_step(self):
+        steps = [get_step_path(RemoveComments), get_step_path(TokenizeCode)]
+        SourceTransformPipeline(self.dataset).execute(steps)
+
+        self.assertListEqual(
+            [
+                summary_entry["operation"]["class"]
+                for summary_entry in self.dataset.summary["processing"]
+            ],
+            steps,
+        )
+
+    def test_summary_entry_counts_files(self):
+        SourceTransformPipeline(self.dataset).execute([get_step_path(TokenizeCode)])
+
+        summary_entry = self.dataset.summary["processing"][0]
+        self.assertEqual(summary_entry["files_processed"], 8)
+        self.assertEqual(summary_entry["files_modified"], 4)
+
+    def test_unmodified_files_are_not_written(self):
+        filepath = join(self.dataset_path, "class01", "tc01", "item04.c")
+        pipeline = SourceTransformPipeline(self.dataset)
+        pipeline.execute([get_step_path(RemoveComments)])
+        file_stat = stat(filepath)
+
+        pipeline.execute([get_step_path(RemoveComments)])
+
+        self.assertEqual(stat(filepath).st_mtime_ns, file_stat.st_mtime_ns)
+        self.assertEqual(self.dataset.summary["processing"][1]["files_modified"], 0)
+
+    def test_step_without_transformation_fails(self):
+        with self.assertRaises(ValueError):
+            SourceTransformPipeline(self.dataset).execute(
+                [get_step_path(RemoveCppFiles)]
+            )
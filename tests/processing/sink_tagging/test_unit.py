@@ -0,0 +1,244 @@
+from os import utime
+from os.path import exists, join
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import Mock, patch
+
+from py2neo.errors import ConnectionBroken, TransientError
+
+from bugfinder.processing.sink_tagging import (
+    SINK_MANIFEST_CACHE_EXT,
+    TAG_SINKS_QUERY,
+    SinkManifest,
+    SinkTaggingProcessing,
+    get_sink_batches,
+    sinktagging_worker,
+)
+from tests import patch_paths
+
+
+class TestGetSinkBatches(TestCase):
+    def setUp(self) -> None:
+        self.tc_list = {
+            "tc01": {
+                "tcid": 1,
+                "sinks": [
+                    {"basename": "tc01.c", "lineno": 10, "sardid": 1},
+                    {"basename": "tc01.c", "lineno": 20, "sardid": 1},
+                ],
+            },
+            "tc02": {"tcid": 2, "sinks": []},
+            "tc03": {
+                "tcid": 3,
+                "sinks": [{"basename": "tc03.c", "lineno": 30, "sardid": 3}],
+            },
+        }
+
+    def test_batches_span_test_cases(self):
+        self.assertListEqual(
+            get_sink_batches(self.tc_list, 10),
+            [
+                [
+                    {"name": "tc01", "tcid": 1, "basename": "tc01.c", "lineno": 10},
+                    {"name": "tc01", "tcid": 1, "basename": "tc01.c", "lineno": 20},
+                    {"name": "tc03", "tcid": 3, "basename": "tc03.c", "lineno": 30},
+                ]
+            ],
+        )
+
+    def test_batch_size_is_bounded(self):
+        self.assertListEqual(
+            [len(sinks) for sinks in get_sink_batches(self.tc_list, 2)], [2, 1]
+        )
+
+    def test_no_sinks_returns_no_batches(self):
+        self.assertListEqual(get_sink_batches({"tc02": self.tc_list["tc02"]}, 2), [])
+
+
+class TestSinktaggingWorker(TestCase):
+    def setUp(self) -> None:
+        patch_paths(
+            self,
+            [
+                "bugfinder.processing.sink_tagging.LOGGER",
+                "bugfinder.processing.sink_tagging.sleep",
+            ],
+        )
+
+        patch_get_graph = patch("bugfinder.processing.sink_tagging.get_graph")
+        self.graph = patch_get_graph.start().return_value
+        self.addCleanup(patch_get_graph.stop)
+
+        self.progress_bar = Mock()
+        self.sinks = [
+            {"name": "tc01", "tcid": 1, "basename": "tc01.c", "lineno": 10},
+            {"name": "tc03", "tcid": 3, "basename": "tc03.c", "lineno": 30},
+            {"name": "tc01", "tcid": 1, "basename": "tc01.c", "lineno": 20},
+        ]
+
+    def test_batch_is_sent_in_a_single_query(self):
+        failed, query_stats = sinktagging_worker(self.progress_bar, self.sinks, 7687)
+
+        self.assertListEqual(failed, [])
+        self.graph.run.assert_called_once_with(
+            TAG_SINKS_QUERY.template, {"sinks": self.sinks}
+        )
+        self.assertEqual(
+            query_stats["cypher_templates"]["sink_tagging.tag_sinks"]["queries"], 1
+        )
+        self.progress_bar.next.assert_called_once_with(n=3)
+
+    def test_failed_batch_returns_its_test_cases(self):
+        self.graph.run.side_effect = Exception("mock_error")
+
+        failed, _ = sinktagging_worker(self.progress_bar, self.sinks, 7687)
+
+        self.assertListEqual(
+            failed, [(1, "tc01", "mock_error"), (3, "tc03", "mock_error")]
+        )
+        self.assertEqual(self.graph.run.call_count, 1)
+
+    def test_connection_errors_are_retried(self):
+        self.graph.run.side_effect = [ConnectionBroken("mock_error"), Mock()]
+
+        failed, _ = sinktagging_worker(self.progress_bar, self.sinks, 7687)
+
+        self.assertListEqual(failed, [])
+        self.assertEqual(self.graph.run.call_count, 2)
+
+    def test_transient_errors_are_retried(self):
+        self.graph.run.side_effect = [
+            TransientError(
+                "mock_error", code="Neo.TransientError.Transaction.Deadlock"
+            ),
+            Mock(),
+        ]
+
+        failed, _ = sinktagging_worker(self.progress_bar, self.sinks, 7687)
+
+        self.assertListEqual(failed, [])
+        self.assertEqual(self.graph.run.call_count, 2)
+
+    def test_tries_are_bounded(self):
+        self.graph.run.side_effect = ConnectionBroken("mock_error")
+
+        failed, _ = sinktagging_worker(self.progress_bar, self.sinks, 7687)
+
+        self.assertListEqual(
+            failed,
+            [(1, "tc01", "All tries exhausted."), (3, "tc03", "All tries exhausted.")],
+        )
+        self.assertEqual(self.graph.run.call_count, 4)
+
+
+class TestSinkTaggingProcessingConfigureCommand(TestCase):
+    def setUp(self) -> None:
+        self.dataset_processing = SinkTaggingProcessing(None)
+        self.command = {"log_input": None, "log_output": None, "sinks": "sinks.csv"}
+
+    def test_batch_size_is_configured(self):
+        self.dataset_processing.configure_command({**self.command, "batch_size": 5})
+
+        self.assertEqual(self.dataset_processing.batch_size, 5)
+
+    def test_invalid_batch_size_raises_error(self):
+        with self.assertRaises(ValueError):
+            self.dataset_processing.configure_command({**self.command, "batch_size": 0})
+
+
+class TestSinkManifest(TestCase):
+    def setUp(self) -> None:
+        patch_paths(self, ["bugfinder.processing.sink_tagging.LOGGER"])
+
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.sinks_path = join(self.tmp_dir.name, "sinks.csv")
+        self.write_sinks(
+            [
+                "1,/sard/000001/tc01.c,10",
+                "1,/sard/000001/tc01.c,10",
+                "1,/sard/000001/tc01.c,20",
+                "5,/juliet/CWE121_tc02a.c,30",
+                "7,/juliet/CWE121_tc02b.c,40",
+                "7,/juliet/CWE121_tc02b.c,40",
+                "6,/juliet/CWE121_tc02a.c,50",
+                "invalid line",
+            ]
+        )
+
+    def write_sinks(self, lines, mtime=1):
+        with open(self.sinks_path, "w") as sink_fp:
+            sink_fp.write("".join("%s\n" % line for line in lines))
+
+        # Recently modified files are never trusted by the cache.
+        utime(self.sinks_path, (mtime, mtime))
+
+    def test_sard_sinks_are_deduplicated(self):
+        self.assertListEqual(
+            SinkManifest(self.sinks_path).get_sinks("000001", {"000001"}),
+            [
+                {"basename": "tc01.c", "lineno": 10, "sardid": 1},
+                {"basename": "tc01.c", "lineno": 20, "sardid": 1},
+            ],
+        )
+
+    def test_latest_juliet_version_is_used(self):
+        self.assertListEqual(
+            SinkManifest(self.sinks_path).get_sinks("CWE121_tc02", {"CWE121_tc02"}),
+            [{"basename": "CWE121_tc02b.c", "lineno": 39, "sardid": 7}],
+        )
+
+    def test_sard_test_cases_take_precedence(self):
+        self.assertListEqual(
+            SinkManifest(self.sinks_path).get_sinks(
+                "CWE121_tc02", {"CWE121_tc02", "000007"}
+            ),
+            [{"basename": "CWE121_tc02a.c", "lineno": 49, "sardid": 6}],
+        )
+
+    def test_unknown_test_cases_have_no_sinks(self):
+        self.assertListEqual(
+            SinkManifest(self.sinks_path).get_sinks("tc03", {"tc03"}), []
+        )
+
+    def test_sinks_are_assigned(self):
+        tc_list = {"000001": {"tcid": 1, "sinks": []}, "tc03": {"tcid": 3, "sinks": []}}
+
+        SinkManifest(self.sinks_path).assign_sinks(tc_list)
+
+        self.assertEqual(len(tc_list["000001"]["sinks"]), 2)
+        self.assertListEqual(tc_list["tc03"]["sinks"], [])
+
+    def test_invalid_lines_are_skipped(self):
+        with patch("bugfinder.processing.sink_tagging.LOGGER") as mock_logger:
+            sink_manifest = SinkManifest(self.sinks_path)
+
+        self.assertEqual(sink_manifest.sink_count, 8)
+        self.assertEqual(mock_logger.warning.call_count, 1)
+
+    def test_index_is_read_from_cache(self):
+        sink_manifest = SinkManifest(self.sinks_path)
+
+        with patch(
+            "bugfinder.processing.sink_tagging.SinkManifest.parse"
+        ) as mock_parse:
+            cached_manifest = SinkManifest(self.sinks_path)
+
+        self.assertFalse(mock_parse.called)
+        self.assertDictEqual(cached_manifest.sard_sinks, sink_manifest.sard_sinks)
+        self.assertDictEqual(cached_manifest.juliet_sinks, sink_manifest.juliet_sinks)
+        self.assertEqual(cached_manifest.sink_count, sink_manifest.sink_count)
+
+    def test_modified_sinks_file_is_parsed(self):
+        SinkManifest(self.sinks_path)
+        self.write_sinks(["2,/sard/000002/tc01.c,10"], 2)
+
+        sink_manifest = SinkManifest(self.sinks_path)
+
+        self.assertListEqual(list(sink_manifest.sard_sinks), ["000002"])
+
+    def test_cache_can_be_disabled(self):
+        SinkManifest(self.sinks_path, use_cache=False)
+
+        self.assertFalse(exists("%s%s" % (self.sinks_path, SINK_MANIFEST_CACHE_EXT)))
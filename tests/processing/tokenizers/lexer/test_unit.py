@@ -0,0 +1,49 @@
+from unittest import TestCase
+
+from bugfinder.processing.tokenizers.lexer import CodeLexer, TokenType, code_lexer
+
+
+class TestCodeLexerTokenize(TestCase):
+    def test_blanks_separate_tokens(self):
+        self.assertListEqual(
+            code_lexer.tokenize("int  a\nchar b\n"), ["int", "a", "char", "b"]
+        )
+
+    def test_operators_are_single_tokens(self):
+        self.assertListEqual(
+            code_lexer.tokenize("a<<=b->c;d&&!e"),
+            ["a", "<<=", "b", "->", "c", ";", "d", "&&", "!e"],
+        )
+
+    def test_longest_operator_is_matched(self):
+        self.assertListEqual(
+            code_lexer.tokenize("a>>=b>>c>d"), ["a", ">>=", "b", ">>", "c", ">", "d"]
+        )
+
+    def test_operator_chars_outside_operators_are_kept(self):
+        self.assertListEqual(code_lexer.tokenize("!a != b"), ["!a", "!=", "b"])
+
+    def test_escapes_and_tabs_are_removed(self):
+        self.assertListEqual(
+            code_lexer.tokenize('printf("a\\n");\r\n\tb\\;'),
+            ["printf", "(", '"a"', ")", ";", "b", ";"],
+        )
+
+    def test_custom_operators(self):
+        self.assertListEqual(
+            CodeLexer(operators={"+"}).tokenize("a+b;c"), ["a", "+", "b;c"]
+        )
+
+
+class TestCodeLexerGetTokenType(TestCase):
+    def test_operator(self):
+        self.assertEqual(code_lexer.get_token_type("->"), TokenType.OPERATOR)
+
+    def test_keyword(self):
+        self.assertEqual(code_lexer.get_token_type("while"), TokenType.KEYWORD)
+
+    def test_identifier(self):
+        self.assertEqual(code_lexer.get_token_type("_data01"), TokenType.IDENTIFIER)
+
+    def test_other(self):
+        self.assertEqual(code_lexer.get_token_type("0x1F"), TokenType.OTHER)
@@ -64,3 +64,23 @@ class TestReplaceFunctionsProcessFile(TestCase):
             processed_file.readlines()
 
         self.assertNotEqual(unprocessed_file, processed_file)
+
+
+class TestReplaceFunctionsReplaceFunctions(TestCase):
+    def test_functions_are_numbered_by_appearance(self):
+        self.assertEqual(
+            ReplaceFunctions.replace_functions("b(a());\nint a (int x) { b(x); }\n"),
+            ("FUN1(FUN2());\nint FUN2 (int x) { FUN1(x); }\n", 2),
+        )
+
+    def test_keywords_and_main_are_kept(self):
+        self.assertEqual(
+            ReplaceFunctions.replace_functions("int main() { while (f()) {} }\n"),
+            ("int main() { while (FUN1()) {} }\n", 1),
+        )
+
+    def test_call_on_next_line_is_not_replaced(self):
+        self.assertEqual(
+            ReplaceFunctions.replace_functions('f\n(printf("%d", 0x1F));\n'),
+            ("f\n(FUN1(, HEX));\n", 1),
+        )
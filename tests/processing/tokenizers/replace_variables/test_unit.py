@@ -64,3 +64,23 @@ class TestReplaceVariablesProcessFile(TestCase):
             processed_file.readlines()
 
         self.assertNotEqual(unprocessed_file, processed_file)
+
+
+class TestReplaceVariablesReplaceVariables(TestCase):
+    def test_variables_are_numbered_by_appearance(self):
+        self.assertEqual(
+            ReplaceVariables.replace_variables("int b = a;\na = b + c;\n"),
+            ("int VAR1 = VAR2;\nVAR2 = VAR1 + VAR3;\n", 3),
+        )
+
+    def test_keywords_functions_and_main_vars_are_kept(self):
+        self.assertEqual(
+            ReplaceVariables.replace_variables("return f(argc, x);\n"),
+            ("return f(argc, VAR1);\n", 1),
+        )
+
+    def test_variables_are_only_replaced_on_lines_using_them(self):
+        self.assertEqual(
+            ReplaceVariables.replace_variables("x = 0;\nx *y;\n"),
+            ("VAR1 = 0;\nx *VAR2;\n", 2),
+        )
@@ -1,9 +1,23 @@
 """
 """
 import unittest
+from os import mkdir, rename, stat, utime
+from os.path import join, samefile
+from tempfile import TemporaryDirectory
+from time import time_ns
 from unittest.mock import patch
 
-from bugfinder.utils.dirs import copy_dir
+from bugfinder.utils.dirs import (
+    copy_dir,
+    get_signature,
+    scan_tree,
+    is_tree_unchanged,
+    get_file_hash,
+    get_tree_hash,
+    link_file,
+    break_hard_link,
+    MTIME_RESOLUTION_NS,
+)
 
 
 class TestCopyDir(unittest.TestCase):
@@ -60,3 +74,210 @@ class TestCopyDir(unittest.TestCase):
         self.mock_isdir.return_value = True
 
         self.assertTrue(copy_dir(self.input, self.output))
+
+
+class TestScanTree(unittest.TestCase):
+    def setUp(self) -> None:
+        self.root_path = "./tests/fixtures/dataset01"
+
+    def test_files_are_correct(self):
+        _, dir_files = scan_tree(self.root_path, "class01")
+
+        self.assertEqual(
+            dir_files,
+            {
+                "class01/tc02": ["item.c", "item.h"],
+                "class01/tc03": ["item.c", "item.txt"],
+            },
+        )
+
+    def test_all_directories_are_recorded(self):
+        dir_signatures, _ = scan_tree(self.root_path, "class01")
+
+        self.assertEqual(
+            set(dir_signatures.keys()),
+            {"class01", "class01/tc01", "class01/tc02", "class01/tc03"},
+        )
+
+
+class TestGetSignature(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+    def test_recent_path_returns_none(self):
+        self.assertIsNone(get_signature(self.tmp_dir.name))
+
+    def test_old_path_returns_signature(self):
+        old_time_ns = time_ns() - 2 * MTIME_RESOLUTION_NS
+        utime(self.tmp_dir.name, ns=(old_time_ns, old_time_ns))
+
+        self.assertEqual(get_signature(self.tmp_dir.name)[0], old_time_ns)
+
+
+class TestIsTreeUnchanged(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        class_path = join(self.tmp_dir.name, "class01")
+        test_case_path = join(class_path, "tc01")
+        mkdir(class_path)
+        mkdir(test_case_path)
+
+        with open(join(test_case_path, "item.c"), "w"):
+            pass
+
+        old_time_ns = time_ns() - 2 * MTIME_RESOLUTION_NS
+
+        for dirpath in [test_case_path, class_path]:
+            utime(dirpath, ns=(old_time_ns, old_time_ns))
+
+        self.dir_signatures, _ = scan_tree(self.tmp_dir.name, "class01")
+
+    def test_unchanged_tree_returns_true(self):
+        self.assertTrue(is_tree_unchanged(self.tmp_dir.name, self.dir_signatures))
+
+    def test_untrusted_signature_returns_false(self):
+        self.dir_signatures["class01"] = None
+
+        self.assertFalse(is_tree_unchanged(self.tmp_dir.name, self.dir_signatures))
+
+    def test_modified_directory_returns_false(self):
+        with open(join(self.tmp_dir.name, "class01", "tc01", "item.h"), "w"):
+            pass
+
+        self.assertFalse(is_tree_unchanged(self.tmp_dir.name, self.dir_signatures))
+
+    def test_removed_directory_returns_false(self):
+        self.tmp_dir.cleanup()
+
+        self.assertFalse(is_tree_unchanged(self.tmp_dir.name, self.dir_signatures))
+
+
+class TestGetTreeHash(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.tree_path = join(self.tmp_dir.name, "tree")
+        mkdir(self.tree_path)
+        mkdir(join(self.tree_path, "subdir"))
+
+        for filepath in ["item.c", "subdir/item.h"]:
+            with open(join(self.tree_path, filepath), "w") as file_fp:
+                file_fp.write(filepath)
+
+        self.tree_hash = get_tree_hash(self.tree_path)
+
+    def test_missing_path_returns_none(self):
+        self.assertIsNone(get_tree_hash(join(self.tmp_dir.name, "missing")))
+
+    def test_unchanged_tree_has_same_hash(self):
+        self.assertEqual(get_tree_hash(self.tree_path), self.tree_hash)
+
+    def test_modified_file_changes_hash(self):
+        with open(join(self.tree_path, "subdir", "item.h"), "w") as file_fp:
+            file_fp.write("modified")
+
+        self.assertNotEqual(get_tree_hash(self.tree_path), self.tree_hash)
+
+    def test_added_file_changes_hash(self):
+        with open(join(self.tree_path, "subdir", "item.c"), "w"):
+            pass
+
+        self.assertNotEqual(get_tree_hash(self.tree_path), self.tree_hash)
+
+    def test_moved_file_changes_hash(self):
+        rename(join(self.tree_path, "subdir", "item.h"), join(self.tree_path, "item.h"))
+
+        self.assertNotEqual(get_tree_hash(self.tree_path), self.tree_hash)
+
+    def test_cached_file_hash_is_reused(self):
+        filepath = join(self.tree_path, "item.c")
+        old_time_ns = time_ns() - 2 * MTIME_RESOLUTION_NS
+        utime(filepath, ns=(old_time_ns, old_time_ns))
+        file_hashes = {}
+
+        file_hash = get_file_hash(filepath, file_hashes)
+        file_hashes[filepath] = (file_hashes[filepath][0], "cached")
+
+        self.assertNotEqual(file_hash, "cached")
+        self.assertEqual(get_file_hash(filepath, file_hashes), "cached")
+
+    def test_recent_file_hash_is_not_cached(self):
+        file_hashes = {}
+
+        get_file_hash(join(self.tree_path, "item.c"), file_hashes)
+
+        self.assertDictEqual(file_hashes, {})
+
+
+class TestLinkFile(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.src_path = join(self.tmp_dir.name, "src.c")
+        self.dest_path = join(self.tmp_dir.name, "dest.c")
+
+        with open(self.src_path, "w") as file_fp:
+            file_fp.write("int a;\n")
+
+    def assert_same_content(self):
+        with open(self.dest_path, "r") as file_fp:
+            self.assertEqual(file_fp.read(), "int a;\n")
+
+    def test_content_is_shared(self):
+        self.assertEqual(link_file(self.src_path, self.dest_path), self.dest_path)
+        self.assert_same_content()
+
+    @patch("bugfinder.utils.dirs.fcntl.ioctl")
+    def test_hard_link_is_used_without_reflinks(self, mock_ioctl):
+        mock_ioctl.side_effect = OSError("Operation not supported")
+
+        link_file(self.src_path, self.dest_path)
+
+        self.assertTrue(samefile(self.src_path, self.dest_path))
+        self.assert_same_content()
+
+    @patch("bugfinder.utils.dirs.link")
+    @patch("bugfinder.utils.dirs.fcntl.ioctl")
+    def test_file_is_copied_without_links(self, mock_ioctl, mock_link):
+        mock_ioctl.side_effect = OSError("Operation not supported")
+        mock_link.side_effect = OSError("Invalid cross-device link")
+
+        link_file(self.src_path, self.dest_path)
+
+        self.assertFalse(samefile(self.src_path, self.dest_path))
+        self.assert_same_content()
+
+
+class TestBreakHardLink(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.src_path = join(self.tmp_dir.name, "src.c")
+        self.dest_path = join(self.tmp_dir.name, "dest.c")
+
+        with open(self.src_path, "w") as file_fp:
+            file_fp.write("int a;\n")
+
+    def test_single_link_is_kept(self):
+        self.assertFalse(break_hard_link(self.src_path))
+
+    @patch("bugfinder.utils.dirs.fcntl.ioctl")
+    def test_linked_file_gets_own_copy(self, mock_ioctl):
+        mock_ioctl.side_effect = OSError("Operation not supported")
+        link_file(self.src_path, self.dest_path)
+
+        self.assertTrue(break_hard_link(self.dest_path))
+
+        with open(self.dest_path, "a") as file_fp:
+            file_fp.write("int b;\n")
+
+        with open(self.src_path, "r") as file_fp:
+            self.assertEqual(file_fp.read(), "int a;\n")
+
+        self.assertEqual(stat(self.src_path).st_nlink, 1)
@@ -0,0 +1,271 @@
+"""
+"""
+import json
+import unittest
+from os import listdir
+from os.path import join, exists
+from tempfile import TemporaryDirectory
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from bugfinder.utils.feature_store import (
+    FeatureStore,
+    COLUMNS_FILE,
+    SPARSE_BLOCK,
+    BLOCKS_DIR,
+)
+
+
+class TestFeatureStore(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.features = pd.read_csv("./tests/fixtures/dataset01/features/features.csv")
+        self.feature_store = FeatureStore(join(self.tmp_dir.name, "features.store"))
+
+    def test_missing_store_does_not_exist(self):
+        self.assertFalse(self.feature_store.exists())
+
+    def test_written_store_exists(self):
+        self.feature_store.write(self.features)
+
+        self.assertTrue(self.feature_store.exists())
+        self.assertFalse(exists("%s.tmp" % self.feature_store.path))
+
+    def test_read_features_are_equal(self):
+        self.feature_store.write(self.features)
+
+        self.assertTrue(self.features.equals(self.feature_store.read()))
+
+    def test_shape_is_correct(self):
+        self.feature_store.write(self.features)
+
+        self.assertEqual(self.feature_store.shape, self.features.shape)
+
+    def test_column_types_are_kept(self):
+        self.feature_store.write(self.features)
+
+        self.assertEqual(self.feature_store.dtypes["result"], "int64")
+        self.assertEqual(self.feature_store.dtypes["f01"], "float64")
+        self.assertEqual(self.feature_store.dtypes["name"], "str")
+
+    def test_single_column_is_read(self):
+        self.feature_store.write(self.features)
+
+        np.testing.assert_array_equal(
+            self.feature_store.get_column("f02"), self.features["f02"].to_numpy()
+        )
+
+    def test_subset_of_columns_is_read(self):
+        self.feature_store.write(self.features)
+
+        self.assertListEqual(
+            list(self.feature_store.read(["name", "f03"]).columns), ["name", "f03"]
+        )
+
+    def test_unknown_column_raises_error(self):
+        self.feature_store.write(self.features)
+
+        with self.assertRaises(KeyError):
+            self.feature_store.get_column("unknown")
+
+    def test_changes_to_read_features_are_not_saved(self):
+        self.feature_store.write(self.features)
+
+        self.feature_store.get_column("f01")[0] = 42
+        self.assertEqual(
+            FeatureStore(self.feature_store.path).get_column("f01")[0], 0.01
+        )
+
+    def test_store_is_overwritten(self):
+        self.feature_store.write(self.features)
+        self.feature_store.write(self.features[["name", "result"]])
+
+        self.assertListEqual(self.feature_store.columns, ["name", "result"])
+
+    def test_unsupported_version_raises_error(self):
+        self.feature_store.write(self.features)
+
+        with open(self.feature_store.columns_filepath, "w") as columns_fp:
+            json.dump({"version": 0}, columns_fp)
+
+        with self.assertRaises(ValueError):
+            FeatureStore(self.feature_store.path).columns
+
+    def test_csv_import_and_export(self):
+        csv_filepath = join(self.tmp_dir.name, "features.csv")
+
+        self.feature_store.import_csv(
+            "./tests/fixtures/dataset01/features/features.csv"
+        )
+        self.feature_store.export_csv(csv_filepath)
+
+        self.assertTrue(self.features.equals(pd.read_csv(csv_filepath)))
+
+    def test_copy_is_readable(self):
+        self.feature_store.write(self.features)
+        feature_store_copy = self.feature_store.copy(
+            join(self.tmp_dir.name, "features.1.store")
+        )
+
+        self.assertTrue(exists(join(feature_store_copy.path, COLUMNS_FILE)))
+        self.assertTrue(self.features.equals(feature_store_copy.read()))
+
+    def test_test_cases_are_not_recorded_by_default(self):
+        self.feature_store.write(self.features)
+
+        self.assertIsNone(self.feature_store.test_cases)
+
+    def test_test_cases_are_recorded(self):
+        self.feature_store.write(self.features, ["class01/tc01", "class02/tc01"])
+
+        self.assertListEqual(
+            self.feature_store.test_cases.tolist(), ["class01/tc01", "class02/tc01"]
+        )
+        self.assertTrue(self.features.equals(self.feature_store.read()))
+
+    def test_test_cases_kept_by_selected_columns(self):
+        self.feature_store.write(self.features, ["class01/tc01", "class02/tc01"])
+        self.feature_store.create_version()
+        self.feature_store.select(["f01", "name", "result"])
+
+        self.assertListEqual(
+            self.feature_store.test_cases.tolist(), ["class01/tc01", "class02/tc01"]
+        )
+        self.assertListEqual(
+            self.feature_store.get_version(1).test_cases.tolist(),
+            ["class01/tc01", "class02/tc01"],
+        )
+
+    def test_test_cases_of_every_row_are_required(self):
+        with self.assertRaises(IndexError):
+            self.feature_store.write(self.features, ["class01/tc01"])
+
+
+class TestFeatureStoreVersions(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.features = pd.read_csv("./tests/fixtures/dataset01/features/features.csv")
+        self.feature_store = FeatureStore(join(self.tmp_dir.name, "features.store"))
+        self.feature_store.write(self.features)
+        self.blocks_path = join(self.feature_store.path, BLOCKS_DIR)
+
+    def test_new_store_is_first_version(self):
+        self.assertEqual(self.feature_store.feature_version, 1)
+        self.assertIsNone(self.feature_store.parent)
+        self.assertListEqual(self.feature_store.versions, [])
+
+    def test_created_version_is_readable(self):
+        self.assertEqual(self.feature_store.create_version(), 1)
+        self.feature_store.write(self.features[["name", "result"]])
+
+        self.assertEqual(self.feature_store.feature_version, 2)
+        self.assertEqual(self.feature_store.parent, 1)
+        self.assertTrue(self.features.equals(self.feature_store.get_version(1).read()))
+
+    def test_created_version_does_not_copy_blocks(self):
+        blocks = listdir(self.blocks_path)
+        self.feature_store.create_version()
+
+        self.assertListEqual(listdir(self.blocks_path), blocks)
+
+    def test_selected_columns_share_blocks(self):
+        blocks = set(listdir(self.blocks_path))
+        self.feature_store.select(["f03", "name"])
+
+        self.assertTrue(blocks.issuperset(listdir(self.blocks_path)))
+        self.assertTrue(
+            self.features[["f03", "name"]].equals(self.feature_store.read())
+        )
+
+    def test_unknown_selected_column_raises_error(self):
+        with self.assertRaises(KeyError):
+            self.feature_store.select(["unknown"])
+
+    def test_unused_blocks_are_removed(self):
+        blocks = set(listdir(self.blocks_path))
+        self.feature_store.write(self.features)
+
+        self.assertEqual(len(listdir(self.blocks_path)), len(blocks))
+        self.assertTrue(blocks.isdisjoint(listdir(self.blocks_path)))
+
+    def test_versioned_blocks_are_kept(self):
+        blocks = set(listdir(self.blocks_path))
+        self.feature_store.create_version()
+        self.feature_store.write(self.features)
+
+        self.assertTrue(blocks.issubset(listdir(self.blocks_path)))
+
+    def test_previous_version_is_read_only(self):
+        self.feature_store.create_version()
+
+        with self.assertRaises(ValueError):
+            self.feature_store.get_version(1).write(self.features)
+
+    def test_unknown_version_raises_error(self):
+        with self.assertRaises(KeyError):
+            self.feature_store.get_version(1)
+
+    def test_unsupported_store_is_overwritten(self):
+        with open(self.feature_store.columns_filepath, "w") as columns_fp:
+            json.dump({"version": 0}, columns_fp)
+
+        feature_store = FeatureStore(self.feature_store.path)
+        feature_store.write(self.features)
+
+        self.assertTrue(self.features.equals(feature_store.read()))
+
+
+class TestFeatureStoreSparse(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        self.matrix = sparse.csr_matrix([[0, 1.5, 0], [2, 0, 0], [0, 0, 0]])
+        self.features = pd.DataFrame.sparse.from_spmatrix(
+            self.matrix, columns=["f01", "f02", "f03"]
+        )
+        self.features["result"] = [0, 1, 1]
+        self.features["name"] = ["alpha", "beta", "gamma"]
+
+        self.feature_store = FeatureStore(join(self.tmp_dir.name, "features.store"))
+        self.feature_store.write(self.features)
+
+    def test_sparse_columns_are_stored_as_sparse_matrix(self):
+        self.assertIn(
+            "npz",
+            [
+                block_file.split(".")[-1]
+                for block_file in listdir(join(self.feature_store.path, BLOCKS_DIR))
+            ],
+        )
+        self.assertEqual(self.feature_store.dtypes["f01"], SPARSE_BLOCK)
+        self.assertEqual(self.feature_store.dtypes["result"], "int64")
+
+    def test_read_features_are_sparse(self):
+        features = self.feature_store.read()
+
+        self.assertListEqual(list(features.columns), list(self.features.columns))
+        self.assertIsInstance(features["f02"].dtype, pd.SparseDtype)
+        self.assertEqual(features["name"].tolist(), ["alpha", "beta", "gamma"])
+
+    def test_matrix_is_correct(self):
+        matrix = self.feature_store.get_matrix(["f01", "f02", "f03"])
+
+        self.assertIsInstance(matrix, sparse.csr_matrix)
+        np.testing.assert_array_equal(matrix.toarray(), self.matrix.toarray())
+
+    def test_matrix_keeps_column_order(self):
+        matrix = self.feature_store.get_matrix(["result", "f02"])
+
+        np.testing.assert_array_equal(matrix.toarray(), [[0, 1.5], [1, 0], [1, 0]])
+
+    def test_single_sparse_column_is_read(self):
+        np.testing.assert_array_equal(
+            np.asarray(self.feature_store.get_column("f01")), [0, 2, 0]
+        )
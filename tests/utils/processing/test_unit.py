@@ -2,7 +2,12 @@
 """
 import unittest
 
-from bugfinder.utils.processing import is_operation_valid, is_processing_stack_valid
+from bugfinder.utils.processing import (
+    is_operation_valid,
+    is_processing_stack_valid,
+    are_artifacts_overlapping,
+    are_operations_conflicting,
+)
 from tests import MockAbstractProcessing, patch_paths
 
 
@@ -76,3 +81,57 @@ class TestIsProcessingStackValid(unittest.TestCase):
         operation_list = [{"class": self.operation_class, "args": {}}, object]
 
         self.assertFalse(is_processing_stack_valid(operation_list))
+
+
+class TestAreArtifactsOverlapping(unittest.TestCase):
+    def test_same_artifacts_overlap(self):
+        self.assertTrue(are_artifacts_overlapping({"feats"}, {"joern", "feats"}))
+
+    def test_different_artifacts_do_not_overlap(self):
+        self.assertFalse(are_artifacts_overlapping({"feats"}, {"joern", "source"}))
+
+    def test_named_artifact_overlaps_with_artifact(self):
+        self.assertTrue(are_artifacts_overlapping({"models"}, {"models/model01"}))
+        self.assertTrue(are_artifacts_overlapping({"models/model01"}, {"models"}))
+
+    def test_different_named_artifacts_do_not_overlap(self):
+        self.assertFalse(
+            are_artifacts_overlapping({"models/model01"}, {"models/model02"})
+        )
+
+    def test_artifact_prefix_does_not_overlap(self):
+        self.assertFalse(are_artifacts_overlapping({"models"}, {"models_old"}))
+
+
+class TestAreOperationsConflicting(unittest.TestCase):
+    def test_undeclared_artifacts_conflict(self):
+        self.assertTrue(
+            are_operations_conflicting((None, None), ({"source"}, {"source"}))
+        )
+        self.assertTrue(
+            are_operations_conflicting(({"source"}, {"source"}), (None, None))
+        )
+
+    def test_concurrent_reads_do_not_conflict(self):
+        self.assertFalse(
+            are_operations_conflicting(
+                ({"feats"}, {"models/model01"}), ({"feats"}, {"models/model02"})
+            )
+        )
+
+    def test_write_after_read_conflicts(self):
+        self.assertTrue(
+            are_operations_conflicting(({"source"}, {"joern"}), ({"joern"}, {"neo4j"}))
+        )
+
+    def test_read_after_write_conflicts(self):
+        self.assertTrue(
+            are_operations_conflicting(({"joern"}, {"neo4j"}), ({"source"}, {"joern"}))
+        )
+
+    def test_concurrent_writes_conflict(self):
+        self.assertTrue(
+            are_operations_conflicting(
+                ({"feats"}, {"models/model01"}), ({"source"}, {"models/model01"})
+            )
+        )
@@ -0,0 +1,186 @@
+"""
+"""
+import unittest
+from os import remove
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+from bugfinder.utils.profiling import (
+    ResourceProfiler,
+    get_files_snapshot,
+    get_io_counters,
+    get_resources_table,
+    format_resources_table,
+    display_bytes,
+)
+
+
+class TestGetIoCounters(unittest.TestCase):
+    def test_written_bytes_are_counted(self):
+        tmp_dir = TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        _, start_write_bytes = get_io_counters()
+
+        with open(join(tmp_dir.name, "item.c"), "w") as item_fp:
+            item_fp.write("x" * 1000)
+
+        _, write_bytes = get_io_counters()
+        self.assertGreaterEqual(write_bytes - start_write_bytes, 1000)
+
+    @patch("bugfinder.utils.profiling.PROC_IO_FILE", "/missing/io")
+    def test_missing_counters_return_none(self):
+        self.assertEqual(get_io_counters(), (None, None))
+
+
+class TestGetFilesSnapshot(unittest.TestCase):
+    def test_files_are_recorded(self):
+        files_snapshot = get_files_snapshot(
+            ["./tests/fixtures/dataset01/class01", "./tests/fixtures/missing"]
+        )
+
+        self.assertSetEqual(
+            set(files_snapshot.keys()),
+            {
+                "./tests/fixtures/dataset01/class01/tc01/.keep",
+                "./tests/fixtures/dataset01/class01/tc02/item.c",
+                "./tests/fixtures/dataset01/class01/tc02/item.h",
+                "./tests/fixtures/dataset01/class01/tc03/item.c",
+                "./tests/fixtures/dataset01/class01/tc03/item.txt",
+            },
+        )
+
+
+class TestResourceProfiler(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp_dir = TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        for filename in ["item.c", "item.h", "item.txt"]:
+            with open(join(self.tmp_dir.name, filename), "w") as item_fp:
+                item_fp.write(filename)
+
+    def test_resources_are_measured(self):
+        profiler = ResourceProfiler()
+        profiler.start()
+        sum(range(10**6))
+        resources = profiler.stop()
+
+        self.assertGreater(resources["cpu_user"] + resources["cpu_system"], 0)
+        self.assertGreater(resources["peak_rss"], 0)
+        self.assertIsNone(resources["files_touched"])
+
+    def test_touched_files_are_counted(self):
+        profiler = ResourceProfiler([self.tmp_dir.name])
+        profiler.start()
+
+        with open(join(self.tmp_dir.name, "item.c"), "a") as item_fp:
+            item_fp.write("modified")
+
+        remove(join(self.tmp_dir.name, "item.h"))
+
+        with open(join(self.tmp_dir.name, "item.py"), "w"):
+            pass
+
+        self.assertEqual(profiler.stop()["files_touched"], 3)
+
+    @patch("bugfinder.utils.profiling.reset_peak_rss")
+    def test_peak_is_not_reset_by_concurrent_profilers(self, mock_reset_peak_rss):
+        profilers = [ResourceProfiler(), ResourceProfiler()]
+
+        for profiler in profilers:
+            profiler.start()
+
+        for profiler in profilers:
+            profiler.stop()
+
+        profiler = ResourceProfiler()
+        profiler.start()
+        profiler.stop()
+
+        self.assertEqual(mock_reset_peak_rss.call_count, 2)
+        self.assertEqual(ResourceProfiler.active_profilers, 0)
+
+
+class TestResourcesTable(unittest.TestCase):
+    def setUp(self) -> None:
+        resources = {
+            "cpu_user": 1.5,
+            "cpu_system": 0.5,
+            "peak_rss": 2048,
+            "read_bytes": 100,
+            "write_bytes": None,
+            "files_touched": 2,
+        }
+        self.summary = {
+            "metadata": {},
+            "processing": [
+                {
+                    "operation": {"class": "bugfinder.module.OperationA"},
+                    "time": 1000,
+                    "resources": dict(resources, peak_rss=1024),
+                },
+                {
+                    "operation": {"class": "bugfinder.module.OperationB"},
+                    "time": 500,
+                    "resources": dict(resources, cypher_queries=10, cypher_time=300),
+                },
+                {
+                    "operation": {"class": "bugfinder.module.OperationA"},
+                    "time": 1000,
+                    "resources": resources,
+                },
+                {"operation": {"class": "bugfinder.module.OperationC"}, "time": 10},
+            ],
+            "training": {
+                "model01": {
+                    "last_results": None,
+                    "sessions": [
+                        {
+                            "operation": {"class": "bugfinder.module.Model"},
+                            "time": 3000,
+                            "resources": resources,
+                        }
+                    ],
+                }
+            },
+        }
+
+    def test_operations_are_aggregated(self):
+        table = get_resources_table(self.summary)
+
+        self.assertListEqual(
+            [(row["stage"], row["operation"]) for row in table],
+            [
+                ("processing", "OperationA"),
+                ("processing", "OperationB"),
+                ("training", "Model"),
+            ],
+        )
+        self.assertDictEqual(
+            table[0],
+            {
+                "stage": "processing",
+                "operation": "OperationA",
+                "runs": 2,
+                "time": 2000,
+                "cpu_user": 3.0,
+                "cpu_system": 1.0,
+                "peak_rss": 2048,
+                "read_bytes": 200,
+                "files_touched": 4,
+            },
+        )
+
+    def test_table_is_formatted(self):
+        table_lines = format_resources_table(self.summary).split("\n")
+
+        self.assertEqual(len(table_lines), 4)
+        self.assertTrue(table_lines[0].startswith("Stage"))
+        self.assertIn("OperationB", table_lines[2])
+        self.assertIn("300ms", table_lines[2])
+
+    def test_bytes_are_displayed(self):
+        self.assertEqual(display_bytes(100), "100B")
+        self.assertEqual(display_bytes(2048), "2.0KB")
+        self.assertEqual(display_bytes(3 * 1024**3), "3.0GB")
@@ -3,7 +3,12 @@
 import unittest
 from time import sleep
 
-from bugfinder.utils.statistics import get_time, display_time, has_better_metrics
+from bugfinder.utils.statistics import (
+    get_time,
+    display_time,
+    has_better_metrics,
+    get_dedup_stats,
+)
 
 
 class TestGetTime(unittest.TestCase):
@@ -52,3 +57,13 @@ class TestHasBetterMetrics(unittest.TestCase):
 
     def test_better_equal_metrics_returns_true(self):
         self.assertTrue(has_better_metrics(["key"], {"key": 1}, {"key": 1}))
+
+
+class TestGetDedupStats(unittest.TestCase):
+    def test_ratio_is_computed(self):
+        self.assertDictEqual(
+            get_dedup_stats(6, 4), {"files": 6, "unique_files": 4, "dedup_ratio": 1.5}
+        )
+
+    def test_empty_set_ratio_is_one(self):
+        self.assertEqual(get_dedup_stats(0, 0)["dedup_ratio"], 1.0)